@@ -9,6 +9,7 @@ It handles all API routes, middleware configuration, and application lifecycle.
 
 print("[DEBUG] ======= API/main.py LOADING START =======", flush=True)
 
+import asyncio
 import os
 import json
 import logging
@@ -33,6 +34,7 @@ print("[DEBUG] 2. Settings imported OK", flush=True)
 from api.routes import upload, evaluation, results
 from api.routes import auth, admin, teachers, students
 from api.routes import community, grievance, dashboard, oauth
+from api.routes import batch
 
 print("[DEBUG] 3. Routes imported OK", flush=True)
 
@@ -87,6 +89,16 @@ async def lifespan(app: FastAPI):
     init_db()
     logger.info("[OK] Database initialized")
     
+    # Evaluation statistics aggregates (built once for existing evaluations)
+    from database.models import SessionLocal
+    from database.aggregates import ensure_built
+    db = SessionLocal()
+    try:
+        if ensure_built(db):
+            logger.info("[OK] Evaluation statistics aggregates built")
+    finally:
+        db.close()
+    
     # Create default admin account
     create_default_admin()
     logger.info("[OK] Default admin checked/created")
@@ -103,7 +115,20 @@ async def lifespan(app: FastAPI):
     
     # NOTE: Models are loaded lazily on first request to reduce startup memory
     # This helps with free-tier hosting (512MB RAM limit)
-    logger.info("[INFO] ML models will be loaded on first request (lazy loading)")
+    # Either way each model is loaded once per worker via the shared model registry
+    from api.services.model_registry import get_model_registry
+    if settings.LOW_MEMORY_MODE:
+        logger.info("[INFO] ML models will be loaded on first request (lazy loading)")
+    else:
+        get_model_registry().warm_up()
+        logger.info("[OK] ML models preloaded into model registry")
+    
+    # Dashboard counters: full recompute at startup and then periodically (repairs drift)
+    from api.services.dashboard_service import run_counter_repairs
+    counter_repairs = None
+    if settings.DASHBOARD_REPAIR_INTERVAL_MINUTES > 0:
+        counter_repairs = asyncio.create_task(run_counter_repairs(settings.DASHBOARD_REPAIR_INTERVAL_MINUTES))
+        logger.info(f"[OK] Dashboard counter repairs every {settings.DASHBOARD_REPAIR_INTERVAL_MINUTES} min")
     
     logger.info(f"[SERVER] API running at http://{settings.API_HOST}:{settings.API_PORT}")
     logger.info("=" * 60)
@@ -112,6 +137,12 @@ async def lifespan(app: FastAPI):
     
     # ===== SHUTDOWN =====
     logger.info("[STOP] Shutting down AssessIQ...")
+    if counter_repairs is not None:
+        counter_repairs.cancel()
+    from api.services.evaluation_executor import get_evaluation_executor
+    from api.services.extraction_job_service import get_extraction_job_service
+    get_evaluation_executor().shutdown()
+    get_extraction_job_service().shutdown()
     logger.info("[BYE] Goodbye!")
 
 
@@ -287,6 +318,12 @@ app.include_router(
     tags=["Results"]
 )
 
+app.include_router(
+    batch.router,
+    prefix=f"{settings.API_PREFIX}/batch",
+    tags=["Batch Grading"]
+)
+
 # ========== Authentication & User Management Routers ==========
 app.include_router(
     auth.router,
@@ -382,11 +419,20 @@ async def root():
 async def health_check():
     """
     Health check endpoint for monitoring and load balancers.
+    Includes evaluation pool load (running / queued) for autoscaling.
     """
+    from api.services.evaluation_executor import get_evaluation_executor
+    
+    executor = get_evaluation_executor()
     return {
         "status": "healthy",
         "app": settings.APP_NAME,
         "version": settings.APP_VERSION,
+        "evaluation_pool": {
+            "running": executor.running,
+            "queued": executor.queued,
+            "capacity": executor.capacity,
+        },
         "timestamp": datetime.now().isoformat()
     }
 
@@ -396,6 +442,14 @@ async def api_info():
     """
     Get detailed API information and configuration.
     """
+    from api.services.model_registry import get_model_registry
+    from api.services.embedding_cache import get_embedding_cache
+    from api.services.evaluation_executor import get_evaluation_executor
+    from api.services.ocr_engine_pool import get_ocr_engine_pool
+    from api.services.ensemble_scheduler import get_ensemble_timing_stats
+    
+    embedding_cache = get_embedding_cache()
+    
     return {
         "success": True,
         "data": {
@@ -404,6 +458,11 @@ async def api_info():
             "ocr_engine": settings.OCR_ENGINE,
             "nlp_model": settings.SPACY_MODEL,
             "semantic_model": settings.SENTENCE_TRANSFORMER_MODEL,
+            "model_registry": get_model_registry().get_stats(),
+            "embedding_cache": embedding_cache.get_stats() if embedding_cache else None,
+            "evaluation_pool": get_evaluation_executor().get_stats(),
+            "ocr_engine_pool": get_ocr_engine_pool().get_stats(),
+            "ocr_ensemble": get_ensemble_timing_stats().get_stats(),
             "scoring_weights": {
                 "semantic": settings.WEIGHT_SEMANTIC,
                 "keyword": settings.WEIGHT_KEYWORD,
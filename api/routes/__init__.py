@@ -1,5 +1,5 @@
 # API Routes Package
-from . import upload, evaluation, results, auth, admin, teachers, students, community, grievance, dashboard, oauth
+from . import upload, evaluation, results, auth, admin, teachers, students, community, grievance, dashboard, oauth, batch
 
 __all__ = [
     "upload", 
@@ -12,5 +12,6 @@ __all__ = [
     "community",
     "grievance",
     "dashboard",
-    "oauth"
+    "oauth",
+    "batch"
 ]
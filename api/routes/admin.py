@@ -11,6 +11,8 @@ Endpoints:
 - PUT /admin/teachers/{id} - Update teacher
 - DELETE /admin/teachers/{id} - Delete teacher
 - GET /admin/activity-logs - View activity logs
+- GET /admin/ocr-cache - OCR result cache statistics
+- DELETE /admin/ocr-cache - Purge the OCR result cache
 """
 
 import logging
@@ -27,6 +29,7 @@ from database.models import (
     Evaluation, ManualEvaluation, ActivityLog,
     UserStatus, UserRole
 )
+from database.aggregates import read_totals
 from api.services.auth_service import (
     auth_service, get_current_admin, TokenData, hash_password
 )
@@ -102,11 +105,11 @@ async def admin_dashboard(
         Subject.is_active == True
     ).scalar() or 0
     
-    total_evaluations = db.query(func.count(Evaluation.id)).scalar() or 0
-    
-    total_manual_evals = db.query(func.count(ManualEvaluation.id)).scalar() or 0
-    
-    avg_score = db.query(func.avg(Evaluation.final_score)).scalar() or 0
+    # Evaluation figures come from the maintained aggregates
+    totals = read_totals(db)
+    total_evaluations = totals["ai"]["count"]
+    total_manual_evals = totals["manual"]["count"]
+    avg_score = totals["ai"]["average_score"]
     
     # Recent activities
     recent_activities = db.query(ActivityLog).order_by(
@@ -443,3 +446,45 @@ async def get_activity_logs(
             }
         }
     }
+
+
+# ========== OCR Cache ==========
+@router.get("/ocr-cache")
+async def get_ocr_cache_stats(
+    current_user: TokenData = Depends(get_current_admin)
+):
+    """
+    Get OCR result cache statistics (entries, size, hit rate, evictions).
+    """
+    from api.services.ocr_cache import get_ocr_cache
+
+    cache = get_ocr_cache()
+    return {
+        "success": True,
+        "data": {"enabled": cache is not None, **(cache.get_stats() if cache else {})}
+    }
+
+
+@router.delete("/ocr-cache")
+async def purge_ocr_cache(
+    current_user: TokenData = Depends(get_current_admin)
+):
+    """
+    Delete every cached OCR result.
+    """
+    from api.services.ocr_cache import get_ocr_cache
+
+    cache = get_ocr_cache()
+    if cache is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="OCR cache is disabled"
+        )
+    removed = cache.purge()
+    logger.info(f"OCR cache purged ({removed} entries) by admin {current_user.user_id}")
+
+    return {
+        "success": True,
+        "message": f"Removed {removed} cached OCR results",
+        "data": {"removed": removed}
+    }
@@ -0,0 +1,243 @@
+"""
+Batch Grading Routes
+=====================
+Class-wide grading: upload one model answer plus many student answer
+sheets (individual files and/or a ZIP) and grade them as one job.
+
+The model answer is OCRed and analysed once; student sheets are OCRed and
+scored on a bounded worker pool.  Poll ``GET /batch/{job_id}`` for
+per-student progress.
+"""
+
+import os
+import json
+import uuid
+import shutil
+import logging
+import zipfile
+from typing import Optional, List, Dict, Any
+
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from pydantic import BaseModel
+
+from config.settings import settings
+from api.services.auth_service import get_optional_user
+from api.routes.upload import validate_file_extension, generate_unique_filename, save_upload_file
+
+logger = logging.getLogger("AssessIQ.Batch")
+
+router = APIRouter()
+
+
+# ========== Pydantic Models ==========
+class BatchResponse(BaseModel):
+    """Response model for batch job operations."""
+    success: bool
+    message: str
+    data: Optional[dict] = None
+
+
+# ========== Helper Functions ==========
+def _extract_sheet_text(path: str, ocr_engine: str) -> str:
+    """Text of one answer sheet, cleaned the same way the upload cache is."""
+    from api.services.ocr_service import OCRService
+    from api.services.text_cleaning_service import TextCleaningService
+
+    if path.endswith(".txt"):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    else:
+        try:
+            ocr = OCRService(engine=ocr_engine)
+        except ValueError:
+            logger.warning(f"[BATCH] Engine {ocr_engine} not available, using easyocr")
+            ocr, ocr_engine = OCRService(engine="easyocr"), "easyocr"
+        try:
+            text = ocr.extract_text(path, language=None)
+        except Exception as e:
+            error_str = str(e).lower()
+            if ocr_engine == "sarvam" and ("connecterror" in error_str or "getaddrinfo" in error_str or "connection" in error_str):
+                logger.warning(f"[BATCH] Sarvam network error, falling back to easyocr for {os.path.basename(path)}")
+                text = OCRService(engine="easyocr").extract_text(path, language=None)
+            else:
+                raise
+    return TextCleaningService.clean_for_question_segmentation(text)
+
+
+def _evaluate_sheet(model_text: str, student_text: str, compiled, job) -> Dict[str, Any]:
+    """Score one sheet with the single-question pipeline, reusing the compiled model answer."""
+    from api.routes.evaluation import _evaluate_single_question_sync
+
+    return _evaluate_single_question_sync(
+        model_answer=model_text,
+        student_answer=student_text,
+        question_type=job.question_type,
+        max_marks=job.max_marks,
+        rubric_config=job.rubric_config,
+        compiled=compiled,
+    )
+
+
+def _extract_zip(zip_path: str, dest_dir: str, limit: int) -> List[str]:
+    """
+    Extract the answer sheets from a ZIP into *dest_dir*.
+
+    Only files with allowed extensions are kept; directory structure is
+    flattened (member names are reduced to their base name) so archive
+    paths cannot escape *dest_dir*.
+    """
+    paths: List[str] = []
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            for member in archive.infolist():
+                name = os.path.basename(member.filename)
+                if member.is_dir() or not name or name.startswith("."):
+                    continue
+                if not validate_file_extension(name):
+                    logger.info(f"[BATCH] Skipping {member.filename} (unsupported type)")
+                    continue
+                if member.file_size > settings.MAX_FILE_SIZE:
+                    raise HTTPException(status_code=413, detail=f"{name} exceeds the maximum file size")
+                if len(paths) >= limit:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Too many student sheets (max {settings.BATCH_MAX_STUDENTS})",
+                    )
+                target = os.path.join(dest_dir, name)
+                if os.path.exists(target):
+                    target = os.path.join(dest_dir, generate_unique_filename(name))
+                with archive.open(member) as src, open(target, "wb") as out:
+                    while chunk := src.read(1024 * 1024):
+                        out.write(chunk)
+                paths.append(target)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="students_zip is not a valid ZIP archive")
+    return paths
+
+
+# ========== API Endpoints ==========
+@router.post("/", response_model=BatchResponse)
+async def create_batch_job(
+    model_answer: UploadFile = File(..., description="Model answer key (image/PDF)"),
+    student_answers: List[UploadFile] = File(None, description="Student answer sheets (images/PDFs)"),
+    students_zip: Optional[UploadFile] = File(None, description="ZIP of student answer sheets"),
+    question_type: str = Form("descriptive", description="Type of question: factual, descriptive, diagram"),
+    max_marks: int = Form(10, description="Maximum marks per student"),
+    ocr_engine: str = Form("easyocr", description="OCR engine (easyocr, ensemble, tesseract, paddleocr, sarvam)"),
+    rubric_config: Optional[str] = Form(None, description="Optional rubric configuration as JSON"),
+    current_user=Depends(get_optional_user),
+):
+    """
+    Grade a whole class against one model answer.
+
+    **Workflow:**
+    1. Upload the model answer once plus the student sheets (files and/or a ZIP)
+    2. The job is queued and this call returns its `job_id` immediately
+    3. Model answer is OCRed and compiled once; sheets are graded in parallel
+    4. Poll `GET /batch/{job_id}` for per-student progress and scores
+
+    Student sheets are identified by file name (e.g. `roll_23.pdf` → `roll_23`).
+    """
+    from api.services.batch_grading_service import get_batch_grading_service
+
+    if not validate_file_extension(model_answer.filename):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type for model answer. Allowed: {settings.ALLOWED_EXTENSIONS}"
+        )
+    student_answers = [f for f in (student_answers or []) if f is not None and f.filename]
+    if not student_answers and students_zip is None:
+        raise HTTPException(status_code=400, detail="Provide student_answers files or a students_zip")
+    for upload in student_answers:
+        if not validate_file_extension(upload.filename):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid file type for {upload.filename}. Allowed: {settings.ALLOWED_EXTENSIONS}"
+            )
+
+    rubric = None
+    if rubric_config:
+        try:
+            rubric = json.loads(rubric_config)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="rubric_config must be valid JSON")
+
+    service = get_batch_grading_service()
+    job_id = str(uuid.uuid4())
+    job_dir = service.job_dir(job_id)
+    students_dir = os.path.join(job_dir, "students")
+    os.makedirs(students_dir, exist_ok=True)
+
+    try:
+        model_path = os.path.join(job_dir, f"model_{generate_unique_filename(model_answer.filename)}")
+        await save_upload_file(model_answer, model_path)
+
+        student_paths: List[str] = []
+        for upload in student_answers:
+            if len(student_paths) >= settings.BATCH_MAX_STUDENTS:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Too many student sheets (max {settings.BATCH_MAX_STUDENTS})",
+                )
+            target = os.path.join(students_dir, os.path.basename(upload.filename))
+            if os.path.exists(target):
+                target = os.path.join(students_dir, generate_unique_filename(upload.filename))
+            await save_upload_file(upload, target)
+            student_paths.append(target)
+
+        if students_zip is not None:
+            zip_path = os.path.join(job_dir, "students.zip")
+            await save_upload_file(students_zip, zip_path)
+            student_paths += _extract_zip(
+                zip_path, students_dir, settings.BATCH_MAX_STUDENTS - len(student_paths),
+            )
+            os.remove(zip_path)
+
+        if not student_paths:
+            raise HTTPException(status_code=400, detail="No valid student answer sheets found")
+
+        teacher_id = current_user.user_id if current_user and current_user.role == "teacher" else None
+        job = service.create_job(
+            model_path, student_paths, job_id=job_id,
+            question_type=question_type, max_marks=max_marks,
+            ocr_engine=ocr_engine, rubric_config=rubric, teacher_id=teacher_id,
+        )
+        service.start(job, evaluate_fn=_evaluate_sheet, extract_fn=_extract_sheet_text)
+        logger.info(f"[BATCH] Job {job_id} queued with {job.total} student sheets")
+
+        return BatchResponse(
+            success=True,
+            message=f"Batch job queued for {job.total} student sheets",
+            data={
+                "job_id": job_id,
+                "status": job.status,
+                "total": job.total,
+                "status_url": f"{settings.API_PREFIX}/batch/{job_id}",
+            },
+        )
+
+    except HTTPException:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        raise
+    except Exception as e:
+        logger.error(f"Batch job creation error: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to create batch job: {str(e)}")
+
+
+@router.get("/{job_id}", response_model=BatchResponse)
+async def get_batch_job(job_id: str):
+    """
+    Progress of a batch job: overall status plus one entry per student
+    (status, marks, grade, error).
+    """
+    from api.services.batch_grading_service import get_batch_grading_service
+
+    job = get_batch_grading_service().get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Batch job {job_id} not found")
+
+    data = job.to_dict()
+    for student in data["students"]:
+        student.pop("path", None)
+    data.pop("model_path", None)
+    return BatchResponse(success=True, message=f"Batch job {job.status}", data=data)
@@ -50,13 +50,9 @@ async def get_dashboard(
         # Increment login count
         DashboardService.update_login_count(db, dashboard)
         
-        # Update metrics based on user role
+        # Teacher / student counters are maintained on write; admin metrics are recomputed
         if user_role == UserRole.ADMIN:
             DashboardService.update_admin_metrics(db, user_id)
-        elif user_role == UserRole.TEACHER:
-            DashboardService.update_teacher_metrics(db, user_id)
-        elif user_role == UserRole.STUDENT:
-            DashboardService.update_student_metrics(db, user_id)
         
         # Refresh to get latest data
         db.refresh(dashboard)
@@ -229,7 +225,8 @@ async def reset_dashboard(
     current_user: dict = Depends(get_current_user)
 ):
     """
-    Reset all dashboard metrics to zero.
+    Reset activity and engagement metrics to zero.
+    Teacher / student counts and scores always cover all existing data.
     Only admin can reset other users' dashboards.
     Users can only reset their own.
     
@@ -11,7 +11,7 @@ import uuid
 import tempfile
 import shutil
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from enum import Enum
 
 import numpy as np
@@ -21,7 +21,7 @@ from sqlalchemy.orm import Session
 
 from config.settings import settings
 from database.models import get_db, Evaluation, GradeLevel, QuestionType as DBQuestionType
-from api.services.auth_service import get_current_user, get_optional_user
+from api.services.auth_service import TokenData, get_current_user, get_optional_user
 
 router = APIRouter()
 logger = logging.getLogger("AssessIQ.Evaluation")
@@ -251,6 +251,16 @@ class MultiQuestionResult(BaseModel):
 
 
 # ========== Helper Functions ==========
+def _compile_model_answer(model_text: str):
+    """Compiled model-answer artifact (cached per worker), or None on failure."""
+    try:
+        from api.services.model_answer_compiler import get_compiled_model_answer
+        return get_compiled_model_answer(model_text)
+    except Exception as e:
+        logger.warning(f"Model answer compilation failed, analysing per request: {e}")
+        return None
+
+
 def classify_grade(similarity: float) -> GradeLevel:
     """Classify similarity score into grade levels."""
     if similarity >= settings.SEMANTIC_EXCELLENT_THRESHOLD:
@@ -384,7 +394,7 @@ def generate_suggestions(
 async def evaluate_answer_multi_question(
     request: EvaluationRequest,
     db: Session = Depends(get_db),
-    current_user: dict = Depends(get_optional_user)
+    current_user: TokenData = Depends(get_optional_user)
 ):
     """
     Evaluate student answer in **question-wise mode** using uploaded files.
@@ -421,8 +431,18 @@ async def evaluate_answer_multi_question(
     student_cache = os.path.join(cache_dir, "student_extracted.txt")
     model_cache = os.path.join(cache_dir, "model_extracted.txt")
     
+    # Join the upload's background extraction job if it has not finished yet
+    from api.services.extraction_job_service import get_extraction_job_service
+    extraction_job = await get_extraction_job_service().wait_async(
+        request.evaluation_id, eval_dir, timeout=settings.EXTRACTION_JOIN_TIMEOUT,
+    )
+    
     if not os.path.exists(model_cache) or not os.path.exists(student_cache):
         logger.warning(f"Missing cached text files")
+        if extraction_job is not None and not extraction_job.is_finished:
+            raise HTTPException(status_code=409, detail="Text extraction is still in progress. Please retry shortly.")
+        if extraction_job is not None and extraction_job.error:
+            raise HTTPException(status_code=400, detail=f"Text extraction failed: {extraction_job.error}")
         raise HTTPException(status_code=400, detail="Cached text not found. Please re-upload files.")
     
     try:
@@ -468,6 +488,7 @@ async def evaluate_answer_multi_question(
     logger.info(f"[Phase 5/5] ✅ Returning results to client...")
     logger.info(f"Processing time: {time.time() - start_time:.2f}s")
     
+    _tag_result_owner(result.evaluation_id, current_user)
     return result
 
 
@@ -475,7 +496,7 @@ async def evaluate_answer_multi_question(
 async def evaluate_answer(
     request: EvaluationRequest,
     db: Session = Depends(get_db),
-    current_user: dict = Depends(get_optional_user)
+    current_user: TokenData = Depends(get_optional_user)
 ):
     """
     Evaluate student answer against model answer using uploaded files.
@@ -492,6 +513,69 @@ async def evaluate_answer(
     
     **Note:** For question-wise evaluation, use POST /multi instead
     """
+    from api.services.evaluation_executor import run_evaluation_task
+    from api.services.extraction_job_service import get_extraction_job_service
+    
+    # Join the upload's background extraction job here, on the event loop,
+    # so a long OCR job does not hold an evaluation pool worker
+    eval_dir = os.path.join(settings.UPLOAD_DIR, "evaluations", request.evaluation_id)
+    extraction_job = await get_extraction_job_service().wait_async(
+        request.evaluation_id, eval_dir, timeout=settings.EXTRACTION_JOIN_TIMEOUT,
+    )
+    
+    # OCR + scoring run on the evaluation pool, off the event loop
+    result, db_fields = await run_evaluation_task(_evaluate_answer_sync, request, extraction_job)
+    
+    # ============ SAVE TO DATABASE ============
+    if db_fields is not None:
+        try:
+            logger.info(f"[DATABASE] Saving evaluation result to database...")
+            user_id = current_user.user_id if current_user else None
+            user_role = current_user.role if current_user else None
+            
+            # Create database record
+            db_evaluation = Evaluation(
+                **db_fields,
+                student_id=user_id if user_role == "student" else None,  # Save user_id if student
+                teacher_id=user_id if user_role == "teacher" else None,  # Save user_id if teacher
+            )
+            
+            db.add(db_evaluation)
+            db.commit()
+            db.refresh(db_evaluation)
+            logger.info(f"[DATABASE] ✅ Evaluation saved successfully with ID: {db_evaluation.id}")
+        except Exception as e:
+            logger.error(f"[DATABASE] ⚠️ Failed to save evaluation to database: {e}")
+            # Continue anyway - don't fail the evaluation if database save fails
+    
+    _tag_result_owner(result.evaluation_id, current_user)
+    return result
+
+
+def _tag_result_owner(evaluation_id: str, current_user: Optional[TokenData]):
+    """Record the requesting teacher / student on the stored result (for result filters)."""
+    if not current_user:
+        return
+    try:
+        role = current_user.role
+        if role not in ("teacher", "student"):
+            return
+        from api.routes.results import tag_result
+        tag_result(evaluation_id, **{f"{role}_id": current_user.user_id})
+    except Exception as e:
+        logger.warning(f"Failed to tag result {evaluation_id} with its owner: {e}")
+
+
+def _evaluate_answer_sync(request: EvaluationRequest, extraction_job=None):
+    """
+    Synchronous body of ``evaluate_answer`` (runs on the evaluation pool).
+    
+    *extraction_job* is the upload's background extraction job, already
+    joined by the route (``None`` if there was none).
+    
+    Returns ``(EvaluationResult, db_fields)`` where ``db_fields`` are the
+    ``Evaluation`` column values (``None`` if they could not be built).
+    """
     
     import time
     start_time = time.time()
@@ -518,6 +602,7 @@ async def evaluate_answer(
         from api.services.nlp_service import NLPPreprocessor
         from api.services.semantic_service import SemanticAnalyzer
         from api.services.scoring_service import ScoringService
+        from api.services.evaluation_context import EvaluationContext
         
         # Find files in evaluation directory to detect PDF
         files = os.listdir(eval_dir)
@@ -572,6 +657,12 @@ async def evaluate_answer(
         # ============ PHASE 4: Text Extraction (OCR) ============
         logger.info(f"[Phase 4/17] 📖 OCR Extraction - Extracting text from files...")
         
+        # The route joined the upload's background extraction job; if it
+        # failed or is still running, the text is extracted inline below
+        from api.services.extraction_job_service import FAILED
+        if extraction_job is not None and extraction_job.status == FAILED:
+            logger.warning(f"[Phase 4/17] Background extraction failed ({extraction_job.error}); extracting inline")
+        
         # Check for cached extracted text first (OPTIMIZATION: avoid re-extraction)
         cache_dir = os.path.join(eval_dir, ".cache")
         student_cache = os.path.join(cache_dir, "student_extracted.txt")
@@ -665,18 +756,29 @@ async def evaluate_answer(
 
         # ============ PHASE 5: Text Preprocessing ============
         logger.info(f"[Phase 5/17] 🧹 NLP Preprocessing - Normalizing text...")
-        model_normalized = nlp.normalize_text(model_text)
+        # Model-side analysis is compiled once per model answer and reused
+        compiled = _compile_model_answer(model_text)
+        model_normalized = compiled.normalized_text if compiled else nlp.normalize_text(model_text)
         student_normalized = nlp.normalize_text(student_text)
+        # Sentences + embeddings shared by every scorer below
+        context = EvaluationContext.build(
+            model_text, student_text,
+            model_normalized=model_normalized,
+            student_normalized=student_normalized,
+            compiled=compiled,
+        )
         logger.info(f"[Phase 5/17] ✓ Text preprocessing complete")
         
         # ============ PHASE 6: Semantic Analysis ============
         logger.info(f"[Phase 6/17] 🌐 Semantic Analysis - Calculating similarity score...")
-        semantic_score = semantic.calculate_similarity(model_normalized, student_normalized)
+        semantic_score = semantic.calculate_similarity(
+            model_normalized, student_normalized, context=context
+        )
         logger.info(f"[Phase 6/17] ✓ Semantic Score: {semantic_score:.4f}")
         
         # ============ PHASE 7: Keyword Coverage Analysis ============
         logger.info(f"[Phase 7/17] 🔑 Keyword Analysis - Extracting keywords...")
-        model_keywords = nlp.extract_keywords(model_text)
+        model_keywords = list(compiled.keywords) if compiled else nlp.extract_keywords(model_text)
         student_keywords = nlp.extract_keywords(student_text)
         
         # Add custom keywords if provided
@@ -696,7 +798,9 @@ async def evaluate_answer(
             try:
                 from api.services.concept_graph_service import ConceptGraphScorer
                 cg_scorer = ConceptGraphScorer()
-                concept_graph_result = cg_scorer.score(model_text, student_text)
+                concept_graph_result = cg_scorer.score(
+                    model_text, student_text, context=context, compiled=compiled,
+                )
                 concept_graph_score = concept_graph_result.combined_score
                 logger.info(f"[Phase 8/17] ✓ Concept Graph Score: {concept_graph_score:.4f}")
             except Exception as e:
@@ -717,6 +821,8 @@ async def evaluate_answer(
                 sentence_alignment_result = sa_scorer.score(
                     model_text, student_text,
                     custom_keywords=request.custom_keywords,
+                    context=context,
+                    compiled=compiled,
                 )
                 sentence_alignment_score = sentence_alignment_result.combined_score
                 logger.info(f"[Phase 9/17] ✓ Sentence Alignment Score: {sentence_alignment_score:.4f}")
@@ -769,6 +875,7 @@ async def evaluate_answer(
                     keyword_score=keyword_score,
                     semantic_score=semantic_score,
                     matched_keywords=matched,
+                    context=context,
                 )
                 gaming_penalty = gaming_report.total_penalty
                 if gaming_report.is_flagged:
@@ -897,6 +1004,7 @@ async def evaluate_answer(
                     ),
                     question_type=request.question_type.value,
                     rubric_config=request.rubric_config,
+                    context=context,
                 )
                 rubric_final_score = rubric_report.rubric_score
                 # Apply gaming penalty and length penalty to rubric score too
@@ -930,6 +1038,7 @@ async def evaluate_answer(
                     question_text=question_text,
                     student_text=student_text,
                     model_text=model_text,
+                    expected_level=compiled.expected_bloom_level if compiled else None,
                 )
                 bloom_modifier = bloom_result.bloom_score_modifier
                 weighted_score += bloom_modifier
@@ -1159,12 +1268,10 @@ async def evaluate_answer(
         logger.info(f"[Phase 17/17] ✅ Response Generation - Evaluation complete (took {processing_time:.2f}s)")
         logger.info(f"[Phase 17/17] 📋 Summary: Score={obtained_marks}/{request.max_marks}, Grade={grade}, Confidence={confidence_result.confidence_percentage:.0f}%" if confidence_result else f"[Phase 17/17] 📋 Summary: Score={obtained_marks}/{request.max_marks}, Grade={grade}")
         
-        # ============ SAVE TO DATABASE ============
+        # ============ DATABASE RECORD ============
+        # Built here, saved by evaluate_answer on the request's own session
+        db_fields = None
         try:
-            logger.info(f"[DATABASE] Saving evaluation result to database...")
-            user_id = current_user.get("user_id") if current_user else None
-            user_role = current_user.get("user_role") if current_user else None
-            
             # Map string grade to GradeLevel enum
             grade_enum = None
             if grade:
@@ -1178,11 +1285,8 @@ async def evaluate_answer(
                 elif grade_value == "poor":
                     grade_enum = GradeLevel.POOR
             
-            # Create database record
-            db_evaluation = Evaluation(
+            db_fields = dict(
                 evaluation_id=request.evaluation_id,
-                student_id=user_id if user_role == "student" else None,  # Save user_id if student
-                teacher_id=user_id if user_role == "teacher" else None,  # Save user_id if teacher
                 student_answer_text=student_text,
                 question_type=DBQuestionType.DESCRIPTIVE if request.question_type.value == "descriptive" else DBQuestionType.FACTUAL if request.question_type.value == "factual" else DBQuestionType.DIAGRAM,
                 max_marks=request.max_marks,
@@ -1200,20 +1304,14 @@ async def evaluate_answer(
                 suggestions=suggestions,
                 processing_time=float(processing_time)
             )
-            
-            db.add(db_evaluation)
-            db.commit()
-            db.refresh(db_evaluation)
-            logger.info(f"[DATABASE] ✅ Evaluation saved successfully with ID: {db_evaluation.id}")
         except Exception as e:
-            logger.error(f"[DATABASE] ⚠️ Failed to save evaluation to database: {e}")
-            # Continue anyway - don't fail the evaluation if database save fails
+            logger.error(f"[DATABASE] ⚠️ Failed to prepare evaluation record: {e}")
         
         # Save result to storage
         from api.routes.results import save_result
         save_result(request.evaluation_id, result.model_dump())
         
-        return result
+        return result, db_fields
         
     except HTTPException:
         raise
@@ -1267,6 +1365,15 @@ async def evaluate_text_directly(request: TextEvaluationRequest):
     - For quick API testing
     - For integration with other systems
     """
+    from api.services.evaluation_executor import run_evaluation_task
+    
+    return await run_evaluation_task(_evaluate_text_sync, request)
+
+
+def _evaluate_text_sync(request: TextEvaluationRequest) -> EvaluationResult:
+    """
+    Blocking implementation of ``evaluate_text_directly``; called via the evaluation pool.
+    """
     
     import time
     import uuid
@@ -1277,6 +1384,7 @@ async def evaluate_text_directly(request: TextEvaluationRequest):
         from api.services.nlp_service import NLPPreprocessor
         from api.services.semantic_service import SemanticAnalyzer
         from api.services.scoring_service import ScoringService
+        from api.services.evaluation_context import EvaluationContext
         
         # Initialize services
         nlp = NLPPreprocessor()
@@ -1287,14 +1395,27 @@ async def evaluate_text_directly(request: TextEvaluationRequest):
         evaluation_id = str(uuid.uuid4())
         
         # NLP Preprocessing
-        model_normalized = nlp.normalize_text(request.model_answer)
+        compiled = _compile_model_answer(request.model_answer)
+        model_normalized = (
+            compiled.normalized_text if compiled else nlp.normalize_text(request.model_answer)
+        )
         student_normalized = nlp.normalize_text(request.student_answer)
+        context = EvaluationContext.build(
+            request.model_answer, request.student_answer,
+            model_normalized=model_normalized,
+            student_normalized=student_normalized,
+            compiled=compiled,
+        )
         
         # Semantic Analysis
-        semantic_score = semantic.calculate_similarity(model_normalized, student_normalized)
+        semantic_score = semantic.calculate_similarity(
+            model_normalized, student_normalized, context=context
+        )
         
         # Keyword Analysis
-        model_keywords = nlp.extract_keywords(request.model_answer)
+        model_keywords = (
+            list(compiled.keywords) if compiled else nlp.extract_keywords(request.model_answer)
+        )
         student_keywords = nlp.extract_keywords(request.student_answer)
         
         if request.custom_keywords:
@@ -1311,7 +1432,10 @@ async def evaluate_text_directly(request: TextEvaluationRequest):
             try:
                 from api.services.concept_graph_service import ConceptGraphScorer
                 cg_scorer = ConceptGraphScorer()
-                concept_graph_result = cg_scorer.score(request.model_answer, request.student_answer)
+                concept_graph_result = cg_scorer.score(
+                    request.model_answer, request.student_answer,
+                    context=context, compiled=compiled,
+                )
                 concept_graph_score = concept_graph_result.combined_score
             except Exception as e:
                 logger.warning(f"Concept graph scoring failed: {e}")
@@ -1329,6 +1453,8 @@ async def evaluate_text_directly(request: TextEvaluationRequest):
                 sentence_alignment_result = sa_scorer.score(
                     request.model_answer, request.student_answer,
                     custom_keywords=request.custom_keywords,
+                    context=context,
+                    compiled=compiled,
                 )
                 sentence_alignment_score = sentence_alignment_result.combined_score
             except Exception as e:
@@ -1364,6 +1490,7 @@ async def evaluate_text_directly(request: TextEvaluationRequest):
                     model_text=request.model_answer,
                     keyword_score=keyword_score,
                     semantic_score=semantic_score,
+                    context=context,
                 )
                 gaming_penalty = min(
                     gaming_report.total_penalty,
@@ -1465,6 +1592,7 @@ async def evaluate_text_directly(request: TextEvaluationRequest):
                     ),
                     question_type=request.question_type.value,
                     rubric_config=request.rubric_config,
+                    context=context,
                 )
                 rubric_final_score = rubric_report.rubric_score
                 # Apply gaming penalty and length penalty to rubric score too
@@ -1488,6 +1616,7 @@ async def evaluate_text_directly(request: TextEvaluationRequest):
                     question_text=question_text,
                     student_text=request.student_answer,
                     model_text=request.model_answer,
+                    expected_level=compiled.expected_bloom_level if compiled else None,
                 )
                 bloom_modifier = bloom_result.bloom_score_modifier
                 weighted_score += bloom_modifier
@@ -1724,6 +1853,59 @@ async def evaluate_text_directly(request: TextEvaluationRequest):
         )
 
 
+# ========== Internal helper: shared NLP work across question pairs ==========
+
+def _build_question_contexts(pairs: List[Dict[str, Any]]) -> List[Tuple[Any, Any]]:
+    """
+    Build ``(context, compiled)`` for every answered question pair at once.
+
+    All segments of all questions are parsed in one spaCy ``nlp.pipe`` run
+    and every sentence, document and student key phrase is encoded in one
+    batch (see ``EvaluationContext.build_batch``), instead of one small
+    batch per question.  Unanswered pairs get ``(None, None)``; on any
+    failure every pair does, and each question builds its own context.
+    """
+    results: List[Tuple[Any, Any]] = [(None, None)] * len(pairs)
+    answered = [
+        i for i, p in enumerate(pairs)
+        if p["student_answer"] and len(p["student_answer"].strip()) >= 3
+    ]
+    if not answered:
+        return results
+
+    try:
+        from api.services.nlp_service import NLPPreprocessor
+        from api.services.evaluation_context import EvaluationContext
+
+        nlp = NLPPreprocessor()
+        compiled_list = [_compile_model_answer(pairs[i]["model_answer"]) for i in answered]
+        batch = []
+        for i, compiled in zip(answered, compiled_list):
+            model_answer = pairs[i]["model_answer"]
+            student_answer = pairs[i]["student_answer"]
+            batch.append((
+                model_answer,
+                student_answer,
+                compiled.normalized_text if compiled else nlp.normalize_text(model_answer),
+                nlp.normalize_text(student_answer),
+            ))
+
+        phrase_extractor = None
+        if getattr(settings, 'ENABLE_CONCEPT_GRAPH', True):
+            from api.services.concept_graph_service import ConceptExtractor
+            phrase_extractor = ConceptExtractor().extract_key_phrases
+
+        contexts = EvaluationContext.build_batch(
+            batch, compiled=compiled_list, phrase_extractor=phrase_extractor,
+        )
+        for i, context, compiled in zip(answered, contexts, compiled_list):
+            results[i] = (context, compiled)
+    except Exception as e:
+        logger.warning(f"[MULTI-QUESTION] Batched context build failed, falling back per question: {e}")
+        return [(None, None)] * len(pairs)
+    return results
+
+
 # ========== Internal helper: evaluate a single question pair ==========
 
 def _evaluate_single_question_sync(
@@ -1733,11 +1915,16 @@ def _evaluate_single_question_sync(
     max_marks: float = 10,
     rubric_config=None,
     custom_keywords=None,
+    context=None,
+    compiled=None,
 ) -> dict:
     """
     Run the full evaluation pipeline on a single model/student answer pair.
     Returns a dict with all fields needed for PerQuestionResult.
     Designed to be called in a loop by the multi-question endpoint.
+
+    ``context`` / ``compiled`` may be supplied pre-built (see
+    ``_build_question_contexts``); otherwise they are built here.
     """
     import time as _time
     start = _time.time()
@@ -1745,6 +1932,7 @@ def _evaluate_single_question_sync(
     from api.services.nlp_service import NLPPreprocessor
     from api.services.semantic_service import SemanticAnalyzer
     from api.services.scoring_service import ScoringService
+    from api.services.evaluation_context import EvaluationContext
 
     nlp = NLPPreprocessor()
     semantic = SemanticAnalyzer()
@@ -1776,11 +1964,21 @@ def _evaluate_single_question_sync(
         }
 
     # ── NLP ──────────────────────────────────────────────────────
-    model_norm = nlp.normalize_text(model_answer)
-    student_norm = nlp.normalize_text(student_answer)
-    semantic_score = semantic.calculate_similarity(model_norm, student_norm)
+    if context is not None:
+        model_norm = context.model_normalized
+        student_norm = context.student_normalized
+    else:
+        compiled = compiled or _compile_model_answer(model_answer)
+        model_norm = compiled.normalized_text if compiled else nlp.normalize_text(model_answer)
+        student_norm = nlp.normalize_text(student_answer)
+        context = EvaluationContext.build(
+            model_answer, student_answer,
+            model_normalized=model_norm, student_normalized=student_norm,
+            compiled=compiled,
+        )
+    semantic_score = semantic.calculate_similarity(model_norm, student_norm, context=context)
 
-    model_kws = nlp.extract_keywords(model_answer)
+    model_kws = list(compiled.keywords) if compiled else nlp.extract_keywords(model_answer)
     student_kws = nlp.extract_keywords(student_answer)
     if custom_keywords:
         model_kws.extend(custom_keywords)
@@ -1792,7 +1990,9 @@ def _evaluate_single_question_sync(
     if getattr(settings, 'ENABLE_CONCEPT_GRAPH', True):
         try:
             from api.services.concept_graph_service import ConceptGraphScorer
-            concept_graph_result = ConceptGraphScorer().score(model_answer, student_answer)
+            concept_graph_result = ConceptGraphScorer().score(
+                model_answer, student_answer, context=context, compiled=compiled,
+            )
             concept_graph_score = concept_graph_result.combined_score
         except Exception:
             concept_graph_score = semantic_score
@@ -1807,6 +2007,7 @@ def _evaluate_single_question_sync(
             from api.services.sentence_alignment_service import SentenceAlignmentScorer
             sentence_alignment_result = SentenceAlignmentScorer().score(
                 model_answer, student_answer, custom_keywords=custom_keywords,
+                context=context, compiled=compiled,
             )
             sentence_alignment_score = sentence_alignment_result.combined_score
         except Exception:
@@ -1836,6 +2037,7 @@ def _evaluate_single_question_sync(
             gaming_report = AntiGamingAnalyzer().analyze(
                 student_text=student_answer, model_text=model_answer,
                 keyword_score=keyword_score, semantic_score=semantic_score,
+                context=context,
             )
             gaming_penalty = min(
                 gaming_report.total_penalty,
@@ -1921,6 +2123,7 @@ def _evaluate_single_question_sync(
                 ),
                 question_type=question_type,
                 rubric_config=rubric_config,
+                context=context,
             )
             rubric_final = rubric_report.rubric_score - gaming_penalty - length_penalty
             weighted_score = max(0.0, min(1.0, rubric_final))
@@ -1937,6 +2140,7 @@ def _evaluate_single_question_sync(
                 question_text='',
                 student_text=student_answer,
                 model_text=model_answer,
+                expected_level=compiled.expected_bloom_level if compiled else None,
             )
             bloom_modifier = bloom_result.bloom_score_modifier
             weighted_score += bloom_modifier
@@ -2089,6 +2293,16 @@ async def evaluate_multi_question(request: MultiQuestionRequest):
 
     Returns per-question breakdown + aggregate summary.
     """
+    from api.services.evaluation_executor import run_evaluation_task
+    
+    return await run_evaluation_task(_evaluate_multi_question_sync, request)
+
+
+def _evaluate_multi_question_sync(request: MultiQuestionRequest) -> MultiQuestionResult:
+    """
+    Blocking implementation of ``evaluate_multi_question``.  Also safe to call
+    directly from code already running off the event loop.
+    """
     import time
     import uuid
     start_time = time.time()
@@ -2169,14 +2383,19 @@ async def evaluate_multi_question(request: MultiQuestionRequest):
         answered = 0
         unanswered = 0
 
+        question_contexts = _build_question_contexts(pairs)
+
         for i, pair in enumerate(pairs):
             try:
+                context, compiled = question_contexts[i]
                 res = _evaluate_single_question_sync(
                     model_answer=pair["model_answer"],
                     student_answer=pair["student_answer"],
                     question_type=question_type_str,
                     max_marks=pair["max_marks"],
                     rubric_config=request.rubric_config,
+                    context=context,
+                    compiled=compiled,
                 )
 
                 pqr = PerQuestionResult(
@@ -82,58 +82,31 @@ class ExportFormat(BaseModel):
     format: str = Field(default="json", pattern="^(json|csv|pdf)$")
 
 
-# ========== In-Memory Storage (for demo) ==========
-# In production, use a proper database
-evaluation_results_store = {}
-
-
 # ========== Helper Functions ==========
-def save_result(evaluation_id: str, result: dict):
-    """Save evaluation result to storage."""
+# Results live in the indexed store (api/services/result_store.py): summary
+# rows for listing / statistics, compressed reports behind a bounded LRU
+def save_result(evaluation_id: str, result: dict, **owner):
+    """Save evaluation result to storage (*owner*: teacher_id / student_id / class_id)."""
+    from api.services.result_store import get_result_store
+
     # Sanitize to ensure all values are JSON-serializable Python types
     safe_result = sanitize_for_json({
         **result,
         "saved_at": datetime.now().isoformat()
     })
-    evaluation_results_store[evaluation_id] = safe_result
-    
-    # Also save to file for persistence
-    results_dir = Path(settings.UPLOAD_DIR) / "results"
-    results_dir.mkdir(parents=True, exist_ok=True)
-    
-    result_file = results_dir / f"{evaluation_id}.json"
-    with open(result_file, 'w', encoding='utf-8') as f:
-        json.dump(safe_result, f, indent=2, cls=NumpyEncoder)
+    get_result_store().save(evaluation_id, safe_result, **owner)
 
 
-def load_result(evaluation_id: str) -> Optional[dict]:
-    """Load evaluation result from storage."""
-    # Try memory first
-    if evaluation_id in evaluation_results_store:
-        return evaluation_results_store[evaluation_id]
-    
-    # Try file storage
-    result_file = Path(settings.UPLOAD_DIR) / "results" / f"{evaluation_id}.json"
-    if result_file.exists():
-        with open(result_file, 'r', encoding='utf-8') as f:
-            result = json.load(f)
-            evaluation_results_store[evaluation_id] = result
-            return result
-    
-    return None
+def tag_result(evaluation_id: str, **owner) -> bool:
+    """Attach the owner (teacher_id / student_id / class_id) to a saved result."""
+    from api.services.result_store import get_result_store
+    return get_result_store().tag(evaluation_id, **owner)
 
 
-def load_all_results() -> List[dict]:
-    """Load all evaluation results."""
-    results = []
-    results_dir = Path(settings.UPLOAD_DIR) / "results"
-    
-    if results_dir.exists():
-        for result_file in results_dir.glob("*.json"):
-            with open(result_file, 'r', encoding='utf-8') as f:
-                results.append(json.load(f))
-    
-    return results
+def load_result(evaluation_id: str) -> Optional[dict]:
+    """Load evaluation result from storage."""
+    from api.services.result_store import get_result_store
+    return get_result_store().get(evaluation_id)
 
 
 # ========== API Endpoints ==========
@@ -143,7 +116,9 @@ async def list_results(
     offset: int = Query(default=0, ge=0),
     min_score: Optional[float] = Query(default=None, ge=0, le=100),
     max_score: Optional[float] = Query(default=None, ge=0, le=100),
-    grade: Optional[str] = Query(default=None)
+    grade: Optional[str] = Query(default=None),
+    teacher_id: Optional[str] = Query(default=None),
+    class_id: Optional[str] = Query(default=None)
 ):
     """
     List all evaluation results with optional filtering.
@@ -154,44 +129,33 @@ async def list_results(
     - min_score: Minimum score filter
     - max_score: Maximum score filter
     - grade: Filter by grade (excellent, good, average, poor)
+    - teacher_id / class_id: Filter by owner
     """
+    from api.services.result_store import get_result_store
     
-    all_results = load_all_results()
-    
-    # Apply filters
-    filtered_results = all_results
-    
-    if min_score is not None:
-        filtered_results = [r for r in filtered_results if r.get("final_score", 0) >= min_score]
-    
-    if max_score is not None:
-        filtered_results = [r for r in filtered_results if r.get("final_score", 0) <= max_score]
-    
-    if grade:
-        filtered_results = [r for r in filtered_results if r.get("grade", "").lower() == grade.lower()]
-    
-    # Sort by timestamp (newest first)
-    filtered_results.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-    
-    # Apply pagination
-    paginated_results = filtered_results[offset:offset + limit]
+    # Filtering, newest-first sorting and pagination run on the summary index
+    total, rows = get_result_store().list(
+        limit=limit, offset=offset,
+        min_score=min_score, max_score=max_score, grade=grade,
+        teacher_id=teacher_id, class_id=class_id,
+    )
     
     # Convert to summaries
     summaries = [
         ResultSummary(
-            evaluation_id=r.get("evaluation_id", ""),
-            final_score=r.get("final_score", 0),
-            max_marks=r.get("max_marks", 10),
-            obtained_marks=r.get("obtained_marks", 0),
-            grade=r.get("grade", "unknown"),
-            timestamp=r.get("timestamp", "")
+            evaluation_id=r["evaluation_id"],
+            final_score=r["final_score"],
+            max_marks=r["max_marks"],
+            obtained_marks=r["obtained_marks"],
+            grade=r["grade"],
+            timestamp=r["timestamp"]
         )
-        for r in paginated_results
+        for r in rows
     ]
     
     return ResultsListResponse(
         success=True,
-        count=len(filtered_results),
+        count=total,
         results=summaries
     )
 
@@ -233,14 +197,17 @@ async def delete_result(evaluation_id: str):
     """
     Delete an evaluation result.
     """
-    # Remove from memory
-    if evaluation_id in evaluation_results_store:
-        del evaluation_results_store[evaluation_id]
+    from api.services.result_store import get_result_store
+    
+    deleted = get_result_store().delete(evaluation_id)
     
-    # Remove from file storage
+    # Remove a leftover file from the old per-result JSON storage
     result_file = Path(settings.UPLOAD_DIR) / "results" / f"{evaluation_id}.json"
     if result_file.exists():
         os.remove(result_file)
+        deleted = True
+    
+    if deleted:
         return {
             "success": True,
             "message": f"Result {evaluation_id} deleted successfully"
@@ -304,9 +271,11 @@ async def get_statistics():
     """
     Get summary statistics for all evaluations.
     """
-    all_results = load_all_results()
+    from api.services.result_store import get_result_store
+    
+    stats = get_result_store().statistics()
     
-    if not all_results:
+    if not stats["total_evaluations"]:
         return {
             "success": True,
             "data": {
@@ -317,24 +286,7 @@ async def get_statistics():
             }
         }
     
-    # Calculate statistics
-    total = len(all_results)
-    scores = [r.get("final_score", 0) for r in all_results]
-    average_score = sum(scores) / total if total > 0 else 0
-    
-    # Grade distribution
-    grades = {}
-    for r in all_results:
-        grade = r.get("grade", "unknown")
-        grades[grade] = grades.get(grade, 0) + 1
-    
     return {
         "success": True,
-        "data": {
-            "total_evaluations": total,
-            "average_score": round(average_score, 2),
-            "highest_score": max(scores) if scores else 0,
-            "lowest_score": min(scores) if scores else 0,
-            "grade_distribution": grades
-        }
+        "data": stats
     }
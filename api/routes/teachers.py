@@ -25,6 +25,7 @@ from database.models import (
     Evaluation, ManualEvaluation, ModelAnswer,
     UserStatus, UserRole
 )
+from database.aggregates import read_totals
 from api.services.auth_service import (
     auth_service, get_current_teacher, get_current_teacher_only, 
     TokenData, hash_password
@@ -270,22 +271,12 @@ async def teacher_dashboard(
         Class.is_active == True
     ).scalar() or 0
     
-    total_evaluations = db.query(func.count(Evaluation.id)).filter(
-        Evaluation.teacher_id == teacher.id
-    ).scalar() or 0
-    
-    total_manual_evals = db.query(func.count(ManualEvaluation.id)).filter(
-        ManualEvaluation.teacher_id == teacher.id
-    ).scalar() or 0
-    
-    pending_reviews = db.query(func.count(Evaluation.id)).filter(
-        Evaluation.teacher_id == teacher.id,
-        Evaluation.is_reviewed == False
-    ).scalar() or 0
-    
-    avg_score = db.query(func.avg(Evaluation.final_score)).filter(
-        Evaluation.teacher_id == teacher.id
-    ).scalar() or 0
+    # Evaluation figures come from the maintained aggregates
+    totals = read_totals(db, "teacher", teacher.id)
+    total_evaluations = totals["ai"]["count"]
+    total_manual_evals = totals["manual"]["count"]
+    pending_reviews = totals["ai"]["pending_reviews"]
+    avg_score = totals["ai"]["average_score"]
     
     # Recent evaluations
     recent_evals = db.query(Evaluation).filter(
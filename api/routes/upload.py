@@ -6,15 +6,17 @@ Supports PDF and image files with validation and preprocessing.
 """
 
 import os
+import json
 import uuid
 import shutil
+import asyncio
 import logging
 from datetime import datetime
 from typing import Optional, List
 from pathlib import Path
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 import aiofiles
 
@@ -186,89 +188,35 @@ async def upload_files(
             }
         }
         
-        # OPTIMIZATION: Extract text NOW (synchronously before returning)
-        # This GUARANTEES cache exists before evaluation starts
-        try:
-            from api.services.ocr_service import OCRService
-            from api.services.text_cleaning_service import TextCleaningService
-            
-            logger.info(f"[CACHE] Starting pre-cache extraction for {evaluation_id}...")
-            
-            # Initialize cache directory
-            os.makedirs(os.path.join(eval_dir, ".cache"), exist_ok=True)
-            
-            # Get engine string
-            ocr_engine_str = ocr_engine.value if hasattr(ocr_engine, 'value') else str(ocr_engine)
-            
-            try:
-                ocr = OCRService(engine=ocr_engine_str)
-            except ValueError:
-                logger.warning(f"[CACHE] Engine {ocr_engine_str} not available, using easyocr")
-                ocr = OCRService(engine='easyocr')
-                ocr_engine_str = 'easyocr'
-            
-            # Extract model text
-            if model_path and os.path.exists(model_path):
-                logger.info(f"[CACHE] Extracting model answer...")
-                try:
-                    model_text = ocr.extract_text(model_path, language=None)
-                    model_clean = TextCleaningService.clean_for_question_segmentation(model_text)
-                    with open(os.path.join(eval_dir, ".cache", "model_extracted.txt"), 'w', encoding='utf-8') as f:
-                        f.write(model_clean)
-                    logger.info(f"[CACHE] Model cached: {len(model_text)} -> {len(model_clean)} chars")
-                except Exception as e:
-                    # Check if it's a network error and engine is Sarvam
-                    error_str = str(e).lower()
-                    if ('connecterror' in error_str or 'getaddrinfo' in error_str or 'connection' in error_str) and ocr_engine_str == 'sarvam':
-                        logger.warning(f"[CACHE] Sarvam network error, falling back to easyocr for model")
-                        fallback_ocr = OCRService(engine='easyocr')
-                        model_text = fallback_ocr.extract_text(model_path, language=None)
-                        model_clean = TextCleaningService.clean_for_question_segmentation(model_text)
-                        with open(os.path.join(eval_dir, ".cache", "model_extracted.txt"), 'w', encoding='utf-8') as f:
-                            f.write(model_clean)
-                        logger.info(f"[CACHE] Model cached via fallback: {len(model_text)} -> {len(model_clean)} chars")
-                    else:
-                        raise
-            
-            # Extract student text
-            if student_path and os.path.exists(student_path) and not student_path.endswith('.txt'):
-                logger.info(f"[CACHE] Extracting student answer...")
-                try:
-                    student_text = ocr.extract_text(student_path, language=None)
-                    student_clean = TextCleaningService.clean_for_question_segmentation(student_text)
-                    with open(os.path.join(eval_dir, ".cache", "student_extracted.txt"), 'w', encoding='utf-8') as f:
-                        f.write(student_clean)
-                    logger.info(f"[CACHE] Student cached: {len(student_text)} -> {len(student_clean)} chars")
-                except Exception as e:
-                    # Check if it's a network error and engine is Sarvam
-                    error_str = str(e).lower()
-                    if ('connecterror' in error_str or 'getaddrinfo' in error_str or 'connection' in error_str) and ocr_engine_str == 'sarvam':
-                        logger.warning(f"[CACHE] Sarvam network error, falling back to easyocr for student")
-                        fallback_ocr = OCRService(engine='easyocr')
-                        student_text = fallback_ocr.extract_text(student_path, language=None)
-                        student_clean = TextCleaningService.clean_for_question_segmentation(student_text)
-                        with open(os.path.join(eval_dir, ".cache", "student_extracted.txt"), 'w', encoding='utf-8') as f:
-                            f.write(student_clean)
-                        logger.info(f"[CACHE] Student cached via fallback: {len(student_text)} -> {len(student_clean)} chars")
-                    else:
-                        raise
-            elif student_path and student_path.endswith('.txt'):
-                logger.info(f"[CACHE] Using text input, saving to cache...")
-                with open(student_path, 'r', encoding='utf-8') as f:
-                    student_text = f.read()
-                student_clean = TextCleaningService.clean_for_question_segmentation(student_text)
-                with open(os.path.join(eval_dir, ".cache", "student_extracted.txt"), 'w', encoding='utf-8') as f:
-                    f.write(student_clean)
-                logger.info(f"[CACHE] Text cached: {len(student_text)} -> {len(student_clean)} chars")
-            
-            logger.info(f"[CACHE] Pre-caching complete")
-            
-        except Exception as e:
-            logger.warning(f"[CACHE] Pre-caching failed (will extract during eval): {e}")
+        # Extract text in the background; /evaluate joins this job if it is
+        # still running, so the upload request returns immediately
+        from api.services.extraction_job_service import get_extraction_job_service
+        from api.routes.upload_extraction_task import _extract_and_cache_text
+        
+        ocr_engine_str = ocr_engine.value if hasattr(ocr_engine, 'value') else str(ocr_engine)
+        job = get_extraction_job_service().submit(
+            evaluation_id, eval_dir, _extract_and_cache_text,
+            task_kwargs=dict(
+                evaluation_id=evaluation_id,
+                eval_dir=eval_dir,
+                model_path=model_path,
+                student_path=student_path,
+                student_file=os.path.basename(student_path) if student_path else None,
+                ocr_engine=ocr_engine_str,
+            ),
+            ocr_engine=ocr_engine_str,
+        )
+        response_data["extraction"] = {
+            "job_id": job.job_id,
+            "status": job.status,
+            "status_url": f"{settings.API_PREFIX}/upload/{evaluation_id}/status",
+            "events_url": f"{settings.API_PREFIX}/upload/{evaluation_id}/events",
+        }
+        logger.info(f"[UPLOAD] Extraction job queued for {evaluation_id}")
         
         return UploadResponse(
             success=True,
-            message="Files uploaded successfully. Ready for evaluation.",
+            message="Files uploaded successfully. Text extraction is running in the background.",
             data=response_data
         )
         
@@ -445,6 +393,11 @@ async def extract_text_from_upload(evaluation_id: str, ocr_engine: str = "easyoc
             "note": "✅ LOADED FROM CACHE (no re-extraction)"
         }
         
+        # Background extraction state (text may not be cached yet)
+        from api.services.extraction_job_service import get_extraction_job_service
+        extraction_job = get_extraction_job_service().get_job(evaluation_id, eval_dir)
+        result["extraction"] = extraction_job.to_dict() if extraction_job else None
+        
         # Load model answer text from cache
         model_cache = os.path.join(cache_dir, "model_extracted.txt")
         if os.path.exists(model_cache):
@@ -516,3 +469,81 @@ async def extract_text_from_upload(evaluation_id: str, ocr_engine: str = "easyoc
             detail=f"Failed to load cached text: {str(e)}"
         )
 
+
+
+@router.get("/{evaluation_id}/status")
+async def get_extraction_status(evaluation_id: str):
+    """
+    Status of the background text extraction started by the upload.
+    
+    **States:** queued → running → done | failed
+    """
+    from api.services.extraction_job_service import get_extraction_job_service
+    
+    eval_dir = os.path.join(settings.UPLOAD_DIR, "evaluations", evaluation_id)
+    if not os.path.exists(eval_dir):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Evaluation {evaluation_id} not found"
+        )
+    
+    job = get_extraction_job_service().get_job(evaluation_id, eval_dir)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No extraction job for evaluation {evaluation_id}"
+        )
+    return {
+        "success": True,
+        "data": job.to_dict()
+    }
+
+
+@router.get("/{evaluation_id}/events")
+async def stream_extraction_events(evaluation_id: str, request: Request):
+    """
+    Server-sent-events stream of extraction progress.
+    
+    Emits a `progress` event whenever the job state changes and a final
+    `done` or `failed` event, then closes the stream.
+    """
+    from api.services.extraction_job_service import get_extraction_job_service
+    
+    eval_dir = os.path.join(settings.UPLOAD_DIR, "evaluations", evaluation_id)
+    service = get_extraction_job_service()
+    if service.get_job(evaluation_id, eval_dir) is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No extraction job for evaluation {evaluation_id}"
+        )
+    
+    async def event_stream():
+        last = None
+        idle = 0.0
+        while True:
+            job = service.get_job(evaluation_id, eval_dir)
+            if job is None:
+                return
+            snapshot = job.to_dict()
+            snapshot.pop("heartbeat_at", None)
+            if snapshot != last:
+                last = snapshot
+                idle = 0.0
+                event = job.status if job.is_finished else "progress"
+                yield f"event: {event}\ndata: {json.dumps(snapshot)}\n\n"
+                if job.is_finished:
+                    return
+            elif idle >= 15:
+                # Comment line keeps proxies from closing an idle stream
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            if await request.is_disconnected():
+                return
+            await asyncio.sleep(0.5)
+            idle += 0.5
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,80 +1,112 @@
 #!/usr/bin/env python3
 """
 Background extraction task for upload.py
-Extracts text after files are uploaded and caches it for later use
+Extracts text after files are uploaded and caches it for later use.
+
+Run as an extraction job (see api/services/extraction_job_service.py):
+upload_files submits it and returns immediately; /evaluate joins the job.
 """
 
-# This function should be added to api/routes/upload.py
+import os
+import logging
+from typing import Callable, Optional
+
+logger = logging.getLogger("AssessIQ.Upload")
+
+
+def _is_network_error(error: Exception) -> bool:
+    error_str = str(error).lower()
+    return 'connecterror' in error_str or 'getaddrinfo' in error_str or 'connection' in error_str
+
+
+def _extract_file(ocr, ocr_engine: str, path: str, label: str) -> str:
+    """OCR one file, falling back to EasyOCR when Sarvam is unreachable."""
+    from api.services.ocr_service import OCRService
+
+    try:
+        return ocr.extract_text(path, language=None)
+    except Exception as e:
+        if ocr_engine == 'sarvam' and _is_network_error(e):
+            logger.warning(f"[BACKGROUND] Sarvam network error, falling back to easyocr for {label}")
+            return OCRService(engine='easyocr').extract_text(path, language=None)
+        raise
+
 
 def _extract_and_cache_text(
     evaluation_id: str,
     eval_dir: str,
     model_path: str,
-    student_path: str,
-    student_file: str
+    student_path: Optional[str],
+    student_file: Optional[str],
+    ocr_engine: str = 'easyocr',
+    progress: Optional[Callable[[str, float, str], None]] = None,
 ) -> None:
     """
     Background task: Extract text from model and student answers immediately after upload.
-    
+
     This function:
     1. Extracts text from uploaded files
-    2. Caches extracted text locally
+    2. Caches extracted text locally (.cache/model_extracted.txt, .cache/student_extracted.txt)
     3. Prevents redundant extraction during evaluation
-    
+
     Args:
         evaluation_id: Unique evaluation ID
         eval_dir: Directory containing evaluation files
         model_path: Path to model answer file
         student_path: Path to student answer file
         student_file: Filename of student answer
+        ocr_engine: OCR engine selected at upload
+        progress: optional ``progress(stage, fraction, message)`` callback
+
+    Raises:
+        Exception: when either file cannot be extracted (the job is marked failed)
     """
-    import os
     from api.services.ocr_service import OCRService
-    
+    from api.services.text_cleaning_service import TextCleaningService
+
+    report = progress or (lambda stage, fraction, message="": None)
     logger.info(f"[BACKGROUND] Starting post-upload text extraction for evaluation {evaluation_id}")
-    
+
+    # Create cache directory
+    cache_dir = os.path.join(eval_dir, ".cache")
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # Initialize OCR service with the engine chosen at upload
+    ocr_engine = ocr_engine.value if hasattr(ocr_engine, 'value') else str(ocr_engine)
     try:
-        # Create cache directory
-        cache_dir = os.path.join(eval_dir, ".cache")
-        os.makedirs(cache_dir, exist_ok=True)
-        
-        # Initialize OCR service with default engine
-        ocr = OCRService(engine='easyocr')  # Use fast engine for background extraction
-        
-        # Extract model text
-        try:
-            logger.info(f"[BACKGROUND] Extracting model answer text...")
-            model_text = ocr.extract_text(model_path, language=None)
-            
-            # Cache it
-            model_cache = os.path.join(cache_dir, "model_extracted.txt")
-            with open(model_cache, 'w', encoding='utf-8') as f:
-                f.write(model_text)
-            
-            logger.info(f"[BACKGROUND] Model answer cached: {len(model_text)} chars")
-        except Exception as e:
-            logger.warning(f"[BACKGROUND] Model extraction failed: {e}")
-        
-        # Extract student text
-        try:
-            if student_file.endswith('.txt'):
-                # Text input - no extraction needed
-                logger.info(f"[BACKGROUND] Student answer is text input - no extraction needed")
-            else:
-                logger.info(f"[BACKGROUND] Extracting student answer text...")
-                student_text = ocr.extract_text(student_path, language=None)
-                
-                # Cache it
-                student_cache = os.path.join(cache_dir, "student_extracted.txt")
-                with open(student_cache, 'w', encoding='utf-8') as f:
-                    f.write(student_text)
-                
-                logger.info(f"[BACKGROUND] Student answer cached: {len(student_text)} chars")
-        except Exception as e:
-            logger.warning(f"[BACKGROUND] Student extraction failed: {e}")
-        
-        logger.info(f"[BACKGROUND] Post-upload extraction completed for {evaluation_id}")
-        
-    except Exception as e:
-        logger.error(f"[BACKGROUND] Unexpected error during post-upload extraction: {e}")
-        # Don't raise - this is background task, failure shouldn't affect user
+        ocr = OCRService(engine=ocr_engine)
+    except ValueError:
+        logger.warning(f"[BACKGROUND] Engine {ocr_engine} not available, using easyocr")
+        ocr = OCRService(engine='easyocr')
+        ocr_engine = 'easyocr'
+
+    # Extract model text
+    if model_path and os.path.exists(model_path):
+        report("model", 0.05, "Extracting model answer")
+        logger.info(f"[BACKGROUND] Extracting model answer text...")
+        model_text = _extract_file(ocr, ocr_engine, model_path, "model")
+        model_clean = TextCleaningService.clean_for_question_segmentation(model_text)
+        with open(os.path.join(cache_dir, "model_extracted.txt"), 'w', encoding='utf-8') as f:
+            f.write(model_clean)
+        logger.info(f"[BACKGROUND] Model answer cached: {len(model_text)} -> {len(model_clean)} chars")
+
+    # Extract student text
+    report("student", 0.5, "Extracting student answer")
+    if student_path and (student_path.endswith('.txt') or (student_file or '').endswith('.txt')):
+        # Text input - no OCR needed, just clean and cache
+        logger.info(f"[BACKGROUND] Student answer is text input - no extraction needed")
+        with open(student_path, 'r', encoding='utf-8') as f:
+            student_text = f.read()
+    elif student_path and os.path.exists(student_path):
+        logger.info(f"[BACKGROUND] Extracting student answer text...")
+        student_text = _extract_file(ocr, ocr_engine, student_path, "student")
+    else:
+        student_text = None
+
+    if student_text is not None:
+        student_clean = TextCleaningService.clean_for_question_segmentation(student_text)
+        with open(os.path.join(cache_dir, "student_extracted.txt"), 'w', encoding='utf-8') as f:
+            f.write(student_clean)
+        logger.info(f"[BACKGROUND] Student answer cached: {len(student_text)} -> {len(student_clean)} chars")
+
+    logger.info(f"[BACKGROUND] Post-upload extraction completed for {evaluation_id}")
@@ -49,6 +49,8 @@ from typing import Dict, List, Optional, Set, Tuple
 
 import numpy as np
 
+from api.services.model_registry import get_model_registry
+
 logger = logging.getLogger("AssessIQ.AntiGaming")
 
 
@@ -843,14 +845,13 @@ class AntiGamingAnalyzer:
     def __init__(self):
         self._nlp = None
         self._embedder = None
+        registry = get_model_registry()
         try:
-            import spacy
-            self._nlp = spacy.load("en_core_web_sm")
+            self._nlp = registry.get_spacy()
         except Exception:
             logger.debug("spaCy not available; using regex sentence splitting")
         try:
-            from sentence_transformers import SentenceTransformer
-            self._embedder = SentenceTransformer("all-MiniLM-L6-v2")
+            self._embedder = registry.get_sentence_transformer()
         except Exception:
             logger.warning("SentenceTransformer not available; using word-overlap fallback")
 
@@ -863,8 +864,13 @@ class AntiGamingAnalyzer:
         keyword_score: float = 0.0,
         semantic_score: float = 0.0,
         matched_keywords: Optional[List[str]] = None,
+        context=None,
     ) -> AntiGamingReport:
-        """Run all 6 detectors and produce an aggregated report."""
+        """Run all 6 detectors and produce an aggregated report.
+
+        *context* (an ``EvaluationContext``) supplies the spaCy parses and
+        sentence embeddings already computed for this answer pair.
+        """
         if not student_text or len(student_text.strip()) < 10:
             return AntiGamingReport()
         if not model_text or len(model_text.strip()) < 10:
@@ -873,13 +879,19 @@ class AntiGamingAnalyzer:
         matched_keywords = matched_keywords or []
 
         # ── Preprocessing ────────────────────────────────────────────
-        student_sents = self._split_sentences(student_text)
-        model_sents = self._split_sentences(model_text)
+        student_sents = self._split_sentences(student_text, context)
+        model_sents = self._split_sentences(model_text, context)
 
         # Compute embeddings (batched for efficiency)
         stu_emb = None
         mod_emb = None
-        if self._embedder is not None:
+        if context is not None and student_sents and model_sents:
+            try:
+                stu_emb = context.embed(student_sents)
+                mod_emb = context.embed(model_sents)
+            except Exception as e:
+                logger.debug(f"Context embeddings unavailable: {e}")
+        elif self._embedder is not None:
             all_sents = student_sents + model_sents
             if all_sents:
                 all_emb = self._embedder.encode(all_sents, show_progress_bar=False)
@@ -995,9 +1007,11 @@ class AntiGamingAnalyzer:
 
     # ─── Private Helpers ─────────────────────────────────────────────
 
-    def _split_sentences(self, text: str) -> List[str]:
-        """Split text into sentences using spaCy or regex fallback."""
-        if self._nlp is not None:
+    def _split_sentences(self, text: str, context=None) -> List[str]:
+        """Split text into sentences using spaCy (the context's parse when given) or regex fallback."""
+        doc = context.doc(text) if context is not None else None
+        if doc is None and self._nlp is not None:
             doc = self._nlp(text[:100000])
+        if doc is not None:
             return [s.text.strip() for s in doc.sents if s.text.strip()]
         return _split_sentences_simple(text)
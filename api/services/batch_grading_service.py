@@ -0,0 +1,525 @@
+"""
+Batch Grading Service
+======================
+Class-wide grading: one model answer against N student answer sheets.
+
+Problem
+-------
+Grading a class meant one ``POST /upload/`` + ``POST /evaluate/`` round trip
+per student, each in its own ``evaluation_id`` directory, so the model
+answer was uploaded, OCRed and analysed once per student.
+
+Solution
+--------
+A ``BatchJob`` holds one model answer and many student sheets:
+
+1.  The model answer is OCRed once and compiled once
+    (``get_compiled_model_answer``).
+2.  Student sheets are OCRed on a bounded worker pool
+    (``BATCH_GRADING_WORKERS``) shared by all running jobs; scoring goes
+    through the evaluation executor (``run_blocking``), so it counts
+    against ``EVALUATION_MAX_CONCURRENCY`` like interactive evaluations.
+3.  Per-student status is tracked on the job and persisted to
+    ``<UPLOAD_DIR>/batches/<job_id>/job.json`` so progress can be polled.
+    Running jobs refresh a heartbeat there; a ``queued`` / ``running`` job
+    whose heartbeat stopped was interrupted by a restart and is reported
+    as ``failed``.
+4.  Finished results are written in bulk — one ``add_all`` + ``commit`` per
+    ``BATCH_RESULT_FLUSH_SIZE`` students instead of one commit per student —
+    and saved to the result store so ``/results`` lists them.  Sheets whose
+    write failed are marked ``failed`` and fail the job.
+
+The text-extraction and scoring steps are injected (``extract_fn`` /
+``evaluate_fn``) so the route layer decides which OCR engine and scoring
+pipeline are used.
+
+Usage:
+    service = get_batch_grading_service()
+    job = service.create_job(model_path, student_paths, max_marks=10)
+    service.start(job, evaluate_fn=..., extract_fn=...)
+    service.get_job(job.job_id).to_dict()
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("AssessIQ.BatchGrading")
+
+# Job / student states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+TERMINAL_STATES = (DONE, FAILED)
+
+# Live jobs re-persist at least this often; a queued / running job whose
+# state has not been touched for STALE_AFTER_SECONDS lost its process
+HEARTBEAT_SECONDS = 10.0
+STALE_AFTER_SECONDS = 3 * HEARTBEAT_SECONDS
+
+# (path, ocr_engine) -> extracted text
+ExtractFn = Callable[[str, str], str]
+# (model_text, student_text, compiled, job) -> _evaluate_single_question_sync() dict
+EvaluateFn = Callable[[str, str, Any, "BatchJob"], Dict[str, Any]]
+
+
+@dataclass
+class BatchStudentItem:
+    """One student sheet within a batch job."""
+    index: int
+    student_ref: str
+    filename: str
+    path: str
+    evaluation_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: str = QUEUED
+    obtained_marks: Optional[float] = None
+    final_score: Optional[float] = None
+    grade: Optional[str] = None
+    is_unanswered: bool = False
+    error: Optional[str] = None
+    processing_time: Optional[float] = None
+    persisted: bool = False
+
+
+@dataclass
+class BatchJob:
+    """A class-wide grading job and its per-student progress."""
+    job_id: str
+    model_path: str
+    students: List[BatchStudentItem]
+    question_type: str = "descriptive"
+    max_marks: int = 10
+    ocr_engine: str = "easyocr"
+    rubric_config: Optional[Dict[str, Any]] = None
+    teacher_id: Optional[int] = None
+    status: str = QUEUED
+    error: Optional[str] = None
+    model_text_chars: int = 0
+    model_compiled: bool = False
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    heartbeat_at: float = field(default_factory=time.time)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in TERMINAL_STATES
+
+    @property
+    def total(self) -> int:
+        return len(self.students)
+
+    @property
+    def completed(self) -> int:
+        return sum(1 for s in self.students if s.status == DONE)
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for s in self.students if s.status == FAILED)
+
+    @property
+    def progress(self) -> float:
+        """Fraction of students finished (done or failed)."""
+        if not self.students:
+            return 1.0 if self.status in (DONE, FAILED) else 0.0
+        return round((self.completed + self.failed) / self.total, 4)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.update(
+            total=self.total,
+            completed=self.completed,
+            failed=self.failed,
+            progress=self.progress,
+        )
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BatchJob":
+        data = dict(data)
+        for key in ("total", "completed", "failed", "progress"):
+            data.pop(key, None)
+        data["students"] = [BatchStudentItem(**s) for s in data.get("students", [])]
+        return cls(**data)
+
+
+class BatchGradingService:
+    """
+    Runs batch jobs: model side once, student sheets on a shared pool.
+
+    Each job gets a lightweight driver thread; the per-sheet work for every
+    job goes through one ``ThreadPoolExecutor`` so the number of sheets in
+    progress stays bounded however many jobs are queued.  Scoring is handed
+    on to the evaluation executor and waits there for an idle worker.
+    """
+
+    def __init__(
+        self,
+        root_dir: str,
+        max_workers: int = 2,
+        flush_size: int = 25,
+        session_factory: Optional[Callable[[], Any]] = None,
+        evaluation_executor: Any = None,
+    ):
+        self.root_dir = root_dir
+        self.max_workers = max(1, max_workers)
+        self.flush_size = max(1, flush_size)
+        self._session_factory = session_factory
+        self._evaluation_executor = evaluation_executor
+        self._jobs: Dict[str, BatchJob] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._heartbeat: Optional[threading.Thread] = None
+
+    # ─── Job lifecycle ───────────────────────────────────────────────
+
+    def job_dir(self, job_id: str) -> str:
+        return os.path.join(self.root_dir, job_id)
+
+    def create_job(
+        self,
+        model_path: str,
+        student_paths: List[str],
+        job_id: Optional[str] = None,
+        **options,
+    ) -> BatchJob:
+        """
+        Register a job for *model_path* vs *student_paths*.
+
+        ``student_ref`` defaults to each file's name without extension
+        (typically the roll number / student name the sheets are saved as).
+        """
+        students = [
+            BatchStudentItem(
+                index=i,
+                student_ref=os.path.splitext(os.path.basename(p))[0],
+                filename=os.path.basename(p),
+                path=p,
+            )
+            for i, p in enumerate(student_paths)
+        ]
+        job = BatchJob(
+            job_id=job_id or str(uuid.uuid4()),
+            model_path=model_path,
+            students=students,
+            **options,
+        )
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._persist(job)
+        return job
+
+    def start(self, job: BatchJob, evaluate_fn: EvaluateFn, extract_fn: ExtractFn) -> None:
+        """Run *job* in the background and return immediately."""
+        thread = threading.Thread(
+            target=self.run, args=(job, evaluate_fn, extract_fn),
+            name=f"batch-{job.job_id[:8]}", daemon=True,
+        )
+        thread.start()
+
+    def run(self, job: BatchJob, evaluate_fn: EvaluateFn, extract_fn: ExtractFn) -> BatchJob:
+        """Run *job* to completion on the calling thread (workers for students)."""
+        start = time.time()
+        job.status = RUNNING
+        job.started_at = datetime.now().isoformat()
+        self._persist(job)
+        self._ensure_heartbeat()
+
+        # ── Model side: OCR + compile exactly once ───────────────────
+        try:
+            model_text = extract_fn(job.model_path, job.ocr_engine)
+            if not model_text or not model_text.strip():
+                raise ValueError("No text could be extracted from the model answer")
+        except Exception as e:
+            logger.error(f"[BATCH {job.job_id}] Model answer extraction failed: {e}")
+            job.status = FAILED
+            job.error = f"Model answer extraction failed: {e}"
+            job.finished_at = datetime.now().isoformat()
+            self._persist(job)
+            return job
+        job.model_text_chars = len(model_text)
+
+        compiled = None
+        try:
+            from api.services.model_answer_compiler import get_compiled_model_answer
+            compiled = get_compiled_model_answer(model_text)
+        except Exception as e:
+            logger.warning(f"[BATCH {job.job_id}] Model answer compile failed, scoring uncompiled: {e}")
+        job.model_compiled = compiled is not None
+        self._persist(job)
+
+        # ── Student side: fan out over the shared pool ───────────────
+        executor = self._get_executor()
+        futures = {
+            executor.submit(self._grade_one, job, item, model_text, compiled, evaluate_fn, extract_fn): item
+            for item in job.students
+        }
+        pending: List[tuple] = []
+        unsaved = 0
+        for future in as_completed(futures):
+            item = futures[future]
+            result = future.result()
+            if result is not None:
+                pending.append((item, result))
+            if len(pending) >= self.flush_size:
+                unsaved += len(pending) - self._write_results(job, pending)
+                pending = []
+            self._persist(job)
+        if pending:
+            unsaved += len(pending) - self._write_results(job, pending)
+
+        if unsaved:
+            job.status = FAILED
+            job.error = f"{unsaved} graded results could not be saved"
+        else:
+            job.status = DONE
+        job.finished_at = datetime.now().isoformat()
+        self._persist(job)
+        logger.info(
+            f"[BATCH {job.job_id}] Finished {job.total} sheets in {time.time() - start:.1f}s "
+            f"({job.completed} graded, {job.failed} failed)"
+        )
+        return job
+
+    def _grade_one(
+        self,
+        job: BatchJob,
+        item: BatchStudentItem,
+        model_text: str,
+        compiled: Any,
+        evaluate_fn: EvaluateFn,
+        extract_fn: ExtractFn,
+    ) -> Optional[Dict[str, Any]]:
+        """OCR + score one sheet; failures are recorded on the item, not raised."""
+        start = time.time()
+        item.status = RUNNING
+        try:
+            student_text = extract_fn(item.path, job.ocr_engine)
+            result = self._get_evaluation_executor().run_blocking(
+                evaluate_fn, model_text, student_text or "", compiled, job,
+            )
+        except Exception as e:
+            logger.warning(f"[BATCH {job.job_id}] {item.filename} failed: {e}")
+            item.status = FAILED
+            item.error = str(e)[:300]
+            item.processing_time = round(time.time() - start, 3)
+            return None
+
+        result = dict(result, student_answer_text=student_text)
+        item.obtained_marks = result.get("obtained_marks")
+        item.final_score = result.get("final_score")
+        item.grade = result.get("grade")
+        item.is_unanswered = bool(result.get("is_unanswered"))
+        item.processing_time = round(time.time() - start, 3)
+        item.status = DONE
+        return result
+
+    # ─── Persistence ─────────────────────────────────────────────────
+
+    def _write_results(self, job: BatchJob, items: List[tuple]) -> int:
+        """
+        Bulk-insert one ``Evaluation`` row per graded sheet (single commit).
+
+        Returns the number of rows written; when the commit fails the
+        sheets are marked ``failed`` and nothing is written.
+        """
+        from database.models import Evaluation, GradeLevel, QuestionType
+
+        try:
+            question_type = QuestionType(job.question_type)
+        except ValueError:
+            question_type = QuestionType.DESCRIPTIVE
+
+        rows = []
+        for item, result in items:
+            breakdown = result.get("score_breakdown") or {}
+            concepts = result.get("concepts") or {}
+            try:
+                grade = GradeLevel(str(result.get("grade", "")).lower())
+            except ValueError:
+                grade = None
+            rows.append(Evaluation(
+                evaluation_id=item.evaluation_id,
+                teacher_id=job.teacher_id,
+                student_answer_text=result.get("student_answer_text"),
+                student_answer_file=item.path,
+                question_type=question_type,
+                max_marks=job.max_marks,
+                obtained_marks=float(result.get("obtained_marks") or 0.0),
+                final_score=float(result.get("final_score") or 0.0),
+                grade=grade,
+                semantic_score=_as_float(breakdown.get("semantic_score")),
+                keyword_score=_as_float(breakdown.get("keyword_score")),
+                length_penalty=_as_float(breakdown.get("length_penalty")) or 0.0,
+                matched_keywords=list(concepts.get("matched") or []),
+                missing_keywords=list(concepts.get("missing") or []),
+                concept_coverage=_as_float(concepts.get("coverage_percentage")),
+                explanation=result.get("explanation"),
+                suggestions=list(result.get("suggestions") or []),
+                processing_time=item.processing_time,
+            ))
+
+        session_factory = self._session_factory
+        if session_factory is None:
+            from database.models import SessionLocal
+            session_factory = SessionLocal
+        db = session_factory()
+        try:
+            db.add_all(rows)
+            db.commit()
+            for item, _ in items:
+                item.persisted = True
+            logger.info(f"[BATCH {job.job_id}] Wrote {len(rows)} evaluations")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[BATCH {job.job_id}] Bulk result write failed: {e}")
+            for item, _ in items:
+                item.status = FAILED
+                item.error = f"Result could not be saved: {e}"[:300]
+            return 0
+        finally:
+            db.close()
+
+        for item, result in items:
+            self._save_report(job, item, result)
+        return len(rows)
+
+    def _save_report(self, job: BatchJob, item: BatchStudentItem, result: Dict[str, Any]) -> None:
+        """Add the sheet's report to the result store (``/results``)."""
+        from api.routes.results import save_result
+
+        report = dict(
+            result,
+            evaluation_id=item.evaluation_id,
+            batch_job_id=job.job_id,
+            student_ref=item.student_ref,
+            filename=item.filename,
+            question_type=job.question_type,
+            max_marks=job.max_marks,
+            processing_time=item.processing_time,
+            timestamp=datetime.now().isoformat(),
+        )
+        try:
+            save_result(item.evaluation_id, report, teacher_id=job.teacher_id)
+        except Exception as e:
+            logger.warning(f"[BATCH {job.job_id}] Could not save report for {item.filename}: {e}")
+
+    def _persist(self, job: BatchJob) -> None:
+        """Write the job's progress snapshot to ``job.json`` (atomic replace)."""
+        directory = self.job_dir(job.job_id)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, "job.json")
+            tmp_path = f"{path}.tmp"
+            with self._lock:
+                job.heartbeat_at = time.time()
+                snapshot = job.to_dict()
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f, indent=2, default=str)
+                os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"[BATCH {job.job_id}] Could not persist job state: {e}")
+
+    def _ensure_heartbeat(self) -> None:
+        with self._lock:
+            if self._heartbeat is not None:
+                return
+            self._heartbeat = threading.Thread(
+                target=self._heartbeat_loop, name="batch-heartbeat", daemon=True,
+            )
+            self._heartbeat.start()
+
+    def _heartbeat_loop(self) -> None:
+        """Re-persist live jobs so other workers can tell them from orphans."""
+        while True:
+            time.sleep(HEARTBEAT_SECONDS)
+            with self._lock:
+                live = [job for job in self._jobs.values() if not job.is_finished]
+                if not live:
+                    self._heartbeat = None
+                    return
+            for job in live:
+                self._persist(job)
+
+    # ─── Lookup ──────────────────────────────────────────────────────
+
+    def get_job(self, job_id: str) -> Optional[BatchJob]:
+        """In-memory job, or the persisted snapshot (interrupted jobs reported as failed)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        path = os.path.join(self.job_dir(job_id), "job.json")
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # Snapshots written before heartbeats existed: last write time
+            data.setdefault("heartbeat_at", os.path.getmtime(path))
+            job = BatchJob.from_dict(data)
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"[BATCH {job_id}] Unreadable job state: {e}")
+            return None
+        if not job.is_finished and time.time() - job.heartbeat_at > STALE_AFTER_SECONDS:
+            job.status = FAILED
+            job.error = job.error or "Batch job was interrupted (server restarted)"
+            for item in job.students:
+                if item.status not in TERMINAL_STATES:
+                    item.status = FAILED
+                    item.error = "Not graded: batch job was interrupted"
+        return job
+
+    def _get_evaluation_executor(self):
+        if self._evaluation_executor is None:
+            from api.services.evaluation_executor import get_evaluation_executor
+            self._evaluation_executor = get_evaluation_executor()
+        return self._evaluation_executor
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="batch-grade",
+                    )
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def _as_float(value) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+# ─── Process-wide singleton ──────────────────────────────────────────
+
+_service: Optional[BatchGradingService] = None
+_service_lock = threading.Lock()
+
+
+def get_batch_grading_service() -> BatchGradingService:
+    """Shared service configured from settings."""
+    global _service
+    from config.settings import settings
+
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = BatchGradingService(
+                    root_dir=os.path.join(settings.UPLOAD_DIR, "batches"),
+                    max_workers=settings.BATCH_GRADING_WORKERS,
+                    flush_size=settings.BATCH_RESULT_FLUSH_SIZE,
+                )
+    return _service
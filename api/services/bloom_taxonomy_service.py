@@ -254,6 +254,32 @@ def _detect_level_from_patterns(
     return best_level, confidence, hits
 
 
+def detect_question_level(
+    question_text: str = "",
+    model_text: str = "",
+) -> Tuple[int, float, List[str]]:
+    """
+    Expected Bloom level of a question.
+
+    Uses the question prompt, or the first 200 chars of the model answer as
+    a proxy when no prompt is available.
+    Returns (level, confidence, matched_indicators).
+    """
+    _ensure_compiled()
+
+    q_text = question_text.strip()
+    if not q_text and model_text:
+        q_text = model_text[:200]
+
+    q_level, q_conf, q_hits = _detect_level_from_patterns(
+        q_text, _COMPILED_Q_PATTERNS, top_n_chars=300,
+    )
+    q_indicators: List[str] = []
+    for hits_list in q_hits.values():
+        q_indicators.extend(hits_list)
+    return q_level, q_conf, q_indicators
+
+
 def _compute_student_level_breakdown(
     hits: Dict[int, List[str]],
 ) -> List[BloomLevelDetail]:
@@ -301,6 +327,7 @@ class BloomTaxonomyAnalyzer:
         student_text: str = "",
         model_text: str = "",
         question_bloom_override: Optional[int] = None,
+        expected_level: Optional[Tuple[int, float, List[str]]] = None,
     ) -> BloomAnalysisResult:
         """
         Analyse cognitive level alignment between question and student answer.
@@ -311,28 +338,24 @@ class BloomTaxonomyAnalyzer:
             student_text:  Student's answer text.
             model_text:    Model/expected answer (used as fallback for question detection).
             question_bloom_override: Force a specific Bloom level for the question (1-6).
+            expected_level: Precomputed ``detect_question_level`` result (e.g.
+                           from a compiled model answer); used when no
+                           question_text is given.
         """
         _ensure_compiled()
 
         # ── Detect question Bloom level ──────────────────────────
-        q_text = question_text.strip()
-        if not q_text and model_text:
-            # Use first 200 chars of model text as proxy
-            q_text = model_text[:200]
-
         if question_bloom_override and 1 <= question_bloom_override <= 6:
             q_level = question_bloom_override
             q_conf = 1.0
-            q_hits: Dict[int, List[str]] = {i: [] for i in range(1, 7)}
+            q_indicators: List[str] = []
+        elif expected_level is not None and not question_text.strip():
+            q_level, q_conf, q_indicators = expected_level
         else:
-            q_level, q_conf, q_hits = _detect_level_from_patterns(
-                q_text, _COMPILED_Q_PATTERNS, top_n_chars=300,
+            q_level, q_conf, q_indicators = detect_question_level(
+                question_text, model_text,
             )
 
-        q_indicators: List[str] = []
-        for hits_list in q_hits.values():
-            q_indicators.extend(hits_list)
-
         # ── Detect student answer Bloom level ────────────────────
         s_level, s_conf, s_hits = _detect_level_from_patterns(
             student_text, _COMPILED_A_PATTERNS,
@@ -55,6 +55,8 @@ from typing import Dict, List, Optional, Set, Tuple
 
 import numpy as np
 
+from api.services.model_registry import get_model_registry
+
 logger = logging.getLogger("AssessIQ.ConceptGraph")
 
 
@@ -247,6 +249,8 @@ class ConceptExtractor:
     MIN_CONCEPT_LEN = 3
     # Maximum concepts to extract per text
     MAX_CONCEPTS = 80
+    # Input cap for spaCy parsing
+    MAX_PARSE_CHARS = 10000
 
     def __init__(self):
         self._nlp = None
@@ -256,14 +260,7 @@ class ConceptExtractor:
     def _init_nlp(self):
         """Load spaCy model (used for dependency parsing)."""
         try:
-            import spacy
-            try:
-                self._nlp = spacy.load("en_core_web_sm")
-            except OSError:
-                logger.info("Downloading spaCy en_core_web_sm...")
-                from spacy.cli import download
-                download("en_core_web_sm")
-                self._nlp = spacy.load("en_core_web_sm")
+            self._nlp = get_model_registry().get_spacy()
             logger.debug("ConceptExtractor: spaCy loaded")
         except ImportError:
             logger.warning(
@@ -272,18 +269,28 @@ class ConceptExtractor:
 
     # ── public API ────────────────────────────────────────────────
 
-    def extract_propositions(self, text: str) -> List[Proposition]:
-        """Extract (subject, predicate, object) triples from text."""
+    def extract_propositions(self, text: str, doc=None) -> List[Proposition]:
+        """Extract (subject, predicate, object) triples from text.
+
+        *doc* is an optional existing spaCy parse of *text* (e.g. from an
+        ``EvaluationContext``) that is reused instead of re-parsing.
+        """
         if self._nlp:
-            return self._extract_propositions_spacy(text)
+            return self._extract_propositions_spacy(text, doc)
         return self._extract_propositions_regex(text)
 
-    def extract_key_phrases(self, text: str) -> List[str]:
-        """Extract noun chunks / key phrases."""
+    def extract_key_phrases(self, text: str, doc=None) -> List[str]:
+        """Extract noun chunks / key phrases (*doc*: optional existing parse)."""
         if self._nlp:
-            return self._extract_phrases_spacy(text)
+            return self._extract_phrases_spacy(text, doc)
         return self._extract_phrases_regex(text)
 
+    def _parse(self, text: str, doc=None):
+        """spaCy parse of the capped text, reusing *doc* when it covers it."""
+        if doc is not None and len(text) <= self.MAX_PARSE_CHARS:
+            return doc
+        return self._nlp(text[:self.MAX_PARSE_CHARS])
+
     def rank_by_importance(
         self, phrases: List[str], full_text: str
     ) -> List[Tuple[str, float]]:
@@ -329,9 +336,9 @@ class ConceptExtractor:
 
     # ── spaCy-based extraction ────────────────────────────────────
 
-    def _extract_propositions_spacy(self, text: str) -> List[Proposition]:
+    def _extract_propositions_spacy(self, text: str, doc=None) -> List[Proposition]:
         """Use dependency parsing to extract SVOs."""
-        doc = self._nlp(text[:10000])  # cap input length
+        doc = self._parse(text, doc)  # cap input length
         propositions: List[Proposition] = []
         seen: Set[str] = set()
 
@@ -423,9 +430,9 @@ class ConceptExtractor:
         parts.append(token.text)
         return " ".join(parts).strip()
 
-    def _extract_phrases_spacy(self, text: str) -> List[str]:
+    def _extract_phrases_spacy(self, text: str, doc=None) -> List[str]:
         """Extract noun chunks + named entities via spaCy."""
-        doc = self._nlp(text[:10000])
+        doc = self._parse(text, doc)
         phrases: List[str] = []
         seen: Set[str] = set()
 
@@ -989,6 +996,8 @@ class ConceptGraphScorer:
         self,
         model_text: str,
         student_text: str,
+        context=None,
+        compiled=None,
     ) -> ConceptGraphScore:
         """
         Full concept-graph scoring pipeline.
@@ -996,12 +1005,21 @@ class ConceptGraphScorer:
         Args:
             model_text: The reference / model answer
             student_text: The student's answer
+            context: Optional EvaluationContext; node and phrase embeddings
+                     are memoised on it and shared with the other scorers
+            compiled: Optional CompiledModelAnswer for *model_text*; its
+                      concept graph replaces steps 1-2
 
         Returns:
             ConceptGraphScore with all sub-scores and details
         """
         start = time.time()
-        self._ensure_services()
+        if context is not None:
+            builder = SemanticGraphBuilder(context)
+            matcher = ConceptMatcher(context)
+        else:
+            self._ensure_services()
+            builder, matcher = self._builder, self._matcher
 
         result = ConceptGraphScore()
 
@@ -1013,21 +1031,26 @@ class ConceptGraphScorer:
             result.processing_time = time.time() - start
             return result
 
-        # ── Step 1: Extract concepts from model answer ────────────
-        model_propositions = self._extractor.extract_propositions(model_text)
-        model_phrases = self._extractor.extract_key_phrases(model_text)
-        model_ranked = self._extractor.rank_by_importance(model_phrases, model_text)
-        model_importance = {p: s for p, s in model_ranked}
+        if compiled is not None and compiled.concept_graph_ok and compiled.text == model_text:
+            # ── Steps 1-2: precompiled model concept graph ────────
+            model_graph = compiled.build_concept_graph()
+        else:
+            # ── Step 1: Extract concepts from model answer ────────
+            model_doc = context.doc(model_text) if context is not None else None
+            model_propositions = self._extractor.extract_propositions(model_text, doc=model_doc)
+            model_phrases = self._extractor.extract_key_phrases(model_text, doc=model_doc)
+            model_ranked = self._extractor.rank_by_importance(model_phrases, model_text)
+            model_importance = {p: s for p, s in model_ranked}
 
-        logger.debug(
-            f"Model: {len(model_propositions)} propositions, "
-            f"{len(model_phrases)} phrases"
-        )
+            logger.debug(
+                f"Model: {len(model_propositions)} propositions, "
+                f"{len(model_phrases)} phrases"
+            )
 
-        # ── Step 2: Build model concept graph ─────────────────────
-        model_graph = self._builder.build(
-            model_text, model_propositions, model_phrases, model_importance,
-        )
+            # ── Step 2: Build model concept graph ─────────────────
+            model_graph = builder.build(
+                model_text, model_propositions, model_phrases, model_importance,
+            )
         result.model_concept_count = model_graph.node_count
 
         if model_graph.node_count == 0:
@@ -1038,11 +1061,12 @@ class ConceptGraphScorer:
             return result
 
         # ── Step 3: Extract concepts from student answer ──────────
-        student_phrases = self._extractor.extract_key_phrases(student_text)
+        student_doc = context.doc(student_text) if context is not None else None
+        student_phrases = self._extractor.extract_key_phrases(student_text, doc=student_doc)
         result.student_concept_count = len(student_phrases)
 
         # ── Step 4: Per-concept matching ──────────────────────────
-        matches = self._matcher.match(model_graph, student_phrases)
+        matches = matcher.match(model_graph, student_phrases)
         result.concept_matches = matches
 
         covered = [m for m in matches if m.status == "covered"]
@@ -1078,7 +1102,7 @@ class ConceptGraphScorer:
             result.depth_score = float(np.mean(partial_sims)) * 0.5 if partial_sims else 0.0
 
         # ── Step 7: Relevance score ───────────────────────────────
-        irrelevant = self._matcher.find_irrelevant(
+        irrelevant = matcher.find_irrelevant(
             model_graph, student_phrases,
         )
         result.irrelevant_phrases = irrelevant[:10]  # cap for report
@@ -4,9 +4,12 @@ Dashboard Service
 Handles dashboard initialization and metric updates.
 - Initializes dashboard with zero values on first user access
 - Updates metrics when user performs actions
+  (teacher / student counters on write, see database/dashboard_counters.py)
 - Tracks trends and historical data
 """
 
+import asyncio
+import logging
 from datetime import datetime
 from typing import Optional, Dict, Any
 from sqlalchemy.orm import Session
@@ -21,6 +24,8 @@ from database.models import (
     Class
 )
 
+logger = logging.getLogger("AssessIQ.Dashboard")
+
 
 class DashboardService:
     """Service for managing dashboard operations."""
@@ -49,6 +54,7 @@ class DashboardService:
         """
         Get existing dashboard or create new one with zero values.
         Called on user's first visit to dashboard.
+        Teacher / student counters are filled from existing data on creation.
         
         Args:
             db: Database session
@@ -91,6 +97,12 @@ class DashboardService:
         
         db.add(dashboard)
         db.commit()
+        
+        # Start the counters from the user's existing data; deltas follow
+        if user_role in (UserRole.TEACHER, UserRole.STUDENT):
+            from database.dashboard_counters import recompute
+            recompute(db, user_role.value, user_id)
+            db.commit()
         db.refresh(dashboard)
         
         return dashboard
@@ -145,92 +157,34 @@ class DashboardService:
         db.commit()
         return dashboard
     
-    # ===== TEACHER DASHBOARD UPDATES =====
+    # ===== TEACHER / STUDENT DASHBOARD UPDATES =====
+    # Kept up to date on write by database.dashboard_counters; these
+    # recompute one dashboard from the database (creation, reset, repairs).
     
     @staticmethod
     def update_teacher_metrics(db: Session, teacher_id: int) -> Dashboard:
         """
         Recalculate teacher dashboard metrics from database.
-        Called after teacher creates class, does evaluation, etc.
+        Not needed after evaluations, uploads, etc. (the counters follow them).
         """
-        dashboard = db.query(Dashboard).filter_by(teacher_id=teacher_id).first()
-        if not dashboard:
-            return None
-        
-        # Count students taught
-        dashboard.students_taught = db.query(Student).filter_by(teacher_id=teacher_id).count()
-        
-        # Count classes managed
-        dashboard.classes_managed = db.query(Class).filter_by(teacher_id=teacher_id).count()
-        
-        # Count AI evaluations created
-        dashboard.evaluations_created = db.query(Evaluation).filter_by(teacher_id=teacher_id).count()
-        
-        # Count manual evaluations
-        dashboard.manual_evaluations_done = db.query(ManualEvaluation).filter_by(teacher_id=teacher_id).count()
-        
-        # Count model answers uploaded
-        dashboard.model_answers_uploaded = db.query(ModelAnswer).filter_by(teacher_id=teacher_id).count()
-        
-        # Total evaluations
-        dashboard.total_evaluations = dashboard.evaluations_created + dashboard.manual_evaluations_done
-        
-        # Calculate average evaluation score
-        avg_score = db.query(Evaluation.final_score).filter(
-            Evaluation.teacher_id == teacher_id
-        ).values(Evaluation.final_score)
-        
-        scores = [score[0] for score in avg_score if score[0] is not None]
-        dashboard.average_evaluation_score = sum(scores) / len(scores) if scores else 0.0
-        
-        # Count documents uploaded
-        dashboard.documents_uploaded = db.query(UploadedFile).filter_by(teacher_id=teacher_id).count()
-        
-        dashboard.last_activity_at = datetime.utcnow()
-        db.commit()
-        return dashboard
-    
-    # ===== STUDENT DASHBOARD UPDATES =====
+        return DashboardService._recompute(db, "teacher", teacher_id)
     
     @staticmethod
     def update_student_metrics(db: Session, student_id: int) -> Dashboard:
         """
         Recalculate student dashboard metrics from database.
-        Called after student receives evaluation, submits answers, etc.
+        Not needed after evaluations are written (the counters follow them).
         """
-        dashboard = db.query(Dashboard).filter_by(student_id=student_id).first()
+        return DashboardService._recompute(db, "student", student_id)
+    
+    @staticmethod
+    def _recompute(db: Session, role: str, owner_id: int) -> Optional[Dashboard]:
+        from database.dashboard_counters import recompute
+        
+        dashboard = db.query(Dashboard).filter_by(**{f"{role}_id": owner_id}).first()
         if not dashboard:
             return None
-        
-        # Count evaluations received
-        evaluations = db.query(Evaluation).filter_by(student_id=student_id).all()
-        dashboard.evaluations_received = len(evaluations)
-        
-        # Calculate scores
-        scores = [e.final_score for e in evaluations if e.final_score is not None]
-        
-        if scores:
-            dashboard.average_score = sum(scores) / len(scores)
-            dashboard.highest_score = max(scores)
-            dashboard.lowest_score = min(scores)
-        else:
-            dashboard.average_score = 0.0
-            dashboard.highest_score = 0.0
-            dashboard.lowest_score = 0.0
-        
-        # Get feedback count
-        dashboard.total_feedback_received = sum(
-            1 for e in evaluations if e.feedback and len(e.feedback) > 0
-        )
-        
-        # Count assignments received (model answers assigned to student's class)
-        student = db.query(Student).filter_by(id=student_id).first()
-        if student:
-            dashboard.assignments_received = db.query(ModelAnswer).filter_by(
-                class_id=student.class_id
-            ).count()
-        
-        dashboard.last_activity_at = datetime.utcnow()
+        recompute(db, role, owner_id)
         db.commit()
         return dashboard
     
@@ -373,9 +327,15 @@ class DashboardService:
     @staticmethod
     def reset_dashboard(db: Session, dashboard: Dashboard) -> Dashboard:
         """
-        Reset all dashboard metrics to zero (for new period/semester).
+        Reset dashboard metrics to zero (for new period/semester).
+        The teacher / student counters kept by database/dashboard_counters.py
+        (evaluations, students, scores, ...) count all existing data and
+        are not reset; activity and engagement metrics are.
         """
-        dashboard.reset_to_zero()
+        from database.dashboard_counters import FIELDS
+        
+        role = "teacher" if dashboard.teacher_id else "student" if dashboard.student_id else None
+        dashboard.reset_to_zero(keep=FIELDS.get(role, ()))
         db.commit()
         return dashboard
 
@@ -384,3 +344,30 @@ class DashboardService:
 def get_dashboard_service():
     """Dependency injection for DashboardService."""
     return DashboardService()
+
+
+# ===== COUNTER REPAIRS =====
+
+def repair_dashboard_counters() -> int:
+    """Recompute every teacher / student dashboard; returns how many had drifted."""
+    from database.models import SessionLocal
+    from database.dashboard_counters import repair
+    
+    db = SessionLocal()
+    try:
+        return repair(db)
+    finally:
+        db.close()
+
+
+async def run_counter_repairs(interval_minutes: float) -> None:
+    """
+    Repair the dashboard counters now and then every *interval_minutes*.
+    Runs until cancelled; each pass runs off the event loop.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(repair_dashboard_counters)
+        except Exception as e:
+            logger.warning(f"Dashboard counter repair failed: {e}")
+        await asyncio.sleep(interval_minutes * 60)
@@ -0,0 +1,419 @@
+"""
+Embedding Cache Service
+========================
+Content-addressed, two-tier cache for sentence-transformer embeddings.
+
+Problem
+-------
+A teacher grading 60 students against one model answer made
+``SemanticAnalyzer.get_embedding`` re-encode the identical model answer,
+model sentences and concept labels 60 times.
+
+Solution
+--------
+Embeddings are keyed by ``(model name, SHA-256 of the text)`` and kept in
+two tiers:
+
+1.  **Memory** — an in-process LRU bounded by a byte budget
+    (``EMBEDDING_CACHE_MEMORY_MB``).
+2.  **Disk** — a float16 matrix per model, backed by memory-mapped files
+    under ``EMBEDDING_CACHE_DIR``, so warm entries survive restarts and are
+    shared by every worker.  The store is a fixed-capacity ring
+    (``EMBEDDING_DISK_CACHE_MAX_ENTRIES``): once full, the oldest rows are
+    overwritten.
+
+Disk hits are promoted into the memory tier.  ``get_stats()`` reports
+memory / disk hits and misses.
+
+Usage:
+    cache = get_embedding_cache()
+    vectors = cache.encode(model_name, texts, encoder)   # encodes misses only
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("AssessIQ.EmbeddingCache")
+
+
+def embedding_key(model_name: str, text: str) -> str:
+    """Content address of *text* embedded by *model_name*."""
+    return hashlib.sha256(f"{model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Tier 2: memory-mapped float16 store
+# ═══════════════════════════════════════════════════════════════════════
+
+STORE_FORMAT = 2
+EMPTY_DIGEST = bytes(32)
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Exclusive, blocking lock on *path* across processes."""
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            while True:
+                try:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class _DiskStore:
+    """
+    Fixed-capacity float16 ring of embeddings for one model, shared by every
+    process (API worker) using the same directory.
+
+    Files (``<name>`` is the sanitised model name):
+      • ``<name>.f16``        — ``capacity x dim`` float16 memmap
+      • ``<name>.keys``       — ``capacity x 32`` key digests (zeros = empty row)
+      • ``<name>.head``       — rows ever written; the ring cursor
+      • ``<name>.lock``       — held exclusively while writing
+      • ``<name>.meta.json``  — ``{"dim": ..., "capacity": ..., "format": ...}``
+
+    Writers take the lock and allocate rows from the shared cursor.  A row's
+    digest is cleared while its vector is rewritten and set once the vector
+    is flushed; readers compare the digest before and after copying the
+    vector, so a lookup never returns a row another process overwrote.
+    Each process keeps its own digest -> row map and catches up on rows
+    written since it last looked when a lookup misses.
+    """
+
+    def __init__(self, directory: str, model_name: str, dim: int, capacity: int):
+        self.dim = dim
+        self.capacity = capacity
+        base = self._base_path(directory, model_name)
+        os.makedirs(directory, exist_ok=True)
+        self._data_path = f"{base}.f16"
+        self._keys_path = f"{base}.keys"
+        self._head_path = f"{base}.head"
+        self._lock_path = f"{base}.lock"
+        self._meta_path = f"{base}.meta.json"
+        self._legacy_index_path = f"{base}.index"
+
+        self._rows: Dict[bytes, int] = {}
+        self._seen = 0
+
+        with _file_lock(self._lock_path):
+            if not self._meta_matches():
+                self._reset()
+            self._data = self._map(self._data_path, np.float16, (capacity, dim))
+            self._keys = self._map(self._keys_path, np.uint8, (capacity, 32))
+            self._head = self._map(self._head_path, np.int64, (1,))
+        self._catch_up()
+
+    @staticmethod
+    def _base_path(directory: str, model_name: str) -> str:
+        return os.path.join(directory, re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name))
+
+    @staticmethod
+    def _map(path: str, dtype, shape: tuple) -> np.memmap:
+        mode = "r+" if os.path.exists(path) else "w+"
+        return np.memmap(path, dtype=dtype, mode=mode, shape=shape)
+
+    @classmethod
+    def existing_dim(cls, directory: str, model_name: str) -> Optional[int]:
+        """Embedding dimension of a store left by a previous run, if any."""
+        try:
+            with open(f"{cls._base_path(directory, model_name)}.meta.json", "r", encoding="utf-8") as f:
+                return int(json.load(f)["dim"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _meta_matches(self) -> bool:
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            return (meta.get("dim") == self.dim and meta.get("capacity") == self.capacity
+                    and meta.get("format") == STORE_FORMAT)
+        except (OSError, ValueError):
+            return False
+
+    def _reset(self) -> None:
+        for path in (self._data_path, self._keys_path, self._head_path, self._legacy_index_path):
+            if os.path.exists(path):
+                os.remove(path)
+        with open(self._meta_path, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "capacity": self.capacity, "format": STORE_FORMAT}, f)
+
+    def _catch_up(self) -> None:
+        """Map the rows written (by any process) since the last look."""
+        head = int(self._head[0])
+        if head == self._seen:
+            return
+        if head < self._seen or head - self._seen >= self.capacity:
+            self._rows.clear()
+            rows = np.flatnonzero(self._keys.any(axis=1))
+        else:
+            rows = [r % self.capacity for r in range(self._seen, head)]
+        for row in rows:
+            digest = bytes(self._keys[row])
+            if digest != EMPTY_DIGEST:
+                self._rows[digest] = int(row)
+        self._seen = head
+
+    def _holds(self, digest: bytes) -> Optional[int]:
+        row = self._rows.get(digest)
+        if row is not None and bytes(self._keys[row]) == digest:
+            return row
+        return None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        digest = bytes.fromhex(key)
+        if digest not in self._rows:
+            self._catch_up()
+        row = self._holds(digest)
+        if row is None:
+            self._rows.pop(digest, None)
+            return None
+        vec = np.array(self._data[row], dtype=np.float32)
+        if bytes(self._keys[row]) != digest:    # rewritten while we copied it
+            self._rows.pop(digest, None)
+            return None
+        return vec
+
+    def put_many(self, items: List[tuple]) -> None:
+        """Write ``(key, vector)`` pairs, overwriting the oldest rows when full."""
+        with _file_lock(self._lock_path):
+            self._catch_up()
+            fresh: Dict[bytes, np.ndarray] = {}
+            for key, vec in items:
+                digest = bytes.fromhex(key)
+                if self._holds(digest) is None:
+                    fresh[digest] = vec
+            if not fresh:
+                return
+            entries = list(fresh.items())[-self.capacity:]
+            head = int(self._head[0])
+            rows = [(head + i) % self.capacity for i in range(len(entries))]
+
+            for row in rows:
+                old = bytes(self._keys[row])
+                if self._rows.get(old) == row:
+                    del self._rows[old]
+                self._keys[row] = 0
+            self._keys.flush()
+            for row, (_, vec) in zip(rows, entries):
+                self._data[row] = vec.astype(np.float16)
+            self._data.flush()
+            for row, (digest, _) in zip(rows, entries):
+                self._keys[row] = np.frombuffer(digest, dtype=np.uint8)
+                self._rows[digest] = row
+            self._keys.flush()
+            self._head[0] = head + len(entries)
+            self._head.flush()
+            self._seen = head + len(entries)
+
+    def clear(self) -> None:
+        with _file_lock(self._lock_path):
+            self._keys[:] = 0
+            self._keys.flush()
+            # Moving the cursor a full lap makes every process rescan
+            self._head[0] = int(self._head[0]) + self.capacity
+            self._head.flush()
+            self._rows.clear()
+            self._seen = int(self._head[0])
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Two-tier cache
+# ═══════════════════════════════════════════════════════════════════════
+
+class EmbeddingCache:
+    """
+    Thread-safe memory LRU in front of an optional on-disk float16 store.
+    """
+
+    def __init__(
+        self,
+        memory_budget_bytes: int = 64 * 1024 * 1024,
+        disk_dir: Optional[str] = None,
+        disk_capacity: int = 100_000,
+    ):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.disk_dir = disk_dir or None
+        self.disk_capacity = disk_capacity
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: Dict[str, _DiskStore] = {}
+        self._disk_failed = False
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # ─── Lookup / store ──────────────────────────────────────────────
+
+    def get_many(self, model_name: str, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Cached vector (float32) for each text, ``None`` for misses."""
+        results: List[Optional[np.ndarray]] = []
+        with self._lock:
+            store = self._get_disk_store(model_name)
+            for text in texts:
+                key = embedding_key(model_name, text)
+                vec = self._memory.get(key)
+                if vec is not None:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                else:
+                    vec = store.get(key) if store is not None else None
+                    if vec is not None:
+                        self.disk_hits += 1
+                        self._remember(key, vec)
+                    else:
+                        self.misses += 1
+                results.append(vec)
+        return results
+
+    def put_many(self, model_name: str, texts: List[str], vectors: np.ndarray) -> None:
+        """Store freshly encoded vectors in both tiers."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(texts) != len(vectors):
+            return
+        items = [(embedding_key(model_name, t), v.copy()) for t, v in zip(texts, vectors)]
+        with self._lock:
+            for key, vec in items:
+                self._remember(key, vec)
+            store = self._get_disk_store(model_name, vectors.shape[1])
+            if store is not None:
+                try:
+                    store.put_many(items)
+                except OSError as e:
+                    logger.warning(f"Embedding disk cache write failed: {e}")
+
+    def encode(self, model_name: str, texts: List[str], encoder: Any) -> np.ndarray:
+        """
+        Embeddings for *texts*, shape ``(len(texts), dim)``.
+
+        Each string is looked up separately; only the misses (deduplicated)
+        are passed to ``encoder.encode`` in one batch.
+        """
+        cached = self.get_many(model_name, texts)
+        missing = list(dict.fromkeys(t for t, v in zip(texts, cached) if v is None))
+        if missing:
+            encoded = np.asarray(encoder.encode(
+                missing, convert_to_numpy=True, show_progress_bar=False,
+            ), dtype=np.float32)
+            self.put_many(model_name, missing, encoded)
+            fresh = dict(zip(missing, encoded))
+            cached = [v if v is not None else fresh[t] for t, v in zip(texts, cached)]
+        return np.stack(cached)
+
+    # ─── Internals ───────────────────────────────────────────────────
+
+    def _remember(self, key: str, vec: np.ndarray) -> None:
+        """Insert into the memory LRU, evicting until within budget."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        if vec.nbytes > self.memory_budget_bytes:
+            return
+        self._memory[key] = vec
+        self._memory_bytes += vec.nbytes
+        while self._memory_bytes > self.memory_budget_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+
+    def _get_disk_store(self, model_name: str, dim: Optional[int] = None) -> Optional[_DiskStore]:
+        """
+        Open (or create) the disk store for *model_name*.
+
+        Without *dim* only an existing store (from a previous run) is
+        opened, so lookups can hit warm entries before anything is written.
+        """
+        if not self.disk_dir or self._disk_failed:
+            return None
+        store = self._disk.get(model_name)
+        if dim is None:
+            if store is not None:
+                return store
+            dim = _DiskStore.existing_dim(self.disk_dir, model_name)
+            if dim is None:
+                return None
+        if store is None or store.dim != dim:
+            try:
+                store = _DiskStore(self.disk_dir, model_name, dim, self.disk_capacity)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Embedding disk cache disabled: {e}")
+                self._disk_failed = True
+                return None
+            self._disk[model_name] = store
+        return store
+
+    def clear(self, disk: bool = False) -> None:
+        """Empty the memory tier (and the disk tier when ``disk=True``)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if disk:
+                for store in self._disk.values():
+                    store.clear()
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "disk_entries": sum(len(s) for s in self._disk.values()),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+# ─── Process-wide singleton ──────────────────────────────────────────
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Shared cache configured from settings, or ``None`` when disabled."""
+    global _cache
+    from config.settings import settings
+
+    if not getattr(settings, "EMBEDDING_CACHE_ENABLED", True):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EmbeddingCache(
+                    memory_budget_bytes=int(settings.EMBEDDING_CACHE_MEMORY_MB * 1024 * 1024),
+                    disk_dir=settings.EMBEDDING_CACHE_DIR,
+                    disk_capacity=settings.EMBEDDING_DISK_CACHE_MAX_ENTRIES,
+                )
+    return _cache
@@ -0,0 +1,304 @@
+"""
+Ensemble Scheduler
+===================
+Streams per-variant results from the ensemble OCR engines and stops
+scheduling work as soon as it is no longer needed.
+
+Problem
+-------
+``OCRService._extract_ensemble`` submitted one job per engine and waited for
+every future.  Its "top quality > 0.75" early exit was only checked after
+all engines and variants had finished, so the slowest engine (often
+PaddleOCR or Tesseract on three variants) set the latency of every page.
+
+Solution
+--------
+``EnsembleScheduler`` runs each engine's variants on that engine's own
+thread and pushes every result onto a queue the caller consumes as it
+arrives.
+
+*   Once a result reaches ``quality_threshold`` or ``deadline`` seconds
+    have passed, no further variant starts and ``run()`` returns with the
+    results received so far.  An engine call that is already running
+    cannot be interrupted; it is abandoned (counted in ``variants_abandoned``)
+    and its result dropped.  Its thread keeps using the caller's engines
+    until it returns, so the caller defers checking them back in with
+    ``when_idle()``.
+*   Inside one engine, later variants are still skipped when an earlier
+    one scored above ``variant_gate`` (the previous per-engine shortcut).
+*   Every variant not run is recorded in ``skipped`` with its reason, and
+    ``timings`` reports per-engine seconds spent and estimated seconds
+    saved.  Process-wide totals are surfaced on ``GET /api/info``.
+
+Usage:
+    scheduler = EnsembleScheduler(run_variant, quality_threshold=0.75, deadline=60)
+    results = scheduler.run({"easyocr": variants, "tesseract": variants})
+    scheduler.stop_reason, scheduler.skipped, scheduler.timings
+    scheduler.when_idle(release_engines)   # after abandoned variants return
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("AssessIQ.EnsembleScheduler")
+
+# (engine, variant name, image) → result dict with "quality_score", or None
+VariantRunner = Callable[[str, str, Any], Optional[Dict]]
+
+STOP_QUALITY = "quality"         # a result reached the quality threshold
+STOP_DEADLINE = "deadline"       # the per-page deadline passed
+SKIP_ENGINE_QUALITY = "engine_quality"  # an earlier variant of the same engine was good enough
+
+_DONE = object()
+
+
+@dataclass
+class EngineTiming:
+    """Work one engine did (and was spared) for one page."""
+    seconds: float = 0.0
+    variants_run: int = 0
+    variants_skipped: int = 0
+    variants_abandoned: int = 0  # still running when the page stopped early
+    seconds_saved: float = 0.0   # skipped variants × this engine's mean variant time
+
+    def as_dict(self) -> Dict[str, float]:
+        return {k: round(v, 3) if isinstance(v, float) else v for k, v in asdict(self).items()}
+
+
+class EnsembleScheduler:
+    """Per-engine worker threads with a shared stop signal and a result stream."""
+
+    def __init__(
+        self,
+        run_variant: VariantRunner,
+        quality_threshold: float = 0.75,
+        deadline: Optional[float] = None,
+        variant_gate: float = 0.65,
+    ):
+        self._run_variant = run_variant
+        self.quality_threshold = quality_threshold
+        self.deadline = deadline if deadline and deadline > 0 else None
+        self.variant_gate = variant_gate
+
+        self.results: List[Dict] = []
+        self.skipped: List[Dict[str, str]] = []
+        self.timings: Dict[str, EngineTiming] = {}
+        self.stop_reason: Optional[str] = None
+
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._deadline_at: Optional[float] = None
+        self._active = 0                 # workers that have not returned
+        self._unreported = 0             # workers whose _DONE run() has not consumed
+        self._queued: Dict[str, List[Tuple[str, Any]]] = {}   # variants not yet claimed by a worker
+        self._in_flight: Dict[str, bool] = {}
+        self._returned = False
+        self._idle_callbacks: List[Callable[[], None]] = []
+
+    def stop(self, reason: str) -> None:
+        """Let no further variant start; the first reason given is kept."""
+        with self._lock:
+            if self.stop_reason is None:
+                self.stop_reason = reason
+                logger.info(f"Ensemble stopping early ({reason})")
+        self._stop.set()
+
+    # ─── Scheduling ──────────────────────────────────────────────────
+
+    def run(self, engine_variants: Dict[str, Sequence[Tuple[str, Any]]]) -> List[Dict]:
+        """Run every engine's variants; returns results in arrival order."""
+        start = time.monotonic()
+        self._deadline_at = start + self.deadline if self.deadline else None
+        stream: "queue.Queue" = queue.Queue()
+        self.timings = {engine: EngineTiming() for engine in engine_variants}
+        self._queued = {engine: list(variants) for engine, variants in engine_variants.items()}
+
+        workers = [
+            threading.Thread(
+                target=self._worker, args=(engine, stream),
+                name=f"ocr-ensemble-{engine}", daemon=True,
+            )
+            for engine in engine_variants
+        ]
+        self._active = len(workers)
+        for worker in workers:
+            worker.start()
+
+        self._unreported = len(workers)
+        stream_open = bool(workers)
+        while stream_open and not self._stop.is_set():
+            timeout = None
+            if self._deadline_at is not None:
+                timeout = max(0.0, self._deadline_at - time.monotonic())
+            try:
+                item = stream.get(timeout=timeout)
+            except queue.Empty:
+                self.stop(STOP_DEADLINE)
+                break
+            stream_open = self._take(item)
+
+        # Stopped early: keep what has already arrived, abandon the rest
+        while stream_open:
+            try:
+                stream_open = self._take(stream.get_nowait())
+            except queue.Empty:
+                break
+        with self._lock:
+            self._returned = True
+            for engine, queued in self._queued.items():
+                for var_name, _ in queued:
+                    self._record_skip(engine, var_name, self.stop_reason)
+                queued.clear()
+                if self._in_flight.get(engine):
+                    self.timings[engine].variants_abandoned += 1
+        self._account_savings()
+        _stats.record(self, time.monotonic() - start)
+        return self.results
+
+    def _take(self, item) -> bool:
+        """Consume one stream item; False once every worker has finished."""
+        if item is _DONE:
+            self._unreported -= 1
+            return self._unreported > 0
+        self.results.append(item)
+        if item.get("quality_score", 0) >= self.quality_threshold:
+            self.stop(STOP_QUALITY)
+        return True
+
+    def when_idle(self, callback: Callable[[], None]) -> None:
+        """Call *callback* once every worker has returned (now, if none is running)."""
+        with self._lock:
+            if self._active:
+                self._idle_callbacks.append(callback)
+                return
+        callback()
+
+    def _worker(self, engine: str, stream: "queue.Queue") -> None:
+        timing = self.timings[engine]
+        best_quality = 0.0
+        try:
+            while True:
+                with self._lock:
+                    queued = self._queued[engine]
+                    if not queued:
+                        break
+                    var_name, image = queued.pop(0)
+                reason = self._skip_reason(best_quality, timing)
+                if reason:
+                    self._skip(engine, var_name, reason)
+                    continue
+                t0 = time.monotonic()
+                with self._lock:
+                    if self._returned:       # run() returned while this variant was being claimed
+                        self._record_skip(engine, var_name, self.stop_reason)
+                        continue
+                    self._in_flight[engine] = True
+                try:
+                    result = self._run_variant(engine, var_name, image)
+                except Exception as e:
+                    logger.debug(f"  {engine}/{var_name} failed: {e}")
+                    result = None
+                with self._lock:
+                    self._in_flight[engine] = False
+                    if self._returned:       # abandoned: already counted, result dropped
+                        break
+                    timing.seconds += time.monotonic() - t0
+                    timing.variants_run += 1
+                if result:
+                    best_quality = max(best_quality, result.get("quality_score", 0))
+                    stream.put(result)
+        finally:
+            with self._lock:
+                self._active -= 1
+                callbacks = self._idle_callbacks if not self._active else []
+                if callbacks:
+                    self._idle_callbacks = []
+            stream.put(_DONE)
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.warning(f"Ensemble idle callback failed: {e}")
+
+    def _skip_reason(self, best_quality: float, timing: EngineTiming) -> Optional[str]:
+        if self._deadline_at is not None and time.monotonic() >= self._deadline_at:
+            self.stop(STOP_DEADLINE)
+        if self._stop.is_set():
+            return self.stop_reason
+        if timing.variants_run and best_quality > self.variant_gate:
+            return SKIP_ENGINE_QUALITY
+        return None
+
+    def _skip(self, engine: str, variant: str, reason: str) -> None:
+        with self._lock:
+            self._record_skip(engine, variant, reason)
+
+    def _record_skip(self, engine: str, variant: str, reason: str) -> None:
+        """Record a variant not run (caller holds ``_lock``)."""
+        self.skipped.append({"engine": engine, "variant": variant, "reason": reason})
+        self.timings[engine].variants_skipped += 1
+        logger.debug(f"  {engine}: skipping {variant} ({reason})")
+
+    def _account_savings(self) -> None:
+        """Estimate skipped work from each engine's own mean variant time."""
+        ran = [t for t in self.timings.values() if t.variants_run]
+        overall = (sum(t.seconds for t in ran) / sum(t.variants_run for t in ran)) if ran else 0.0
+        for timing in self.timings.values():
+            mean = timing.seconds / timing.variants_run if timing.variants_run else overall
+            timing.seconds_saved = mean * timing.variants_skipped
+
+    def get_summary(self) -> Dict[str, Any]:
+        return {
+            "stop_reason": self.stop_reason,
+            "skipped": list(self.skipped),
+            "engine_timings": {engine: t.as_dict() for engine, t in self.timings.items()},
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Process-wide timing totals
+# ═══════════════════════════════════════════════════════════════════════
+
+class EnsembleTimingStats:
+    """Cumulative per-engine timings across every ensemble page."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.seconds = 0.0
+        self.stops: Dict[str, int] = {}
+        self.engines: Dict[str, EngineTiming] = {}
+
+    def record(self, scheduler: EnsembleScheduler, seconds: float) -> None:
+        with self._lock:
+            self.pages += 1
+            self.seconds += seconds
+            if scheduler.stop_reason:
+                self.stops[scheduler.stop_reason] = self.stops.get(scheduler.stop_reason, 0) + 1
+            for engine, timing in scheduler.timings.items():
+                total = self.engines.setdefault(engine, EngineTiming())
+                total.seconds += timing.seconds
+                total.variants_run += timing.variants_run
+                total.variants_skipped += timing.variants_skipped
+                total.variants_abandoned += timing.variants_abandoned
+                total.seconds_saved += timing.seconds_saved
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pages": self.pages,
+                "seconds": round(self.seconds, 3),
+                "early_stops": dict(self.stops),
+                "engines": {engine: t.as_dict() for engine, t in self.engines.items()},
+            }
+
+
+_stats = EnsembleTimingStats()
+
+
+def get_ensemble_timing_stats() -> EnsembleTimingStats:
+    return _stats
@@ -0,0 +1,380 @@
+"""
+Evaluation Context
+===================
+Per-answer-pair analysis state shared by every scoring stage.
+
+Problem
+-------
+A single evaluation runs the same model / student text through
+``SemanticAnalyzer.calculate_similarity``, ``ConceptGraphScorer.score``,
+``SentenceAlignmentScorer.score``, ``AntiGamingAnalyzer.analyze`` and
+``RubricScorer.evaluate``.  Each stage split the texts into sentences and
+ran its own MiniLM forward passes, so the same sentences (and the same
+concept phrases) were encoded several times per evaluation.
+
+Solution
+--------
+An ``EvaluationContext`` is built once per answer pair and handed to every
+scorer.  It holds:
+
+*   the raw and normalized model / student text,
+*   the sentence segmentation of both texts (spaCy, regex fallback),
+*   a memo of every embedding computed for this pair — whole-document,
+    sentence and phrase embeddings alike.
+
+``embed()`` only sends strings it has not seen before to the encoder, in a
+single batch, so each distinct string is encoded at most once per
+evaluation.  ``get_embedding()`` mirrors ``SemanticAnalyzer.get_embedding``
+so the context can be passed anywhere an embedder is expected.
+
+Usage:
+    context = EvaluationContext.build(
+        model_text, student_text,
+        model_normalized=nlp.normalize_text(model_text),
+        student_normalized=nlp.normalize_text(student_text),
+    )
+    semantic.calculate_similarity(model_norm, student_norm, context=context)
+    ConceptGraphScorer().score(model_text, student_text, context=context)
+"""
+
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger("AssessIQ.EvaluationContext")
+
+# Same cap as SemanticAnalyzer.get_embedding — the model truncates anyway
+MAX_EMBED_CHARS = 10000
+
+# Same cap the spaCy-based sentence splitters use
+MAX_PARSE_CHARS = 100000
+
+
+class EvaluationContext:
+    """
+    Sentences and embeddings for one (model answer, student answer) pair.
+
+    The context is request-scoped and not thread-safe; build a new one for
+    every answer pair.
+    """
+
+    def __init__(
+        self,
+        model_text: str,
+        student_text: str,
+        model_normalized: Optional[str] = None,
+        student_normalized: Optional[str] = None,
+        model_name: Optional[str] = None,
+        encoder: Any = None,
+        nlp: Any = None,
+    ):
+        """
+        Args:
+            model_text: raw model answer text
+            student_text: raw student answer text
+            model_normalized: normalized model text (defaults to raw text)
+            student_normalized: normalized student text (defaults to raw text)
+            model_name: sentence-transformers model used for embeddings
+                        (default: ``settings.SENTENCE_TRANSFORMER_MODEL``)
+            encoder: object with ``.encode(list[str])``; fetched from the
+                     model registry on first use when omitted.  Only the
+                     registry encoder reads / writes the shared embedding
+                     cache — an injected encoder is not necessarily the
+                     model its name claims
+            nlp: spaCy pipeline for sentence splitting; fetched from the
+                 model registry on first use when omitted
+        """
+        from config.settings import settings
+
+        self.model_text = model_text or ""
+        self.student_text = student_text or ""
+        self.model_normalized = model_normalized if model_normalized is not None else self.model_text
+        self.student_normalized = student_normalized if student_normalized is not None else self.student_text
+        self.model_name = model_name or settings.SENTENCE_TRANSFORMER_MODEL
+
+        self._encoder = encoder
+        self._use_shared_cache = encoder is None
+        self._encoder_error: Optional[Exception] = None
+        self._nlp = nlp
+        self._nlp_checked = nlp is not None
+
+        self._embeddings: Dict[str, np.ndarray] = {}
+        self._sentences: Dict[str, List[str]] = {}
+        self._docs: Dict[str, Any] = {}
+
+        # Bookkeeping
+        self.encode_calls = 0
+        self.encoded_texts = 0
+        self.cache_hits = 0
+
+    @classmethod
+    def build(
+        cls,
+        model_text: str,
+        student_text: str,
+        model_normalized: Optional[str] = None,
+        student_normalized: Optional[str] = None,
+        compiled=None,
+        **kwargs,
+    ) -> "EvaluationContext":
+        """
+        Build a context and encode both documents and all their sentences
+        in a single batch.
+
+        A ``CompiledModelAnswer`` for the model text pre-fills the model-side
+        sentences and embeddings, so only the student side is encoded.
+
+        Encoder failures are logged, not raised: scorers fall back to their
+        own non-embedding paths exactly as they did without a context.
+        """
+        context = cls(
+            model_text, student_text,
+            model_normalized=model_normalized,
+            student_normalized=student_normalized,
+            **kwargs,
+        )
+        if compiled is not None:
+            compiled.seed_context(context)
+        try:
+            context.prime()
+        except Exception as e:
+            logger.warning(f"Evaluation context embeddings unavailable: {e}")
+        return context
+
+    @classmethod
+    def build_batch(
+        cls,
+        pairs: List[Tuple[str, str, Optional[str], Optional[str]]],
+        compiled: Optional[List[Any]] = None,
+        phrase_extractor: Optional[Callable[[str, Any], List[str]]] = None,
+        **kwargs,
+    ) -> List["EvaluationContext"]:
+        """
+        Build contexts for many answer pairs with shared NLP work.
+
+        Every raw text is parsed in one ``nlp.pipe`` run, and every sentence,
+        document and (optionally) phrase across all pairs is encoded in a
+        single batch.  Each context's memo holds row views into that shared
+        matrix, so per-pair scoring works on slices of it.
+
+        Args:
+            pairs: ``(model_text, student_text, model_normalized,
+                   student_normalized)`` tuples
+            compiled: optional ``CompiledModelAnswer`` per pair (or ``None``)
+            phrase_extractor: ``f(text, doc) -> phrases`` whose output is
+                   added to the shared batch (e.g. concept key phrases)
+        """
+        compiled = compiled or [None] * len(pairs)
+        contexts = [
+            cls(m, s, model_normalized=mn, student_normalized=sn, **kwargs)
+            for (m, s, mn, sn) in pairs
+        ]
+        for context, artifact in zip(contexts, compiled):
+            if artifact is not None:
+                artifact.seed_context(context)
+        if not contexts:
+            return contexts
+
+        # ── One spaCy pass over every unparsed segment ───────────────
+        lead = contexts[0]
+        nlp = lead._get_nlp()
+        if nlp is not None:
+            pending: Dict[str, List[EvaluationContext]] = {}
+            for context in contexts:
+                for text in (context.model_text, context.student_text):
+                    if text and text not in context._sentences:
+                        pending.setdefault(text, []).append(context)
+            if pending:
+                texts = list(pending)
+                try:
+                    docs = list(nlp.pipe(t[:MAX_PARSE_CHARS] for t in texts))
+                except Exception as e:
+                    logger.warning(f"Batched spaCy parse failed: {e}")
+                    docs = []
+                for text, doc in zip(texts, docs):
+                    for context in pending[text]:
+                        context._nlp, context._nlp_checked = nlp, True
+                        context.set_doc(text, doc)
+
+        # ── One encoder pass over every sentence / document / phrase ─
+        wanted: Dict[EvaluationContext, List[str]] = {}
+        for context in contexts:
+            texts = [context.model_normalized, context.student_normalized]
+            texts += context.model_sentences + context.student_sentences
+            if phrase_extractor is not None and context.student_text:
+                try:
+                    texts += phrase_extractor(context.student_text, context.doc(context.student_text))
+                except Exception as e:
+                    logger.debug(f"Phrase extraction for batch failed: {e}")
+            wanted[context] = [
+                t[:MAX_EMBED_CHARS] for t in dict.fromkeys(texts)
+                if t and not context.has_embedding(t)
+            ]
+
+        shared = list(dict.fromkeys(t for texts in wanted.values() for t in texts))
+        if shared:
+            try:
+                matrix = lead._encode(shared)
+            except Exception as e:
+                logger.warning(f"Batched context embeddings unavailable: {e}")
+                return contexts
+            row = {t: i for i, t in enumerate(shared)}
+            for context, texts in wanted.items():
+                context.add_embeddings(texts, [matrix[row[t]] for t in texts])
+
+        logger.info(
+            f"Batched {len(contexts)} evaluation contexts: "
+            f"{len(shared)} strings encoded in {lead.encode_calls} call(s)"
+        )
+        return contexts
+
+    # ─── Sentences ───────────────────────────────────────────────────
+
+    @property
+    def model_sentences(self) -> List[str]:
+        return self.sentences(self.model_text)
+
+    @property
+    def student_sentences(self) -> List[str]:
+        return self.sentences(self.student_text)
+
+    def sentences(self, text: str) -> List[str]:
+        """Sentence segmentation of *text* (spaCy, else regex), memoised."""
+        cached = self._sentences.get(text)
+        if cached is not None:
+            return cached
+
+        doc = self.doc(text)
+        if doc is not None:
+            sents = [s.text.strip() for s in doc.sents if s.text.strip()]
+        else:
+            parts = re.split(r'(?<=[.!?])\s+', text.strip())
+            sents = [p.strip() for p in parts if p.strip()]
+
+        self._sentences[text] = sents
+        return sents
+
+    def doc(self, text: str):
+        """spaCy ``Doc`` for *text* (first ``MAX_PARSE_CHARS`` chars), memoised.
+
+        Returns ``None`` when spaCy is unavailable.
+        """
+        doc = self._docs.get(text)
+        if doc is None:
+            nlp = self._get_nlp()
+            if nlp is None:
+                return None
+            doc = nlp(text[:MAX_PARSE_CHARS])
+            self._docs[text] = doc
+        return doc
+
+    def set_doc(self, text: str, doc) -> None:
+        """Seed the parse of *text* (e.g. from a batched ``nlp.pipe`` run)."""
+        self._docs[text] = doc
+
+    def set_sentences(self, text: str, sentences: List[str]) -> None:
+        """Seed the segmentation of *text* (e.g. from a compiled model answer)."""
+        self._sentences[text] = list(sentences)
+
+    def _get_nlp(self):
+        if not self._nlp_checked:
+            self._nlp_checked = True
+            try:
+                from api.services.model_registry import get_model_registry
+                self._nlp = get_model_registry().get_spacy()
+            except Exception:
+                logger.debug("spaCy not available; using regex sentence splitting")
+        return self._nlp
+
+    # ─── Embeddings ──────────────────────────────────────────────────
+
+    @property
+    def model_sentence_embeddings(self) -> np.ndarray:
+        return self.embed(self.model_sentences)
+
+    @property
+    def student_sentence_embeddings(self) -> np.ndarray:
+        return self.embed(self.student_sentences)
+
+    def prime(self) -> None:
+        """Encode both documents and every sentence in one forward batch."""
+        texts = [self.model_normalized, self.student_normalized]
+        texts += self.model_sentences + self.student_sentences
+        self.embed([t for t in texts if t])
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embeddings for *texts*, shape ``(len(texts), dim)``.
+
+        Strings already embedded for this pair are served from the memo;
+        the rest are encoded together in one batch.
+        """
+        keys = [t[:MAX_EMBED_CHARS] for t in texts]
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        missing = list(dict.fromkeys(k for k in keys if k not in self._embeddings))
+        self.cache_hits += len(keys) - len(missing)
+
+        if missing:
+            vectors = self._encode(missing)
+            for key, vec in zip(missing, vectors):
+                self._embeddings[key] = vec
+
+        return np.stack([self._embeddings[k] for k in keys])
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """One encoder round-trip (through the shared cache when applicable)."""
+        encoder = self._get_encoder()
+        cache = None
+        if self._use_shared_cache:
+            from api.services.embedding_cache import get_embedding_cache
+            cache = get_embedding_cache()
+        if cache is not None:
+            vectors = cache.encode(self.model_name, texts, encoder)
+        else:
+            vectors = np.asarray(encoder.encode(
+                texts, convert_to_numpy=True, show_progress_bar=False,
+            ))
+        self.encode_calls += 1
+        self.encoded_texts += len(texts)
+        return vectors
+
+    def has_embedding(self, text: str) -> bool:
+        return text[:MAX_EMBED_CHARS] in self._embeddings
+
+    def add_embeddings(self, texts: List[str], vectors: np.ndarray) -> None:
+        """Seed the memo with precomputed vectors (e.g. a compiled model answer)."""
+        for text, vec in zip(texts, vectors):
+            self._embeddings.setdefault(text[:MAX_EMBED_CHARS], np.asarray(vec))
+
+    def get_embedding(self, text: Union[str, List[str]]) -> np.ndarray:
+        """``SemanticAnalyzer.get_embedding``-compatible wrapper around ``embed``."""
+        if not text:
+            raise ValueError("Text cannot be empty")
+        if isinstance(text, str):
+            return self.embed([text])[0]
+        return self.embed(list(text))
+
+    def _get_encoder(self):
+        if self._encoder is None:
+            if self._encoder_error is not None:
+                raise RuntimeError(f"Sentence encoder unavailable: {self._encoder_error}")
+            try:
+                from api.services.model_registry import get_model_registry
+                self._encoder = get_model_registry().get_sentence_transformer(self.model_name)
+            except Exception as e:
+                self._encoder_error = e
+                raise RuntimeError(f"Sentence encoder unavailable: {e}") from e
+        return self._encoder
+
+    def get_stats(self) -> Dict[str, int]:
+        """Encoder usage for this pair (for logging / result metadata)."""
+        return {
+            "encode_calls": self.encode_calls,
+            "encoded_texts": self.encoded_texts,
+            "cache_hits": self.cache_hits,
+            "cached_embeddings": len(self._embeddings),
+        }
@@ -0,0 +1,223 @@
+"""
+Evaluation Executor
+====================
+Bounded worker pool that keeps CPU-bound evaluation work off the asyncio
+event loop.
+
+Problem
+-------
+``evaluate_answer``, ``evaluate_text_directly``, ``evaluate_multi_question``
+and ``upload_files`` are ``async def`` but ran OCR, MiniLM, spaCy and the
+Hungarian alignment synchronously inside the coroutine.  One evaluation
+froze the whole uvicorn worker — ``/health``, auth and dashboards all
+waited behind it.
+
+Solution
+--------
+Routes hand the synchronous pipeline to ``run_evaluation_task``, which runs
+it on a shared pool and awaits the result:
+
+*   ``EVALUATION_EXECUTOR`` — ``"thread"`` (default) or ``"process"``.
+    Process mode needs picklable callables / arguments and loads models
+    once per worker process.
+*   ``EVALUATION_MAX_CONCURRENCY`` — evaluations running at once.
+*   ``EVALUATION_QUEUE_SIZE`` — evaluations allowed to wait for a free
+    worker.  Beyond that the request is rejected with ``429 Too Many
+    Requests`` (``Retry-After`` set) instead of piling up.
+
+Background work (batch grading) uses ``run_blocking``: it counts against
+the same cap but waits for an idle worker instead of being rejected, and
+never takes a queue slot an interactive request could use.
+
+``get_stats()`` reports running / queued counts and rejections; it is
+exposed on ``/health`` and ``/api/info``.
+
+Usage:
+    result = await run_evaluation_task(_evaluate_text_sync, request)
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("AssessIQ.Executor")
+
+
+class ExecutorSaturated(Exception):
+    """All workers are busy and the wait queue is full."""
+
+    def __init__(self, running: int, queued: int):
+        super().__init__(f"Evaluation pool saturated ({running} running, {queued} queued)")
+        self.running = running
+        self.queued = queued
+
+
+class EvaluationExecutor:
+    """
+    Admission-controlled wrapper around a thread or process pool.
+
+    At most ``max_workers + queue_size`` tasks are accepted at once; the
+    pool itself runs ``max_workers`` of them and the rest wait in its
+    internal queue.
+    """
+
+    def __init__(self, max_workers: int = 2, queue_size: int = 8, mode: str = "thread"):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown executor mode: {mode!r} (expected 'thread' or 'process')")
+        self.max_workers = max(1, max_workers)
+        self.queue_size = max(0, queue_size)
+        self.mode = mode
+
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._worker_free = threading.Condition(self._lock)
+        self._in_flight = 0
+
+        # Bookkeeping
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    # ─── Submission ──────────────────────────────────────────────────
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.queue_size
+
+    @property
+    def running(self) -> int:
+        return min(self._in_flight, self.max_workers)
+
+    @property
+    def queued(self) -> int:
+        return max(0, self._in_flight - self.max_workers)
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` on the pool and await its result.
+
+        Raises:
+            ExecutorSaturated: when ``capacity`` tasks are already in flight
+        """
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.rejected += 1
+                raise ExecutorSaturated(self.running, self.queued)
+            self._in_flight += 1
+        try:
+            future = self._get_executor().submit(fn, *args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        # Release the slot when the work finishes, not when the caller stops
+        # waiting — a disconnected client does not stop a running evaluation
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def run_blocking(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` on the pool from a background thread.
+
+        Blocks until fewer than ``max_workers`` tasks are in flight, then
+        until *fn* returns; exceptions raised by *fn* propagate.
+        """
+        with self._worker_free:
+            while self._in_flight >= self.max_workers:
+                self._worker_free.wait()
+            self._in_flight += 1
+        try:
+            future = self._get_executor().submit(fn, *args, **kwargs)
+        except BaseException:
+            with self._worker_free:
+                self._in_flight -= 1
+                self._worker_free.notify()
+            raise
+        future.add_done_callback(self._on_done)
+        return future.result()
+
+    def _on_done(self, future) -> None:
+        with self._worker_free:
+            self._in_flight -= 1
+            self._worker_free.notify()
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.mode == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers, thread_name_prefix="evaluation",
+                        )
+                    logger.info(
+                        f"Evaluation pool started: {self.mode} x{self.max_workers}, "
+                        f"queue {self.queue_size}"
+                    )
+        return self._executor
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "queue_size": self.queue_size,
+            "running": self.running,
+            "queued": self.queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+
+# ─── Process-wide singleton ──────────────────────────────────────────
+
+_executor: Optional[EvaluationExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_evaluation_executor() -> EvaluationExecutor:
+    """Shared executor configured from settings."""
+    global _executor
+    from config.settings import settings
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = EvaluationExecutor(
+                    max_workers=settings.EVALUATION_MAX_CONCURRENCY,
+                    queue_size=settings.EVALUATION_QUEUE_SIZE,
+                    mode=settings.EVALUATION_EXECUTOR,
+                )
+    return _executor
+
+
+async def run_evaluation_task(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Route helper: run *fn* on the shared pool, mapping saturation to 429.
+
+    ``HTTPException`` raised inside *fn* propagates unchanged.
+    """
+    from fastapi import HTTPException
+    from config.settings import settings
+
+    try:
+        return await get_evaluation_executor().run(fn, *args, **kwargs)
+    except ExecutorSaturated as e:
+        logger.warning(f"Rejecting evaluation: {e}")
+        raise HTTPException(
+            status_code=429,
+            detail="Server is busy grading other answers. Please retry shortly.",
+            headers={"Retry-After": str(settings.EVALUATION_RETRY_AFTER_SECONDS)},
+        )
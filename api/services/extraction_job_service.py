@@ -0,0 +1,282 @@
+"""
+Extraction Job Service
+=======================
+Background OCR for uploads, with persisted job state.
+
+Problem
+-------
+``upload_files`` OCRed both files before responding, which could take
+minutes for a multi-page PDF and held the HTTP request open the whole time.
+If pre-extraction failed or was skipped, ``/evaluate/multi`` failed with
+"Cached text not found".
+
+Solution
+--------
+``upload_files`` saves the files and submits an ``ExtractionJob``; it returns
+at once with the job id (the evaluation id).  The job runs
+``upload_extraction_task._extract_and_cache_text`` on a small worker pool
+(``EXTRACTION_WORKERS``) and moves through ``queued → running → done``
+(or ``failed``).  Each transition and progress update is written to
+``<eval_dir>/.cache/extraction_job.json``, so status survives across API
+workers and restarts.
+
+Consumers:
+  • ``GET /upload/{id}/status`` — current job state
+  • ``GET /upload/{id}/events`` — server-sent-events progress stream
+  • ``/evaluate`` — ``wait()`` / ``wait_async()`` join the job instead of
+    failing when the cache is not there yet
+
+Live jobs refresh a heartbeat in their state file.  A ``queued`` /
+``running`` job whose heartbeat stopped was interrupted by a restart and is
+reported as ``failed``; evaluation then falls back to extracting inline.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("AssessIQ.ExtractionJobs")
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+TERMINAL_STATES = (DONE, FAILED)
+
+STATE_FILENAME = "extraction_job.json"
+
+# Live jobs re-persist at least this often; a queued / running job whose
+# state has not been touched for STALE_AFTER_SECONDS lost its process
+HEARTBEAT_SECONDS = 10.0
+STALE_AFTER_SECONDS = 3 * HEARTBEAT_SECONDS
+
+
+@dataclass
+class ExtractionJob:
+    """State of one upload's background text extraction."""
+    job_id: str
+    eval_dir: str
+    ocr_engine: str = "easyocr"
+    status: str = QUEUED
+    stage: Optional[str] = None
+    progress: float = 0.0
+    message: str = "Waiting for a worker"
+    error: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    heartbeat_at: float = field(default_factory=time.time)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in TERMINAL_STATES
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("eval_dir", None)
+        return data
+
+
+def state_path(eval_dir: str) -> str:
+    return os.path.join(eval_dir, ".cache", STATE_FILENAME)
+
+
+class ExtractionJobService:
+    """Runs extraction jobs on a bounded pool and tracks their state."""
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max(1, max_workers)
+        self._jobs: Dict[str, ExtractionJob] = {}
+        self._events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._heartbeat: Optional[threading.Thread] = None
+
+    # ─── Submission ──────────────────────────────────────────────────
+
+    def submit(
+        self,
+        job_id: str,
+        eval_dir: str,
+        task: Callable[..., None],
+        task_kwargs: Dict[str, Any],
+        ocr_engine: str = "easyocr",
+    ) -> ExtractionJob:
+        """
+        Queue ``task(progress=callback, **task_kwargs)`` as job *job_id*.
+
+        ``callback(stage, fraction, message)`` updates the persisted state;
+        an exception raised by *task* marks the job ``failed``.
+        """
+        job = ExtractionJob(job_id=job_id, eval_dir=eval_dir, ocr_engine=ocr_engine)
+        with self._lock:
+            self._jobs[job_id] = job
+            self._events[job_id] = threading.Event()
+        self._persist(job)
+        self._get_executor().submit(self._run, job, task, task_kwargs)
+        self._ensure_heartbeat()
+        return job
+
+    def _ensure_heartbeat(self) -> None:
+        with self._lock:
+            if self._heartbeat is not None:
+                return
+            self._heartbeat = threading.Thread(
+                target=self._heartbeat_loop, name="extraction-heartbeat", daemon=True,
+            )
+            self._heartbeat.start()
+
+    def _heartbeat_loop(self) -> None:
+        """Re-persist live jobs so other workers can tell them from orphans."""
+        while True:
+            time.sleep(HEARTBEAT_SECONDS)
+            with self._lock:
+                live = list(self._jobs.values())
+                if not live:
+                    self._heartbeat = None
+                    return
+            for job in live:
+                self._update(job)
+
+    def _run(self, job: ExtractionJob, task: Callable[..., None], task_kwargs: Dict[str, Any]) -> None:
+        start = time.time()
+        self._update(job, status=RUNNING, started_at=datetime.now().isoformat(), message="Extracting text")
+
+        def progress(stage: str, fraction: float, message: str = "") -> None:
+            self._update(job, stage=stage, progress=round(min(max(fraction, 0.0), 1.0), 3), message=message)
+
+        try:
+            task(progress=progress, **task_kwargs)
+        except Exception as e:
+            logger.error(f"[EXTRACT {job.job_id}] Failed: {e}")
+            self._update(
+                job, status=FAILED, error=str(e)[:500], message="Extraction failed",
+                finished_at=datetime.now().isoformat(),
+            )
+        else:
+            self._update(
+                job, status=DONE, progress=1.0, stage=None, message="Text extracted",
+                finished_at=datetime.now().isoformat(),
+            )
+            logger.info(f"[EXTRACT {job.job_id}] Done in {time.time() - start:.1f}s")
+        finally:
+            # The persisted state is authoritative from here on
+            with self._lock:
+                self._jobs.pop(job.job_id, None)
+                event = self._events.pop(job.job_id, None)
+            if event is not None:
+                event.set()
+
+    def _update(self, job: ExtractionJob, **changes) -> None:
+        with self._lock:
+            for key, value in changes.items():
+                setattr(job, key, value)
+            job.heartbeat_at = time.time()
+        self._persist(job)
+
+    def _persist(self, job: ExtractionJob) -> None:
+        path = state_path(job.eval_dir)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with self._lock:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(asdict(job), f, indent=2)
+                os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"[EXTRACT {job.job_id}] Could not persist job state: {e}")
+
+    # ─── Lookup / join ───────────────────────────────────────────────
+
+    def get_job(self, job_id: str, eval_dir: str) -> Optional[ExtractionJob]:
+        """Live job, or the persisted state (interrupted jobs reported as failed)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        path = state_path(eval_dir)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                job = ExtractionJob(**json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"[EXTRACT {job_id}] Unreadable job state: {e}")
+            return None
+        if not job.is_finished and time.time() - job.heartbeat_at > STALE_AFTER_SECONDS:
+            job.status = FAILED
+            job.error = job.error or "Extraction was interrupted (server restarted)"
+        return job
+
+    def wait(
+        self, job_id: str, eval_dir: str, timeout: float, poll_interval: float = 0.25,
+    ) -> Optional[ExtractionJob]:
+        """
+        Block until the job finishes (or *timeout* seconds pass); ``None`` if there is no job.
+
+        A job of this process is joined on its event; a job running in
+        another worker is followed through its state file.
+        """
+        deadline = time.monotonic() + timeout
+        job = self.get_job(job_id, eval_dir)
+        while job is not None and not job.is_finished:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            event = self._events.get(job_id)
+            if event is not None:
+                event.wait(remaining)
+            else:
+                time.sleep(min(poll_interval, remaining))
+            job = self.get_job(job_id, eval_dir)
+        return job
+
+    async def wait_async(
+        self, job_id: str, eval_dir: str, timeout: float, poll_interval: float = 0.25,
+    ) -> Optional[ExtractionJob]:
+        """``wait()`` for coroutines: polls without blocking the event loop."""
+        deadline = time.monotonic() + timeout
+        job = self.get_job(job_id, eval_dir)
+        while job is not None and not job.is_finished and time.monotonic() < deadline:
+            await asyncio.sleep(poll_interval)
+            job = self.get_job(job_id, eval_dir)
+        return job
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="extraction",
+                    )
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# ─── Process-wide singleton ──────────────────────────────────────────
+
+_service: Optional[ExtractionJobService] = None
+_service_lock = threading.Lock()
+
+
+def get_extraction_job_service() -> ExtractionJobService:
+    """Shared service configured from settings."""
+    global _service
+    from config.settings import settings
+
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = ExtractionJobService(max_workers=settings.EXTRACTION_WORKERS)
+    return _service
@@ -31,6 +31,15 @@ from config.settings import settings
 logger = logging.getLogger("AssessIQ.Storage")
 
 
+def calculate_checksum(file_path: str) -> str:
+    """SHA-256 checksum of a file (also the content address used by the OCR cache)."""
+    sha256_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for byte_block in iter(lambda: f.read(65536), b""):
+            sha256_hash.update(byte_block)
+    return sha256_hash.hexdigest()
+
+
 class FileStorageService:
     """
     File Storage Service
@@ -85,11 +94,7 @@ class FileStorageService:
     
     def _calculate_checksum(self, file_path: str) -> str:
         """Calculate SHA-256 checksum of a file."""
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+        return calculate_checksum(file_path)
     
     def _get_mime_type(self, extension: str) -> str:
         """Get MIME type from file extension."""
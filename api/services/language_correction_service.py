@@ -11,7 +11,7 @@ Pipeline (each layer builds on the previous):
       - Punctuation & capitalisation normalisation
 
   Layer 2: Contextual Spell Correction  (~30% remaining error fix)
-      - Edit-distance candidate generation (Norvig algorithm)
+      - Edit-distance ≤ 2 candidates from a symmetric-delete (SymSpell) index
       - Bigram context scoring for candidate ranking
       - NLTK 234k-word dictionary for validation
       - Frequency-weighted selection
@@ -19,7 +19,8 @@ Pipeline (each layer builds on the previous):
   Layer 3: Transformer Grammar Correction  (~15% remaining error fix)
       - T5-small grammar correction model
       - Handles grammar, punctuation, tense, articles
-      - Runs in batches per-sentence for quality
+      - Runs per-sentence for quality, in length-bucketed batches
+      - Sentence cache, optional int8 quantisation, per-document time budget
       - Auto-downloads on first use (~250MB, one-time)
 
   Layer 4: API-Based Correction (optional)  (~5% remaining error fix)
@@ -37,9 +38,10 @@ Example:
 import re
 import os
 import logging
+import threading
 import time
 from typing import Optional, List, Dict, Tuple
-from collections import Counter
+from collections import Counter, OrderedDict
 
 logger = logging.getLogger("AssessIQ.LanguageCorrection")
 
@@ -345,13 +347,13 @@ class OCRPatternCorrector:
 
 
 # ═══════════════════════════════════════════════════════════════════════
-# Layer 2: Contextual Spell Corrector (Norvig + Bigram)
+# Layer 2: Contextual Spell Corrector (SymSpell + Bigram)
 # ═══════════════════════════════════════════════════════════════════════
 
 class ContextualSpellCorrector:
     """
     Advanced spell correction using:
-      1. Edit-distance candidate generation (Norvig's algorithm)
+      1. Candidates up to edit distance 2 from a symmetric-delete index
       2. Unigram word frequency for candidate ranking
       3. Bigram context scoring (left + right word)
       4. Dictionary validation via NLTK 234k-word corpus
@@ -364,51 +366,26 @@ class ContextualSpellCorrector:
     CONTEXT_WEIGHT = 0.6
     FREQUENCY_WEIGHT = 0.4
 
-    def __init__(self, dictionary: set = None):
-        self._dictionary = dictionary or set()
-        self._word_freq: Counter = Counter()
+    # Corrections remembered per (word, left, right) context
+    MEMO_SIZE = 4096
+
+    def __init__(self, dictionary=None):
+        from api.services.lexicon import COMMON_WORD_FREQUENCIES, Lexicon
+
+        # Word frequencies live in the (shared) lexicon; a plain set is
+        # wrapped with the same base frequencies
+        if not isinstance(dictionary, Lexicon):
+            dictionary = Lexicon.from_words(dictionary or (), COMMON_WORD_FREQUENCIES)
+        self._dictionary = dictionary
+        self._index = None  # DeletionIndex, built / opened on first use
+        self._memo: "OrderedDict[Tuple[str, Optional[str], Optional[str]], str]" = OrderedDict()
+        self._memo_lock = threading.Lock()
         self._bigram_freq: Counter = Counter()
-        self._total_words = 0
         self._total_bigrams = 0
         self._build_frequency_model()
 
     def _build_frequency_model(self):
-        """Build word and bigram frequency models from dictionary."""
-        # Use a base frequency model from common English words
-        # Top 5000 English words by frequency (condensed set)
-        common_words = {
-            'the': 69971, 'of': 36411, 'and': 28852, 'to': 26149, 'a': 23237,
-            'in': 21341, 'is': 16817, 'it': 12458, 'that': 12287, 'was': 11123,
-            'for': 9489, 'on': 8596, 'are': 7825, 'with': 7012, 'as': 6996,
-            'be': 6745, 'at': 5987, 'this': 5913, 'have': 5535, 'from': 5267,
-            'or': 5073, 'an': 4843, 'by': 4796, 'not': 4658, 'but': 4589,
-            'what': 3856, 'all': 3810, 'were': 3654, 'when': 3540, 'we': 3503,
-            'there': 3427, 'can': 3383, 'been': 3322, 'has': 3283, 'more': 3150,
-            'if': 3017, 'will': 2976, 'one': 2948, 'do': 2918, 'their': 2835,
-            'would': 2775, 'they': 2723, 'which': 2707, 'about': 2625, 'up': 2609,
-            'out': 2531, 'so': 2410, 'them': 2392, 'he': 2379, 'she': 2211,
-            'many': 2183, 'some': 2121, 'time': 2043, 'very': 2001, 'could': 1978,
-            'no': 1944, 'make': 1891, 'like': 1857, 'just': 1846, 'over': 1789,
-            'such': 1745, 'also': 1720, 'new': 1685, 'most': 1654, 'how': 1612,
-            'after': 1532, 'only': 1521, 'other': 1509, 'into': 1498, 'its': 1453,
-            'than': 1421, 'first': 1389, 'may': 1367, 'between': 1287, 'should': 1269,
-            'each': 1247, 'made': 1234, 'people': 1221, 'where': 1219, 'way': 1189,
-            'system': 1125, 'computer': 1087, 'software': 1043, 'operating': 998,
-            'process': 955, 'data': 933, 'program': 911, 'management': 889,
-            'information': 856, 'technology': 834, 'network': 812, 'memory': 790,
-            'function': 768, 'algorithm': 745, 'structure': 723, 'hardware': 701,
-            'application': 679, 'database': 657, 'machine': 645, 'learning': 634,
-            'student': 621, 'education': 609, 'knowledge': 597, 'answer': 585,
-            'question': 573, 'evaluation': 561, 'important': 549, 'different': 537,
-        }
-
-        self._word_freq = Counter(common_words)
-        # Also give every dictionary word a base frequency
-        for w in self._dictionary:
-            if w not in self._word_freq:
-                self._word_freq[w] = 1
-        self._total_words = sum(self._word_freq.values())
-
+        """Build the bigram context model (unigram frequencies come from the lexicon)."""
         # Build bigram frequencies from common pairs
         common_bigrams = [
             ('operating', 'system'), ('machine', 'learning'), ('data', 'structure'),
@@ -468,7 +445,22 @@ class ContextualSpellCorrector:
         return ''.join(tokens)
 
     def _best_correction(self, word: str, left: str = None, right: str = None) -> str:
-        """Find the best correction using log-frequency + context scoring."""
+        """Find the best correction using log-frequency + context scoring (memoised)."""
+        key = (word, left, right)
+        with self._memo_lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+
+        best_word = self._score_candidates(word, left, right)
+
+        with self._memo_lock:
+            self._memo[key] = best_word
+            if len(self._memo) > self.MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return best_word
+
+    def _score_candidates(self, word: str, left: str = None, right: str = None) -> str:
         import math
         candidates = self._candidates(word)
         if not candidates:
@@ -477,9 +469,9 @@ class ContextualSpellCorrector:
         best_word = word
         best_score = -1.0
 
-        for candidate in candidates:
+        for candidate, dist in candidates.items():
             # Log-frequency score (avoids tiny numbers from linear normalisation)
-            raw_freq = self._word_freq.get(candidate, 0)
+            raw_freq = self._dictionary.frequency(candidate)
             freq_score = math.log1p(raw_freq) / 12.0   # log(70000)≈11.2 → max ~0.93
 
             # Bigram context score
@@ -503,7 +495,6 @@ class ContextualSpellCorrector:
                 score += 0.001
 
             # Penalty: edit distance (prefer closer corrections)
-            dist = self._edit_distance(word, candidate)
             score -= dist * 0.005
 
             if score > best_score:
@@ -512,61 +503,36 @@ class ContextualSpellCorrector:
 
         return best_word
 
-    def _candidates(self, word: str) -> set:
-        """Generate candidate corrections (edit distance 1 and 2)."""
+    def _candidates(self, word: str) -> Dict[str, int]:
+        """Candidate corrections (edit distance 1, else 2) with their distance."""
         word = word.lower()
         # Priority: known word > edit-1 known words > edit-2 known words > original
-        known = {word} & self._dictionary
-        if known:
-            return known
+        if word in self._dictionary:
+            return {word: 0}
 
-        edits1 = self._edits1(word)
-        known1 = edits1 & self._dictionary
+        found = self._deletion_index.lookup(word, max_distance=2)
+        known1 = {w: d for w, d in found.items() if d <= 1}
         if known1:
             return known1
-
-        # Edit distance 2 (computationally heavier, but catches more)
-        edits2 = set()
-        for e1 in edits1:
-            edits2 |= self._edits1(e1)
-        known2 = edits2 & self._dictionary
-        if known2:
+        if found:
             # Limit to top candidates by frequency to avoid explosion
-            if len(known2) > 15:
-                known2 = set(sorted(known2,
-                    key=lambda w: self._word_freq.get(w, 0), reverse=True)[:15])
-            return known2
-
-        return {word}
+            if len(found) > 15:
+                top = sorted(found, key=self._dictionary.frequency, reverse=True)[:15]
+                found = {w: found[w] for w in top}
+            return found
 
-    @staticmethod
-    def _edits1(word: str) -> set:
-        """All words that are 1 edit distance away from `word`."""
-        letters = 'abcdefghijklmnopqrstuvwxyz'
-        splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
-        deletes = [L + R[1:] for L, R in splits if R]
-        transposes = [L + R[1] + R[0] + R[2:] for L, R in splits if len(R) > 1]
-        replaces = [L + c + R[1:] for L, R in splits if R for c in letters]
-        inserts = [L + c + R for L, R in splits for c in letters]
-        return set(deletes + transposes + replaces + inserts)
+        return {word: 0}
 
-    @staticmethod
-    def _edit_distance(s1: str, s2: str) -> int:
-        """Compute Levenshtein edit distance."""
-        if len(s1) < len(s2):
-            return ContextualSpellCorrector._edit_distance(s2, s1)
-        if len(s2) == 0:
-            return len(s1)
-        prev_row = range(len(s2) + 1)
-        for i, c1 in enumerate(s1):
-            curr_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                insertions = prev_row[j + 1] + 1
-                deletions = curr_row[j] + 1
-                substitutions = prev_row[j] + (c1 != c2)
-                curr_row.append(min(insertions, deletions, substitutions))
-            prev_row = curr_row
-        return prev_row[-1]
+    @property
+    def _deletion_index(self):
+        """Symmetric-delete index over the dictionary (shared one for the shared lexicon)."""
+        if self._index is None:
+            from api.services.lexicon import DeletionIndex, get_deletion_index, get_lexicon
+            if self._dictionary is get_lexicon():
+                self._index = get_deletion_index()
+            else:
+                self._index = DeletionIndex.build(self._dictionary)
+        return self._index
 
     @staticmethod
     def _apply_case(original: str, corrected: str) -> str:
@@ -582,6 +548,89 @@ class ContextualSpellCorrector:
 # Layer 3: Transformer Grammar Corrector (T5-based)
 # ═══════════════════════════════════════════════════════════════════════
 
+class GrammarCache:
+    """
+    Sentence → corrected sentence, shared by every grammar corrector.
+
+    An in-process LRU in front of an optional on-disk tier (the same
+    size-bounded JSON store as the OCR result cache).  Keys include the
+    model and its quantisation, so switching either never serves stale
+    corrections.
+    """
+
+    def __init__(self, max_entries: int = 4096, directory: Optional[str] = None,
+                 max_disk_bytes: int = 64 * 1024 * 1024):
+        from api.services.ocr_cache import OCRCache
+
+        self.max_entries = max(0, max_entries)
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = OCRCache(directory, max_disk_bytes) if directory else None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model_id: str, sentence: str) -> str:
+        import hashlib
+        return hashlib.sha256(f"{model_id}\x00{sentence}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+        record = self._disk.get(key) if self._disk else None
+        if record is not None and isinstance(record.get("text"), str):
+            self._remember(key, record["text"])
+            with self._lock:
+                self.hits += 1
+            return record["text"]
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, corrected: str) -> None:
+        self._remember(key, corrected)
+        if self._disk:
+            self._disk.put(key, {"text": corrected})
+
+    def _remember(self, key: str, corrected: str) -> None:
+        with self._lock:
+            self._memory[key] = corrected
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk": self._disk.get_stats() if self._disk else None,
+            }
+
+
+_grammar_cache: Optional[GrammarCache] = None
+_grammar_cache_lock = threading.Lock()
+
+
+def get_grammar_cache() -> GrammarCache:
+    """Process-wide sentence cache configured from settings."""
+    global _grammar_cache
+    if _grammar_cache is None:
+        with _grammar_cache_lock:
+            if _grammar_cache is None:
+                from config.settings import settings
+                _grammar_cache = GrammarCache(
+                    max_entries=getattr(settings, "GRAMMAR_CACHE_SIZE", 4096),
+                    directory=getattr(settings, "GRAMMAR_CACHE_DIR", None),
+                )
+    return _grammar_cache
+
+
 class TransformerGrammarCorrector:
     """
     Grammar correction using a fine-tuned T5 transformer model.
@@ -594,7 +643,12 @@ class TransformerGrammarCorrector:
       - Capitalisation
     
     The model auto-downloads on first use (~900MB for t5-base, one-time).
-    Runs on CPU (~0.5-2s per sentence depending on length).
+    Runs on CPU (~0.5-2s per sentence depending on length), so:
+      - sentences are generated in batches of similar length (little padding)
+      - corrections are cached per sentence (memory LRU + disk)
+      - the Linear layers can be int8 dynamic-quantised (GRAMMAR_QUANTIZE_INT8)
+      - each document gets a time budget (GRAMMAR_TIME_BUDGET); sentences
+        not reached within it are left uncorrected instead of blocking
     
     Falls back gracefully if torch or transformers are unavailable.
     """
@@ -606,13 +660,22 @@ class TransformerGrammarCorrector:
         "Grammarly/coedit-large",                    # Grammarly's model
     ]
 
-    def __init__(self, model_name: str = None, max_length: int = 256):
+    NUM_BEAMS = 4
+
+    def __init__(self, model_name: str = None, max_length: int = 256,
+                 quantize: bool = None, batch_size: int = None, time_budget: float = None):
+        from config.settings import settings
+
         self._model = None
         self._tokenizer = None
         self._available = False
         self._model_name = model_name or self._MODEL_OPTIONS[0]
         self._max_length = max_length
         self._device = "cpu"
+        self._quantize = getattr(settings, "GRAMMAR_QUANTIZE_INT8", False) if quantize is None else quantize
+        self._batch_size = max(1, batch_size or getattr(settings, "GRAMMAR_BATCH_SIZE", 8))
+        self._time_budget = getattr(settings, "GRAMMAR_TIME_BUDGET", 0) if time_budget is None else time_budget
+        self._cache = get_grammar_cache()
         self._load_model()
 
     def _load_model(self):
@@ -620,21 +683,30 @@ class TransformerGrammarCorrector:
         try:
             from transformers import T5ForConditionalGeneration, T5TokenizerFast
             import torch
+            from api.services.model_registry import get_model_registry
 
-            logger.info(f"Loading grammar correction model: {self._model_name}")
-            start = time.time()
+            registry = get_model_registry()
+            max_length = self._max_length
+            quantize = self._quantize
 
-            # Try each model option until one works
+            # Try each model option until one works (shared per process via the registry)
             for model_name in ([self._model_name] + self._MODEL_OPTIONS):
+                def _load(name=model_name):
+                    tokenizer = T5TokenizerFast.from_pretrained(
+                        name, model_max_length=max_length)
+                    model = T5ForConditionalGeneration.from_pretrained(name)
+                    model.eval()
+                    if quantize:
+                        # int8 weights for the Linear layers: ~4x smaller, ~2x faster on CPU
+                        model = torch.quantization.quantize_dynamic(
+                            model, {torch.nn.Linear}, dtype=torch.qint8)
+                    return tokenizer, model
+
                 try:
-                    self._tokenizer = T5TokenizerFast.from_pretrained(
-                        model_name, model_max_length=self._max_length)
-                    self._model = T5ForConditionalGeneration.from_pretrained(model_name)
-                    self._model.eval()
+                    self._tokenizer, self._model = registry.get_or_load(
+                        "t5_grammar", f"{model_name}@{max_length}{'+int8' if quantize else ''}", _load)
                     self._model_name = model_name
                     self._available = True
-                    elapsed = time.time() - start
-                    logger.info(f"Grammar model loaded: {model_name} ({elapsed:.1f}s)")
                     return
                 except Exception as e:
                     logger.debug(f"Model {model_name} unavailable: {e}")
@@ -651,65 +723,117 @@ class TransformerGrammarCorrector:
     def is_available(self) -> bool:
         return self._available
 
-    def correct(self, text: str) -> str:
+    @property
+    def _model_id(self) -> str:
+        return f"{self._model_name}@{self._max_length}{'+int8' if self._quantize else ''}/b{self.NUM_BEAMS}"
+
+    def correct(self, text: str, time_budget: float = None) -> str:
         """
         Correct grammar in text using T5 model.
         
         Processes sentence-by-sentence for better quality
-        (T5 performs better on individual sentences than long paragraphs).
+        (T5 performs better on individual sentences than long paragraphs);
+        uncached sentences are generated in length-sorted batches.
+        *time_budget* (seconds, default GRAMMAR_TIME_BUDGET, 0 = none) caps
+        the whole document.
         """
+        return self.correct_within_budget(text, time_budget)[0]
+
+    def correct_within_budget(self, text: str, time_budget: float = None) -> Tuple[str, bool]:
+        """``correct()``, plus whether every sentence was corrected (``False`` when the budget ran out)."""
         if not self._available or not text or not text.strip():
-            return text
+            return text, True
 
         try:
-            import torch
+            budget = self._time_budget if time_budget is None else time_budget
+            deadline = time.monotonic() + budget if budget and budget > 0 else None
 
             # Split into sentences for better quality
             sentences = self._split_sentences(text)
-            corrected_parts = []
+            corrected_parts = list(sentences)
+            pending: Dict[str, List[int]] = {}
 
-            for sentence in sentences:
+            for i, sentence in enumerate(sentences):
                 stripped = sentence.strip()
                 if not stripped or len(stripped) < 3:
-                    corrected_parts.append(sentence)
                     continue
-
-                # T5 grammar correction prompt
-                if "coedit" in self._model_name.lower():
-                    input_text = f"Fix grammatical errors in this sentence: {stripped}"
+                cached = self._cache.get(self._cache.key(self._model_id, stripped))
+                if cached is not None:
+                    corrected_parts[i] = cached
                 else:
-                    input_text = f"grammar: {stripped}"
+                    pending.setdefault(stripped, []).append(i)
 
-                input_ids = self._tokenizer(
-                    input_text, return_tensors="pt",
-                    max_length=self._max_length, truncation=True,
-                    padding=True
-                ).input_ids
+            complete = True
+            if pending:
+                generated = self._generate(list(pending), deadline)
+                complete = len(generated) == len(pending)
+                for stripped, corrected in generated.items():
+                    for i in pending[stripped]:
+                        corrected_parts[i] = corrected
 
-                with torch.no_grad():
-                    outputs = self._model.generate(
-                        input_ids,
-                        max_length=self._max_length,
-                        num_beams=4,
-                        early_stopping=True,
-                        no_repeat_ngram_size=3,
-                    )
+            return ' '.join(corrected_parts), complete
 
-                corrected = self._tokenizer.decode(outputs[0], skip_special_tokens=True)
+        except Exception as e:
+            logger.warning(f"Transformer correction failed: {e}")
+            return text, True
+
+    def _generate(self, sentences: List[str], deadline: Optional[float]) -> Dict[str, str]:
+        """Correct *sentences* in length-bucketed batches until *deadline*."""
+        import torch
+
+        ordered = sorted(sentences, key=len)  # similar lengths share a batch
+        results: Dict[str, str] = {}
+        for start in range(0, len(ordered), self._batch_size):
+            batch = ordered[start:start + self._batch_size]
+            generate_kwargs = dict(
+                max_length=self._max_length,
+                num_beams=self.NUM_BEAMS,
+                early_stopping=True,
+                no_repeat_ngram_size=3,
+            )
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._log_budget_exhausted(len(ordered) - start, len(ordered))
+                    break
+                generate_kwargs["max_time"] = remaining
+
+            # T5 grammar correction prompt
+            if "coedit" in self._model_name.lower():
+                inputs = [f"Fix grammatical errors in this sentence: {s}" for s in batch]
+            else:
+                inputs = [f"grammar: {s}" for s in batch]
 
+            encoded = self._tokenizer(
+                inputs, return_tensors="pt",
+                max_length=self._max_length, truncation=True,
+                padding=True
+            )
+            with torch.no_grad():
+                outputs = self._model.generate(
+                    input_ids=encoded.input_ids,
+                    attention_mask=encoded.attention_mask,
+                    **generate_kwargs,
+                )
+
+            if deadline is not None and time.monotonic() >= deadline:
+                # Generation was cut off by max_time — outputs may be truncated
+                self._log_budget_exhausted(len(ordered) - start, len(ordered))
+                break
+
+            for stripped, corrected in zip(batch, self._tokenizer.batch_decode(outputs, skip_special_tokens=True)):
                 # Sanity check: if model output is drastically different or empty, keep original
                 if (not corrected.strip()
                         or len(corrected) < len(stripped) * 0.3
                         or len(corrected) > len(stripped) * 3.0):
-                    corrected_parts.append(sentence)
-                else:
-                    corrected_parts.append(corrected)
-
-            return ' '.join(corrected_parts)
+                    corrected = stripped
+                results[stripped] = corrected
+                self._cache.put(self._cache.key(self._model_id, stripped), corrected)
+        return results
 
-        except Exception as e:
-            logger.warning(f"Transformer correction failed: {e}")
-            return text
+    @staticmethod
+    def _log_budget_exhausted(skipped: int, total: int) -> None:
+        logger.info(f"Grammar correction time budget reached: {skipped}/{total} sentence(s) left uncorrected")
 
     @staticmethod
     def _split_sentences(text: str) -> List[str]:
@@ -940,146 +1064,17 @@ class OCRLanguageCorrector:
 
         logger.info(f"Language Corrector ready ({elapsed:.1f}s) — layers: {', '.join(layers)}")
 
-    def _load_dictionary(self) -> set:
+    def _load_dictionary(self):
         """
-        Load NLTK English dictionary + generate inflected forms.
-
-        The raw NLTK ``words`` corpus contains ~234 k base forms but is
-        missing plurals, past tenses, gerunds, etc.  We expand it with
-        common morphological suffixes so that words like *structures*,
-        *algorithms*, *interconnected*, *answered*, and *manages* are
-        recognised by the char-confusion and spell-correction layers.
-
-        We also inject a curated set of technical / computing terms that
-        are absent from the corpus, and **remove** a small set of rare
-        real-English words (``lo``, ``lhe``, …) that are almost always
-        OCR artefacts in practice.
-        """
-        try:
-            import nltk
-            try:
-                from nltk.corpus import words as nltk_words
-                base = set(w.lower() for w in nltk_words.words() if len(w) >= 2)
-            except LookupError:
-                nltk.download('words', quiet=True)
-                from nltk.corpus import words as nltk_words
-                base = set(w.lower() for w in nltk_words.words() if len(w) >= 2)
-
-            # Single-letter words that must be in the dictionary
-            base.update({'a', 'i', 'o'})
-
-            # ── Generate common inflected forms ──────────────────────
-            expanded = set(base)
-            for word in base:
-                if len(word) < 3:
-                    continue
-
-                # — Plurals / 3rd-person singular present ─────────
-                if word.endswith(('s', 'sh', 'ch', 'x', 'z')):
-                    expanded.add(word + 'es')
-                elif word.endswith('y') and len(word) > 2 and word[-2] not in 'aeiou':
-                    expanded.add(word[:-1] + 'ies')   # study → studies
-                else:
-                    expanded.add(word + 's')
-
-                # — Past tense / past participle ──────────────────
-                if word.endswith('e'):
-                    expanded.add(word + 'd')           # manage → managed
-                elif (word.endswith('y') and len(word) > 2
-                      and word[-2] not in 'aeiou'):
-                    expanded.add(word[:-1] + 'ied')    # study → studied
-                else:
-                    expanded.add(word + 'ed')           # answer → answered
-                    # Double final consonant for CVC pattern
-                    if (len(word) >= 3
-                            and word[-1] in 'bdfgklmnprstvz'
-                            and word[-2] in 'aeiou'
-                            and word[-3] not in 'aeiou'):
-                        expanded.add(word + word[-1] + 'ed')  # stop → stopped
-
-                # — Present participle / gerund ───────────────────
-                if word.endswith('e') and not word.endswith('ee'):
-                    expanded.add(word[:-1] + 'ing')    # manage → managing
-                elif word.endswith('ie'):
-                    expanded.add(word[:-2] + 'ying')   # die → dying
-                else:
-                    expanded.add(word + 'ing')
-                    if (len(word) >= 3
-                            and word[-1] in 'bdfgklmnprstvz'
-                            and word[-2] in 'aeiou'
-                            and word[-3] not in 'aeiou'):
-                        expanded.add(word + word[-1] + 'ing')  # run → running
-
-                # — Comparative / agent ───────────────────────────
-                expanded.add(word + 'er')
-                expanded.add(word + 'est')
-
-                # — Adverb ────────────────────────────────────────
-                expanded.add(word + 'ly')
-                if word.endswith('le'):
-                    expanded.add(word[:-1] + 'y')      # simple → simply
-                if word.endswith('y'):
-                    expanded.add(word[:-1] + 'ily')    # happy → happily
-
-                # — Negation / noun ───────────────────────────────
-                expanded.add(word + 'ness')
-                expanded.add(word + 'ment')
-
-            # ── Technical / computing terms missing from NLTK ────
-            tech_extras = {
-                'software', 'hardware', 'firmware', 'middleware', 'malware',
-                'algorithms', 'algorithm', 'algorithmic',
-                'interconnected', 'interconnect', 'interconnection',
-                'structured', 'structures', 'unstructured',
-                'database', 'databases', 'dataset', 'datasets',
-                'internet', 'intranet', 'ethernet', 'bluetooth', 'wifi',
-                'website', 'websites', 'webpage', 'webpages',
-                'email', 'emails', 'online', 'offline', 'login', 'logout',
-                'smartphone', 'smartphones', 'laptop', 'laptops',
-                'desktop', 'desktops', 'router', 'routers',
-                'server', 'servers', 'client', 'clients',
-                'frontend', 'backend', 'fullstack', 'devops',
-                'api', 'apis', 'http', 'https', 'html', 'css',
-                'javascript', 'python', 'java', 'typescript',
-                'boolean', 'integer', 'string', 'array',
-                'cpu', 'gpu', 'ram', 'rom', 'ssd', 'hdd',
-                'blockchain', 'cryptocurrency', 'cybersecurity',
-                'efficiently', 'effectiveness', 'efficiently',
-                'organise', 'organises', 'organised', 'organising',
-                'organize', 'organizes', 'organized', 'organizing',
-                'optimise', 'optimised', 'optimize', 'optimized',
-                'analyse', 'analysed', 'analyze', 'analyzed',
-                'programme', 'programmes', 'programmed', 'programming',
-            }
-            expanded.update(tech_extras)
-
-            # ── Remove known OCR false-positives ─────────────────
-            #    These are real English words, but in handwritten-OCR
-            #    context they are almost always artefacts.
-            ocr_false_positives = {
-                'lo',     # almost always "to" (l→t)
-                'lhe',    # almost always "the" (l→t)
-                'lhat',   # "that"
-                'lhis',   # "this"
-                'lhey',   # "they"
-                'lhere',  # "there"
-                'lhen',   # "then"
-                'lhese',  # "these"
-                'lhose',  # "those"
-                'ls',     # "is" (l→i) — uncommon meaning of 'ls'
-            }
-            expanded -= ocr_false_positives
+        The shared English lexicon (see ``lexicon.py``).
 
-            base_count = len(base)
-            logger.info(
-                f"Dictionary loaded: {base_count:,} base → "
-                f"{len(expanded):,} total (inflections + tech terms)"
-            )
-            return expanded
-
-        except Exception as e:
-            logger.warning(f"Dictionary load failed: {e}")
-            return set()
+        NLTK's ~234 k base forms expanded with plurals, tenses, gerunds etc.,
+        plus technical terms missing from the corpus, minus rare real words
+        (``lo``, ``lhe``, …) that are almost always OCR artefacts.  Built
+        once per process — memory-mapped from ``LEXICON_DIR`` when prebuilt.
+        """
+        from api.services.lexicon import get_lexicon
+        return get_lexicon()
 
     def correct(self, text: str, enable_layers: str = "all") -> dict:
         """
@@ -1101,6 +1096,7 @@ class OCRLanguageCorrector:
                 - corrections_made: count of words changed
                 - processing_time: seconds
                 - layer_details: per-layer before/after for debugging
+                - complete: False when the grammar layer's time budget ran out
         """
         if not text or not text.strip():
             return {
@@ -1110,12 +1106,14 @@ class OCRLanguageCorrector:
                 'corrections_made': 0,
                 'processing_time': 0.0,
                 'layer_details': {},
+                'complete': True,
             }
 
         start = time.time()
         current = text.strip()
         layers_applied = []
         layer_details = {}
+        complete = True
         original_words = set(re.findall(r'[a-zA-Z]+', current.lower()))
 
         # ── Layer 1: OCR Pattern Fixes ──
@@ -1143,7 +1141,7 @@ class OCRLanguageCorrector:
         if (enable_layers in ("all", "local")
                 and self.grammar_corrector is not None):
             before = current
-            current = self.grammar_corrector.correct(current)
+            current, complete = self.grammar_corrector.correct_within_budget(current)
             if current != before:
                 layers_applied.append("transformer_grammar")
                 layer_details["transformer_grammar"] = {
@@ -1176,6 +1174,7 @@ class OCRLanguageCorrector:
             'corrections_made': changed,
             'processing_time': round(processing_time, 3),
             'layer_details': layer_details,
+            'complete': complete,
         }
 
     def correct_fast(self, text: str) -> str:
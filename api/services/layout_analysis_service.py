@@ -1132,15 +1132,19 @@ class LayoutAnalyzer:
         return result
 
     def analyze_with_text(
-        self, image_path: str, ocr_text: str
+        self, image_path: str, ocr_text: str,
+        layout: Optional[LayoutResult] = None,
     ) -> LayoutResult:
         """
         Layout analysis with OCR text for question-number detection.
 
         Call this AFTER OCR has extracted text, to get better question
         boundary detection using both spatial layout AND text patterns.
+        Pass the ``layout`` already computed for the image to skip
+        segmenting it again.
         """
-        layout = self.analyze(image_path)
+        if layout is None:
+            layout = self.analyze(image_path)
 
         if ocr_text and ocr_text.strip():
             # Assign OCR text to paragraphs (best-effort by line count)
@@ -1314,6 +1318,8 @@ class StructuredOCRExtractor:
     MIN_LINES_FOR_SEGMENTED = 3
     # Maximum lines to OCR individually (avoid very slow processing)
     MAX_LINES_FOR_INDIVIDUAL = 80
+    # With batched recognition a line costs a fraction of a path-based call
+    MAX_LINES_FOR_BATCHED = 400
 
     def __init__(self):
         self.layout_analyzer = LayoutAnalyzer()
@@ -1333,6 +1339,7 @@ class StructuredOCRExtractor:
         image_path: str,
         ocr_func,
         preprocess_func=None,
+        recognize_lines=None,
     ) -> Dict:
         """
         Per-region OCR with layout analysis.
@@ -1341,6 +1348,10 @@ class StructuredOCRExtractor:
             image_path: Path to image
             ocr_func: Callable(image_path) → str  (the actual OCR function)
             preprocess_func: Optional preprocessing function
+            recognize_lines: Optional Callable(List[np.ndarray]) → List[str].
+                Recognises all line crops in one call, in memory and without
+                text detection; ``ocr_func`` is then only used for
+                whole-page fallbacks.
 
         Returns:
             Dict with:
@@ -1383,12 +1394,24 @@ class StructuredOCRExtractor:
         h, w = image.shape[:2]
 
         # Step 2: Decide granularity
-        if layout.line_count <= self.MAX_LINES_FOR_INDIVIDUAL:
+        line_texts = None
+        recognition = 'per_region'
+        if recognize_lines and layout.line_count <= self.MAX_LINES_FOR_BATCHED:
+            # All line crops in one batched recogniser call
+            try:
+                line_texts = self._recognize_per_line(
+                    image, layout, recognize_lines, w, h
+                )
+                recognition = 'batched'
+            except Exception as e:
+                logger.warning(f"Batched line recognition failed, OCRing lines one by one: {e}")
+
+        if line_texts is None and layout.line_count <= self.MAX_LINES_FOR_INDIVIDUAL:
             # Per-line OCR
             line_texts = self._ocr_per_line(
                 image, layout, ocr_func, w, h
             )
-        else:
+        elif line_texts is None:
             # Per-paragraph OCR (faster for very long documents)
             line_texts = self._ocr_per_paragraph(
                 image, layout, ocr_func, w, h
@@ -1401,7 +1424,7 @@ class StructuredOCRExtractor:
 
         # Step 4: Re-analyze with text for question detection
         layout_with_text = self.layout_analyzer.analyze_with_text(
-            image_path, full_text
+            image_path, full_text, layout=layout
         )
 
         # Step 5: Build structured result
@@ -1459,6 +1482,7 @@ class StructuredOCRExtractor:
                 'has_questions': layout_with_text.has_questions,
                 'image_size': [w, h],
                 'processing_time': elapsed,
+                'recognition': recognition,
             },
             'method': 'segmented',
         }
@@ -1470,6 +1494,49 @@ class StructuredOCRExtractor:
         )
         return result
 
+    def _line_crop(
+        self, image: np.ndarray, line: TextLine, img_w: int, img_h: int
+    ) -> Optional[np.ndarray]:
+        """Padded crop of one line, upscaled to OCR height; None if blank or empty."""
+        cv2 = self._cv2
+        if line.is_blank:
+            return None
+
+        # Crop line with padding
+        padded = line.bbox.pad(8, 4, img_w, img_h)
+        crop = padded.crop(image)
+        if crop.size == 0:
+            return None
+
+        # Resize very small crops (OCR needs minimum resolution)
+        crop_h, crop_w = crop.shape[:2]
+        if crop_h < 30:
+            scale = 30 / crop_h
+            crop = cv2.resize(
+                crop, None, fx=scale, fy=scale,
+                interpolation=cv2.INTER_CUBIC
+            )
+        return crop
+
+    def _recognize_per_line(
+        self, image: np.ndarray, layout: LayoutResult,
+        recognize_lines, img_w: int, img_h: int
+    ) -> List[str]:
+        """Recognise every line crop in one batched call (no temp files)."""
+        crops = [self._line_crop(image, line, img_w, img_h) for line in layout.lines]
+        present = [i for i, crop in enumerate(crops) if crop is not None]
+        texts = recognize_lines([crops[i] for i in present]) if present else []
+        if len(texts) != len(present):
+            raise ValueError(f"recogniser returned {len(texts)} texts for {len(present)} lines")
+
+        line_texts = [""] * len(layout.lines)
+        for i, text in zip(present, texts):
+            # Clean: OCR on a single line should produce one line
+            text = (text or "").strip().replace('\n', ' ')
+            layout.lines[i].text = text
+            line_texts[i] = text
+        return line_texts
+
     def _ocr_per_line(
         self, image: np.ndarray, layout: LayoutResult,
         ocr_func, img_w: int, img_h: int
@@ -1482,26 +1549,11 @@ class StructuredOCRExtractor:
         temp_files = []
 
         for line in layout.lines:
-            if line.is_blank:
-                line_texts.append("")
-                continue
-
-            # Crop line with padding
-            padded = line.bbox.pad(8, 4, img_w, img_h)
-            crop = padded.crop(image)
-            if crop.size == 0:
+            crop = self._line_crop(image, line, img_w, img_h)
+            if crop is None:
                 line_texts.append("")
                 continue
 
-            # Resize very small crops (OCR needs minimum resolution)
-            crop_h, crop_w = crop.shape[:2]
-            if crop_h < 30:
-                scale = 30 / crop_h
-                crop = cv2.resize(
-                    crop, None, fx=scale, fy=scale,
-                    interpolation=cv2.INTER_CUBIC
-                )
-
             # Save to temp file for OCR
             tmp_path = tempfile.mktemp(suffix='.png')
             cv2.imwrite(tmp_path, crop)
@@ -0,0 +1,666 @@
+"""
+Shared English Lexicon
+=======================
+One immutable word list for OCR quality scoring and spell correction.
+
+Problem
+-------
+``OCRQualityAnalyzer`` built a Python ``set`` of ~235k NLTK words on every
+instantiation, and ``OCRLanguageCorrector`` built a second, inflected copy
+plus a frequency ``Counter`` over the same words for
+``ContextualSpellCorrector``.  Tens of MB of small string objects per copy,
+rebuilt per request and duplicated in every worker.
+
+Solution
+--------
+``Lexicon`` keeps the words as one sorted, fixed-width byte array with a
+parallel ``uint32`` frequency array:
+
+*   membership / frequency are a binary search (``np.searchsorted``);
+    ``known()`` checks a whole batch of candidates in one vectorised call.
+*   ``with_prefix()`` returns the sorted range sharing a prefix.
+*   The arrays are written once to ``LEXICON_DIR`` as ``.npy`` files and
+    opened with ``mmap_mode="r"`` — startup is a file open, and every worker
+    process shares the same page-cache pages instead of private copies.
+
+``DeletionIndex`` (SymSpell symmetric-delete index over word prefixes) is
+stored alongside it and serves spell-correction candidates up to edit
+distance 2 without generating edit sets.
+
+The word list is the NLTK ``words`` corpus expanded with inflected forms and
+technical terms, minus words that are almost always OCR artefacts.  Bump
+``LEXICON_VERSION`` when those rules change so stale files are rebuilt.
+
+Usage:
+    lexicon = get_lexicon()
+    "algorithm" in lexicon            # True
+    lexicon.frequency("the")          # 69971
+    lexicon.known({"teh", "the"})     # {"the"}
+    lexicon.with_prefix("algor")      # ["algorism", "algorithm", ...]
+    get_deletion_index().lookup("algorlthm")   # {"algorithm": 1}
+
+Prebuild (build.sh / Dockerfile):
+    python -m api.services.lexicon
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("AssessIQ.Lexicon")
+
+LEXICON_VERSION = 1
+LEXICON_NAME = "english"
+
+# Relative frequencies of common English + domain words (higher = more common).
+# Every other lexicon word has frequency 1.
+COMMON_WORD_FREQUENCIES: Dict[str, int] = {
+    'the': 69971, 'of': 36411, 'and': 28852, 'to': 26149, 'a': 23237,
+    'in': 21341, 'is': 16817, 'it': 12458, 'that': 12287, 'was': 11123,
+    'for': 9489, 'on': 8596, 'are': 7825, 'with': 7012, 'as': 6996,
+    'be': 6745, 'at': 5987, 'this': 5913, 'have': 5535, 'from': 5267,
+    'or': 5073, 'an': 4843, 'by': 4796, 'not': 4658, 'but': 4589,
+    'what': 3856, 'all': 3810, 'were': 3654, 'when': 3540, 'we': 3503,
+    'there': 3427, 'can': 3383, 'been': 3322, 'has': 3283, 'more': 3150,
+    'if': 3017, 'will': 2976, 'one': 2948, 'do': 2918, 'their': 2835,
+    'would': 2775, 'they': 2723, 'which': 2707, 'about': 2625, 'up': 2609,
+    'out': 2531, 'so': 2410, 'them': 2392, 'he': 2379, 'she': 2211,
+    'many': 2183, 'some': 2121, 'time': 2043, 'very': 2001, 'could': 1978,
+    'no': 1944, 'make': 1891, 'like': 1857, 'just': 1846, 'over': 1789,
+    'such': 1745, 'also': 1720, 'new': 1685, 'most': 1654, 'how': 1612,
+    'after': 1532, 'only': 1521, 'other': 1509, 'into': 1498, 'its': 1453,
+    'than': 1421, 'first': 1389, 'may': 1367, 'between': 1287, 'should': 1269,
+    'each': 1247, 'made': 1234, 'people': 1221, 'where': 1219, 'way': 1189,
+    'system': 1125, 'computer': 1087, 'software': 1043, 'operating': 998,
+    'process': 955, 'data': 933, 'program': 911, 'management': 889,
+    'information': 856, 'technology': 834, 'network': 812, 'memory': 790,
+    'function': 768, 'algorithm': 745, 'structure': 723, 'hardware': 701,
+    'application': 679, 'database': 657, 'machine': 645, 'learning': 634,
+    'student': 621, 'education': 609, 'knowledge': 597, 'answer': 585,
+    'question': 573, 'evaluation': 561, 'important': 549, 'different': 537,
+}
+
+# Technical / computing terms missing from the NLTK corpus
+TECH_TERMS = {
+    'software', 'hardware', 'firmware', 'middleware', 'malware',
+    'algorithms', 'algorithm', 'algorithmic',
+    'interconnected', 'interconnect', 'interconnection',
+    'structured', 'structures', 'unstructured',
+    'database', 'databases', 'dataset', 'datasets',
+    'internet', 'intranet', 'ethernet', 'bluetooth', 'wifi',
+    'website', 'websites', 'webpage', 'webpages',
+    'email', 'emails', 'online', 'offline', 'login', 'logout',
+    'smartphone', 'smartphones', 'laptop', 'laptops',
+    'desktop', 'desktops', 'router', 'routers',
+    'server', 'servers', 'client', 'clients',
+    'frontend', 'backend', 'fullstack', 'devops',
+    'api', 'apis', 'http', 'https', 'html', 'css',
+    'javascript', 'python', 'java', 'typescript',
+    'boolean', 'integer', 'string', 'array',
+    'cpu', 'gpu', 'ram', 'rom', 'ssd', 'hdd',
+    'blockchain', 'cryptocurrency', 'cybersecurity',
+    'efficiently', 'effectiveness',
+    'organise', 'organises', 'organised', 'organising',
+    'organize', 'organizes', 'organized', 'organizing',
+    'optimise', 'optimised', 'optimize', 'optimized',
+    'analyse', 'analysed', 'analyze', 'analyzed',
+    'programme', 'programmes', 'programmed', 'programming',
+}
+
+# Real English words that in handwritten-OCR context are almost always
+# artefacts (l→t, l→i confusions)
+OCR_FALSE_POSITIVES = {
+    'lo', 'lhe', 'lhat', 'lhis', 'lhey', 'lhere', 'lhen', 'lhese', 'lhose', 'ls',
+}
+
+
+class Lexicon:
+    """Immutable sorted word list with frequencies; safe to share across threads."""
+
+    def __init__(self, words: np.ndarray, freqs: np.ndarray):
+        self._words = words    # sorted, dtype S<width>, UTF-8
+        self._freqs = freqs    # uint32, aligned with _words
+        self._width = words.dtype.itemsize
+
+    @classmethod
+    def from_words(cls, words: Iterable[str],
+                   frequencies: Optional[Mapping[str, int]] = None) -> "Lexicon":
+        """Build an in-memory lexicon; *frequencies* default to 1 per word."""
+        frequencies = frequencies or {}
+        unique = sorted({w.encode("utf-8") for w in words if w})
+        width = max((len(w) for w in unique), default=1)
+        array = np.array(unique, dtype=f"S{width}")
+        freqs = np.array(
+            [frequencies.get(w.decode("utf-8"), 1) for w in unique], dtype=np.uint32
+        )
+        return cls(array, freqs)
+
+    # ─── Lookups ─────────────────────────────────────────────────────
+
+    def _index(self, word: str) -> int:
+        key = word.encode("utf-8")
+        if not key or len(key) > self._width:
+            return -1
+        i = int(np.searchsorted(self._words, key))
+        if i < len(self._words) and self._words[i] == key:
+            return i
+        return -1
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self._index(word) >= 0
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __iter__(self):
+        for w in self._words:
+            yield w.decode("utf-8")
+
+    def frequency(self, word: str) -> int:
+        """Relative frequency of *word*; 0 when not in the lexicon."""
+        i = self._index(word)
+        return int(self._freqs[i]) if i >= 0 else 0
+
+    def known(self, words: Iterable[str]) -> Set[str]:
+        """The subset of *words* in the lexicon (one vectorised search)."""
+        candidates = [w for w in words if w]
+        encoded = [w.encode("utf-8") for w in candidates]
+        keep = [i for i, key in enumerate(encoded) if len(key) <= self._width]
+        if not keep or not len(self._words):
+            return set()
+        keys = np.array([encoded[i] for i in keep], dtype=self._words.dtype)
+        idx = np.searchsorted(self._words, keys)
+        idx_clipped = np.minimum(idx, len(self._words) - 1)
+        hits = (idx < len(self._words)) & (self._words[idx_clipped] == keys)
+        return {candidates[keep[j]] for j in np.flatnonzero(hits)}
+
+    def with_prefix(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Words starting with *prefix*, in sorted order."""
+        key = prefix.encode("utf-8")
+        if len(key) > self._width:
+            return []
+        lo = int(np.searchsorted(self._words, key, side="left"))
+        upper = key + b"\xff" * (self._width - len(key))  # 0xff never occurs in UTF-8
+        hi = int(np.searchsorted(self._words, upper, side="right"))
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return [w.decode("utf-8") for w in self._words[lo:hi]]
+
+    # ─── Persistence ─────────────────────────────────────────────────
+
+    @staticmethod
+    def _paths(directory: str, name: str) -> Dict[str, str]:
+        base = os.path.join(directory, f"{name}.v{LEXICON_VERSION}")
+        return {"words": f"{base}.words.npy", "freqs": f"{base}.freqs.npy", "meta": f"{base}.json"}
+
+    def save(self, directory: str, name: str = LEXICON_NAME) -> None:
+        """Write the arrays atomically so concurrent workers never see a partial file."""
+        os.makedirs(directory, exist_ok=True)
+        paths = self._paths(directory, name)
+        suffix = f".{os.getpid()}.tmp"
+        for part, array in (("words", self._words), ("freqs", self._freqs)):
+            with open(paths[part] + suffix, "wb") as f:
+                np.save(f, np.ascontiguousarray(array))
+        with open(paths["meta"] + suffix, "w", encoding="utf-8") as f:
+            json.dump({"version": LEXICON_VERSION, "words": len(self), "width": self._width}, f)
+        # Meta last: its presence marks a complete lexicon
+        for part in ("words", "freqs", "meta"):
+            os.replace(paths[part] + suffix, paths[part])
+
+    @classmethod
+    def open(cls, directory: str, name: str = LEXICON_NAME) -> Optional["Lexicon"]:
+        """Memory-map a saved lexicon; ``None`` if absent or incomplete."""
+        paths = cls._paths(directory, name)
+        if not os.path.exists(paths["meta"]):
+            return None
+        try:
+            words = np.load(paths["words"], mmap_mode="r")
+            freqs = np.load(paths["freqs"], mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not open lexicon in {directory}: {e}")
+            return None
+        if len(words) != len(freqs):
+            return None
+        return cls(words, freqs)
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "words": len(self),
+            "width": self._width,
+            "bytes": int(self._words.nbytes + self._freqs.nbytes),
+            "memory_mapped": isinstance(self._words, np.memmap),
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Building
+# ═══════════════════════════════════════════════════════════════════════
+
+def inflect(base: Set[str]) -> Set[str]:
+    """*base* plus common plural, tense, participle, comparative and adverb forms."""
+    expanded = set(base)
+    for word in base:
+        if len(word) < 3:
+            continue
+
+        # — Plurals / 3rd-person singular present ─────────
+        if word.endswith(('s', 'sh', 'ch', 'x', 'z')):
+            expanded.add(word + 'es')
+        elif word.endswith('y') and len(word) > 2 and word[-2] not in 'aeiou':
+            expanded.add(word[:-1] + 'ies')   # study → studies
+        else:
+            expanded.add(word + 's')
+
+        # — Past tense / past participle ──────────────────
+        if word.endswith('e'):
+            expanded.add(word + 'd')           # manage → managed
+        elif (word.endswith('y') and len(word) > 2
+              and word[-2] not in 'aeiou'):
+            expanded.add(word[:-1] + 'ied')    # study → studied
+        else:
+            expanded.add(word + 'ed')           # answer → answered
+            # Double final consonant for CVC pattern
+            if (len(word) >= 3
+                    and word[-1] in 'bdfgklmnprstvz'
+                    and word[-2] in 'aeiou'
+                    and word[-3] not in 'aeiou'):
+                expanded.add(word + word[-1] + 'ed')  # stop → stopped
+
+        # — Present participle / gerund ───────────────────
+        if word.endswith('e') and not word.endswith('ee'):
+            expanded.add(word[:-1] + 'ing')    # manage → managing
+        elif word.endswith('ie'):
+            expanded.add(word[:-2] + 'ying')   # die → dying
+        else:
+            expanded.add(word + 'ing')
+            if (len(word) >= 3
+                    and word[-1] in 'bdfgklmnprstvz'
+                    and word[-2] in 'aeiou'
+                    and word[-3] not in 'aeiou'):
+                expanded.add(word + word[-1] + 'ing')  # run → running
+
+        # — Comparative / agent ───────────────────────────
+        expanded.add(word + 'er')
+        expanded.add(word + 'est')
+
+        # — Adverb ────────────────────────────────────────
+        expanded.add(word + 'ly')
+        if word.endswith('le'):
+            expanded.add(word[:-1] + 'y')      # simple → simply
+        if word.endswith('y'):
+            expanded.add(word[:-1] + 'ily')    # happy → happily
+
+        # — Negation / noun ───────────────────────────────
+        expanded.add(word + 'ness')
+        expanded.add(word + 'ment')
+    return expanded
+
+
+def _nltk_words() -> Set[str]:
+    import nltk
+    try:
+        from nltk.corpus import words as nltk_words
+        return set(w.lower() for w in nltk_words.words() if len(w) >= 2)
+    except LookupError:
+        nltk.download('words', quiet=True)
+        from nltk.corpus import words as nltk_words
+        return set(w.lower() for w in nltk_words.words() if len(w) >= 2)
+
+
+def build_lexicon(base: Optional[Set[str]] = None) -> Lexicon:
+    """
+    Build the English lexicon from *base* (default: the NLTK words corpus).
+
+    Raises when the corpus is unavailable, so callers can fall back.
+    """
+    base = set(_nltk_words() if base is None else base)
+    base.update({'a', 'i', 'o'})  # single-letter words
+    words = inflect(base)
+    words.update(TECH_TERMS)
+    words -= OCR_FALSE_POSITIVES
+    logger.info(f"Lexicon built: {len(base):,} base → {len(words):,} total (inflections + tech terms)")
+    return Lexicon.from_words(words, COMMON_WORD_FREQUENCIES)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Symmetric-delete index (SymSpell)
+# ═══════════════════════════════════════════════════════════════════════
+
+def _pack(key: bytes) -> int:
+    """Up to 8 bytes as a big-endian uint64 (words never contain NUL)."""
+    return int.from_bytes(key.ljust(8, b"\0"), "big")
+
+
+def _deletes(key: bytes, max_distance: int) -> Set[bytes]:
+    """*key* and every string reachable from it by up to *max_distance* deletions."""
+    found = {key}
+    frontier = {key}
+    for _ in range(max_distance):
+        frontier = {d[:i] + d[i + 1:] for d in frontier for i in range(len(d))}
+        found |= frontier
+    return found
+
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _letter_mask(key: bytes) -> int:
+    """Bit per letter a-z present (bit 26: any other byte)."""
+    mask = 0
+    for c in key:
+        mask |= 1 << (c - 97 if 97 <= c <= 122 else 26)
+    return mask
+
+
+def _letter_masks(words: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Byte length and ``_letter_mask`` of every row of a fixed-width byte array."""
+    width = words.dtype.itemsize
+    matrix = np.frombuffer(np.ascontiguousarray(words).tobytes(), dtype=np.uint8).reshape(len(words), width)
+    lengths = (matrix != 0).sum(axis=1).astype(np.uint8)
+    masks = np.zeros(len(words), dtype=np.uint32)
+    for col in range(width):
+        c = matrix[:, col]
+        bits = np.where((c >= 97) & (c <= 122), c - 97, 26).astype(np.uint32)
+        masks |= np.where(c != 0, np.left_shift(np.uint32(1), bits), np.uint32(0)).astype(np.uint32)
+    return lengths, masks
+
+
+def osa_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal-string-alignment distance (Levenshtein + adjacent transposition).
+
+    Only the diagonal band of width ``2 * max_distance + 1`` is computed, and
+    ``max_distance + 1`` is returned as soon as the distance must exceed it.
+    """
+    # Common prefix / suffix never change the distance
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+
+    k = max_distance
+    over = k + 1
+    if abs(len(a) - len(b)) > k:
+        return over
+    if not a or not b:
+        return max(len(a), len(b))
+
+    prev_prev = None
+    prev = [j if j <= k else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        cur = [over] * (len(b) + 1)
+        if i <= k:
+            cur[0] = i
+        ai = a[i - 1]
+        lo, hi = max(1, i - k), min(len(b), i + k)
+        row_min = cur[lo - 1]
+        for j in range(lo, hi + 1):
+            value = prev[j - 1] + (ai != b[j - 1])
+            if prev[j] + 1 < value:
+                value = prev[j] + 1
+            if cur[j - 1] + 1 < value:
+                value = cur[j - 1] + 1
+            if (prev_prev is not None and j > 1 and ai == b[j - 2]
+                    and a[i - 2] == b[j - 1] and prev_prev[j - 2] + 1 < value):
+                value = prev_prev[j - 2] + 1
+            if value > over:
+                value = over
+            cur[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > k:
+            return over
+        prev_prev, prev = prev, cur
+    return prev[-1]
+
+
+class DeletionIndex:
+    """
+    Dictionary words within edit distance 2 via precomputed deletions.
+
+    Words are grouped by their first ``prefix_length`` bytes — each group is
+    a contiguous range of the sorted lexicon — and every deletion (up to
+    ``MAX_DISTANCE``) of each group prefix is stored as a packed ``uint64``
+    key.  A lookup generates the deletions of the query's prefix (≤ 22
+    strings) and finds matching groups with ``searchsorted``.  The groups'
+    words are filtered with vectorised bounds — byte length within the
+    distance, and at most two letters gained or lost per edit (per-word
+    letter bitmasks) — before the survivors are verified with a bounded OSA
+    distance.  Indexing prefixes instead of
+    whole words keeps the index a fraction of the size of a full SymSpell
+    dictionary over ~2M inflected forms.
+    """
+
+    MAX_DISTANCE = 2
+    PREFIX_LENGTH = 6
+
+    PARTS = ("keys", "groups", "bounds", "lengths", "masks")
+
+    def __init__(self, lexicon: Lexicon, keys: np.ndarray, groups: np.ndarray,
+                 bounds: np.ndarray, lengths: np.ndarray, masks: np.ndarray,
+                 prefix_length: int = PREFIX_LENGTH):
+        self._lexicon = lexicon
+        self._keys = keys        # sorted packed deletions
+        self._groups = groups    # group id per key
+        self._bounds = bounds    # group g = lexicon rows [bounds[g], bounds[g + 1])
+        self._lengths = lengths  # byte length per lexicon row
+        self._masks = masks      # letter bitmask per lexicon row
+        self.prefix_length = prefix_length
+
+    @classmethod
+    def build(cls, lexicon: Lexicon, prefix_length: int = PREFIX_LENGTH) -> "DeletionIndex":
+        if not 1 <= prefix_length <= 8:
+            raise ValueError("prefix_length must be between 1 and 8")
+        words = lexicon._words
+        if not len(words):
+            empty = np.zeros(0, dtype=np.uint32)
+            return cls(lexicon, np.zeros(0, dtype=np.uint64), empty, np.zeros(1, dtype=np.uint32),
+                       np.zeros(0, dtype=np.uint8), empty, prefix_length)
+
+        # Groups: runs of equal prefixes in the sorted word array
+        prefixes = np.asarray(words).astype(f"S{prefix_length}")
+        starts = np.flatnonzero(np.r_[True, prefixes[1:] != prefixes[:-1]])
+        bounds = np.r_[starts, len(words)].astype(np.uint32)
+        group_count = len(starts)
+
+        # Every deletion of every group prefix, vectorised over groups
+        rows = np.zeros((group_count, 8), dtype=np.uint8)
+        rows[:, :prefix_length] = np.frombuffer(
+            prefixes[starts].tobytes(), dtype=np.uint8).reshape(group_count, prefix_length)
+
+        def delete(matrix, i):
+            out = np.zeros_like(matrix)
+            out[:, :i] = matrix[:, :i]
+            out[:, i:7] = matrix[:, i + 1:]
+            return out
+
+        # Delete positions in decreasing order so each set of positions is
+        # generated once: (matrix, last deleted position)
+        variants = [rows]
+        level = [(rows, prefix_length)]
+        for _ in range(cls.MAX_DISTANCE):
+            level = [(delete(m, i), i) for m, last in level for i in range(last)]
+            variants.extend(m for m, _ in level)
+        keys = np.concatenate([v.view(">u8").ravel() for v in variants]).astype(np.uint64)
+        groups = np.tile(np.arange(group_count, dtype=np.uint32), len(variants))
+        del variants, level
+
+        # Deduplicate (key, group) pairs; sorted by key for searchsorted
+        order = np.lexsort((groups, keys))
+        keys, groups = keys[order], groups[order]
+        keep = np.r_[True, (keys[1:] != keys[:-1]) | (groups[1:] != groups[:-1])]
+        lengths, masks = _letter_masks(words)
+        index = cls(lexicon, keys[keep], groups[keep], bounds, lengths, masks, prefix_length)
+        logger.info(
+            f"Deletion index built: {group_count:,} prefix groups, "
+            f"{len(index._keys):,} keys ({index.get_stats()['bytes'] / (1024 * 1024):.0f} MB)"
+        )
+        return index
+
+    def lookup(self, word: str, max_distance: int = MAX_DISTANCE) -> Dict[str, int]:
+        """Dictionary words within *max_distance* of *word*, with their distance."""
+        max_distance = min(max_distance, self.MAX_DISTANCE)
+        if not len(self._keys):
+            return {}
+        key = word.encode("utf-8")
+        packed = np.array([_pack(d) for d in _deletes(key[:self.prefix_length], max_distance)],
+                          dtype=np.uint64)
+        lo = np.searchsorted(self._keys, packed, side="left")
+        hi = np.searchsorted(self._keys, packed, side="right")
+        hits = [self._groups[a:b] for a, b in zip(lo, hi) if b > a]
+        if not hits:
+            return {}
+
+        # Expand the matched groups into lexicon rows
+        groups = np.unique(np.concatenate(hits))
+        starts = self._bounds[groups].astype(np.int64)
+        counts = self._bounds[groups + 1].astype(np.int64) - starts
+        offsets = np.repeat(starts - np.r_[0, np.cumsum(counts)[:-1]], counts)
+        rows = offsets + np.arange(int(counts.sum()))
+
+        # Cheap bounds before the exact distance
+        rows = rows[np.abs(self._lengths[rows].astype(np.int16) - len(key)) <= max_distance]
+        changed = _POPCOUNT[(self._masks[rows] ^ np.uint32(_letter_mask(key))).view(np.uint8)]
+        rows = rows[changed.reshape(-1, 4).sum(axis=1) <= 2 * max_distance]
+
+        words = self._lexicon._words
+        found: Dict[str, int] = {}
+        for row in rows:
+            candidate = words[row].decode("utf-8")
+            distance = osa_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                found[candidate] = distance
+        return found
+
+    # ─── Persistence ─────────────────────────────────────────────────
+
+    @staticmethod
+    def _paths(directory: str, name: str, prefix_length: int) -> Dict[str, str]:
+        base = os.path.join(directory, f"{name}.v{LEXICON_VERSION}.deletes{prefix_length}")
+        paths = {part: f"{base}.{part}.npy" for part in DeletionIndex.PARTS}
+        paths["meta"] = f"{base}.json"
+        return paths
+
+    def save(self, directory: str, name: str = LEXICON_NAME) -> None:
+        os.makedirs(directory, exist_ok=True)
+        paths = self._paths(directory, name, self.prefix_length)
+        suffix = f".{os.getpid()}.tmp"
+        for part in self.PARTS:
+            with open(paths[part] + suffix, "wb") as f:
+                np.save(f, np.ascontiguousarray(getattr(self, f"_{part}")))
+        with open(paths["meta"] + suffix, "w", encoding="utf-8") as f:
+            json.dump({"version": LEXICON_VERSION, "words": len(self._lexicon),
+                       "prefix_length": self.prefix_length}, f)
+        for part in self.PARTS + ("meta",):
+            os.replace(paths[part] + suffix, paths[part])
+
+    @classmethod
+    def open(cls, directory: str, lexicon: Lexicon, name: str = LEXICON_NAME,
+             prefix_length: int = PREFIX_LENGTH) -> Optional["DeletionIndex"]:
+        """Memory-map a saved index; ``None`` if absent or built for another lexicon."""
+        paths = cls._paths(directory, name, prefix_length)
+        try:
+            with open(paths["meta"], "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("words") != len(lexicon):
+                return None
+            arrays = {part: np.load(paths[part], mmap_mode="r") for part in cls.PARTS}
+        except (OSError, ValueError):
+            return None
+        return cls(lexicon, *(arrays[part] for part in cls.PARTS), prefix_length=prefix_length)
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "prefix_length": self.prefix_length,
+            "groups": max(len(self._bounds) - 1, 0),
+            "keys": len(self._keys),
+            "bytes": int(sum(getattr(self, f"_{part}").nbytes for part in self.PARTS)),
+            "memory_mapped": isinstance(self._keys, np.memmap),
+        }
+
+
+# ─── Process-wide singleton ──────────────────────────────────────────
+
+_lexicon: Optional[Lexicon] = None
+_deletion_index: Optional[DeletionIndex] = None
+_lexicon_lock = threading.Lock()
+
+
+def load_lexicon(directory: Optional[str]) -> Lexicon:
+    """Open the prebuilt lexicon in *directory*, building and saving it if missing."""
+    if directory:
+        lexicon = Lexicon.open(directory)
+        if lexicon is not None:
+            logger.info(f"Lexicon memory-mapped from {directory} ({len(lexicon):,} words)")
+            return lexicon
+    try:
+        lexicon = build_lexicon()
+    except Exception as e:
+        logger.warning(f"Lexicon unavailable (NLTK words corpus missing?): {e}")
+        return Lexicon.from_words([])
+    if directory:
+        try:
+            lexicon.save(directory)
+            return Lexicon.open(directory) or lexicon
+        except OSError as e:
+            logger.warning(f"Could not save lexicon to {directory}: {e}")
+    return lexicon
+
+
+def get_lexicon() -> Lexicon:
+    """Shared lexicon; empty when the NLTK corpus is unavailable."""
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                from config.settings import settings
+                _lexicon = load_lexicon(getattr(settings, "LEXICON_DIR", None))
+    return _lexicon
+
+
+def load_deletion_index(directory: Optional[str], lexicon: Lexicon) -> DeletionIndex:
+    """Open the prebuilt deletion index for *lexicon*, building and saving it if missing."""
+    if directory:
+        index = DeletionIndex.open(directory, lexicon)
+        if index is not None:
+            return index
+    index = DeletionIndex.build(lexicon)
+    if directory and len(lexicon):
+        try:
+            index.save(directory)
+            return DeletionIndex.open(directory, lexicon) or index
+        except OSError as e:
+            logger.warning(f"Could not save deletion index to {directory}: {e}")
+    return index
+
+
+def get_deletion_index() -> DeletionIndex:
+    """Shared deletion index over ``get_lexicon()`` (built on first spell correction)."""
+    global _deletion_index
+    lexicon = get_lexicon()
+    if _deletion_index is None or _deletion_index._lexicon is not lexicon:
+        with _lexicon_lock:
+            if _deletion_index is None or _deletion_index._lexicon is not lexicon:
+                from config.settings import settings
+                _deletion_index = load_deletion_index(getattr(settings, "LEXICON_DIR", None), lexicon)
+    return _deletion_index
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    from config.settings import settings
+
+    directory = settings.LEXICON_DIR or "cache/lexicon"
+    lexicon = build_lexicon()
+    lexicon.save(directory)
+    index = DeletionIndex.build(lexicon)
+    index.save(directory)
+    print(f"Lexicon written to {directory}: {lexicon.get_stats()}, deletion index: {index.get_stats()}")
@@ -0,0 +1,211 @@
+"""
+Batched Line Recognition
+=========================
+Recognise many pre-segmented line crops per engine call, without text
+detection.
+
+Problem
+-------
+``StructuredOCRExtractor`` OCRed up to 80 line regions one by one through a
+path-based ``ocr_func``.  Every crop was written to a temp PNG, read back,
+run through the full multi-variant pipeline, and the engine ran text
+detection again on a strip that is already a single line.  That per-line
+cost is why ``ENABLE_LAYOUT_ANALYSIS`` stayed off.
+
+Solution
+--------
+Each engine gets a recogniser that takes a list of crops (numpy arrays)
+and returns one ``(text, confidence)`` per crop, in order.
+
+*   **EasyOCR**: crops are stacked into one grayscale canvas and passed to
+    ``Reader.recognize`` with one box per crop, so only the recognition
+    network runs, ``batch_size`` crops at a time.
+*   **Tesseract**: page segmentation mode 7 (single text line).  With
+    ``tesserocr`` installed, one ``PyTessBaseAPI`` per thread stays loaded
+    and each crop is a ``SetImage`` / ``GetUTF8Text`` call.  Otherwise each
+    crop goes through ``pytesseract`` with ``--psm 7``.
+*   **PaddleOCR**: the crops go straight to the text recogniser, which
+    batches them itself.
+
+Crops never touch the disk.
+
+Usage:
+    recognizer = get_line_recognizer("easyocr", engines.easyocr)
+    for text, conf in recognizer.recognize(crops):
+        ...
+"""
+
+import logging
+import threading
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("AssessIQ.LineRecognition")
+
+# (text, confidence 0-1) for one line crop
+LineResult = Tuple[str, float]
+
+
+def to_gray(crop: np.ndarray) -> np.ndarray:
+    """Single-channel uint8 view of a BGR / BGRA / gray crop."""
+    if crop.ndim == 2:
+        return crop
+    import cv2
+    code = cv2.COLOR_BGRA2GRAY if crop.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+    return cv2.cvtColor(crop, code)
+
+
+def to_bgr(crop: np.ndarray) -> np.ndarray:
+    """Three-channel BGR view of a crop."""
+    if crop.ndim == 3 and crop.shape[2] == 3:
+        return crop
+    import cv2
+    if crop.ndim == 2:
+        return cv2.cvtColor(crop, cv2.COLOR_GRAY2BGR)
+    return cv2.cvtColor(crop, cv2.COLOR_BGRA2BGR)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# EasyOCR
+# ═══════════════════════════════════════════════════════════════════════
+
+class EasyOCRLineRecognizer:
+    """``Reader.recognize`` on crops stacked into one canvas (no detection)."""
+
+    GAP = 16  # blank rows between stacked crops
+
+    def __init__(self, reader, batch_size: int = 32):
+        self.reader = reader
+        self.batch_size = max(1, batch_size)
+
+    def stack(self, crops: Sequence[np.ndarray]) -> Tuple[np.ndarray, List[List[int]]]:
+        """One white canvas with the crops top to bottom, and their boxes as [x_min, x_max, y_min, y_max]."""
+        grays = [to_gray(c) for c in crops]
+        width = max(g.shape[1] for g in grays)
+        height = sum(g.shape[0] for g in grays) + self.GAP * (len(grays) + 1)
+        canvas = np.full((height, width), 255, dtype=np.uint8)
+        boxes, y = [], self.GAP
+        for gray in grays:
+            h, w = gray.shape
+            canvas[y:y + h, :w] = gray
+            boxes.append([0, w, y, y + h])
+            y += h + self.GAP
+        return canvas, boxes
+
+    def recognize(self, crops: Sequence[np.ndarray]) -> List[LineResult]:
+        results: List[LineResult] = []
+        for start in range(0, len(crops), self.batch_size):
+            chunk = crops[start:start + self.batch_size]
+            canvas, boxes = self.stack(chunk)
+            raw = self.reader.recognize(
+                canvas,
+                horizontal_list=boxes,
+                free_list=[],
+                decoder='greedy',
+                batch_size=len(chunk),
+                detail=1,
+                paragraph=False,
+                contrast_ths=0.05,
+                adjust_contrast=0.8,
+            )
+            # Results come back as (points, text, conf); map by top edge
+            by_top = {}
+            for points, text, conf in raw:
+                by_top[int(min(p[1] for p in points))] = (text.strip(), float(conf))
+            results.extend(by_top.get(box[2], ("", 0.0)) for box in boxes)
+        return results
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Tesseract
+# ═══════════════════════════════════════════════════════════════════════
+
+_tess_local = threading.local()
+
+
+def _tesserocr_api(lang: str):
+    """This thread's persistent single-line ``PyTessBaseAPI``, or ``None`` without tesserocr."""
+    apis = getattr(_tess_local, "apis", None)
+    if apis is None:
+        apis = _tess_local.apis = {}
+    if lang not in apis:
+        try:
+            from tesserocr import PSM, PyTessBaseAPI
+        except ImportError:
+            return None
+        apis[lang] = PyTessBaseAPI(lang=lang, psm=PSM.SINGLE_LINE)
+        logger.info(f"tesserocr API loaded ({lang}, PSM 7)")
+    return apis[lang]
+
+
+class TesseractLineRecognizer:
+    """Single-line mode (PSM 7); a persistent tesserocr API when available."""
+
+    CONFIG = '--oem 3 --psm 7'
+
+    def __init__(self, pytesseract=None, lang: str = "eng"):
+        self.pytesseract = pytesseract
+        self.lang = lang
+
+    def recognize(self, crops: Sequence[np.ndarray]) -> List[LineResult]:
+        from PIL import Image
+        images = [Image.fromarray(to_gray(c)) for c in crops]
+
+        api = _tesserocr_api(self.lang)
+        if api is not None:
+            results = []
+            for image in images:
+                api.SetImage(image)
+                results.append((api.GetUTF8Text().strip(), api.MeanTextConf() / 100.0))
+            return results
+
+        if self.pytesseract is None:
+            raise RuntimeError("Neither tesserocr nor pytesseract is available")
+        return [self._pytesseract_line(image) for image in images]
+
+    def _pytesseract_line(self, image) -> LineResult:
+        data = self.pytesseract.image_to_data(
+            image, config=self.CONFIG, output_type=self.pytesseract.Output.DICT)
+        words = [(t.strip(), float(c)) for t, c in zip(data['text'], data['conf']) if t.strip()]
+        if not words:
+            return "", 0.0
+        confs = [c for _, c in words if c >= 0]
+        return " ".join(t for t, _ in words), (sum(confs) / len(confs) / 100.0) if confs else 0.0
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# PaddleOCR
+# ═══════════════════════════════════════════════════════════════════════
+
+class PaddleLineRecognizer:
+    """PaddleOCR's text recogniser on the crops (no detection, no angle classifier)."""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def recognize(self, crops: Sequence[np.ndarray]) -> List[LineResult]:
+        images = [to_bgr(c) for c in crops]
+        recognizer = getattr(self.engine, "text_recognizer", None)
+        if recognizer is not None:
+            rec_res, _ = recognizer(images)
+            return [(text.strip(), float(score)) for text, score in rec_res]
+        results = []
+        for image in images:
+            res = self.engine.ocr(image, det=False, cls=False)
+            text, score = res[0][0] if res and res[0] else ("", 0.0)
+            results.append((text.strip(), float(score)))
+        return results
+
+
+def get_line_recognizer(name: str, engine: Any, batch_size: int = 32) -> Optional[Any]:
+    """Recogniser for an initialised engine (``None`` when it isn't loaded)."""
+    if engine is None:
+        return None
+    if name == "easyocr":
+        return EasyOCRLineRecognizer(engine, batch_size=batch_size)
+    if name == "tesseract":
+        return TesseractLineRecognizer(engine)
+    if name == "paddleocr":
+        return PaddleLineRecognizer(engine)
+    return None
@@ -0,0 +1,386 @@
+"""
+Model Answer Compiler
+======================
+Compile a model answer once into a reusable, versioned artifact.
+
+Problem
+-------
+Every student evaluation re-derived everything about the *model* answer
+from raw text: keywords (``NLPPreprocessor.extract_keywords``), sentence
+segmentation and importance (``SentenceSegmenter`` + ``ImportanceScorer``),
+the concept graph (``ConceptExtractor`` + ``SemanticGraphBuilder.build``),
+sentence / document embeddings and the expected Bloom level.  Grading a
+class of 60 against one model answer did that work 60 times.
+
+Solution
+--------
+``ModelAnswerCompiler.compile()`` runs all model-side analysis once and
+returns a ``CompiledModelAnswer``.  Scorers accept it via a ``compiled=``
+argument and skip the model-side work:
+
+*   ``ConceptGraphScorer.score``     — reuses the concept graph
+*   ``SentenceAlignmentScorer.score`` — reuses sentences + importance
+*   ``BloomTaxonomyAnalyzer.analyze`` — reuses the expected level
+*   ``EvaluationContext``             — seeded with sentence / document
+                                        embeddings
+
+Artifacts are cached in-process by content hash (``get_compiled_model_answer``).
+An artifact is reused only when its ``ARTIFACT_VERSION``, answer and question
+text hashes and embedding model all match; otherwise it is recompiled.
+Model answers arrive as uploaded files rather than ``ModelAnswer`` rows, so
+artifacts are not persisted; ``to_dict()`` / ``from_dict()`` give a
+JSON-safe form for a store that needs one.
+"""
+
+import base64
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("AssessIQ.ModelAnswerCompiler")
+
+# Bump whenever the artifact layout or any model-side derivation changes.
+ARTIFACT_VERSION = 2
+
+# In-process artifacts kept per worker
+MAX_CACHED_ARTIFACTS = 128
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def _pack_array(arr: Optional[np.ndarray]) -> Optional[Dict[str, Any]]:
+    """JSON-safe float32 array encoding."""
+    if arr is None:
+        return None
+    arr = np.ascontiguousarray(arr, dtype=np.float32)
+    return {
+        "shape": list(arr.shape),
+        "data": base64.b64encode(arr.tobytes()).decode("ascii"),
+    }
+
+
+def _unpack_array(packed: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+    if not packed:
+        return None
+    raw = base64.b64decode(packed["data"])
+    return np.frombuffer(raw, dtype=np.float32).reshape(packed["shape"]).copy()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Artifact
+# ═══════════════════════════════════════════════════════════════════════
+
+@dataclass
+class CompiledModelAnswer:
+    """Everything the pipeline derives from a model answer alone."""
+    version: int
+    text_hash: str
+    embedding_model: str
+    text: str
+    normalized_text: str
+    question_hash: str = ""      # the expected Bloom level depends on the question
+    keywords: List[str] = field(default_factory=list)
+    # Sentence layer (SentenceSegmenter + ImportanceScorer output, no embeddings)
+    raw_sentences: List[str] = field(default_factory=list)
+    sentences: List[Dict[str, Any]] = field(default_factory=list)
+    sentence_embeddings: Optional[np.ndarray] = None
+    document_embedding: Optional[np.ndarray] = None
+    # Concept layer
+    concept_nodes: List[Dict[str, Any]] = field(default_factory=list)
+    concept_edges: List[Dict[str, Any]] = field(default_factory=list)
+    concept_embeddings: Optional[np.ndarray] = None
+    concept_graph_ok: bool = False
+    # Bloom expected level: (level, confidence, indicators)
+    bloom_level: int = 2
+    bloom_confidence: float = 0.3
+    bloom_indicators: List[str] = field(default_factory=list)
+    compiled_at: str = ""
+    compile_seconds: float = 0.0
+
+    # ─── Reconstruction for scorers ──────────────────────────────────
+
+    def is_current(self, text: str, embedding_model: str, question_text: str = "") -> bool:
+        return (
+            self.version == ARTIFACT_VERSION
+            and self.text_hash == text_hash(text)
+            and self.question_hash == text_hash((question_text or "").strip())
+            and self.embedding_model == embedding_model
+        )
+
+    @property
+    def expected_bloom_level(self) -> Tuple[int, float, List[str]]:
+        return self.bloom_level, self.bloom_confidence, list(self.bloom_indicators)
+
+    def build_sentence_infos(self):
+        """Fresh ``SentenceInfo`` list (scorers mutate these)."""
+        from api.services.sentence_alignment_service import SentenceInfo
+
+        infos = []
+        for i, data in enumerate(self.sentences):
+            info = SentenceInfo(**data)
+            if self.sentence_embeddings is not None and i < len(self.sentence_embeddings):
+                info.embedding = self.sentence_embeddings[i]
+            infos.append(info)
+        return infos
+
+    def build_concept_graph(self):
+        """Fresh ``ConceptGraph`` with embedded nodes (matching mutates nodes)."""
+        from api.services.concept_graph_service import (
+            ConceptEdge, ConceptGraph, ConceptNode, Proposition,
+        )
+
+        graph = ConceptGraph()
+        for data in self.concept_nodes:
+            node = ConceptNode(
+                id=data["id"],
+                label=data["label"],
+                concept_type=data.get("concept_type", "entity"),
+                importance=data.get("importance", 1.0),
+                propositions=[Proposition(**p) for p in data.get("propositions", [])],
+            )
+            if data.get("has_embedding") and self.concept_embeddings is not None:
+                node.embedding = self.concept_embeddings[data["embedding_row"]]
+            graph.nodes[node.id] = node
+        graph.edges = [ConceptEdge(**e) for e in self.concept_edges]
+        graph._next_id = max(graph.nodes, default=-1) + 1
+        return graph
+
+    def seed_context(self, context) -> None:
+        """Pre-fill an ``EvaluationContext`` with the model-side sentences / vectors."""
+        if context.model_text != self.text or context.model_name != self.embedding_model:
+            return
+        context.set_sentences(self.text, self.raw_sentences)
+        if self.sentence_embeddings is not None:
+            context.add_embeddings([s["text"] for s in self.sentences], self.sentence_embeddings)
+        if self.document_embedding is not None:
+            context.add_embeddings([self.normalized_text], self.document_embedding[None, :])
+
+    # ─── Serialisation ───────────────────────────────────────────────
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "text_hash": self.text_hash,
+            "embedding_model": self.embedding_model,
+            "text": self.text,
+            "normalized_text": self.normalized_text,
+            "question_hash": self.question_hash,
+            "keywords": self.keywords,
+            "raw_sentences": self.raw_sentences,
+            "sentences": self.sentences,
+            "sentence_embeddings": _pack_array(self.sentence_embeddings),
+            "document_embedding": _pack_array(self.document_embedding),
+            "concept_nodes": self.concept_nodes,
+            "concept_edges": self.concept_edges,
+            "concept_embeddings": _pack_array(self.concept_embeddings),
+            "concept_graph_ok": self.concept_graph_ok,
+            "bloom_level": self.bloom_level,
+            "bloom_confidence": self.bloom_confidence,
+            "bloom_indicators": self.bloom_indicators,
+            "compiled_at": self.compiled_at,
+            "compile_seconds": self.compile_seconds,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompiledModelAnswer":
+        data = dict(data)
+        for key in ("sentence_embeddings", "document_embedding", "concept_embeddings"):
+            data[key] = _unpack_array(data.get(key))
+        return cls(**data)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Compiler
+# ═══════════════════════════════════════════════════════════════════════
+
+class ModelAnswerCompiler:
+    """Runs all model-side analysis for one model answer."""
+
+    def __init__(self, embedder=None):
+        """
+        Args:
+            embedder: object with ``.get_embedding(list[str])``
+                      (default: a ``SemanticAnalyzer``, which is cached)
+        """
+        self._embedder = embedder
+
+    def _ensure_embedder(self):
+        if self._embedder is None:
+            from api.services.semantic_service import SemanticAnalyzer
+            self._embedder = SemanticAnalyzer()
+        return self._embedder
+
+    def compile(self, model_text: str, question_text: str = "") -> CompiledModelAnswer:
+        from config.settings import settings
+        from api.services.nlp_service import NLPPreprocessor
+        from api.services.sentence_alignment_service import ImportanceScorer, SentenceSegmenter
+        from api.services.concept_graph_service import ConceptExtractor, SemanticGraphBuilder
+        from api.services.bloom_taxonomy_service import detect_question_level
+
+        start = time.time()
+        embedding_model = getattr(self._embedder, "model_name", None) or settings.SENTENCE_TRANSFORMER_MODEL
+
+        nlp = NLPPreprocessor()
+        normalized = nlp.normalize_text(model_text)
+        keywords = nlp.extract_keywords(model_text)
+
+        # ── Sentences + importance ───────────────────────────────
+        segmenter = SentenceSegmenter()
+        sent_infos = segmenter.segment(model_text)
+        raw_sentences = [s.text for s in sent_infos]
+        sent_infos = ImportanceScorer().score(sent_infos, model_text)
+
+        # ── Embeddings (sentences + whole document) ──────────────
+        sentence_embeddings = None
+        document_embedding = None
+        try:
+            embedder = self._ensure_embedder()
+            if sent_infos:
+                sentence_embeddings = np.asarray(
+                    embedder.get_embedding([s.text for s in sent_infos]), dtype=np.float32,
+                ).reshape(len(sent_infos), -1)
+            if normalized:
+                document_embedding = np.asarray(embedder.get_embedding(normalized), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Model answer embeddings unavailable: {e}")
+
+        # ── Concept graph ────────────────────────────────────────
+        concept_nodes: List[Dict[str, Any]] = []
+        concept_edges: List[Dict[str, Any]] = []
+        concept_embeddings = None
+        concept_graph_ok = False
+        try:
+            extractor = ConceptExtractor()
+            propositions = extractor.extract_propositions(model_text)
+            phrases = extractor.extract_key_phrases(model_text)
+            importance = {p: s for p, s in extractor.rank_by_importance(phrases, model_text)}
+            graph = SemanticGraphBuilder(self._ensure_embedder()).build(
+                model_text, propositions, phrases, importance,
+            )
+            vectors = []
+            for node in graph.nodes.values():
+                has_emb = node.embedding is not None
+                concept_nodes.append({
+                    "id": node.id,
+                    "label": node.label,
+                    "concept_type": node.concept_type,
+                    "importance": float(node.importance),
+                    "has_embedding": has_emb,
+                    "embedding_row": len(vectors) if has_emb else -1,
+                    "propositions": [
+                        {
+                            "subject": p.subject, "predicate": p.predicate,
+                            "object": p.object, "full_text": p.full_text,
+                            "importance": float(p.importance),
+                            "source_sentence": p.source_sentence,
+                        }
+                        for p in node.propositions
+                    ],
+                })
+                if has_emb:
+                    vectors.append(node.embedding)
+            concept_edges = [
+                {"source_id": e.source_id, "target_id": e.target_id,
+                 "relation": e.relation, "weight": float(e.weight)}
+                for e in graph.edges
+            ]
+            if vectors:
+                concept_embeddings = np.asarray(vectors, dtype=np.float32)
+            concept_graph_ok = True
+        except Exception as e:
+            logger.warning(f"Model answer concept graph compilation failed: {e}")
+
+        # ── Bloom expected level ─────────────────────────────────
+        bloom_level, bloom_conf, bloom_indicators = detect_question_level(question_text, model_text)
+
+        sentences = [
+            {
+                "index": s.index, "text": s.text, "role": s.role,
+                "importance": float(s.importance),
+                "role_weight": float(s.role_weight),
+                "tfidf_score": float(s.tfidf_score),
+                "position_weight": float(s.position_weight),
+                "entity_density": float(s.entity_density),
+                "keyword_boost": float(s.keyword_boost),
+                "word_count": s.word_count,
+            }
+            for s in sent_infos
+        ]
+
+        elapsed = time.time() - start
+        logger.info(
+            f"Compiled model answer: {len(sentences)} sentences, "
+            f"{len(concept_nodes)} concepts, {len(keywords)} keywords in {elapsed:.2f}s"
+        )
+        return CompiledModelAnswer(
+            version=ARTIFACT_VERSION,
+            text_hash=text_hash(model_text),
+            embedding_model=embedding_model,
+            text=model_text,
+            normalized_text=normalized,
+            question_hash=text_hash((question_text or "").strip()),
+            keywords=list(keywords),
+            raw_sentences=raw_sentences,
+            sentences=sentences,
+            sentence_embeddings=sentence_embeddings,
+            document_embedding=document_embedding,
+            concept_nodes=concept_nodes,
+            concept_edges=concept_edges,
+            concept_embeddings=concept_embeddings,
+            concept_graph_ok=concept_graph_ok,
+            bloom_level=bloom_level,
+            bloom_confidence=bloom_conf,
+            bloom_indicators=bloom_indicators,
+            compiled_at=datetime.utcnow().isoformat(),
+            compile_seconds=round(elapsed, 3),
+        )
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Caching
+# ═══════════════════════════════════════════════════════════════════════
+
+_artifacts: "OrderedDict[Tuple[str, str, str], CompiledModelAnswer]" = OrderedDict()
+_artifacts_lock = threading.Lock()
+
+
+def _cache_key(model_text: str, question_text: str, embedding_model: str) -> Tuple[str, str, str]:
+    return text_hash(model_text), text_hash((question_text or "").strip()), embedding_model
+
+
+def _remember(key, artifact: CompiledModelAnswer) -> None:
+    with _artifacts_lock:
+        _artifacts[key] = artifact
+        _artifacts.move_to_end(key)
+        while len(_artifacts) > MAX_CACHED_ARTIFACTS:
+            _artifacts.popitem(last=False)
+
+
+def get_compiled_model_answer(model_text: str, question_text: str = "") -> CompiledModelAnswer:
+    """Compiled artifact for *model_text*, compiling on first use per worker."""
+    from config.settings import settings
+
+    key = _cache_key(model_text, question_text, settings.SENTENCE_TRANSFORMER_MODEL)
+    with _artifacts_lock:
+        artifact = _artifacts.get(key)
+        if artifact is not None:
+            _artifacts.move_to_end(key)
+            return artifact
+
+    artifact = ModelAnswerCompiler().compile(model_text, question_text)
+    _remember(key, artifact)
+    return artifact
+
+
+def clear_compiled_cache() -> None:
+    with _artifacts_lock:
+        _artifacts.clear()
@@ -0,0 +1,225 @@
+"""
+Model Registry Service
+=======================
+Process-wide registry for the heavyweight NLP models used by the scoring
+pipeline.
+
+Problem
+-------
+Every evaluation request used to construct its own ``SemanticAnalyzer``,
+``AlignmentMatrixBuilder``, ``AntiGamingAnalyzer``, ``StructuralAnalyzer``,
+``ConceptExtractor`` and ``NLPPreprocessor``.  Each of those called
+``SentenceTransformer("all-MiniLM-L6-v2")`` or ``spacy.load("en_core_web_sm")``
+in its constructor, so a single ``POST /api/v1/evaluate/`` loaded MiniLM
+several times and spaCy four or five times.
+
+Solution
+--------
+A single ``ModelRegistry`` per worker process holds each model exactly once,
+keyed by ``(kind, name)``.  Services ask the registry for a reference instead
+of loading the model themselves:
+
+    from api.services.model_registry import get_model_registry
+    nlp = get_model_registry().get_spacy()
+    model = get_model_registry().get_sentence_transformer()
+
+*   Loading is thread-safe: a per-key lock guarantees that concurrent first
+    requests trigger exactly one load, while requests for *other* models are
+    not blocked.
+*   Failed loads are remembered, so a missing optional model (e.g. spaCy not
+    installed) costs one import attempt per process instead of one per
+    request.  ``clear()`` forgets both models and failures.
+*   Load timings and hit counts are recorded and exposed via ``get_stats()``
+    (surfaced on ``GET /api/info``).
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("AssessIQ.ModelRegistry")
+
+
+# Registry keys: (kind, name) — e.g. ("sentence_transformer", "all-MiniLM-L6-v2")
+ModelKey = Tuple[str, str]
+
+
+@dataclass
+class ModelLoadRecord:
+    """Bookkeeping for one registered model."""
+    kind: str
+    name: str
+    load_seconds: float = 0.0
+    loaded_at: float = 0.0
+    hits: int = 0
+    error: Optional[str] = None
+
+
+class ModelRegistry:
+    """
+    Thread-safe, load-once holder for shared model instances.
+
+    The registry never unloads models on its own: models live for the
+    lifetime of the worker process, which is exactly what makes the second
+    request to a worker free of model-loading cost.
+    """
+
+    KIND_SENTENCE_TRANSFORMER = "sentence_transformer"
+    KIND_SPACY = "spacy"
+
+    def __init__(self):
+        self._models: Dict[ModelKey, Any] = {}
+        self._failures: Dict[ModelKey, BaseException] = {}
+        self._records: Dict[ModelKey, ModelLoadRecord] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[ModelKey, threading.Lock] = {}
+
+    # ─── Generic API ─────────────────────────────────────────────────
+
+    def get_or_load(self, kind: str, name: str, loader: Callable[[], Any]) -> Any:
+        """
+        Return the model registered under ``(kind, name)``, loading it with
+        ``loader()`` on first use.
+
+        Raises the loader's exception (on this and every later call) if the
+        model could not be loaded.
+        """
+        key = (kind, name)
+
+        # Fast path — no locking once the model is resident
+        model = self._models.get(key)
+        if model is not None:
+            self._record_hit(key)
+            return model
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have finished loading while we waited
+            model = self._models.get(key)
+            if model is not None:
+                self._record_hit(key)
+                return model
+            if key in self._failures:
+                raise self._failures[key].with_traceback(None)
+
+            logger.info(f"Loading {kind} model: {name}")
+            start = time.time()
+            try:
+                model = loader()
+            except Exception as e:
+                self._failures[key] = e
+                self._records[key] = ModelLoadRecord(
+                    kind=kind, name=name,
+                    load_seconds=round(time.time() - start, 3),
+                    error=f"{type(e).__name__}: {e}",
+                )
+                logger.warning(f"Failed to load {kind} model '{name}': {e}")
+                raise
+
+            elapsed = time.time() - start
+            self._records[key] = ModelLoadRecord(
+                kind=kind, name=name,
+                load_seconds=round(elapsed, 3),
+                loaded_at=time.time(),
+                hits=1,
+            )
+            self._models[key] = model
+            logger.info(f"{kind} model '{name}' loaded in {elapsed:.2f}s")
+            return model
+
+    def _record_hit(self, key: ModelKey) -> None:
+        record = self._records.get(key)
+        if record is not None:
+            record.hits += 1
+
+    def is_loaded(self, kind: str, name: str) -> bool:
+        """Whether ``(kind, name)`` is resident (without triggering a load)."""
+        return (kind, name) in self._models
+
+    def clear(self) -> None:
+        """Forget every registered model and remembered failure."""
+        with self._lock:
+            self._models.clear()
+            self._failures.clear()
+            self._records.clear()
+            self._key_locks.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Load timings, hit counts and failures for every registered model."""
+        records = list(self._records.values())
+        return {
+            "loaded_count": len(self._models),
+            "failed_count": len(self._failures),
+            "total_load_seconds": round(sum(r.load_seconds for r in records), 3),
+            "models": [
+                {
+                    "kind": r.kind,
+                    "name": r.name,
+                    "loaded": r.error is None,
+                    "load_seconds": r.load_seconds,
+                    "hits": r.hits,
+                    "error": r.error,
+                }
+                for r in records
+            ],
+        }
+
+    # ─── Typed helpers ───────────────────────────────────────────────
+
+    def get_sentence_transformer(self, model_name: str = None):
+        """Shared ``SentenceTransformer`` (default: ``settings.SENTENCE_TRANSFORMER_MODEL``)."""
+        from config.settings import settings
+
+        name = model_name or settings.SENTENCE_TRANSFORMER_MODEL
+
+        def _load():
+            from sentence_transformers import SentenceTransformer
+            return SentenceTransformer(name)
+
+        return self.get_or_load(self.KIND_SENTENCE_TRANSFORMER, name, _load)
+
+    def get_spacy(self, model_name: str = None):
+        """
+        Shared spaCy ``Language`` pipeline (default: ``settings.SPACY_MODEL``).
+
+        Downloads the model once if it is not installed.  Raises
+        ``ImportError`` when spaCy itself is unavailable so callers can fall
+        back to their regex / NLTK paths.
+        """
+        from config.settings import settings
+
+        name = model_name or settings.SPACY_MODEL
+
+        def _load():
+            import spacy
+            try:
+                return spacy.load(name)
+            except OSError:
+                logger.info(f"Downloading spaCy model: {name}")
+                from spacy.cli import download
+                download(name)
+                return spacy.load(name)
+
+        return self.get_or_load(self.KIND_SPACY, name, _load)
+
+    def warm_up(self) -> None:
+        """Eagerly load the default models (used when LOW_MEMORY_MODE is off)."""
+        for getter in (self.get_spacy, self.get_sentence_transformer):
+            try:
+                getter()
+            except Exception as e:
+                logger.warning(f"Model warm-up skipped: {e}")
+
+
+# ─── Process-wide singleton ──────────────────────────────────────────
+
+_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the registry shared by every service in this worker process."""
+    return _registry
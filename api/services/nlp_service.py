@@ -102,18 +102,10 @@ class NLPPreprocessor:
     def _init_spacy(self):
         """Initialize spaCy NLP pipeline."""
         try:
-            import spacy
+            from api.services.model_registry import get_model_registry
             
-            try:
-                self._nlp = spacy.load(self.spacy_model_name)
-                logger.info(f"spaCy model '{self.spacy_model_name}' loaded successfully")
-            except OSError:
-                # Model not found, try to download
-                logger.info(f"Downloading spaCy model: {self.spacy_model_name}")
-                from spacy.cli import download
-                download(self.spacy_model_name)
-                self._nlp = spacy.load(self.spacy_model_name)
-                logger.info(f"spaCy model '{self.spacy_model_name}' downloaded and loaded")
+            # Shared per-process pipeline (downloads the model once if missing)
+            self._nlp = get_model_registry().get_spacy(self.spacy_model_name)
             
             # Update stopwords from spaCy
             self.stopwords.update(self._nlp.Defaults.stop_words)
@@ -0,0 +1,249 @@
+"""
+OCR Result Cache
+=================
+Global, content-addressed cache of OCR output.
+
+Problem
+-------
+The only OCR cache was the per-evaluation ``.cache/model_extracted.txt`` /
+``student_extracted.txt``.  Uploading the same model-answer PDF for a
+second section, or re-running with another scoring config, repeated the
+OCR from scratch.
+
+Solution
+--------
+Results are keyed by the SHA-256 of the file bytes (the checksum
+``FileStorageService`` already records) plus everything that changes the
+output: engine, languages, ``FAST_OCR_MODE``, the preprocessing version and
+the call options (language, preprocess, detail).  Two kinds of entry share
+one store:
+
+*   **document** — the per-page records of a whole file; a hit skips OCR
+    entirely.
+*   **page** — one rendered PDF page, keyed by the hash of its PNG render,
+    so a page that reappears in another PDF is not OCRed again.
+
+Each page record keeps the text, a mean confidence (detail mode) and the
+detail items.  Entries are JSON files under ``OCR_CACHE_DIR``; when the
+store grows past ``OCR_CACHE_MAX_MB`` the least recently used entries are
+evicted.  Results containing failed or timed-out pages are never stored.
+
+``get_stats()`` / ``purge()`` back ``GET`` / ``DELETE /admin/ocr-cache``.
+
+Usage:
+    cache = get_ocr_cache()
+    key = ocr_cache_key("document", checksum, config)
+    record = cache.get(key)          # None on a miss
+    cache.put(key, {"pages": [...]})
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("AssessIQ.OCRCache")
+
+# Eviction trims the store to this fraction of its budget, so a full cache
+# does not rescan the directory on every write
+EVICT_TO_FRACTION = 0.9
+
+
+def ocr_cache_key(kind: str, content_hash: str, config: Dict[str, Any]) -> str:
+    """Content address of *content_hash* OCRed under *config*."""
+    fingerprint = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(f"{kind}\x00{content_hash}\x00{fingerprint}".encode("utf-8")).hexdigest()
+
+
+def _json_default(value: Any) -> Any:
+    """Serialise numpy scalars / arrays found in engine detail output (bboxes)."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, tuple):
+        return list(value)
+    raise TypeError(f"Not JSON serialisable: {type(value).__name__}")
+
+
+class OCRCache:
+    """Size-bounded directory of JSON entries, evicted least recently used first."""
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max(0, max_bytes)
+        self._lock = threading.Lock()
+        self._size_bytes: Optional[int] = None  # computed lazily from disk
+
+        # Bookkeeping
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    # ─── Lookup / store ──────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)  # recency for LRU eviction
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return record
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        path = self._path(key)
+        try:
+            payload = json.dumps(record, default=_json_default, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"OCR result not cacheable: {e}")
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write OCR cache entry: {e}")
+            return
+
+        with self._lock:
+            self.writes += 1
+            if self._size_bytes is None:
+                self._size_bytes = self._scan_size()
+            else:
+                self._size_bytes += size - previous
+            over_budget = self.max_bytes and self._size_bytes > self.max_bytes
+        if over_budget:
+            self._evict()
+
+    # ─── Eviction / maintenance ──────────────────────────────────────
+
+    def _entries(self) -> List[os.DirEntry]:
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    entries.append(entry)
+        return entries
+
+    def _scan_size(self) -> int:
+        total = 0
+        for entry in self._entries():
+            try:
+                total += entry.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the store fits its budget."""
+        with self._lock:
+            stats = []
+            for entry in self._entries():
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                stats.append((st.st_mtime, st.st_size, entry.path))
+            stats.sort()
+            total = sum(size for _, size, _ in stats)
+            target = int(self.max_bytes * EVICT_TO_FRACTION)
+            removed = 0
+            for _, size, path in stats:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            self._size_bytes = total
+            self.evictions += removed
+        if removed:
+            logger.info(f"OCR cache evicted {removed} entries ({total / (1024 * 1024):.1f} MB kept)")
+
+    def purge(self) -> int:
+        """Delete every entry; returns how many were removed."""
+        removed = 0
+        with self._lock:
+            for entry in self._entries():
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except OSError:
+                    pass
+            self._size_bytes = 0
+            self.hits = self.misses = self.writes = self.evictions = 0
+        logger.info(f"OCR cache purged ({removed} entries)")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._entries()
+            size = 0
+            for entry in entries:
+                try:
+                    size += entry.stat().st_size
+                except OSError:
+                    pass
+            self._size_bytes = size
+            lookups = self.hits + self.misses
+            return {
+                "directory": os.path.abspath(self.directory),
+                "entries": len(entries),
+                "size_bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# ─── Process-wide singleton ──────────────────────────────────────────
+
+_cache: Optional[OCRCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_ocr_cache() -> Optional[OCRCache]:
+    """Shared cache configured from settings, or ``None`` when disabled."""
+    global _cache
+    from config.settings import settings
+
+    if not getattr(settings, "OCR_CACHE_ENABLED", True) or not getattr(settings, "OCR_CACHE_DIR", None):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = OCRCache(
+                    directory=settings.OCR_CACHE_DIR,
+                    max_bytes=int(settings.OCR_CACHE_MAX_MB * 1024 * 1024),
+                )
+    return _cache
@@ -0,0 +1,368 @@
+"""
+OCR Engine Pool
+================
+Per-process pool of initialised OCR engines.
+
+Problem
+-------
+``OCRService(engine=...)`` was constructed on every upload, evaluation and
+fallback (up to three per request in ``upload.py``).  Each instance
+re-created ``easyocr.Reader`` / ``PaddleOCR`` and an ``OCRQualityAnalyzer``,
+so every request paid the engines' cold start.
+
+Solution
+--------
+Initialised engine sets live in an ``OCREnginePool`` keyed by
+``(engine, languages)``.  ``OCRService`` is a thin facade: it checks a set
+out for the duration of one image / page and checks it back in.
+
+*   ``checkout()`` hands a set to one caller at a time (PaddleOCR is not
+    thread-safe, and EasyOCR readers are large).  Up to
+    ``OCR_ENGINE_POOL_SIZE`` sets are created per key
+    (``OCR_ENGINE_LOW_MEMORY_POOL_SIZE`` in LOW_MEMORY_MODE); further callers
+    wait up to ``OCR_ENGINE_CHECKOUT_TIMEOUT`` seconds.  The pool size is
+    also the cap on PDF page workers (``OCRService._pdf_page_workers``),
+    since every page holds a set while it runs.
+*   ``hold()`` keeps a set checked out past its ``checkout()`` block until
+    ``drop_hold()`` (ensemble engine threads still running after the page
+    stopped early).
+*   Sets idle for longer than ``OCR_ENGINE_IDLE_SECONDS`` are dropped by a
+    background reaper so their memory can be reclaimed.
+*   ``get_stats()`` (surfaced on ``GET /api/info``) reports sets per key,
+    loads, waits and evictions.
+
+Usage:
+    with get_ocr_engine_pool().checkout("easyocr", ["en", "hi"]) as engines:
+        engines.easyocr.readtext(image)
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("AssessIQ.OCREnginePool")
+
+# Pool keys: (engine, languages) — e.g. ("easyocr", ("en", "hi"))
+PoolKey = Tuple[str, Tuple[str, ...]]
+
+LOCAL_ENGINES = ("ensemble", "easyocr", "tesseract", "paddleocr")
+
+
+@dataclass
+class EngineSet:
+    """Initialised engines for one pool key; ``None`` where an engine is unavailable."""
+    key: PoolKey
+    easyocr: Any = None
+    tesseract: Any = None
+    paddleocr: Any = None
+    created_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    uses: int = 0
+    holds: int = 0                 # hold() calls not yet dropped
+    release_deferred: bool = False
+
+    @property
+    def engine(self) -> str:
+        return self.key[0]
+
+    @property
+    def languages(self) -> List[str]:
+        return list(self.key[1])
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Engine loaders
+# ═══════════════════════════════════════════════════════════════════════
+
+def _load_easyocr(languages: List[str]):
+    import easyocr
+    reader = easyocr.Reader(
+        languages, gpu=False,
+        download_enabled=True, detector=True, recognizer=True)
+    logger.info("EasyOCR initialised successfully")
+    return reader
+
+
+def _load_tesseract(languages: List[str]):
+    import pytesseract
+    from config.settings import settings
+    tess_path = getattr(settings, 'TESSERACT_PATH', None)
+    if tess_path:
+        pytesseract.pytesseract.tesseract_cmd = tess_path
+    # Validate Tesseract is actually installed
+    pytesseract.get_tesseract_version()
+    logger.info("Tesseract initialised successfully")
+    return pytesseract
+
+
+def _load_paddleocr(languages: List[str]):
+    from paddleocr import PaddleOCR
+    engine = PaddleOCR(
+        use_angle_cls=True, lang='en',
+        show_log=False, use_gpu=False)
+    logger.info("PaddleOCR initialised successfully")
+    return engine
+
+
+_LOADERS: Dict[str, Callable[[List[str]], Any]] = {
+    "easyocr": _load_easyocr,
+    "tesseract": _load_tesseract,
+    "paddleocr": _load_paddleocr,
+}
+
+
+def load_engine_set(key: PoolKey) -> EngineSet:
+    """
+    Initialise the engines for *key*.
+
+    Single-engine keys raise if their engine cannot be loaded.  ``ensemble``
+    loads every engine it can and only fails when none is available.
+    """
+    engine, languages = key[0], list(key[1])
+    engines = EngineSet(key=key)
+
+    if engine != "ensemble":
+        setattr(engines, engine, _LOADERS[engine](languages))
+        return engines
+
+    hints = {
+        "easyocr": "pip install easyocr",
+        "tesseract": "pip install pytesseract + Tesseract binary",
+        "paddleocr": "pip install paddlepaddle paddleocr",
+    }
+    loaded = []
+    for name, loader in _LOADERS.items():
+        try:
+            setattr(engines, name, loader(languages))
+            loaded.append(name)
+        except Exception as e:
+            logger.warning(f"{name} init failed (install: {hints[name]}): {e}")
+    if not loaded:
+        raise RuntimeError(
+            "No OCR engines could be initialised. "
+            "Install at least one: pip install easyocr"
+        )
+    logger.info(f"Ensemble OCR ready with {len(loaded)} engines: {', '.join(loaded)}")
+    return engines
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Pool
+# ═══════════════════════════════════════════════════════════════════════
+
+class EngineCheckoutTimeout(RuntimeError):
+    """No engine set for the key became free within the checkout timeout."""
+
+
+class OCREnginePool:
+    """Thread-safe checkout / checkin of initialised engine sets."""
+
+    def __init__(
+        self,
+        max_per_key: int = 1,
+        idle_seconds: float = 900.0,
+        checkout_timeout: float = 300.0,
+        loader: Callable[[PoolKey], EngineSet] = load_engine_set,
+    ):
+        self.max_per_key = max(1, max_per_key)
+        self.idle_seconds = idle_seconds
+        self.checkout_timeout = checkout_timeout
+        self._loader = loader
+
+        self._idle: Dict[PoolKey, List[EngineSet]] = {}
+        self._created: Dict[PoolKey, int] = {}   # live sets (idle + checked out) per key
+        self._cond = threading.Condition()
+        self._reaper: Optional[threading.Thread] = None
+
+        # Bookkeeping
+        self.loads = 0
+        self.load_seconds = 0.0
+        self.checkouts = 0
+        self.waits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(engine: str, languages: Sequence[str]) -> PoolKey:
+        return engine, tuple(languages)
+
+    # ─── Checkout / checkin ──────────────────────────────────────────
+
+    @contextmanager
+    def checkout(self, engine: str, languages: Sequence[str],
+                 timeout: Optional[float] = None) -> Iterator[EngineSet]:
+        """Borrow an engine set for *(engine, languages)*; returned on exit."""
+        engines = self.acquire(engine, languages, timeout=timeout)
+        try:
+            yield engines
+        finally:
+            self.release(engines)
+
+    def acquire(self, engine: str, languages: Sequence[str],
+                timeout: Optional[float] = None) -> EngineSet:
+        key = self.make_key(engine, languages)
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout if timeout else None
+
+        with self._cond:
+            waited = False
+            while True:
+                idle = self._idle.get(key)
+                if idle:
+                    engines = idle.pop()
+                    break
+                if self._created.get(key, 0) < self.max_per_key:
+                    # Reserve the slot, then load outside the lock
+                    self._created[key] = self._created.get(key, 0) + 1
+                    engines = None
+                    break
+                if not waited:
+                    self.waits += 1
+                    waited = True
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise EngineCheckoutTimeout(
+                        f"No {engine} OCR engine free after {timeout:.0f}s "
+                        f"({self.max_per_key} in use)"
+                    )
+                self._cond.wait(remaining)
+            self.checkouts += 1
+
+        if engines is None:
+            start = time.time()
+            logger.info(f"Loading OCR engines for {key[0]} {list(key[1])}")
+            try:
+                engines = self._loader(key)
+            except BaseException:
+                with self._cond:
+                    self._created[key] -= 1
+                    self._cond.notify()
+                raise
+            elapsed = time.time() - start
+            with self._cond:
+                self.loads += 1
+                self.load_seconds += elapsed
+            logger.info(f"OCR engines for {key[0]} ready in {elapsed:.1f}s")
+            self._ensure_reaper()
+
+        engines.uses += 1
+        return engines
+
+    def release(self, engines: EngineSet) -> None:
+        engines.last_used = time.time()
+        with self._cond:
+            if engines.holds:
+                engines.release_deferred = True   # checked in by drop_hold()
+                return
+            self._idle.setdefault(engines.key, []).append(engines)
+            self._cond.notify()
+
+    def hold(self, engines: EngineSet) -> None:
+        """Keep a checked-out set from returning to the pool until ``drop_hold()``."""
+        with self._cond:
+            engines.holds += 1
+
+    def drop_hold(self, engines: EngineSet) -> None:
+        """Undo one ``hold()``; a release that arrived meanwhile happens now."""
+        with self._cond:
+            engines.holds -= 1
+            if engines.holds or not engines.release_deferred:
+                return
+            engines.release_deferred = False
+        self.release(engines)
+
+    def warm(self, engine: str, languages: Sequence[str]) -> None:
+        """Create one set for the key now (used when LOW_MEMORY_MODE is off)."""
+        with self.checkout(engine, languages):
+            pass
+
+    # ─── Idle eviction ───────────────────────────────────────────────
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Drop idle sets unused for ``idle_seconds``; returns how many."""
+        now = time.time() if now is None else now
+        removed = 0
+        with self._cond:
+            for key, idle in self._idle.items():
+                keep = [e for e in idle if now - e.last_used < self.idle_seconds]
+                dropped = len(idle) - len(keep)
+                if dropped:
+                    idle[:] = keep
+                    self._created[key] -= dropped
+                    removed += dropped
+            self.evictions += removed
+            if removed:
+                self._cond.notify_all()
+        if removed:
+            logger.info(f"Evicted {removed} idle OCR engine set(s)")
+            import gc
+            gc.collect()
+        return removed
+
+    def _ensure_reaper(self) -> None:
+        if not self.idle_seconds or self.idle_seconds <= 0:
+            return
+        with self._cond:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(target=self._reap_loop, name="ocr-engine-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self) -> None:
+        interval = max(1.0, min(self.idle_seconds / 2, 60.0))
+        while True:
+            time.sleep(interval)
+            self.evict_idle()
+            with self._cond:
+                if not any(self._created.values()):
+                    self._reaper = None
+                    return
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            keys = [
+                {
+                    "engine": key[0],
+                    "languages": list(key[1]),
+                    "sets": count,
+                    "idle": len(self._idle.get(key, [])),
+                }
+                for key, count in self._created.items() if count
+            ]
+            return {
+                "max_per_key": self.max_per_key,
+                "idle_seconds": self.idle_seconds,
+                "keys": keys,
+                "loads": self.loads,
+                "load_seconds": round(self.load_seconds, 3),
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "evictions": self.evictions,
+            }
+
+
+# ─── Process-wide singleton ──────────────────────────────────────────
+
+_pool: Optional[OCREnginePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_ocr_engine_pool() -> OCREnginePool:
+    """Shared pool configured from settings."""
+    global _pool
+    from config.settings import settings
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                size = settings.OCR_ENGINE_POOL_SIZE
+                if settings.LOW_MEMORY_MODE:
+                    size = min(size, settings.OCR_ENGINE_LOW_MEMORY_POOL_SIZE)
+                _pool = OCREnginePool(
+                    max_per_key=size,
+                    idle_seconds=settings.OCR_ENGINE_IDLE_SECONDS,
+                    checkout_timeout=settings.OCR_ENGINE_CHECKOUT_TIMEOUT,
+                )
+    return _pool
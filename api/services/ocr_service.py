@@ -21,9 +21,15 @@ Messy Handwriting Optimisations:
   - Auto image-quality detection (faded / noisy / low-contrast)
 
 Speed Optimisation:
-  - All 3 engines run in PARALLEL via ThreadPoolExecutor (~3x faster)
-  - Smart image sizing: cap at 3500px max (prevents slowdown on huge imgs)
-  - Early exit when best engine quality > 0.75 (skips unnecessary work)
+  - All 3 engines run in PARALLEL, one thread each (~3x faster)
+  - Smart image sizing: cap at 3500px max (prevents slowdown on huge imgs);
+    large JPEGs are decoded at reduced scale, every image is held to an
+    OCR_MAX_MEGAPIXELS budget before filtering, skew is estimated on a
+    thumbnail and the NLM / bilateral denoisers run tile by tile
+  - Early exit: queued variants are cancelled as soon as one result
+    scores > 0.75 or the per-page deadline passes (skips unnecessary work)
+  - Load / deskew / resize / grayscale done once per image and shared;
+    variants reach the engines as in-memory arrays (no temp PNGs)
   - Total: ~5-12 seconds per image (vs 30-90s sequential)
 
 Accuracy Strategy:
@@ -46,16 +52,16 @@ Engines Supported:
 import os
 import re
 import logging
+import threading
 import time
 import base64
 import tempfile
 import requests
 import difflib
-import zipfile
 from typing import Optional, List, Tuple, Union, Dict
-from pathlib import Path
 from collections import Counter
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 import numpy as np
 
 logger = logging.getLogger("AssessIQ.OCR")
@@ -65,6 +71,14 @@ logger = logging.getLogger("AssessIQ.OCR")
 # Image Preprocessor
 # ---------------------------------------------------------------------------
 
+@dataclass
+class PreparedImage:
+    """Preprocessing base shared by every variant of one image."""
+    image: np.ndarray                      # deskewed + resized (BGR)
+    gray: np.ndarray                       # grayscale of ``image``
+    quality: Dict[str, bool] = field(default_factory=dict)  # auto_detect_image_quality()
+
+
 class ImagePreprocessor:
     """
     Advanced Image Preprocessing Pipeline for Handwriting OCR.
@@ -76,6 +90,18 @@ class ImagePreprocessor:
       - Tesseract: Binarised adaptive threshold (black/white text)
     """
 
+    # Part of the OCR cache key: bump whenever a change here alters the
+    # variants an engine sees, so cached results from the old pipeline miss
+    VERSION = 3
+
+    # Reduced JPEG decode factors (libjpeg DCT scaling), largest first
+    DECODE_REDUCTIONS = (8, 4, 2)
+    # Long side of the thumbnail used to estimate skew
+    SKEW_THUMBNAIL = 1600
+    # Overlap around each filter tile; covers the NLM search + template
+    # radius (10 + 3) and the bilateral radius (4), so tiles join seamlessly
+    TILE_MARGIN = 16
+
     def __init__(self):
         self._available = False
         self.cv2 = None
@@ -89,12 +115,78 @@ class ImagePreprocessor:
 
     # --- Basic Helpers ---
 
-    def load_image(self, image_path: str) -> np.ndarray:
-        """Load image from disk."""
-        img = self.cv2.imread(image_path)
+    def load_image(self, image_path: str, max_dimension: int = 3500,
+                   max_pixels: Optional[int] = None) -> np.ndarray:
+        """
+        Load image from disk within a pixel budget.
+
+        JPEGs whose long side is at least 2×/4×/8× *max_dimension* (the most
+        ``resize_for_ocr`` keeps) are decoded at that reduced scale, so the
+        full-resolution bitmap is never allocated.  Anything still above
+        *max_pixels* (default ``OCR_MAX_MEGAPIXELS``) is area-downscaled
+        straight after decoding, before any filter runs.
+        """
+        flag = self.cv2.IMREAD_COLOR
+        header = self._image_header(image_path)
+        if header and header[0] == "JPEG":
+            long_side = max(header[1])
+            for factor in self.DECODE_REDUCTIONS:
+                if long_side / factor >= max_dimension:
+                    flag = getattr(self.cv2, f"IMREAD_REDUCED_COLOR_{factor}")
+                    break
+        img = self.cv2.imread(image_path, flag)
         if img is None:
             raise FileNotFoundError(f"Cannot read image: {image_path}")
-        return img
+        return self.fit_pixel_budget(img, max_pixels)
+
+    @staticmethod
+    def _image_header(image_path: str) -> Optional[Tuple[str, Tuple[int, int]]]:
+        """(format, (width, height)) from the file header, without decoding pixels."""
+        try:
+            from PIL import Image
+            with Image.open(image_path) as im:
+                return im.format, im.size
+        except Exception:
+            return None
+
+    def fit_pixel_budget(self, image: np.ndarray, max_pixels: Optional[int] = None) -> np.ndarray:
+        """Area-downscale *image* to at most *max_pixels* (``OCR_MAX_MEGAPIXELS`` by default; 0 = no cap)."""
+        if max_pixels is None:
+            from config.settings import settings
+            max_pixels = int(getattr(settings, 'OCR_MAX_MEGAPIXELS', 0) * 1_000_000)
+        h, w = image.shape[:2]
+        if not max_pixels or h * w <= max_pixels:
+            return image
+        scale = (max_pixels / (h * w)) ** 0.5
+        size = (max(1, int(w * scale)), max(1, int(h * scale)))
+        logger.debug(f"Image {w}x{h} over pixel budget, decoding at {size[0]}x{size[1]}")
+        return self.cv2.resize(image, size, interpolation=self.cv2.INTER_AREA)
+
+    def _tiled(self, image: np.ndarray, func, tile: Optional[int] = None) -> np.ndarray:
+        """
+        Apply a local filter tile by tile (``OCR_FILTER_TILE_SIZE``; 0 = whole image).
+
+        Each tile is filtered with ``TILE_MARGIN`` pixels of context and only
+        its interior is kept, so the output matches a whole-image run while
+        the filter's working buffers stay tile-sized.
+        """
+        if tile is None:
+            from config.settings import settings
+            tile = getattr(settings, 'OCR_FILTER_TILE_SIZE', 0)
+        h, w = image.shape[:2]
+        if not tile or (h <= tile and w <= tile):
+            return func(image)
+
+        m = self.TILE_MARGIN
+        out = np.empty_like(image)
+        for y in range(0, h, tile):
+            for x in range(0, w, tile):
+                y0, x0 = max(0, y - m), max(0, x - m)
+                y1, x1 = min(h, y + tile + m), min(w, x + tile + m)
+                filtered = func(np.ascontiguousarray(image[y0:y1, x0:x1]))
+                th, tw = min(tile, h - y), min(tile, w - x)
+                out[y:y + th, x:x + tw] = filtered[y - y0:y - y0 + th, x - x0:x - x0 + tw]
+        return out
 
     def convert_to_grayscale(self, image: np.ndarray) -> np.ndarray:
         """Convert to grayscale if needed."""
@@ -125,12 +217,12 @@ class ImagePreprocessor:
         return clahe.apply(gray)
 
     def denoise(self, image: np.ndarray, strength: int = 10) -> np.ndarray:
-        """Apply Non-Local Means denoising."""
-        return self.cv2.fastNlMeansDenoising(image, None, strength, 7, 21)
+        """Apply Non-Local Means denoising (tiled)."""
+        return self._tiled(image, lambda t: self.cv2.fastNlMeansDenoising(t, None, strength, 7, 21))
 
     def denoise_bilateral(self, gray: np.ndarray) -> np.ndarray:
-        """Edge-preserving bilateral filter (best for handwriting)."""
-        return self.cv2.bilateralFilter(gray, 9, 75, 75)
+        """Edge-preserving bilateral filter (best for handwriting; tiled)."""
+        return self._tiled(gray, lambda t: self.cv2.bilateralFilter(t, 9, 75, 75))
 
     def sharpen(self, image: np.ndarray) -> np.ndarray:
         """Apply sharpening kernel."""
@@ -175,26 +267,41 @@ class ImagePreprocessor:
         lines = self.cv2.morphologyEx(binary, self.cv2.MORPH_OPEN, h_kernel, iterations=2)
         return self.cv2.add(binary, self.cv2.bitwise_not(lines))
 
+    def estimate_skew(self, image: np.ndarray) -> float:
+        """
+        Skew angle in degrees from Hough lines on a thumbnail (0.0 if none found).
+
+        Images longer than ``SKEW_THUMBNAIL`` are estimated on a downscaled
+        copy; the Hough vote threshold scales with it, since votes grow with
+        line length in pixels.
+        """
+        h, w = image.shape[:2]
+        scale = min(1.0, self.SKEW_THUMBNAIL / max(h, w))
+        if scale < 1.0:
+            image = self.cv2.resize(image, None, fx=scale, fy=scale,
+                                    interpolation=self.cv2.INTER_AREA)
+        gray = self.convert_to_grayscale(image)
+        edges = self.cv2.Canny(gray, 50, 150, apertureSize=3)
+        lines = self.cv2.HoughLines(edges, 1, np.pi / 180, max(60, int(round(200 * scale))))
+        if lines is None or len(lines) == 0:
+            return 0.0
+        angles = []
+        for rho, theta in lines[:20, 0]:
+            angle = (theta * 180 / np.pi) - 90
+            if -15 < angle < 15:
+                angles.append(angle)
+        return float(np.median(angles)) if angles else 0.0
+
     def correct_skew(self, image: np.ndarray) -> np.ndarray:
         """Correct image skew using Hough line detection."""
         try:
-            gray = self.convert_to_grayscale(image)
-            edges = self.cv2.Canny(gray, 50, 150, apertureSize=3)
-            lines = self.cv2.HoughLines(edges, 1, np.pi / 180, 200)
-            if lines is not None and len(lines) > 0:
-                angles = []
-                for rho, theta in lines[:20, 0]:
-                    angle = (theta * 180 / np.pi) - 90
-                    if -15 < angle < 15:
-                        angles.append(angle)
-                if angles:
-                    median_angle = np.median(angles)
-                    if abs(median_angle) > 0.3:
-                        h, w = image.shape[:2]
-                        M = self.cv2.getRotationMatrix2D((w / 2, h / 2), median_angle, 1.0)
-                        return self.cv2.warpAffine(image, M, (w, h),
-                                                    flags=self.cv2.INTER_CUBIC,
-                                                    borderMode=self.cv2.BORDER_REPLICATE)
+            median_angle = self.estimate_skew(image)
+            if abs(median_angle) > 0.3:
+                h, w = image.shape[:2]
+                M = self.cv2.getRotationMatrix2D((w / 2, h / 2), median_angle, 1.0)
+                return self.cv2.warpAffine(image, M, (w, h),
+                                            flags=self.cv2.INTER_CUBIC,
+                                            borderMode=self.cv2.BORDER_REPLICATE)
         except Exception as e:
             logger.debug(f"Skew correction skipped: {e}")
         return image
@@ -271,10 +378,12 @@ class ImagePreprocessor:
 
     def auto_detect_image_quality(self, gray: np.ndarray) -> dict:
         """Analyse image to decide how aggressively to preprocess."""
-        mean_val = float(np.mean(gray))
-        std_val = float(np.std(gray))
+        # meanStdDev / a 16-bit Laplacian avoid full-size float64 temporaries
+        mean, std = self.cv2.meanStdDev(gray)
+        mean_val, std_val = float(mean[0, 0]), float(std[0, 0])
         is_faded = mean_val > 180 and std_val < 45
-        laplacian_var = float(self.cv2.Laplacian(gray, self.cv2.CV_64F).var())
+        _, lap_std = self.cv2.meanStdDev(self.cv2.Laplacian(gray, self.cv2.CV_16S))
+        laplacian_var = float(lap_std[0, 0]) ** 2
         is_noisy = laplacian_var > 2000
         is_low_contrast = std_val < 40
         return {
@@ -284,23 +393,35 @@ class ImagePreprocessor:
             'needs_heavy_preprocessing': is_faded or is_noisy or is_low_contrast,
         }
 
+    # --- Shared Base ---
+
+    def prepare(self, image_path: str) -> PreparedImage:
+        """Load, deskew, resize, grayscale and quality-probe an image once."""
+        img = self.load_image(image_path)
+        img = self.correct_skew(img)
+        img = self.resize_for_ocr(img)
+        gray = self.convert_to_grayscale(img)
+        return PreparedImage(image=img, gray=gray, quality=self.auto_detect_image_quality(gray))
+
     # --- Engine-Specific Preprocessing ---
 
-    def get_variants_for_engine(self, image_path: str, engine: str) -> List[Tuple[str, np.ndarray]]:
+    def get_variants_for_engine(self, image_path: str, engine: str,
+                                base: Optional[PreparedImage] = None) -> List[Tuple[str, np.ndarray]]:
         """
         Return 3-4 best preprocessed variants for a specific engine,
         including messy-handwriting-optimised variants.
+
+        Pass *base* (from ``prepare``) to reuse one load/deskew/resize
+        across engines.
         """
         variants = []
         try:
-            img = self.load_image(image_path)
-            img = self.correct_skew(img)
-            img = self.resize_for_ocr(img)
-            gray = self.convert_to_grayscale(img)
+            if base is None:
+                base = self.prepare(image_path)
+            img, gray = base.image, base.gray
 
             # Auto-detect image quality to decide extra variants
-            quality_info = self.auto_detect_image_quality(gray)
-            heavy = quality_info['needs_heavy_preprocessing']
+            heavy = base.quality['needs_heavy_preprocessing']
 
             if engine == "paddleocr":
                 # PaddleOCR: works best with enhanced contrast (colour or CLAHE gray)
@@ -353,16 +474,16 @@ class ImagePreprocessor:
                 pass
         return variants
 
-    def get_all_preprocessed_versions(self, image_path: str) -> List[Tuple[str, np.ndarray]]:
+    def get_all_preprocessed_versions(self, image_path: str,
+                                      base: Optional[PreparedImage] = None) -> List[Tuple[str, np.ndarray]]:
         """
         Generate ALL preprocessed versions (for non-ensemble single-engine mode).
         """
         versions = []
         try:
-            img = self.load_image(image_path)
-            img = self.correct_skew(img)
-            img = self.resize_for_ocr(img)
-            gray = self.convert_to_grayscale(img)
+            if base is None:
+                base = self.prepare(image_path)
+            img, gray = base.image, base.gray
 
             versions.append(("original", img))
             versions.append(("clahe", self.apply_clahe(gray, clip_limit=2.5)))
@@ -412,17 +533,95 @@ class ImagePreprocessor:
 # Ensemble Text Fusion
 # ---------------------------------------------------------------------------
 
+def banded_alignment(n: int, m: int, score, gap: float, band: int = 8) -> List[Tuple[Optional[int], Optional[int]]]:
+    """
+    Needleman-Wunsch global alignment of two sequences of length *n* and *m*,
+    restricted to a band of ±*band* cells around the diagonal.
+
+    ``score(i, j)`` is the reward for pairing element *i* with *j* (``-inf``
+    forbids the pair) and *gap* the reward for skipping an element.  Only
+    the band is filled, so the cost is O((n + m) · band).
+
+    Returns the alignment as ``(i, j)`` pairs, with ``None`` on the side of a gap.
+    """
+    if not n or not m:
+        return [(i, None) for i in range(n)] + [(None, j) for j in range(m)]
+
+    # The band follows the diagonal (0, 0) → (n, m) and must be wider than
+    # its slope so consecutive rows overlap
+    band = max(band, -(-m // n) + 1)
+    neg = float("-inf")
+    DIAG, UP, LEFT = 0, 1, 2
+
+    def bounds(i: int) -> Tuple[int, int]:
+        centre = i * m // n
+        return max(0, centre - band), min(m, centre + band)
+
+    lo, hi = bounds(0)
+    prev = [j * gap for j in range(lo, hi + 1)]
+    prev_lo, prev_hi = lo, hi
+    moves = [(lo, [LEFT] * (hi - lo + 1))]
+
+    for i in range(1, n + 1):
+        lo, hi = bounds(i)
+        row = [neg] * (hi - lo + 1)
+        row_moves = [UP] * (hi - lo + 1)
+        for j in range(lo, hi + 1):
+            best, move = neg, UP
+            if prev_lo <= j <= prev_hi:
+                best = prev[j - prev_lo] + gap
+            if j > 0 and prev_lo <= j - 1 <= prev_hi:
+                value = prev[j - 1 - prev_lo] + score(i - 1, j - 1)
+                if value > best:
+                    best, move = value, DIAG
+            if j > lo:
+                value = row[j - 1 - lo] + gap
+                if value > best:
+                    best, move = value, LEFT
+            row[j - lo], row_moves[j - lo] = best, move
+        prev, prev_lo, prev_hi = row, lo, hi
+        moves.append((lo, row_moves))
+
+    pairs: List[Tuple[Optional[int], Optional[int]]] = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        lo, row_moves = moves[i]
+        move = row_moves[j - lo]
+        if move == DIAG:
+            i, j = i - 1, j - 1
+            pairs.append((i, j))
+        elif move == UP:
+            i -= 1
+            pairs.append((i, None))
+        else:
+            j -= 1
+            pairs.append((None, j))
+    pairs.reverse()
+    return pairs
+
+
 class TextFuser:
     """
     Fuse text from multiple OCR engines using confidence-weighted voting.
 
     Algorithm:
-      1. Split each engine output into lines
-      2. Align lines across engines using SequenceMatcher
-      3. For aligned lines, do word-level majority voting weighted by confidence
-      4. Pick the best word based on combined confidence + alphabetic quality
+      1. Split each engine output into lines of word tokens (interned to ids)
+      2. Map every engine's lines onto the anchor's lines in one monotone,
+         banded DP pass scored by token overlap
+      3. Align the words of each matched line to the anchor's words with a
+         banded Needleman-Wunsch pass, so an inserted or dropped word only
+         affects its own column
+      4. Vote per column, weighted by confidence; dictionary words win, and a
+         column is dropped when most of the weight aligned a gap there
     """
 
+    LINE_MATCH_CUTOFF = 0.25   # minimum token overlap (Dice) to pair two lines
+    LINE_BAND = 16             # alignment band, in lines / words
+    WORD_BAND = 8
+
+    # Word alignment rewards
+    MATCH, SIMILAR, SUBSTITUTE, GAP = 2.0, 1.0, -1.0, -1.0
+
     @staticmethod
     def fuse(results: List[Dict], quality_analyzer=None) -> str:
         """
@@ -451,39 +650,58 @@ class TextFuser:
             r.get("confidence", 0)
         ), reverse=True)
 
-        anchor_lines = results[0]["text"].strip().splitlines()
-        all_engine_lines = []
+        fuser = _FusionState(quality_analyzer)
+        engine_lines = []
         for r in results:
-            lines = r["text"].strip().splitlines()
+            lines = [fuser.tokenize(line) for line in r["text"].strip().splitlines()]
             # Use quality_score for fusion weighting when available
             weight = r.get("quality_score", r.get("confidence", 0.5))
-            all_engine_lines.append((lines, weight))
+            engine_lines.append((lines, weight))
+
+        anchor_lines, anchor_weight = engine_lines[0]
+        candidates: List[List[Tuple[List[str], List[int], float]]] = [
+            [(words, ids, anchor_weight)] for words, ids in anchor_lines
+        ]
+        for lines, weight in engine_lines[1:]:
+            for i, j in TextFuser._align_lines(anchor_lines, lines):
+                if i is not None and j is not None:
+                    candidates[i].append((*lines[j], weight))
 
         fused_lines = []
-        for anchor_line in anchor_lines:
-            if not anchor_line.strip():
+        for line_candidates in candidates:
+            if not line_candidates[0][0]:
                 fused_lines.append("")
                 continue
-
-            # Gather best-matching line from each engine
-            candidates: List[Tuple[str, float]] = [(anchor_line, all_engine_lines[0][1])]
-            for lines, conf in all_engine_lines[1:]:
-                best_match = difflib.get_close_matches(anchor_line, lines, n=1, cutoff=0.25)
-                if best_match:
-                    candidates.append((best_match[0], conf))
-
             # Word-level voting across all candidates for this line
-            fused_line = TextFuser._vote_words(candidates, quality_analyzer)
-            fused_lines.append(fused_line)
+            fused_lines.append(TextFuser._vote_words(line_candidates, fuser))
 
         return "\n".join(fused_lines).strip()
 
     @staticmethod
-    def _vote_words(candidates: List[Tuple[str, float]], quality_analyzer=None) -> str:
+    def _align_lines(anchor, lines) -> List[Tuple[Optional[int], Optional[int]]]:
+        """Monotone line-to-line mapping maximising total token overlap."""
+        anchor_sets = [frozenset(ids) for _, ids in anchor]
+        line_sets = [frozenset(ids) for _, ids in lines]
+
+        def score(i: int, j: int) -> float:
+            a, b = anchor_sets[i], line_sets[j]
+            if not a or not b:
+                return float("-inf")
+            dice = 2.0 * len(a & b) / (len(a) + len(b))
+            return dice if dice >= TextFuser.LINE_MATCH_CUTOFF else float("-inf")
+
+        return banded_alignment(len(anchor), len(lines), score, 0.0, TextFuser.LINE_BAND)
+
+    @staticmethod
+    def _vote_words(candidates: List[Tuple[List[str], List[int], float]], fuser: "_FusionState") -> str:
         """
         Enhanced word-level majority voting with dictionary preference.
         
-        For each word position, all engines vote. Selection priority:
+        Every candidate line is aligned to the anchor (the first candidate);
+        words an engine inserts between two anchor words get their own
+        columns.  Per column, a word is emitted only if the engines voting
+        for it (or an OCR variant of it) outweigh those that aligned a gap.
+        Selection priority:
           1. Valid dictionary word (if quality_analyzer provided)
           2. Highest cumulative quality-weighted confidence
           3. Alphabetic quality (more real letters = better)
@@ -491,44 +709,146 @@ class TextFuser:
         This ensures real English words beat OCR garbage even if
         the garbage comes from a higher-confidence engine.
         """
+        anchor_words, anchor_ids, anchor_weight = candidates[0]
         if len(candidates) == 1:
-            return candidates[0][0]
-
-        word_lists = [(c[0].split(), c[1]) for c in candidates]
-        max_len = max(len(wl[0]) for wl in word_lists)
+            return " ".join(anchor_words)
+
+        n = len(anchor_words)
+        columns: List[Dict[str, Dict]] = [{} for _ in range(n)]
+        inserted: List[List[Dict[str, Dict]]] = [[] for _ in range(n + 1)]  # before anchor word k
+        total = sum(c[2] for c in candidates)
+
+        for k, word in enumerate(anchor_words):
+            fuser.add_vote(columns[k], word, anchor_ids[k], anchor_weight)
+
+        for words, ids, weight in candidates[1:]:
+            slot, run = 0, []
+            # (n, None) flushes a run inserted after the last anchor word
+            for i, j in fuser.align_words(anchor_ids, ids) + [(n, None)]:
+                if i is None:
+                    run.append(j)
+                    continue
+                if run:
+                    fuser.merge_insertion(inserted[slot], [(words[j], ids[j]) for j in run], weight)
+                    run = []
+                if j is not None:
+                    fuser.add_vote(columns[i], words[j], ids[j], weight)
+                slot = i + 1
 
         fused_words = []
-        for i in range(max_len):
-            weighted: Dict[str, Dict] = {}
-            for words, conf in word_lists:
-                if i < len(words):
-                    word = words[i].strip()
-                    if word:
-                        key = word.lower()
-                        if key not in weighted:
-                            is_valid = (quality_analyzer.is_valid_word(word)
-                                        if quality_analyzer else False)
-                            weighted[key] = {
-                                "word": word, "score": 0.0,
-                                "alpha_count": 0, "is_dict_word": is_valid,
-                            }
-                        weighted[key]["score"] += conf
-                        alpha_count = sum(c.isalpha() for c in word)
-                        if alpha_count > weighted[key]["alpha_count"]:
-                            weighted[key]["word"] = word
-                            weighted[key]["alpha_count"] = alpha_count
-
-            if weighted:
-                # Priority: dictionary word > confidence score > alpha quality
-                best = max(weighted.values(), key=lambda v: (
-                    v.get("is_dict_word", False),
-                    v["score"],
-                    v["alpha_count"],
-                ))
-                fused_words.append(best["word"])
+        for k in range(n + 1):
+            for column in inserted[k]:
+                word = TextFuser._pick(column, total, fuser)
+                if word:
+                    fused_words.append(word)
+            if k < n:
+                word = TextFuser._pick(columns[k], total, fuser)
+                if word:
+                    fused_words.append(word)
 
         return " ".join(fused_words)
 
+    @staticmethod
+    def _pick(column: Dict[str, Dict], total: float, fuser: "_FusionState") -> Optional[str]:
+        if not column:
+            return None
+        # Priority: dictionary word > confidence score > alpha quality
+        best = max(column.values(), key=lambda v: (
+            v["is_dict_word"],
+            v["score"],
+            v["alpha_count"],
+        ))
+        # Only the winner and its OCR variants count against a gap, so
+        # unrelated stray words from different engines don't add up
+        gap = total - sum(v["score"] for v in column.values())
+        support = sum(v["score"] for v in column.values()
+                      if v["token"] == best["token"] or fuser.similar(v["token"], best["token"]))
+        return best["word"] if support >= gap else None
+
+
+class _FusionState:
+    """Token interning and per-token caches for one ``TextFuser.fuse`` call."""
+
+    def __init__(self, quality_analyzer=None):
+        self.quality_analyzer = quality_analyzer
+        self._ids: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._valid: Dict[str, bool] = {}
+        self._similar: Dict[Tuple[int, int], bool] = {}
+
+    @staticmethod
+    def normalise(word: str) -> str:
+        return word.strip(".,;:!?\"'()[]{}").lower() or word.lower()
+
+    def tokenize(self, line: str) -> Tuple[List[str], List[int]]:
+        words = line.split()
+        ids = []
+        for word in words:
+            key = self.normalise(word)
+            token = self._ids.get(key)
+            if token is None:
+                token = self._ids[key] = len(self._keys)
+                self._keys.append(key)
+            ids.append(token)
+        return words, ids
+
+    def is_valid(self, word: str) -> bool:
+        valid = self._valid.get(word)
+        if valid is None:
+            valid = self._valid[word] = bool(
+                self.quality_analyzer and self.quality_analyzer.is_valid_word(word))
+        return valid
+
+    def similar(self, a: int, b: int) -> bool:
+        """OCR variants of one word: within edit distance 1 (2 for long words)."""
+        pair = (a, b) if a < b else (b, a)
+        result = self._similar.get(pair)
+        if result is None:
+            from api.services.lexicon import osa_distance
+            x, y = self._keys[a], self._keys[b]
+            limit = 1 if min(len(x), len(y)) < 6 else 2
+            result = min(len(x), len(y)) >= 3 and osa_distance(x, y, limit) <= limit
+            self._similar[pair] = result
+        return result
+
+    def align_words(self, a: List[int], b: List[int],
+                    substitute: float = TextFuser.SUBSTITUTE) -> List[Tuple[Optional[int], Optional[int]]]:
+        def score(i: int, j: int) -> float:
+            if a[i] == b[j]:
+                return TextFuser.MATCH
+            return TextFuser.SIMILAR if self.similar(a[i], b[j]) else substitute
+
+        return banded_alignment(len(a), len(b), score, TextFuser.GAP, TextFuser.WORD_BAND)
+
+    def merge_insertion(self, columns: List[Dict[str, Dict]], run: List[Tuple[str, int]], weight: float) -> None:
+        """
+        Merge words one engine inserted between two anchor words into the
+        columns other engines inserted there.  Only equal or similar words
+        share a column; the rest get columns of their own.
+        """
+        heads = [next(iter(column.values()))["token"] for column in columns]
+        merged = []
+        for i, j in self.align_words(heads, [token for _, token in run], substitute=float("-inf")):
+            column = columns[i] if i is not None else {}
+            if j is not None:
+                self.add_vote(column, *run[j], weight)
+            merged.append(column)
+        columns[:] = merged
+
+    def add_vote(self, column: Dict[str, Dict], word: str, token: int, weight: float) -> None:
+        key = word.lower()
+        entry = column.get(key)
+        if entry is None:
+            entry = column[key] = {
+                "word": word, "token": token, "score": 0.0,
+                "alpha_count": 0, "is_dict_word": self.is_valid(word),
+            }
+        entry["score"] += weight
+        alpha_count = sum(c.isalpha() for c in word)
+        if alpha_count > entry["alpha_count"]:
+            entry["word"] = word
+            entry["alpha_count"] = alpha_count
+
 
 # ---------------------------------------------------------------------------
 # OCR Quality Analyzer (Research-Level Scoring)
@@ -550,8 +870,9 @@ class OCRQualityAnalyzer:
     This ensures that ACCURATE text beats LONG garbage every time.
     
     Components:
-      - dictionary_valid_ratio: Uses NLTK English corpus (235k words) with
-        pattern-based fallback. Checks what % of OCR words are real English.
+      - dictionary_valid_ratio: Uses the shared English lexicon (NLTK corpus
+        + inflections, see lexicon.py) with pattern-based fallback.
+        Checks what % of OCR words are real English.
       - language_model_score: Character bigram frequency analysis against
         Peter Norvig's Google Web Trillion Word Corpus. Real English text
         scores 0.5-0.8; OCR garbage typically < 0.2.
@@ -595,25 +916,16 @@ class OCRQualityAnalyzer:
     }
 
     def __init__(self):
-        self._dictionary: set = set()
+        self._dictionary = None
         self._use_pattern_fallback: bool = True
         self._max_bigram: float = max(self._ENGLISH_BIGRAMS.values())
         self._load_dictionary()
 
     def _load_dictionary(self):
-        """Load English word dictionary — NLTK corpus preferred, pattern fallback."""
-        try:
-            import nltk
-            try:
-                from nltk.corpus import words as nltk_words
-                self._dictionary = set(w.lower() for w in nltk_words.words() if len(w) >= 2)
-            except LookupError:
-                nltk.download('words', quiet=True)
-                from nltk.corpus import words as nltk_words
-                self._dictionary = set(w.lower() for w in nltk_words.words() if len(w) >= 2)
-        except Exception:
-            pass
+        """Use the shared English lexicon (NLTK corpus); pattern fallback without it."""
+        from api.services.lexicon import get_lexicon
 
+        self._dictionary = get_lexicon()
         if len(self._dictionary) >= 100:
             self._use_pattern_fallback = False
             logger.info(f"OCRQualityAnalyzer: {len(self._dictionary)} dictionary words loaded")
@@ -820,6 +1132,20 @@ class OCRQualityAnalyzer:
         return results
 
 
+_quality_analyzer: Optional[OCRQualityAnalyzer] = None
+_quality_analyzer_lock = threading.Lock()
+
+
+def get_quality_analyzer() -> OCRQualityAnalyzer:
+    """Process-wide analyzer, so the NLTK dictionary is loaded once, not per OCRService."""
+    global _quality_analyzer
+    if _quality_analyzer is None:
+        with _quality_analyzer_lock:
+            if _quality_analyzer is None:
+                _quality_analyzer = OCRQualityAnalyzer()
+    return _quality_analyzer
+
+
 # ---------------------------------------------------------------------------
 # OCR Service (main class)
 # ---------------------------------------------------------------------------
@@ -829,7 +1155,7 @@ class OCRService:
     Advanced OCR Service - Engineered for Messy Student Handwriting.
 
     Achieves 95%+ handwriting accuracy in ~5-12 seconds by:
-    1. Running 3 engines in parallel (ThreadPoolExecutor)
+    1. Running 3 engines in parallel, streaming results as they arrive
     2. Each engine gets 3-4 optimised preprocessed variants including:
        - Faded ink enhancement, stroke-width normalisation
        - Multi-scale binarisation, connected-component noise removal
@@ -854,22 +1180,28 @@ class OCRService:
         self.languages = languages or getattr(settings, 'OCR_LANGUAGES', ['en'])
         self.preprocessor = ImagePreprocessor()
         self.fuser = TextFuser()
-        self.quality_analyzer = OCRQualityAnalyzer()
+        self.quality_analyzer = get_quality_analyzer()
         self._fast_ocr_mode = getattr(settings, 'FAST_OCR_MODE', True)
         
         # Language correction (Layers 1-4: patterns → spelling → grammar → API)
         self._language_corrector = None
         self._enable_language_correction = getattr(settings, 'ENABLE_LANGUAGE_CORRECTION', True)
+        self._enable_grammar_correction = getattr(settings, 'ENABLE_GRAMMAR_CORRECTION', False)
+        # Corrections cut short by GRAMMAR_TIME_BUDGET; results that saw one are not cached
+        self._partial_corrections = 0
+        self._partial_lock = threading.Lock()
 
         # Layout analysis (line segmentation + question detection)
         self._layout_analyzer = None
         self._structured_extractor = None
         self._enable_layout_analysis = getattr(settings, 'ENABLE_LAYOUT_ANALYSIS', True)
 
-        # Engine instances (lazy-loaded)
-        self._easyocr_engine = None
-        self._tesseract_engine = None
-        self._paddleocr_engine = None
+        # Engine instances come from the process-wide pool (see
+        # ocr_engine_pool): a set is checked out per image / page and bound
+        # to the calling thread.  Assigning _easyocr_engine & co. directly
+        # overrides the pool for this instance.
+        self._local = threading.local()
+        self._engine_overrides: Dict[str, object] = {}
         self._engine = None  # backward compat
         self._engine_initialized = False
         
@@ -908,8 +1240,9 @@ class OCRService:
         if self._language_corrector is None and self._enable_language_correction:
             try:
                 from api.services.language_correction_service import OCRLanguageCorrector
-                # In fast OCR mode, skip the heavy transformer model
-                enable_transformer = not self._fast_ocr_mode
+                # In fast OCR mode, skip the heavy transformer model unless
+                # grammar correction is explicitly enabled (batched + time-budgeted)
+                enable_transformer = self._enable_grammar_correction or not self._fast_ocr_mode
                 self._language_corrector = OCRLanguageCorrector(
                     enable_transformer=enable_transformer,
                     enable_api=True,
@@ -983,12 +1316,17 @@ class OCRService:
         """
         if not self._enable_language_correction or not text or not text.strip():
             return text
+        if mode == "fast" and self._enable_grammar_correction:
+            mode = "local"  # + T5 grammar layer (no API calls)
         try:
             self._ensure_language_corrector()
             if self._language_corrector is None:
                 return text
             result = self._language_corrector.correct(text, enable_layers=mode)
             corrected = result.get('corrected_text', text)
+            if not result.get('complete', True):
+                with self._partial_lock:
+                    self._partial_corrections += 1
             layers = result.get('layers_applied', [])
             n_fixes = result.get('corrections_made', 0)
             elapsed = result.get('processing_time', 0)
@@ -1011,90 +1349,81 @@ class OCRService:
             self._engine_initialized = True
 
     def _init_engine(self):
-        """Initialise the requested engine(s)."""
+        """Validate the engine choice; local engines load on first pool checkout."""
+        from api.services.ocr_engine_pool import LOCAL_ENGINES, get_ocr_engine_pool
+
         logger.info(f"Initialising OCR engine: {self.engine_name}")
-        if self.engine_name == "ensemble":
-            self._init_all_engines()
-        elif self.engine_name == "easyocr":
-            self._init_easyocr()
-            self._engine = self._easyocr_engine
-        elif self.engine_name == "tesseract":
-            self._init_tesseract()
-            self._engine = self._tesseract_engine
-        elif self.engine_name == "paddleocr":
-            self._init_paddleocr()
-            self._engine = self._paddleocr_engine
-        elif self.engine_name == "sarvam":
+        if self.engine_name == "sarvam":
             self._init_sarvam()
-        else:
+        elif self.engine_name not in LOCAL_ENGINES:
             logger.warning(f"Unknown engine '{self.engine_name}', defaulting to ensemble")
             self.engine_name = "ensemble"
-            self._init_all_engines()
+        if self.engine_name in LOCAL_ENGINES and not self.low_memory_mode:
+            get_ocr_engine_pool().warm(self.engine_name, self.languages)
         self._engine_initialized = True
 
-    def _init_all_engines(self):
-        """Best-effort init of all 3 local engines for ensemble mode."""
-        engines_ok = []
-        try:
-            self._init_easyocr()
-            engines_ok.append("EasyOCR")
-        except Exception as e:
-            logger.warning(f"EasyOCR init failed (install: pip install easyocr): {e}")
-        try:
-            self._init_tesseract()
-            engines_ok.append("Tesseract")
-        except Exception as e:
-            logger.warning(f"Tesseract init failed (install: pip install pytesseract + Tesseract binary): {e}")
-        try:
-            self._init_paddleocr()
-            engines_ok.append("PaddleOCR")
-        except Exception as e:
-            logger.warning(f"PaddleOCR init failed (install: pip install paddlepaddle paddleocr): {e}")
+    # ─── Pooled engine access ────────────────────────────────────────
 
-        if not engines_ok:
-            logger.error("No OCR engines available! Falling back to EasyOCR-only initialisation.")
-            try:
-                self._init_easyocr()
-                engines_ok.append("EasyOCR")
-            except:
-                raise RuntimeError(
-                    "No OCR engines could be initialised. "
-                    "Install at least one: pip install easyocr"
-                )
+    def _pooled_engine(self, name: str):
+        if name in self._engine_overrides:
+            return self._engine_overrides[name]
+        engines = getattr(self._local, "engines", None)
+        return getattr(engines, name, None) if engines is not None else None
 
-        self._engine = self._easyocr_engine or self._tesseract_engine or self._paddleocr_engine
-        logger.info(f"Ensemble OCR ready with {len(engines_ok)} engines: {', '.join(engines_ok)}")
+    @property
+    def _easyocr_engine(self):
+        return self._pooled_engine("easyocr")
 
-    def _init_easyocr(self):
-        if self._easyocr_engine is not None:
-            return
-        import easyocr
-        self._easyocr_engine = easyocr.Reader(
-            self.languages, gpu=False,
-            download_enabled=True, detector=True, recognizer=True)
-        logger.info("EasyOCR initialised successfully")
+    @_easyocr_engine.setter
+    def _easyocr_engine(self, engine):
+        self._engine_overrides["easyocr"] = engine
 
-    def _init_tesseract(self):
-        if self._tesseract_engine is not None:
-            return
-        import pytesseract
-        from config.settings import settings
-        tess_path = getattr(settings, 'TESSERACT_PATH', None)
-        if tess_path:
-            pytesseract.pytesseract.tesseract_cmd = tess_path
-        # Validate Tesseract is actually installed
-        pytesseract.get_tesseract_version()
-        self._tesseract_engine = pytesseract
-        logger.info("Tesseract initialised successfully")
-
-    def _init_paddleocr(self):
-        if self._paddleocr_engine is not None:
+    @property
+    def _tesseract_engine(self):
+        return self._pooled_engine("tesseract")
+
+    @_tesseract_engine.setter
+    def _tesseract_engine(self, engine):
+        self._engine_overrides["tesseract"] = engine
+
+    @property
+    def _paddleocr_engine(self):
+        return self._pooled_engine("paddleocr")
+
+    @_paddleocr_engine.setter
+    def _paddleocr_engine(self, engine):
+        self._engine_overrides["paddleocr"] = engine
+
+    @contextmanager
+    def _engines(self, engine: str = None):
+        """
+        Check an engine set out of the pool and bind it to this thread.
+
+        Re-entrant: a thread that already holds a set for *engine* reuses it.
+        Nothing is checked out for Sarvam (no local engines) or when engines
+        were assigned to this instance directly.
+        """
+        from api.services.ocr_engine_pool import LOCAL_ENGINES, get_ocr_engine_pool
+
+        engine = engine or self.engine_name
+        current = getattr(self._local, "engines", None)
+        if (engine not in LOCAL_ENGINES or self._engine_overrides
+                or (current is not None and current.engine == engine)):
+            yield current
             return
-        from paddleocr import PaddleOCR
-        self._paddleocr_engine = PaddleOCR(
-            use_angle_cls=True, lang='en',
-            show_log=False, use_gpu=False)
-        logger.info("PaddleOCR initialised successfully")
+        with get_ocr_engine_pool().checkout(engine, self.languages) as engines:
+            with self._bound(engines):
+                yield engines
+
+    @contextmanager
+    def _bound(self, engines):
+        """Bind an already checked-out set to the calling thread (ensemble worker threads)."""
+        previous = getattr(self._local, "engines", None)
+        self._local.engines = engines
+        try:
+            yield engines
+        finally:
+            self._local.engines = previous
 
     def _init_sarvam(self):
         from config.settings import settings
@@ -1144,216 +1473,79 @@ class OCRService:
         logger.info("[Sarvam API] No language detected, defaulting to English")
         return 'en'
 
+    # Sarvam language tags for 2-letter codes
+    _SARVAM_LANGUAGE_TAGS = {
+        'en': 'en-IN', 'hi': 'hi-IN', 'ta': 'ta-IN', 'te': 'te-IN',
+        'kn': 'kn-IN', 'ml': 'ml-IN', 'mr': 'mr-IN', 'gu': 'gu-IN',
+        'pa': 'pa-IN', 'bn': 'bn-IN', 'or': 'or-IN', 'ur': 'ur-IN',
+        'es': 'es', 'fr': 'fr', 'de': 'de', 'pt': 'pt', 'it': 'it',
+        'ja': 'ja', 'zh': 'zh', 'ar': 'ar', 'ru': 'ru',
+    }
+
+    def _sarvam_language_tag(self, language: Optional[str]) -> str:
+        return self._SARVAM_LANGUAGE_TAGS.get(language, 'en-IN')
+
+    def _sarvam_page_result(self, text: str, detail: bool, sarvam_language: str,
+                            job_id: str) -> Union[str, List[dict]]:
+        text = self._strip_html(text)
+        if detail:
+            return [{
+                'text': text,
+                'confidence': 1.0,
+                'engine': 'sarvam_sdk',
+                'language': sarvam_language,
+                'job_id': job_id
+            }]
+        return text.strip()
+
     def _extract_sarvam_sdk_direct(self, image_path: str, detail: bool, language: str = None) -> Union[str, List[dict]]:
         """
         Extract text using Sarvam AI Python SDK (Best approach for handwritten text).
         
         This method is MOST RELIABLE because:
         - Uses official Sarvam SDK (not REST API)
-        - Handles multi-page PDFs natively
-        - Better error handling and retries
-        - Faster processing with proper job management
+        - Goes through the shared batching client (see sarvam_client.py):
+          concurrent callers' images share multi-page jobs, jobs in flight
+          are capped and API calls rate-limited
+        - Output ZIP is read in memory
         
         Args:
-            image_path: Path to image or PDF file
+            image_path: Path to an image file (PDFs are rendered page by page
+                        in ``_extract_from_pdf`` first)
             detail: Whether to return detailed results
             language: Language code (e.g., 'en', 'hi', 'ta'). Auto-detected if None.
         """
+        if not self._sarvam_api_key:
+            logger.debug("[Sarvam SDK] API key not configured")
+            return "" if not detail else []
+
+        # Detect language if not provided
+        if language is None:
+            language = self._detect_language_from_path(image_path) if hasattr(self, '_detect_language_from_path') else 'en'
+        sarvam_language = self._sarvam_language_tag(language)
+        logger.info(f"[Sarvam SDK] Using language: {sarvam_language}")
+
         try:
-            from sarvamai import SarvamAI
-            from PIL import Image
-            import gc
-            
-            if not self._sarvam_api_key:
-                logger.debug("[Sarvam SDK] API key not configured")
-                return "" if not detail else []
-            
-            # Detect language if not provided
-            if language is None:
-                language = self._detect_language_from_path(image_path) if hasattr(self, '_detect_language_from_path') else 'en'
-            
-            # Map 2-letter code to Sarvam language tag
-            language_map = {
-                'en': 'en-IN', 'hi': 'hi-IN', 'ta': 'ta-IN', 'te': 'te-IN',
-                'kn': 'kn-IN', 'ml': 'ml-IN', 'mr': 'mr-IN', 'gu': 'gu-IN',
-                'pa': 'pa-IN', 'bn': 'bn-IN', 'or': 'or-IN', 'ur': 'ur-IN',
-                'es': 'es', 'fr': 'fr', 'de': 'de', 'pt': 'pt', 'it': 'it',
-                'ja': 'ja', 'zh': 'zh', 'ar': 'ar', 'ru': 'ru',
-            }
-            sarvam_language = language_map.get(language, 'en-IN')
-            
-            logger.info(f"[Sarvam SDK] Using language: {sarvam_language}")
-            
-            # Prepare file for upload
-            file_to_process = image_path
-            temp_pdf = None
-            
-            # Convert image to PDF if needed
-            if not image_path.lower().endswith('.pdf'):
-                logger.debug("[Sarvam SDK] Converting image to PDF for optimal SDK processing...")
-                temp_pdf_file = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
-                temp_pdf = temp_pdf_file.name
-                temp_pdf_file.close()
-                
-                try:
-                    img = Image.open(image_path)
-                    if img.mode == 'RGBA':
-                        img = img.convert('RGB')
-                    img.save(temp_pdf, 'PDF', resolution=300)
-                    del img
-                    gc.collect()
-                    file_to_process = temp_pdf
-                except Exception as e:
-                    logger.warning(f"[Sarvam SDK] Image to PDF conversion failed: {e}")
-                    # Continue with original image
-                    file_to_process = image_path
-            
-            try:
-                # Initialize Sarvam client
-                logger.debug("[Sarvam SDK] Initializing SarvamAI client...")
-                client = SarvamAI(api_subscription_key=self._sarvam_api_key)
-                
-                # Create job
-                logger.debug("[Sarvam SDK] Creating document intelligence job...")
-                job = client.document_intelligence.create_job(
-                    language=sarvam_language,
-                    output_format="md"  # Markdown format for clean text
+            from api.services.sarvam_client import get_sarvam_client
+
+            client = get_sarvam_client()
+            future = client.submit(image_path, sarvam_language)
+            page = future.result(timeout=client.result_timeout())
+            if page.text:
+                logger.info(
+                    f"[Sarvam SDK] SUCCESS - Extracted {len(page.text)} characters in language={sarvam_language} "
+                    f"(job {page.job_id}, page {page.page}/{page.pages_in_job})"
                 )
-                logger.debug(f"[Sarvam SDK] Job created: {job.job_id}")
-                
-                # Upload file
-                logger.debug(f"[Sarvam SDK] Uploading {os.path.basename(file_to_process)}...")
-                job.upload_file(file_to_process)
-                logger.debug("[Sarvam SDK] File uploaded successfully")
-                
-                # Start processing
-                logger.debug("[Sarvam SDK] Starting job processing...")
-                job.start()
-                
-                # Wait for completion
-                logger.debug("[Sarvam SDK] Waiting for completion (this may take a minute)...")
-                status = job.wait_until_complete()
-                logger.debug(f"[Sarvam SDK] Job completed: {status.job_state}")
-                
-                # Get page metrics
-                try:
-                    metrics = job.get_page_metrics()
-                    logger.debug(f"[Sarvam SDK] Page metrics: {metrics}")
-                except:
-                    pass
-                
-                # Download and extract text
-                logger.debug("[Sarvam SDK] Downloading output...")
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    # Download the ZIP file
-                    zip_path = os.path.join(temp_dir, "output.zip")
-                    job.download_output(zip_path)
-                    logger.debug(f"[Sarvam SDK] Output downloaded to {zip_path}")
-                    
-                    # Extract ZIP if it exists
-                    text = ""
-                    if os.path.exists(zip_path) and zip_path.endswith('.zip'):
-                        logger.debug("[Sarvam SDK] Extracting ZIP file...")
-                        import zipfile
-                        extract_dir = os.path.join(temp_dir, "extracted")
-                        os.makedirs(extract_dir, exist_ok=True)
-                        
-                        try:
-                            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                                zip_ref.extractall(extract_dir)
-                            logger.debug(f"[Sarvam SDK] ZIP extracted to {extract_dir}")
-                            
-                            # Now read the extracted files
-                            output_items = list(Path(extract_dir).glob("**/*"))
-                            logger.debug(f"[Sarvam SDK] Found {len(output_items)} extracted items")
-                            
-                            # Try to read in order of preference: document.md > .md > .txt > .html
-                            for ext in ['document.md', '.md', '.txt', '.html', '']:
-                                for file_item in output_items:
-                                    if file_item.is_file():
-                                        # Check if filename matches or has matching extension
-                                        if (ext and (file_item.name == ext or file_item.suffix == ext)) or (not ext):
-                                            try:
-                                                with open(file_item, 'r', encoding='utf-8', errors='ignore') as f:
-                                                    content = f.read().strip()
-                                                    if content and len(content) > len(text) and not content.startswith('PK'):
-                                                        text = content
-                                                        logger.debug(f"[Sarvam SDK] ✓ Read {len(text)} chars from {file_item.name}")
-                                            except Exception as read_err:
-                                                logger.debug(f"[Sarvam SDK] Could not read {file_item.name}: {read_err}")
-                                if text:
-                                    break
-                                    
-                        except zipfile.BadZipFile:
-                            logger.warning("[Sarvam SDK] ZIP file is corrupted or not a valid ZIP")
-                            # Try to read as directory (if output is already extracted)
-                            output_items = list(Path(temp_dir).glob("**/*"))
-                            for ext in ['.md', '.txt', '.html', '']:
-                                for file_item in output_items:
-                                    if file_item.is_file() and (file_item.suffix == ext or not ext):
-                                        try:
-                                            with open(file_item, 'r', encoding='utf-8', errors='ignore') as f:
-                                                content = f.read().strip()
-                                                if content and not content.startswith('PK'):
-                                                    text = content
-                                                    logger.debug(f"[Sarvam SDK] Read {len(text)} chars from {file_item.name}")
-                                        except:
-                                            pass
-                    else:
-                        # If output is not ZIP, try to read files directly
-                        output_items = list(Path(temp_dir).glob("**/*"))
-                        logger.debug(f"[Sarvam SDK] Reading output files directly (not ZIP)")
-                        
-                        for ext in ['.md', '.txt', '.html', '']:
-                            for file_item in output_items:
-                                if file_item.is_file() and (file_item.suffix == ext or not ext):
-                                    try:
-                                        with open(file_item, 'r', encoding='utf-8', errors='ignore') as f:
-                                            content = f.read().strip()
-                                            if content and not content.startswith('PK'):
-                                                text = content
-                                                logger.debug(f"[Sarvam SDK] Read {len(text)} chars from {file_item.name}")
-                                    except Exception as read_err:
-                                        logger.debug(f"[Sarvam SDK] Could not read {file_item.name}: {read_err}")
-                            if text:
-                                break
-                    
-                    if text:
-                        # Strip HTML tags from extracted text
-                        text = self._strip_html(text)
-                        logger.info(f"[Sarvam SDK] SUCCESS - Extracted {len(text)} characters in language={sarvam_language}")
-                        if detail:
-                            return [{
-                                'text': text,
-                                'confidence': 1.0,
-                                'engine': 'sarvam_sdk',
-                                'language': sarvam_language,
-                                'job_id': job.job_id
-                            }]
-                        return text.strip()
-                    else:
-                        logger.warning("[Sarvam SDK] No text found in output files")
-                        
-            except Exception as job_err:
-                logger.error(f"[Sarvam SDK] Job processing error: {type(job_err).__name__}: {job_err}")
-                import traceback
-                logger.debug(f"[Sarvam SDK] Traceback:\n{traceback.format_exc()}")
-                
+                return self._sarvam_page_result(page.text, detail, sarvam_language, page.job_id)
+            logger.warning("[Sarvam SDK] No text found in output files")
+
         except ImportError:
             logger.warning("[Sarvam SDK] SarvamAI SDK not installed: pip install sarvamai")
         except Exception as e:
             logger.error(f"[Sarvam SDK] Error: {type(e).__name__}: {e}")
             import traceback
             logger.debug(f"[Sarvam SDK] Traceback:\n{traceback.format_exc()}")
-        
-        finally:
-            # Cleanup temporary PDF
-            if temp_pdf:
-                try:
-                    os.remove(temp_pdf)
-                except:
-                    pass
-        
+
         return "" if not detail else []
 
     def _extract_sarvam_api_direct(self, image_path: str, detail: bool, language: str = None) -> Union[str, List[dict]]:
@@ -1463,6 +1655,47 @@ class OCRService:
                 logger.warning(f"Layout analyzer init failed: {e}")
                 self._enable_layout_analysis = False
 
+    def _recognize_lines(self, crops: List[np.ndarray]) -> List[str]:
+        """
+        Recognise pre-segmented line crops in batches (no text detection).
+
+        Single-engine mode uses that engine's batch recogniser; ensemble
+        runs every loaded engine and keeps, per line, the candidate with the
+        best quality score.  Raises when no engine can recognise lines, so
+        the caller falls back to per-line ``ocr_func``.
+        """
+        from config.settings import settings
+        from api.services.line_recognition import get_line_recognizer
+
+        names = ["paddleocr", "easyocr", "tesseract"] if self.engine_name == "ensemble" else [self.engine_name]
+        batch_size = getattr(settings, 'OCR_LINE_BATCH_SIZE', 32)
+        start = time.time()
+
+        with self._engines():
+            candidates: List[List[Tuple[str, float]]] = []
+            for name in names:
+                recognizer = get_line_recognizer(name, self._pooled_engine(name), batch_size=batch_size)
+                if recognizer is None:
+                    continue
+                try:
+                    candidates.append(recognizer.recognize(crops))
+                except Exception as e:
+                    logger.warning(f"{name} batched line recognition failed: {e}")
+        if not candidates:
+            raise RuntimeError(f"No batched line recogniser for engine '{self.engine_name}'")
+
+        texts = []
+        for options in zip(*candidates):
+            options = [(text, conf) for text, conf in options if text]
+            if len(options) > 1:
+                text, _ = max(options, key=lambda o: self.quality_analyzer.calculate_quality_score(*o)["quality_score"])
+            else:
+                text = options[0][0] if options else ""
+            texts.append(self._postprocess_ocr(text) if text else "")
+
+        logger.info(f"Recognised {len(crops)} line crops with {len(candidates)} engine(s) in {time.time()-start:.2f}s")
+        return texts
+
     # ==================== Public API ====================
 
     def extract_text(
@@ -1486,34 +1719,137 @@ class OCRService:
             language: Language code (e.g., 'en', 'hi', 'ta'). 
                      Used primarily for Sarvam AI. If None, auto-detects from filename.
         """
-        self._ensure_engine_initialized()
         logger.info(f"extract_text({image_path}, engine={self.engine_name}, language={language})")
 
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"Image not found: {image_path}")
 
+        # Global OCR cache: same bytes + same config → skip OCR (and engine loading)
+        cache_key = self._document_cache_key(image_path, preprocess, detail, language)
+        if cache_key:
+            record = self._ocr_cache.get(cache_key)
+            if record is not None:
+                logger.info(f"OCR cache hit for {os.path.basename(image_path)}")
+                return self._result_from_pages(record.get("pages", []), detail)
+
+        self._ensure_engine_initialized()
+        pages: List[dict] = []
+        partial_before = self._partial_corrections
+
         # PDF handling with language support
         if image_path.lower().endswith('.pdf'):
-            return self._extract_from_pdf(image_path, preprocess, detail, language=language)
+            result = self._extract_from_pdf(image_path, preprocess, detail, language=language, pages=pages)
 
         # Sarvam cloud API - EXCLUSIVE (no fallback chain)
-        if self.engine_name == "sarvam":
+        elif self.engine_name == "sarvam":
             start = time.time()
             result = self._extract_sarvam_exclusive(image_path, detail, language=language)
             logger.info(f"Sarvam EXCLUSIVE extraction done in {time.time()-start:.1f}s")
-            return result
 
         # ENSEMBLE MODE - the star of the show
-        if self.engine_name == "ensemble":
-            result = self._extract_ensemble(image_path, preprocess, detail)
+        elif self.engine_name == "ensemble":
+            with self._engines():
+                result = self._extract_ensemble(image_path, preprocess, detail)
             logger.info(f"Ensemble extracted {len(result) if isinstance(result, str) else len(result)} chars")
-            return result
 
         # Single-engine mode
-        result = self._extract_single_engine(image_path, preprocess, detail)
-        logger.info(f"Extracted {len(result) if isinstance(result, str) else len(result)} chars")
+        else:
+            with self._engines():
+                result = self._extract_single_engine(image_path, preprocess, detail)
+            logger.info(f"Extracted {len(result) if isinstance(result, str) else len(result)} chars")
+
+        if cache_key and self._partial_corrections != partial_before:
+            logger.info("Grammar correction ran out of time: result not cached")
+        elif cache_key:
+            if not image_path.lower().endswith('.pdf'):
+                pages = [self._page_record(1, result, "ocr")]
+            self._store_document(cache_key, pages)
         return result
 
+    # ==================== Result Cache ====================
+
+    @property
+    def _ocr_cache(self):
+        from api.services.ocr_cache import get_ocr_cache
+        return get_ocr_cache()
+
+    def _ocr_cache_config(self, preprocess: bool, detail: bool, language: Optional[str]) -> Dict:
+        """Everything besides the input bytes that changes what OCR returns."""
+        from config.settings import settings
+
+        return {
+            "engine": self.engine_name,
+            "languages": sorted(self.languages),
+            "fast_ocr_mode": self._fast_ocr_mode,
+            "preprocessing": ImagePreprocessor.VERSION,
+            "max_megapixels": getattr(settings, 'OCR_MAX_MEGAPIXELS', 0),
+            "language_correction": self._enable_language_correction,
+            "grammar_correction": self._enable_language_correction and self._enable_grammar_correction,
+            "language": language,
+            "preprocess": bool(preprocess),
+            "detail": bool(detail),
+        }
+
+    def _document_cache_key(self, path: str, preprocess: bool, detail: bool, language: Optional[str]) -> Optional[str]:
+        """Cache key for a whole file, or ``None`` when the cache is off / unusable."""
+        if self._ocr_cache is None:
+            return None
+        try:
+            from api.services.file_storage_service import calculate_checksum
+            from api.services.ocr_cache import ocr_cache_key
+
+            resolved = language or self._detect_language_from_path(path)
+            config = self._ocr_cache_config(preprocess, detail, resolved)
+            return ocr_cache_key("document", calculate_checksum(path), config)
+        except Exception as e:
+            logger.debug(f"OCR cache key unavailable: {e}")
+            return None
+
+    def _page_cache_key(self, png_bytes: bytes, preprocess: bool, detail: bool, language: Optional[str]) -> Optional[str]:
+        """Cache key for one rendered PDF page."""
+        if self._ocr_cache is None:
+            return None
+        import hashlib
+        from api.services.ocr_cache import ocr_cache_key
+
+        config = self._ocr_cache_config(preprocess, detail, language)
+        return ocr_cache_key("page", hashlib.sha256(png_bytes).hexdigest(), config)
+
+    @staticmethod
+    def _page_record(page: int, result: Union[str, List[dict], None], source: str) -> dict:
+        """Cacheable per-page record: text, mean confidence (detail mode) and detail items."""
+        if isinstance(result, list):
+            confidences = [
+                float(item["confidence"]) for item in result
+                if isinstance(item.get("confidence"), (int, float, np.number))
+            ]
+            return {
+                "page": page,
+                "source": source,
+                "text": " ".join(str(item.get("text", "")) for item in result).strip(),
+                "confidence": round(sum(confidences) / len(confidences), 4) if confidences else None,
+                "items": result,
+            }
+        return {"page": page, "source": source, "text": result or "", "confidence": None, "items": None}
+
+    @staticmethod
+    def _result_from_pages(pages: List[dict], detail: bool) -> Union[str, List[dict]]:
+        """Rebuild an ``extract_text`` result from cached page records."""
+        if detail:
+            items = []
+            for page in pages:
+                items.extend(page.get("items") or [])
+            return items
+        return "\n\n".join(page.get("text", "") for page in pages)
+
+    def _store_document(self, cache_key: str, pages: List[dict]) -> None:
+        """Cache a whole-file result unless it is partial or empty."""
+        if not pages or any(p["source"] in ("failed", "timeout") for p in pages):
+            return
+        if not any(p["text"].strip() for p in pages):
+            return
+        self._ocr_cache.put(cache_key, {"pages": pages})
+
     def extract_text_structured(
         self,
         image_path: str,
@@ -1560,8 +1896,10 @@ class OCRService:
                 """Closure: OCR a single region using current engine."""
                 return self.extract_text(img_path, preprocess=preprocess, detail=False)
 
+            from api.services.ocr_engine_pool import LOCAL_ENGINES
+            recognize_lines = self._recognize_lines if self.engine_name in LOCAL_ENGINES else None
             result = self._structured_extractor.extract_structured(
-                image_path, ocr_func=ocr_func
+                image_path, ocr_func=ocr_func, recognize_lines=recognize_lines
             )
 
             # Apply language correction to full text
@@ -1655,9 +1993,12 @@ class OCRService:
           Thread 3: Tesseract  on adaptive + thick-strokes + multi-clean variants
 
         Speed optimisations:
-          - All threads run simultaneously → total ≈ slowest single engine
+          - All threads run simultaneously; results stream in per variant
           - Image capped at 3500px max to prevent large-image slowdown
-          - Early exit when top result quality > 0.75 (skip fusion overhead)
+          - Early exit: once any result reaches OCR_ENSEMBLE_EARLY_EXIT_QUALITY
+            or OCR_ENSEMBLE_PAGE_DEADLINE passes, queued variants are skipped,
+            variants still running are abandoned (see ensemble_scheduler.py)
+            and fusion is skipped
           - Quality-gated variant skipping inside engine workers
         """
         start = time.time()
@@ -1678,100 +2019,92 @@ class OCRService:
             return "" if not detail else []
 
         # --- Phase 1: Prepare engine-specific preprocessed images ---
-        engine_variants: Dict[str, List[Tuple[str, str]]] = {}  # engine -> [(name, temp_path)]
-        temp_files = []
-        
-        import cv2
+        # One shared base (load → deskew → resize → gray → quality probe);
+        # variants stay in memory — all three engines accept numpy arrays
+        engine_variants: Dict[str, List[Tuple[str, Union[str, np.ndarray]]]] = {}
+        base = None
+        if preprocess and self.preprocessor._available:
+            try:
+                base = self.preprocessor.prepare(image_path)
+            except Exception as e:
+                logger.error(f"Preprocessing base failed, using original image: {e}")
+
         for eng in available_engines:
-            if preprocess and self.preprocessor._available:
-                variants = self.preprocessor.get_variants_for_engine(image_path, eng)
+            if base is not None:
+                engine_variants[eng] = self.preprocessor.get_variants_for_engine(image_path, eng, base=base)
             else:
-                img = cv2.imread(image_path)
-                variants = [("original", img)]
-            
-            paths = []
-            for name, img in variants:
-                tmp = f"{image_path}_ens_{eng}_{name}.png"
-                cv2.imwrite(tmp, img)
-                paths.append((name, tmp))
-                temp_files.append(tmp)
-            engine_variants[eng] = paths
+                engine_variants[eng] = [("original", image_path)]
 
         prep_time = time.time() - start
         logger.info(f"Preprocessing done in {prep_time:.1f}s")
 
-        # --- Phase 2: Run engines in PARALLEL (with quality scoring) ---
-        all_results: List[Dict] = []
+        # --- Phase 2: Run engines in PARALLEL, streaming results (with quality scoring) ---
+        from config.settings import settings
+        from api.services.ensemble_scheduler import EnsembleScheduler
+
         quality_analyzer = self.quality_analyzer  # Capture for closure
-        
-        def run_engine(engine_name: str, variant_paths: List[Tuple[str, str]]) -> List[Dict]:
-            """Worker function for each engine thread (quality-gated)."""
-            results = []
-            best_variant_quality = 0.0
-            for var_name, var_path in variant_paths:
-                # Speed: skip extra variants if first variant already high-quality
-                if results and best_variant_quality > 0.65:
-                    logger.debug(f"  {engine_name}: skipping {var_name} (first variant q={best_variant_quality:.3f})")
-                    continue
-                try:
-                    if engine_name == "easyocr":
-                        text, conf = self._run_easyocr(var_path)
-                    elif engine_name == "tesseract":
-                        text, conf = self._run_tesseract(var_path)
-                    elif engine_name == "paddleocr":
-                        text, conf = self._run_paddleocr(var_path)
-                    else:
-                        continue
-                    
-                    if text.strip():
-                        clean_text = text.strip()
-                        q_metrics = quality_analyzer.calculate_quality_score(clean_text, conf)
-                        q_score = q_metrics["quality_score"]
-                        best_variant_quality = max(best_variant_quality, q_score)
-                        results.append({
-                            "text": clean_text,
-                            "confidence": conf,
-                            "engine": f"{engine_name}_{var_name}",
-                            "source_engine": engine_name,
-                            "variant": var_name,
-                            "char_count": len(clean_text),
-                            "quality_score": q_score,
-                            "quality_metrics": q_metrics,
-                        })
-                        logger.info(
-                            f"  {engine_name}/{var_name}: {len(clean_text)} chars, "
-                            f"conf={conf:.2f}, quality={q_score:.3f} "
-                            f"[dict={q_metrics['dictionary_ratio']:.2f} "
-                            f"lang={q_metrics['language_model']:.2f}]"
-                        )
-                except Exception as e:
-                    logger.debug(f"  {engine_name}/{var_name} failed: {e}")
-            return results
-
-        # Execute all engines in parallel using ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            futures = {}
-            for eng in available_engines:
-                future = executor.submit(run_engine, eng, engine_variants[eng])
-                futures[future] = eng
-            
-            for future in as_completed(futures):
-                eng = futures[future]
-                try:
-                    engine_results = future.result(timeout=60)
-                    all_results.extend(engine_results)
-                except Exception as e:
-                    logger.warning(f"Engine {eng} thread failed: {e}")
+        checked_out = getattr(self._local, "engines", None)  # Engine threads use the caller's set
+
+        def run_variant(engine_name: str, var_name: str, var_image: Union[str, np.ndarray]) -> Optional[Dict]:
+            """One engine on one variant, scored (runs on the engine's thread)."""
+            with self._bound(checked_out):
+                if engine_name == "easyocr":
+                    text, conf = self._run_easyocr(var_image)
+                elif engine_name == "tesseract":
+                    text, conf = self._run_tesseract(var_image)
+                elif engine_name == "paddleocr":
+                    text, conf = self._run_paddleocr(var_image)
+                else:
+                    return None
+
+            if not text.strip():
+                return None
+            clean_text = text.strip()
+            q_metrics = quality_analyzer.calculate_quality_score(clean_text, conf)
+            q_score = q_metrics["quality_score"]
+            logger.info(
+                f"  {engine_name}/{var_name}: {len(clean_text)} chars, "
+                f"conf={conf:.2f}, quality={q_score:.3f} "
+                f"[dict={q_metrics['dictionary_ratio']:.2f} "
+                f"lang={q_metrics['language_model']:.2f}]"
+            )
+            return {
+                "text": clean_text,
+                "confidence": conf,
+                "engine": f"{engine_name}_{var_name}",
+                "source_engine": engine_name,
+                "variant": var_name,
+                "char_count": len(clean_text),
+                "quality_score": q_score,
+                "quality_metrics": q_metrics,
+            }
 
-        # Clean up temp files
-        for tmp in temp_files:
-            try:
-                os.remove(tmp)
-            except:
-                pass
+        # One thread per engine; no new variant starts once a result is
+        # excellent or the page deadline passes
+        scheduler = EnsembleScheduler(
+            run_variant,
+            quality_threshold=settings.OCR_ENSEMBLE_EARLY_EXIT_QUALITY,
+            deadline=settings.OCR_ENSEMBLE_PAGE_DEADLINE,
+        )
+        # Variants abandoned by an early stop keep using checked_out: hold it until they return
+        pool = None
+        if checked_out is not None:
+            from api.services.ocr_engine_pool import get_ocr_engine_pool
+            pool = get_ocr_engine_pool()
+            pool.hold(checked_out)
+        try:
+            all_results = scheduler.run({eng: engine_variants[eng] for eng in available_engines})
+        finally:
+            if pool is not None:
+                scheduler.when_idle(lambda: pool.drop_hold(checked_out))
+        schedule = scheduler.get_summary()
 
         parallel_time = time.time() - start - prep_time
-        logger.info(f"Parallel extraction done in {parallel_time:.1f}s, got {len(all_results)} outputs")
+        logger.info(
+            f"Parallel extraction done in {parallel_time:.1f}s, got {len(all_results)} outputs"
+            + (f", stopped early ({scheduler.stop_reason}), skipped {len(scheduler.skipped)} variant(s)"
+               if scheduler.stop_reason else "")
+        )
 
         if not all_results:
             logger.warning("Ensemble produced no results - falling back to direct extraction")
@@ -1799,7 +2132,7 @@ class OCRService:
         engine_outputs.sort(key=lambda r: r.get("quality_score", 0), reverse=True)
         top_quality = engine_outputs[0].get("quality_score", 0) if engine_outputs else 0
 
-        if top_quality > 0.75 and len(engine_outputs) >= 2:
+        if top_quality >= settings.OCR_ENSEMBLE_EARLY_EXIT_QUALITY and len(engine_outputs) >= 2:
             # Top result is already excellent — use it directly, skip fusion
             fused = engine_outputs[0]["text"]
             logger.info(f"EARLY EXIT: top engine quality={top_quality:.3f}, skipping fusion")
@@ -1838,16 +2171,20 @@ class OCRService:
                     r["source_engine"]: r.get("quality_metrics", {})
                     for r in engine_outputs
                 },
+                "engine_timings": schedule["engine_timings"],
+                "early_exit": schedule["stop_reason"],
+                "skipped_variants": schedule["skipped"],
             }]
         return fused
 
     # ==================== Individual Engine Runners ====================
-    # Each returns (text, avg_confidence)
+    # Each takes a file path or an in-memory image (numpy array, BGR or
+    # grayscale) and returns (text, avg_confidence)
 
-    def _run_easyocr(self, image_path: str) -> Tuple[str, float]:
+    def _run_easyocr(self, image: Union[str, np.ndarray]) -> Tuple[str, float]:
         """Run EasyOCR with aggressive messy-handwriting settings."""
         results = self._easyocr_engine.readtext(
-            image_path,
+            image,
             paragraph=False,
             min_size=5,             # ↓ from 8 – catch smaller text fragments
             text_threshold=0.3,     # ↓ from 0.4 – detect faint/messy text
@@ -1888,10 +2225,9 @@ class OCRService:
         avg_conf = sum(confs) / len(confs) if confs else 0.0
         return text, avg_conf
 
-    def _run_tesseract(self, image_path: str) -> Tuple[str, float]:
+    def _run_tesseract(self, image: Union[str, np.ndarray]) -> Tuple[str, float]:
         """Run Tesseract with multiple PSM modes, pick best by quality."""
-        from PIL import Image
-        img = Image.open(image_path)
+        img = self._to_pil(image)
 
         best_text, best_conf, best_quality = "", 0.0, -1.0
 
@@ -1924,9 +2260,12 @@ class OCRService:
 
         return best_text, best_conf
 
-    def _run_paddleocr(self, image_path: str) -> Tuple[str, float]:
+    def _run_paddleocr(self, image: Union[str, np.ndarray]) -> Tuple[str, float]:
         """Run PaddleOCR with angle classification."""
-        results = self._paddleocr_engine.ocr(image_path, cls=True)
+        if isinstance(image, np.ndarray) and image.ndim == 2:
+            # PaddleOCR expects 3-channel arrays
+            image = self.preprocessor.cv2.cvtColor(image, self.preprocessor.cv2.COLOR_GRAY2BGR)
+        results = self._paddleocr_engine.ocr(image, cls=True)
         if not results or not results[0]:
             return "", 0.0
 
@@ -1939,6 +2278,15 @@ class OCRService:
         avg_conf = sum(confs) / len(confs) if confs else 0.0
         return text, avg_conf
 
+    def _to_pil(self, image: Union[str, np.ndarray]):
+        """PIL image for Tesseract from a path or an OpenCV (BGR / gray) array."""
+        from PIL import Image
+        if not isinstance(image, np.ndarray):
+            return Image.open(image)
+        if image.ndim == 3:
+            image = self.preprocessor.cv2.cvtColor(image, self.preprocessor.cv2.COLOR_BGR2RGB)
+        return Image.fromarray(image)
+
     # ==================== Single-Engine Extraction ====================
 
     def _extract_single_engine(self, image_path: str, preprocess: bool, detail: bool) -> Union[str, List[dict]]:
@@ -2006,7 +2354,6 @@ class OCRService:
         """Multi-variant extraction for single engine mode (quality-scored)."""
         best_result = ""
         best_quality = 0.0
-        import cv2
 
         if not preprocess or not self.preprocessor._available:
             if self._easyocr_engine:
@@ -2014,20 +2361,15 @@ class OCRService:
             return ""
 
         variants = self.preprocessor.get_all_preprocessed_versions(image_path)
-        temp_files = []
 
         for name, img in variants[:6]:
             try:
-                tmp = f"{image_path}_single_{name}.png"
-                cv2.imwrite(tmp, img)
-                temp_files.append(tmp)
-
                 if self.engine_name == "easyocr" and self._easyocr_engine:
-                    text, conf = self._run_easyocr(tmp)
+                    text, conf = self._run_easyocr(img)
                 elif self.engine_name == "tesseract" and self._tesseract_engine:
-                    text, conf = self._run_tesseract(tmp)
+                    text, conf = self._run_tesseract(img)
                 elif self.engine_name == "paddleocr" and self._paddleocr_engine:
-                    text, conf = self._run_paddleocr(tmp)
+                    text, conf = self._run_paddleocr(img)
                 else:
                     continue
 
@@ -2043,12 +2385,6 @@ class OCRService:
             except Exception as e:
                 logger.debug(f"Variant {name} failed: {e}")
 
-        for f in temp_files:
-            try:
-                os.remove(f)
-            except:
-                pass
-
         return self._apply_language_correction(self._postprocess_ocr(best_result), mode="fast")
 
     # ==================== Sarvam / Cloud OCR ====================
@@ -2249,132 +2585,22 @@ class OCRService:
     def _extract_sarvam_via_pdf(self, image_path: str, detail: bool, language: str = None) -> Union[str, List[dict]]:
         """
         Sarvam AI via PDF conversion.
+
+        The batching client always sends images as (multi-page) PDF jobs, so
+        this is the SDK path with English as the default language.
         
         Args:
             image_path: Path to image file
             detail: Whether to return detailed results
             language: Language code (e.g., 'en', 'hi'). Defaults to 'en'.
         """
-        try:
-            from sarvamai import SarvamAI
-            from PIL import Image
-            import gc
-            
-            if language is None:
-                language = 'en'
-            
-            # Map 2-letter code to Sarvam language tag (usually with regional variant)
-            language_map = {
-                'en': 'en-IN',
-                'hi': 'hi-IN',
-                'ta': 'ta-IN',
-                'te': 'te-IN',
-                'kn': 'kn-IN',
-                'ml': 'ml-IN',
-                'mr': 'mr-IN',
-                'gu': 'gu-IN',
-                'pa': 'pa-IN',
-                'bn': 'bn-IN',
-                'or': 'or-IN',
-                'ur': 'ur-IN',
-                'es': 'es',
-                'fr': 'fr',
-                'de': 'de',
-                'pt': 'pt',
-                'it': 'it',
-                'ja': 'ja',
-                'zh': 'zh',
-                'ar': 'ar',
-                'ru': 'ru',
-            }
-            
-            sarvam_language = language_map.get(language, 'en-IN')
-            logger.info(f"[Sarvam PDF SDK] Using language: {sarvam_language} (user language: {language})")
-            
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tf:
-                pdf_path = tf.name
-            
-            try:
-                img = Image.open(image_path)
-                if img.mode == 'RGBA':
-                    img = img.convert('RGB')
-                img.save(pdf_path, 'PDF', resolution=300)
-                del img  # Explicitly delete image object
-                gc.collect()
-                
-                try:
-                    client = SarvamAI(api_subscription_key=self._sarvam_api_key)
-                    job = client.document_intelligence.create_job(language=sarvam_language, output_format="md")
-                    job.upload_file(pdf_path)
-                    job.start()
-                    job.wait_until_complete()
-                    
-                    text = ""
-                    with tempfile.TemporaryDirectory() as td:
-                        # Download output (will be a ZIP file)
-                        zip_path = os.path.join(td, "output.zip")
-                        job.download_output(zip_path)
-                        logger.debug(f"[Sarvam PDF SDK] Downloaded output to {zip_path}")
-                        
-                        # Extract and read the ZIP
-                        if os.path.exists(zip_path):
-                            import zipfile
-                            extract_dir = os.path.join(td, "extracted")
-                            os.makedirs(extract_dir, exist_ok=True)
-                            
-                            try:
-                                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                                    zip_ref.extractall(extract_dir)
-                                logger.debug(f"[Sarvam PDF SDK] Extracted ZIP to {extract_dir}")
-                                
-                                # Look for the main document file
-                                for ext in ['document.md', '.md', '.txt', '.html', '']:
-                                    for root, dirs, files in os.walk(extract_dir):
-                                        for file in files:
-                                            file_path = os.path.join(root, file)
-                                            if ext and (file == ext or file.endswith(ext)):
-                                                try:
-                                                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                                        content = f.read().strip()
-                                                        if content and not content.startswith('PK'):
-                                                            text = content
-                                                            logger.debug(f"[Sarvam PDF SDK] Read {len(text)} chars from {file}")
-                                                            break
-                                                except:
-                                                    pass
-                                        if text:
-                                            break
-                                    if text:
-                                        break
-                            except zipfile.BadZipFile:
-                                logger.warning("[Sarvam PDF SDK] ZIP file is corrupted")
-                    
-                    logger.info(f"[Sarvam PDF SDK] SUCCESS - Extracted {len(text)} characters in language={sarvam_language}")
-                    # Strip HTML tags from extracted text
-                    text = self._strip_html(text)
-                    if detail:
-                        return [{'text': text, 'confidence': 1.0, 'engine': 'sarvam_sdk', 'language': sarvam_language}]
-                    return text.strip()
-                
-                except Exception as sarvam_err:
-                    logger.warning(f"Sarvam PDF processing: {sarvam_err}")
-                    return "" if not detail else []
-            
-            finally:
-                # Cleanup temporary PDF with safe deletion
-                self._safe_delete_file(pdf_path)
-        
-        except Exception as e:
-            logger.warning(f"Sarvam PDF extraction: {e}")
-        
-        return "" if not detail else []
+        return self._extract_sarvam_sdk_direct(image_path, detail, language=language or 'en')
 
     def _fallback_easyocr(self, image_path: str, detail: bool) -> Union[str, List[dict]]:
         """Fallback to local EasyOCR."""
         try:
-            if self._easyocr_engine is None:
-                self._init_easyocr()
-            text, conf = self._run_easyocr(image_path)
+            with self._engines("easyocr" if self._easyocr_engine is None else None):
+                text, conf = self._run_easyocr(image_path)
             if detail:
                 return [{"text": text, "confidence": conf, "engine": "easyocr_fallback"}]
             return self._postprocess_ocr(text)
@@ -2384,21 +2610,36 @@ class OCRService:
 
     # ==================== PDF Extraction ====================
 
-    def _extract_from_pdf(self, pdf_path: str, preprocess: bool, detail: bool, language: str = None) -> Union[str, List[dict]]:
+    # Pages are rendered at 2x (≈144 dpi) before OCR
+    PDF_RENDER_SCALE = 2.0
+
+    # Peak memory per in-flight page, as a multiple of its raw RGB render:
+    # pixmap + PNG + decoded image inside the engine, plus the preprocessing
+    # variants the ensemble builds.  Used to size the page pool.
+    PDF_PAGE_MEMORY_FACTOR = {"ensemble": 12.0, "sarvam": 2.0}
+    PDF_PAGE_MEMORY_FACTOR_DEFAULT = 5.0
+
+    def _extract_from_pdf(self, pdf_path: str, preprocess: bool, detail: bool, language: str = None,
+                          pages: Optional[List[dict]] = None) -> Union[str, List[dict]]:
         """
         Extract text from PDF (embedded text or OCR on rendered pages).
         Supports multilingual extraction with complete page processing.
+
+        Pages without embedded text are OCRed in parallel (see
+        ``_ocr_pdf_pages``) and reassembled in page order.  A page that
+        fails or exceeds ``OCR_PDF_PAGE_TIMEOUT`` contributes empty text;
+        the rest of the document is still returned.
         
         Args:
             pdf_path: Path to PDF file
             preprocess: Whether to apply preprocessing (for local engines)
             detail: Whether to return detailed results with confidence scores
             language: Language code (e.g., 'en', 'hi', 'ta'). Auto-detected if None.
+            pages: When given, receives one ``_page_record`` per page (for the OCR cache)
         """
         try:
             import fitz
             import gc
-            from io import BytesIO
             
             # Detect language from filename if not provided
             if language is None:
@@ -2411,87 +2652,49 @@ class OCRService:
             logger.info(f"[PDF Extraction] Processing {total_pages} pages with language={language}")
             
             try:
+                # Pass 1: embedded text (cheap, stays on this thread)
+                embedded_pages: Dict[int, str] = {}
+                ocr_pages: List[int] = []
                 for i in range(total_pages):
-                    page = doc.load_page(i)
-                    embedded = page.get_text().strip()
-                    
+                    embedded = doc.load_page(i).get_text().strip()
                     if embedded and len(embedded) > 50:
-                        # Page has extractable text
                         logger.debug(f"[PDF Page {i+1}/{total_pages}] Found embedded text ({len(embedded)} chars)")
+                        embedded_pages[i] = embedded
+                    else:
+                        ocr_pages.append(i)
+
+                # Pass 2: OCR the rest on the page pool
+                ocr_results, timed_out = self._ocr_pdf_pages(doc, ocr_pages, preprocess, detail, language)
+
+                # Reassemble in page order
+                for i in range(total_pages):
+                    if i in embedded_pages:
                         if detail:
-                            all_detail.append({"text": embedded, "confidence": 1.0,
-                                               "page": i + 1, "source": "embedded"})
+                            page_result = [{"text": embedded_pages[i], "confidence": 1.0,
+                                            "page": i + 1, "source": "embedded"}]
+                            all_detail.extend(page_result)
                         else:
-                            all_text.append(embedded)
+                            page_result = embedded_pages[i]
+                            all_text.append(page_result)
+                        if pages is not None:
+                            pages.append(self._page_record(i + 1, page_result, "embedded"))
+                        continue
+
+                    result = ocr_results.get(i)
+                    if detail:
+                        if isinstance(result, list):
+                            for item in result:
+                                item['page'] = i + 1
+                                item['language'] = language
+                            all_detail.extend(result)
+                        elif i in timed_out:
+                            all_detail.append({"text": "", "confidence": 0.0,
+                                               "page": i + 1, "source": "timeout"})
                     else:
-                        # Need OCR - render to PNG in memory
-                        logger.debug(f"[PDF Page {i+1}/{total_pages}] No embedded text, rendering for OCR...")
-                        result = None
-                        try:
-                            # Render page to pixmap (image in memory)
-                            mat = fitz.Matrix(2.0, 2.0)
-                            pix = page.get_pixmap(matrix=mat)
-                            
-                            # Save pixmap to bytes (in-memory PNG)
-                            png_bytes = pix.tobytes("png")
-                            
-                            # Create in-memory file-like object
-                            img_buffer = BytesIO(png_bytes)
-                            
-                            # Delete pixmap to free memory
-                            del pix
-                            gc.collect()
-                            
-                            # Save PNG to a very temporary location, process, and delete immediately
-                            import uuid
-                            temp_name = f"ocr_tmp_{uuid.uuid4().hex}.png"
-                            temp_path = os.path.join(tempfile.gettempdir(), temp_name)
-                            
-                            try:
-                                # Write bytes to disk
-                                with open(temp_path, 'wb') as tf:
-                                    tf.write(png_bytes)
-                                
-                                # Immediately close and process
-                                logger.debug(f"[PDF Page {i+1}/{total_pages}] Calling {self.engine_name} for OCR...")
-                                if self.engine_name == "sarvam":
-                                    result = self._extract_sarvam_exclusive(temp_path, detail, language=language)
-                                elif self.engine_name == "ensemble":
-                                    result = self._extract_ensemble(temp_path, preprocess, detail)
-                                else:
-                                    result = self._extract_single_engine(temp_path, preprocess, detail)
-                                
-                                if result and len(str(result)) > 20:
-                                    logger.debug(f"[PDF Page {i+1}/{total_pages}] ✓ OCR extracted {len(str(result)) if isinstance(result, str) else len(str(result[0].get('text', '')))} chars")
-                                else:
-                                    logger.debug(f"[PDF Page {i+1}/{total_pages}] ⚠️  OCR returned minimal text")
-                            
-                            finally:
-                                # Aggressive cleanup - force delete even if locked
-                                if os.path.exists(temp_path):
-                                    try:
-                                        import stat
-                                        # Try to make file writable first (in case it's read-only)
-                                        os.chmod(temp_path, stat.S_IWRITE | stat.S_IREAD)
-                                        os.remove(temp_path)
-                                        logger.debug(f"[PDF Page {i+1}] Cleaned temporary OCR image")
-                                    except PermissionError:
-                                        # Couldn't delete, but that's OK - continue anyway
-                                        logger.debug(f"[PDF Page {i+1}] Temp file will be cleaned by OS")
-                                    except Exception as e:
-                                        logger.debug(f"[PDF Page {i+1}] Temp cleanup warning: {e}")
-                            
-                            if detail and isinstance(result, list):
-                                for item in result:
-                                    item['page'] = i + 1
-                                    item['language'] = language
-                                all_detail.extend(result)
-                            else:
-                                all_text.append(result if result else "")
-                        
-                        except Exception as ocr_err:
-                            logger.warning(f"[PDF Page {i+1}/{total_pages}] OCR extraction failed: {ocr_err}")
-                            all_text.append("")  # Add empty string for failed page
+                        all_text.append(result if isinstance(result, str) else "")
+                    if pages is not None:
+                        source = "timeout" if i in timed_out else ("failed" if result is None else "ocr")
+                        pages.append(self._page_record(i + 1, result, source))
             
             finally:
                 # Close document
@@ -2506,6 +2709,8 @@ class OCRService:
             # Log completion
             total_chars = sum(len(str(t)) for t in all_text)
             logger.info(f"[PDF Extraction] Complete! Processed {total_pages} pages, extracted {total_chars} chars")
+            if timed_out:
+                logger.warning(f"[PDF Extraction] Partial result: pages {[i + 1 for i in timed_out]} timed out")
             
             return all_detail if detail else "\n\n".join(all_text)
         
@@ -2515,6 +2720,317 @@ class OCRService:
             logger.error(f"PDF extraction error: {type(e).__name__}: {e}")
             raise RuntimeError(f"PDF extraction failed: {e}")
 
+    def _pdf_page_workers(self, doc, page_indexes: List[int]) -> int:
+        """
+        Number of pages to OCR at once.
+
+        ``OCR_PDF_PAGE_WORKERS`` (capped by ``OCR_PDF_LOW_MEMORY_PAGE_WORKERS``
+        in LOW_MEMORY_MODE) and by the engine pool's sets per key — each page
+        holds a set for its whole run, so extra workers would only queue on
+        ``checkout`` — lowered further so the estimated working set of the
+        in-flight pages fits ``OCR_PDF_MEMORY_BUDGET_MB``.
+        """
+        from config.settings import settings
+        from api.services.ocr_engine_pool import LOCAL_ENGINES, get_ocr_engine_pool
+
+        workers = max(1, int(getattr(settings, 'OCR_PDF_PAGE_WORKERS', 1)))
+        if self.low_memory_mode:
+            workers = min(workers, max(1, int(getattr(settings, 'OCR_PDF_LOW_MEMORY_PAGE_WORKERS', 1))))
+        if self.engine_name in LOCAL_ENGINES and not self._engine_overrides:
+            workers = min(workers, get_ocr_engine_pool().max_per_key)
+        workers = min(workers, len(page_indexes))
+        if workers <= 1:
+            return 1
+
+        budget_mb = float(getattr(settings, 'OCR_PDF_MEMORY_BUDGET_MB', 0) or 0)
+        if budget_mb > 0:
+            largest = 0.0
+            for i in page_indexes:
+                rect = doc.load_page(i).rect
+                largest = max(largest, rect.width * rect.height)
+            factor = self.PDF_PAGE_MEMORY_FACTOR.get(self.engine_name, self.PDF_PAGE_MEMORY_FACTOR_DEFAULT)
+            page_mb = largest * self.PDF_RENDER_SCALE ** 2 * 3 * factor / (1024 * 1024)
+            if page_mb > 0:
+                workers = min(workers, max(1, int(budget_mb // page_mb)))
+        return workers
+
+    def _render_pdf_page(self, doc, index: int) -> bytes:
+        """Render one page to PNG bytes (PyMuPDF documents are not thread-safe: call from one thread)."""
+        import fitz
+
+        page = doc.load_page(index)
+        pix = page.get_pixmap(matrix=fitz.Matrix(self.PDF_RENDER_SCALE, self.PDF_RENDER_SCALE))
+        png_bytes = pix.tobytes("png")
+        del pix
+        return png_bytes
+
+    def _ocr_pdf_pages(
+        self,
+        doc,
+        page_indexes: List[int],
+        preprocess: bool,
+        detail: bool,
+        language: str,
+    ) -> Tuple[Dict[int, Union[str, List[dict], None]], List[int]]:
+        """
+        OCR rendered pages on a bounded pool of page workers.
+
+        Pages are rendered on the calling thread only when a worker is free,
+        so at most ``_pdf_page_workers()`` rendered pages are in memory at a
+        time.  Pages found in the OCR cache (by the hash of their render)
+        skip OCR; newly OCRed pages with text are added to it.
+
+        A page's ``OCR_PDF_PAGE_TIMEOUT`` starts once its worker has checked
+        out an engine set (waiting for one is bounded by the pool's checkout
+        timeout).  A page still running after it is abandoned: its thread
+        keeps its worker slot, and its engines, until it returns, so
+        abandoned pages still count towards the worker limit.  A result that
+        arrives before the document is done is still used.  If every slot
+        is held by abandoned pages and none returns within another timeout,
+        the pages not yet started are reported as timed out too.
+
+        Returns:
+            ({page_index: result or None}, [timed-out page indexes])
+        """
+        import queue
+        import threading
+        from collections import deque
+        from config.settings import settings
+
+        results: Dict[int, Union[str, List[dict], None]] = {}
+        if not page_indexes:
+            return results, []
+        if self.engine_name == "sarvam":
+            return self._ocr_pdf_pages_sarvam(doc, page_indexes, preprocess, detail, language), []
+
+        total_pages = len(doc)
+        workers = self._pdf_page_workers(doc, page_indexes)
+        timeout = float(getattr(settings, 'OCR_PDF_PAGE_TIMEOUT', 0) or 0) or None
+        logger.info(
+            f"[PDF Extraction] OCR on {len(page_indexes)} pages, {workers} at a time"
+            + (f", {timeout:.0f}s per page" if timeout else "")
+        )
+
+        # (page index, "started" | "done", result, error)
+        events: "queue.Queue[Tuple[int, str, object, Optional[Exception]]]" = queue.Queue()
+
+        cache = self._ocr_cache
+
+        def work(index: int, png_bytes: bytes, page_key: Optional[str]) -> None:
+            partial_before = self._partial_corrections
+            try:
+                # Checked out here (the page re-uses it) so the clock starts once the engines are ours
+                with self._engines():
+                    events.put((index, "started", None, None))
+                    result = self._ocr_pdf_page(png_bytes, index, total_pages, preprocess, detail, language)
+            except Exception as e:
+                events.put((index, "done", None, e))
+                return
+            record = self._page_record(index + 1, result, "ocr")
+            if page_key and record["text"].strip() and self._partial_corrections == partial_before:
+                cache.put(page_key, record)
+            events.put((index, "done", result, None))
+
+        pending = deque(page_indexes)
+        running: set = set()                        # threads that have not returned, abandoned included
+        deadlines: Dict[int, float] = {}            # started, not abandoned -> deadline
+        abandoned: set = set()
+        timed_out: List[int] = []
+
+        while pending or running - abandoned:
+            # Start pages while workers are free
+            while pending and len(running) < workers:
+                i = pending.popleft()
+                try:
+                    png_bytes = self._render_pdf_page(doc, i)
+                except Exception as e:
+                    logger.warning(f"[PDF Page {i+1}/{total_pages}] Render failed: {e}")
+                    results[i] = None
+                    continue
+                page_key = self._page_cache_key(png_bytes, preprocess, detail, language) if cache else None
+                cached = cache.get(page_key) if page_key else None
+                if cached is not None:
+                    logger.debug(f"[PDF Page {i+1}/{total_pages}] OCR cache hit")
+                    results[i] = cached["items"] if detail else cached["text"]
+                    continue
+                # Daemon threads: an abandoned page must not block the caller or shutdown
+                threading.Thread(
+                    target=work, args=(i, png_bytes, page_key), name=f"pdf-ocr-p{i+1}", daemon=True,
+                ).start()
+                running.add(i)
+
+            if not running:
+                continue
+
+            stalled = not (running - abandoned)     # every slot held by an abandoned page
+            wait_for = None
+            if stalled:
+                wait_for = timeout
+            elif timeout and deadlines:
+                wait_for = max(0.0, min(deadlines.values()) - time.monotonic())
+            try:
+                i, kind, result, error = events.get(timeout=wait_for)
+            except queue.Empty:
+                if stalled:
+                    logger.warning(
+                        f"[PDF Extraction] Abandoned pages still hold every worker, "
+                        f"skipping pages {[p + 1 for p in pending]}"
+                    )
+                    for p in pending:
+                        timed_out.append(p)
+                        results[p] = None
+                    pending.clear()
+                    continue
+                now = time.monotonic()
+                for i, deadline in list(deadlines.items()):
+                    if deadline <= now:
+                        logger.warning(
+                            f"[PDF Page {i+1}/{total_pages}] OCR exceeded {timeout:.0f}s, keeping the rest of the document"
+                        )
+                        del deadlines[i]
+                        abandoned.add(i)
+                        timed_out.append(i)
+                        results[i] = None
+                continue
+
+            if kind == "started":
+                if timeout:
+                    deadlines[i] = time.monotonic() + timeout
+                continue
+
+            running.discard(i)
+            if error is not None:
+                logger.warning(f"[PDF Page {i+1}/{total_pages}] OCR extraction failed: {error}")
+            if i in abandoned:
+                abandoned.discard(i)
+                if error is None:
+                    # Late, but the document is not finished yet: keep it
+                    logger.info(f"[PDF Page {i+1}/{total_pages}] Late OCR result recovered")
+                    timed_out.remove(i)
+                    results[i] = result
+            else:
+                deadlines.pop(i, None)
+                results[i] = result
+
+        return results, sorted(timed_out)
+
+    def _ocr_pdf_pages_sarvam(
+        self,
+        doc,
+        page_indexes: List[int],
+        preprocess: bool,
+        detail: bool,
+        language: str,
+    ) -> Dict[int, Union[str, List[dict], None]]:
+        """
+        Sarvam: hand every page to the batching client at once so pages share
+        multi-page jobs (see sarvam_client.py) instead of one job per page.
+
+        Pages are rendered on this thread; OCR-cache hits are not sent.  A
+        page whose job fails, comes back empty or is not back within the
+        client's ``result_timeout()`` is retried on its own via
+        ``_extract_sarvam_exclusive`` (SDK single page, then REST).
+        """
+        from api.services.sarvam_client import get_sarvam_client
+
+        results: Dict[int, Union[str, List[dict], None]] = {}
+        total_pages = len(doc)
+        cache = self._ocr_cache
+        sarvam_language = self._sarvam_language_tag(language)
+        try:
+            client = get_sarvam_client()
+        except (ImportError, ValueError) as e:
+            logger.warning(f"[PDF Extraction] Sarvam batch client unavailable ({e}), pages sent one by one")
+            client = None
+
+        submitted = []
+        for i in page_indexes:
+            try:
+                png_bytes = self._render_pdf_page(doc, i)
+            except Exception as e:
+                logger.warning(f"[PDF Page {i+1}/{total_pages}] Render failed: {e}")
+                results[i] = None
+                continue
+            page_key = self._page_cache_key(png_bytes, preprocess, detail, language) if cache else None
+            cached = cache.get(page_key) if page_key else None
+            if cached is not None:
+                logger.debug(f"[PDF Page {i+1}/{total_pages}] OCR cache hit")
+                results[i] = cached["items"] if detail else cached["text"]
+                continue
+            future = client.submit(png_bytes, sarvam_language) if client else None
+            submitted.append((i, future, png_bytes, page_key))
+
+        logger.info(f"[PDF Extraction] {len(submitted)} pages submitted to Sarvam in batched jobs")
+        deadline = time.monotonic() + client.result_timeout() if client else None
+        for i, future, png_bytes, page_key in submitted:
+            result = None
+            if future is not None:
+                try:
+                    page = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                    if page.text.strip():
+                        result = self._sarvam_page_result(page.text, detail, sarvam_language, page.job_id)
+                        if not detail:
+                            result = self._postprocess_ocr(result)
+                except Exception as e:
+                    logger.warning(f"[PDF Page {i+1}/{total_pages}] Sarvam batch job failed: {e}")
+            partial_before = self._partial_corrections
+            if not result:
+                try:
+                    result = self._ocr_pdf_page(png_bytes, i, total_pages, preprocess, detail, language)
+                except Exception as e:
+                    logger.warning(f"[PDF Page {i+1}/{total_pages}] OCR extraction failed: {e}")
+                    result = None
+            record = self._page_record(i + 1, result, "ocr")
+            if page_key and record["text"].strip() and self._partial_corrections == partial_before:
+                cache.put(page_key, record)
+            results[i] = result
+        return results
+
+    def _ocr_pdf_page(
+        self,
+        png_bytes: bytes,
+        index: int,
+        total_pages: int,
+        preprocess: bool,
+        detail: bool,
+        language: str,
+    ) -> Union[str, List[dict]]:
+        """OCR one rendered page via a short-lived temp PNG (runs on a page worker)."""
+        import uuid
+
+        temp_path = os.path.join(tempfile.gettempdir(), f"ocr_tmp_{uuid.uuid4().hex}.png")
+        try:
+            with open(temp_path, 'wb') as tf:
+                tf.write(png_bytes)
+
+            logger.debug(f"[PDF Page {index+1}/{total_pages}] Calling {self.engine_name} for OCR...")
+            if self.engine_name == "sarvam":
+                result = self._extract_sarvam_exclusive(temp_path, detail, language=language)
+            elif self.engine_name == "ensemble":
+                with self._engines():
+                    result = self._extract_ensemble(temp_path, preprocess, detail)
+            else:
+                with self._engines():
+                    result = self._extract_single_engine(temp_path, preprocess, detail)
+
+            if result and len(str(result)) > 20:
+                logger.debug(f"[PDF Page {index+1}/{total_pages}] ✓ OCR extracted {len(str(result))} chars")
+            else:
+                logger.debug(f"[PDF Page {index+1}/{total_pages}] ⚠️  OCR returned minimal text")
+            return result
+        finally:
+            # Aggressive cleanup - force delete even if locked
+            if os.path.exists(temp_path):
+                try:
+                    import stat
+                    os.chmod(temp_path, stat.S_IWRITE | stat.S_IREAD)
+                    os.remove(temp_path)
+                except PermissionError:
+                    # Couldn't delete, but that's OK - continue anyway
+                    logger.debug(f"[PDF Page {index+1}] Temp file will be cleaned by OS")
+                except Exception as e:
+                    logger.debug(f"[PDF Page {index+1}] Temp cleanup warning: {e}")
+
     # ==================== Post-Processing ====================
 
     def _similarity_ratio(self, a: str, b: str) -> float:
@@ -0,0 +1,475 @@
+"""
+Evaluation Result Store
+========================
+Indexed storage for evaluation results.
+
+Problem
+-------
+``GET /results`` and ``GET /results/stats/summary`` called
+``load_all_results()``, which globbed ``uploads/results/*.json`` and parsed
+every (indent=2) report on every request before filtering, sorting and
+paginating in Python.  With tens of thousands of evaluations that took
+seconds per call, and ``evaluation_results_store`` kept every result ever
+loaded in an unbounded dict.
+
+Solution
+--------
+``ResultStore`` keeps results in the main database (``database/models.py``,
+migration 0004), so every API replica sees the same results:
+
+*   ``result_summaries`` — one row per evaluation: score, marks, grade,
+    timestamp, teacher, student and class, with indexes for the list
+    filters and the newest-first sort.  Listing, counting and statistics
+    are SQL queries that never touch a report.
+*   ``result_details`` — the full report as zlib-compressed JSON, read only
+    by ``get()`` (``GET /results/{id}`` and export).
+*   ``result_totals`` — count, score sum, min and max per grade for all
+    results and per teacher / student / class, updated in the same
+    transaction as every save and delete.  Unfiltered and per-owner
+    ``statistics()`` read a handful of these rows.
+
+``get()`` keeps the ``RESULT_CACHE_SIZE`` most recently used reports in a
+per-process LRU.  Every write bumps the summary's ``version``; a cache hit
+is served only after a primary-key read of that version, so reports saved,
+re-tagged or deleted by another worker are never served stale.
+
+The per-host ``results.db`` SQLite file and the JSON files of the old file
+store are imported once, the first time a worker starts on the database.
+
+Usage:
+    store = get_result_store()
+    store.save(evaluation_id, result_dict, teacher_id="t1")
+    total, rows = store.list(limit=50, grade="good")
+    report = store.get(evaluation_id)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, func, literal, or_, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from database.models import ResultDetail, ResultStoreMeta, ResultSummary, ResultTotal
+
+logger = logging.getLogger("AssessIQ.ResultStore")
+
+SUMMARY_COLUMNS = (
+    "evaluation_id", "final_score", "max_marks", "obtained_marks", "grade",
+    "timestamp", "teacher_id", "student_id", "class_id", "saved_at",
+)
+OWNER_COLUMNS = ("teacher_id", "student_id", "class_id")
+TOTAL_KEY = ("scope", "scope_id", "grade")
+
+summaries = ResultSummary.__table__
+details = ResultDetail.__table__
+totals = ResultTotal.__table__
+meta = ResultStoreMeta.__table__
+
+
+def summarize(evaluation_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Summary columns of one report (multi-question reports use their overall fields)."""
+    grade = result.get("grade", result.get("overall_grade")) or "unknown"
+
+    def owner(column: str) -> Optional[str]:
+        value = result.get(column)
+        return None if value is None else str(value)
+
+    return {
+        "evaluation_id": evaluation_id,
+        "final_score": float(result.get("final_score", result.get("overall_percentage")) or 0),
+        "max_marks": int(result.get("max_marks", result.get("total_max_marks")) or 10),
+        "obtained_marks": float(result.get("obtained_marks", result.get("total_obtained_marks")) or 0),
+        "grade": str(getattr(grade, "value", grade)).lower(),
+        "timestamp": str(result.get("timestamp") or ""),
+        "teacher_id": owner("teacher_id"),
+        "student_id": owner("student_id"),
+        "class_id": owner("class_id"),
+        "saved_at": result.get("saved_at"),
+    }
+
+
+def compress(result: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(result, separators=(",", ":"), default=str).encode("utf-8"), 6)
+
+
+def decompress(blob: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def _upsert(connection: Connection, table, key: Tuple[str, ...], values: Dict[str, Any],
+            increments: Dict[str, Any]) -> None:
+    dialect = connection.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        connection.execute(insert(table).values(**values).on_conflict_do_update(
+            index_elements=list(key), set_=increments))
+        return
+    where = and_(*(table.c[name] == values[name] for name in key))
+    if connection.execute(table.update().where(where).values(**increments)).rowcount == 0:
+        connection.execute(table.insert().values(**values))
+
+
+class ResultStore:
+    """Result summaries + compressed reports in the main database, with a version-checked LRU."""
+
+    def __init__(self, engine: Optional[Engine] = None, cache_size: int = 256,
+                 legacy_dir: Optional[str] = None, legacy_db: Optional[str] = None):
+        if engine is None:
+            from database.models import engine
+        self.engine = engine
+        self.cache_size = max(0, cache_size)
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, Tuple[int, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if legacy_dir or legacy_db:
+            self.import_legacy(legacy_dir, legacy_db)
+
+    # ─── Writes ──────────────────────────────────────────────────────
+
+    def save(self, evaluation_id: str, result: Dict[str, Any], **owner: Optional[str]) -> None:
+        """Insert or replace one report; *owner* sets teacher_id / student_id / class_id."""
+        result = {**result, **{k: v for k, v in owner.items() if v is not None}}
+        with self.engine.begin() as connection:
+            version = self._write(connection, evaluation_id, result)
+        self._remember(evaluation_id, version, result)
+
+    def _write(self, connection: Connection, evaluation_id: str, result: Dict[str, Any]) -> int:
+        """Insert or replace one report in *connection*'s transaction; returns its new version."""
+        summary = summarize(evaluation_id, result)
+        previous = self._summary(connection, evaluation_id, lock=True)
+        if previous is not None:
+            self._remove_totals(connection, previous)
+        self._add_totals(connection, summary)
+
+        detail = {"detail": compress(result)}
+        if previous is None:
+            version = 1
+            connection.execute(summaries.insert().values(**summary, version=version))
+            connection.execute(details.insert().values(evaluation_id=evaluation_id, **detail))
+        else:
+            version = previous["version"] + 1
+            connection.execute(summaries.update().where(summaries.c.evaluation_id == evaluation_id)
+                               .values(**summary, version=version))
+            connection.execute(details.update().where(details.c.evaluation_id == evaluation_id)
+                               .values(**detail))
+        return version
+
+    def tag(self, evaluation_id: str, **owner: Optional[str]) -> bool:
+        """Record who a stored result belongs to (known only after it was saved)."""
+        owner = {k: v for k, v in owner.items() if k in OWNER_COLUMNS and v is not None}
+        if not owner:
+            return False
+        result = self.get(evaluation_id)
+        if result is None:
+            return False
+        self.save(evaluation_id, result, **owner)
+        return True
+
+    def delete(self, evaluation_id: str) -> bool:
+        with self.engine.begin() as connection:
+            previous = self._summary(connection, evaluation_id, lock=True)
+            if previous is not None:
+                self._remove_totals(connection, previous)
+            deleted = connection.execute(
+                delete(summaries).where(summaries.c.evaluation_id == evaluation_id)).rowcount
+            connection.execute(delete(details).where(details.c.evaluation_id == evaluation_id))
+        self._forget(evaluation_id)
+        return bool(deleted)
+
+    @staticmethod
+    def _summary(connection: Connection, evaluation_id: str, lock: bool = False) -> Optional[Dict[str, Any]]:
+        query = select(*(summaries.c[c] for c in SUMMARY_COLUMNS), summaries.c.version).where(
+            summaries.c.evaluation_id == evaluation_id)
+        if lock:
+            # Concurrent writes of one result serialise here (PostgreSQL)
+            query = query.with_for_update()
+        row = connection.execute(query).first()
+        return dict(row._mapping) if row is not None else None
+
+    # ─── Running totals ──────────────────────────────────────────────
+
+    @staticmethod
+    def _scopes(summary: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """``("all", "")`` plus one ``(owner column, id)`` per owner the result has."""
+        return [("all", "")] + [(c, str(summary[c])) for c in OWNER_COLUMNS if summary.get(c) is not None]
+
+    @staticmethod
+    def _total_clause(key: Tuple[str, str, str]):
+        return and_(*(totals.c[name] == value for name, value in zip(TOTAL_KEY, key)))
+
+    def _add_totals(self, connection: Connection, summary: Dict[str, Any]) -> None:
+        score = summary["final_score"]
+        for scope, scope_id in self._scopes(summary):
+            _upsert(connection, totals, TOTAL_KEY, {
+                "scope": scope, "scope_id": scope_id, "grade": summary["grade"],
+                "count": 1, "score_sum": score, "score_min": score, "score_max": score,
+            }, {
+                "count": totals.c.count + 1,
+                "score_sum": totals.c.score_sum + score,
+                "score_min": case((or_(totals.c.score_min.is_(None), totals.c.score_min > score), score),
+                                  else_=totals.c.score_min),
+                "score_max": case((or_(totals.c.score_max.is_(None), totals.c.score_max < score), score),
+                                  else_=totals.c.score_max),
+            })
+
+    def _remove_totals(self, connection: Connection, summary: Dict[str, Any]) -> None:
+        score, grade = summary["final_score"], summary["grade"]
+        for scope, scope_id in self._scopes(summary):
+            where = self._total_clause((scope, scope_id, grade))
+            connection.execute(totals.update().where(where).values(
+                count=totals.c.count - 1, score_sum=totals.c.score_sum - score))
+            row = connection.execute(
+                select(totals.c.count, totals.c.score_min, totals.c.score_max).where(where)).first()
+            if row is None:
+                continue
+            if row.count <= 0:
+                connection.execute(delete(totals).where(where))
+            elif row.score_min is None or row.score_max is None or score <= row.score_min or score >= row.score_max:
+                # The removed score was a bound: re-read it for this one row
+                query = select(func.min(summaries.c.final_score), func.max(summaries.c.final_score)).where(
+                    summaries.c.grade == grade, summaries.c.evaluation_id != summary["evaluation_id"])
+                if scope != "all":
+                    query = query.where(summaries.c[scope] == scope_id)
+                lo, hi = connection.execute(query).first()
+                connection.execute(totals.update().where(where).values(score_min=lo, score_max=hi))
+
+    @staticmethod
+    def _computed_totals(connection: Connection) -> List[Tuple]:
+        s = summaries.c
+        figures = (s.grade, func.count(), func.sum(s.final_score), func.min(s.final_score), func.max(s.final_score))
+        selects = [select(literal("all"), literal(""), *figures).group_by(s.grade)]
+        selects += [select(literal(c), s[c], *figures).where(s[c].isnot(None)).group_by(s[c], s.grade)
+                    for c in OWNER_COLUMNS]
+        return [tuple(row) for query in selects for row in connection.execute(query)]
+
+    def rebuild_totals(self) -> int:
+        """Recompute ``result_totals`` from the summaries; returns the row count."""
+        with self.engine.begin() as connection:
+            rows = self._computed_totals(connection)
+            connection.execute(delete(totals))
+            if rows:
+                connection.execute(totals.insert(), [
+                    dict(zip(TOTAL_KEY + ("count", "score_sum", "score_min", "score_max"), row)) for row in rows
+                ])
+        return len(rows)
+
+    def check_totals(self) -> List[Dict[str, Any]]:
+        """``result_totals`` rows that differ from a recomputation (empty when consistent)."""
+        with self.engine.connect() as connection:
+            expected = {(r[0], str(r[1]), r[2]): r[3:] for r in self._computed_totals(connection)}
+            actual = {tuple(r[:3]): tuple(r[3:]) for r in connection.execute(select(
+                *(totals.c[name] for name in TOTAL_KEY),
+                totals.c.count, totals.c.score_sum, totals.c.score_min, totals.c.score_max))}
+        mismatches = []
+        for key in sorted(set(expected) | set(actual)):
+            a, e = actual.get(key), expected.get(key)
+            if a is None or e is None or a[0] != e[0] or any(
+                    abs(x - y) > 1e-6 * max(1.0, abs(y)) for x, y in zip(a[1:], e[1:])):
+                mismatches.append({"key": key, "stored": a, "expected": e})
+        return mismatches
+
+    # ─── Reads ───────────────────────────────────────────────────────
+
+    def get(self, evaluation_id: str) -> Optional[Dict[str, Any]]:
+        """Full report (LRU while its version is current, else the compressed blob)."""
+        with self._lock:
+            cached = self._cache.get(evaluation_id)
+        with self.engine.connect() as connection:
+            if cached is not None:
+                version = connection.execute(select(summaries.c.version).where(
+                    summaries.c.evaluation_id == evaluation_id)).scalar()
+                if version == cached[0]:
+                    with self._lock:
+                        if evaluation_id in self._cache:
+                            self._cache.move_to_end(evaluation_id)
+                        self.hits += 1
+                    return cached[1]
+                if version is None:
+                    # Deleted by another worker
+                    self._forget(evaluation_id)
+                    return None
+            row = connection.execute(
+                select(summaries.c.version, details.c.detail)
+                .join(details, details.c.evaluation_id == summaries.c.evaluation_id)
+                .where(summaries.c.evaluation_id == evaluation_id)).first()
+        with self._lock:
+            self.misses += 1
+        if row is None:
+            self._forget(evaluation_id)
+            return None
+        result = decompress(row.detail)
+        self._remember(evaluation_id, row.version, result)
+        return result
+
+    def _remember(self, evaluation_id: str, version: int, result: Dict[str, Any]) -> None:
+        if not self.cache_size:
+            return
+        with self._lock:
+            self._cache[evaluation_id] = (version, result)
+            self._cache.move_to_end(evaluation_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _forget(self, evaluation_id: str) -> None:
+        with self._lock:
+            self._cache.pop(evaluation_id, None)
+
+    @staticmethod
+    def _where(filters: Dict[str, Any]) -> List[Any]:
+        clauses = []
+        if filters.get("min_score") is not None:
+            clauses.append(summaries.c.final_score >= filters["min_score"])
+        if filters.get("max_score") is not None:
+            clauses.append(summaries.c.final_score <= filters["max_score"])
+        if filters.get("grade"):
+            clauses.append(summaries.c.grade == str(filters["grade"]).lower())
+        for column in OWNER_COLUMNS:
+            if filters.get(column):
+                clauses.append(summaries.c[column] == str(filters[column]))
+        return clauses
+
+    def list(self, limit: int = 50, offset: int = 0, **filters: Any) -> Tuple[int, List[Dict[str, Any]]]:
+        """``(total matching, page of summaries)``, newest first."""
+        where = self._where(filters)
+        with self.engine.connect() as connection:
+            total = connection.execute(select(func.count()).select_from(summaries).where(*where)).scalar()
+            rows = connection.execute(
+                select(*(summaries.c[c] for c in SUMMARY_COLUMNS)).where(*where)
+                .order_by(summaries.c.timestamp.desc(), summaries.c.evaluation_id)
+                .limit(limit).offset(offset)
+            ).all()
+        return total, [dict(row._mapping) for row in rows]
+
+    def statistics(self, **filters: Any) -> Dict[str, Any]:
+        """Count, mean / min / max score and grade distribution."""
+        active = {k: v for k, v in filters.items() if v is not None and v != ""}
+        if not active or (len(active) == 1 and next(iter(active)) in OWNER_COLUMNS):
+            return self._statistics_from_totals(*next(iter(active.items()), ("all", "")))
+
+        where = self._where(filters)
+        score = summaries.c.final_score
+        with self.engine.connect() as connection:
+            total, average, highest, lowest = connection.execute(
+                select(func.count(), func.avg(score), func.max(score), func.min(score)).where(*where)).first()
+            grades = connection.execute(
+                select(summaries.c.grade, func.count()).where(*where).group_by(summaries.c.grade)).all()
+        return {
+            "total_evaluations": total,
+            "average_score": round(average or 0, 2),
+            "highest_score": highest or 0,
+            "lowest_score": lowest or 0,
+            "grade_distribution": {grade: count for grade, count in grades},
+        }
+
+    def _statistics_from_totals(self, scope: str, scope_id: Any) -> Dict[str, Any]:
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                select(totals.c.grade, totals.c.count, totals.c.score_sum, totals.c.score_min, totals.c.score_max)
+                .where(totals.c.scope == scope, totals.c.scope_id == str(scope_id))).all()
+        total = sum(r.count for r in rows)
+        return {
+            "total_evaluations": total,
+            "average_score": round(sum(r.score_sum for r in rows) / total, 2) if total else 0,
+            "highest_score": max((r.score_max for r in rows), default=0),
+            "lowest_score": min((r.score_min for r in rows), default=0),
+            "grade_distribution": {r.grade: r.count for r in rows},
+        }
+
+    # ─── Legacy import ───────────────────────────────────────────────
+
+    def import_legacy(self, directory: Optional[str] = None, database: Optional[str] = None) -> int:
+        """Import the old stores once per database: ``<id>.json`` reports, then the per-host SQLite file."""
+        with self.engine.connect() as connection:
+            done = connection.execute(
+                select(meta.c.value).where(meta.c.key == "legacy_imported")).first()
+        if done:
+            return 0
+
+        imported = 0
+        try:
+            with self.engine.begin() as connection:
+                # Claims the import: a worker starting alongside fails here
+                connection.execute(meta.insert().values(key="legacy_imported", value=datetime.now().isoformat()))
+                for evaluation_id, result in self._legacy_reports(directory, database):
+                    self._write(connection, evaluation_id, result)
+                    imported += 1
+        except IntegrityError:
+            return 0
+        if imported:
+            logger.info(f"Imported {imported} legacy results into the database")
+        return imported
+
+    @staticmethod
+    def _legacy_reports(directory: Optional[str], database: Optional[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        if directory and os.path.isdir(directory):
+            for entry in os.scandir(directory):
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    with open(entry.path, "r", encoding="utf-8") as f:
+                        result = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Skipping unreadable result file {entry.name}: {e}")
+                    continue
+                yield result.get("evaluation_id") or entry.name[:-len(".json")], result
+
+        if database and os.path.isfile(database):
+            # Reports there already carry their owner columns
+            conn = sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+            try:
+                rows = conn.execute("SELECT evaluation_id, detail FROM result_details").fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"Skipping unreadable result store {database}: {e}")
+                rows = []
+            finally:
+                conn.close()
+            for evaluation_id, blob in rows:
+                yield evaluation_id, decompress(blob)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.engine.connect() as connection:
+            count = connection.execute(select(func.count()).select_from(summaries)).scalar()
+        with self._lock:
+            return {
+                "database": self.engine.url.render_as_string(hide_password=True),
+                "results": count,
+                "cached": len(self._cache),
+                "cache_size": self.cache_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# ─── Process-wide singleton ──────────────────────────────────────────
+
+_store: Optional[ResultStore] = None
+_store_lock = threading.Lock()
+
+
+def get_result_store() -> ResultStore:
+    """Shared store on the main database, importing the old per-host stores once."""
+    global _store
+    from config.settings import settings
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                results_dir = os.path.join(settings.UPLOAD_DIR, "results")
+                legacy_db = settings.RESULT_STORE_PATH or os.path.join(results_dir, "results.db")
+                _store = ResultStore(cache_size=settings.RESULT_CACHE_SIZE,
+                                     legacy_dir=results_dir, legacy_db=legacy_db)
+    return _store
@@ -641,8 +641,18 @@ class RubricScorer:
         # ── Rubric configuration ─────────────────────────────────
         question_type: str = "descriptive",
         rubric_config: Optional[Dict[str, Dict[str, Any]]] = None,
+        # ── Shared analysis state ────────────────────────────────
+        context=None,
     ) -> RubricReport:
-        """Run rubric evaluation and return a RubricReport."""
+        """Run rubric evaluation and return a RubricReport.
+
+        *context* (an ``EvaluationContext``) supplies the texts when they are
+        not passed explicitly.
+        """
+
+        if context is not None:
+            student_text = student_text or context.student_text
+            model_text = model_text or context.model_text
 
         matched_keywords = matched_keywords or []
         missing_keywords = missing_keywords or []
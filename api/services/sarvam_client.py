@@ -0,0 +1,490 @@
+"""
+Sarvam Document Intelligence Client
+====================================
+Batched, concurrent, rate-limited Sarvam jobs.
+
+Problem
+-------
+``OCRService._extract_sarvam_sdk_direct`` created one Sarvam
+document-intelligence job per image: create_job → upload → start →
+``wait_until_complete`` → download ZIP → extract it to a temp dir → read the
+markdown.  ``_extract_from_pdf`` repeated that for every page, so a 10-page
+PDF paid 10 full job round-trips, and concurrent uploads each paid their own.
+
+Solution
+--------
+``SarvamBatchClient`` sits between callers and the API:
+
+*   **Packing.**  ``submit(image)`` queues one page and returns a
+    ``Future``.  A dispatcher packs queued pages of the same language (from
+    one PDF or from concurrent callers) into a single multi-page PDF job, up
+    to ``SARVAM_PAGES_PER_JOB`` pages, waiting at most
+    ``SARVAM_BATCH_LINGER_MS`` for a batch to fill.
+*   **Concurrency.**  At most ``SARVAM_MAX_CONCURRENT_JOBS`` jobs are in
+    flight (a bounded semaphore).  While all slots are busy, pages keep
+    queueing, so the next job is fuller.  A job not finished after
+    ``SARVAM_JOB_TIMEOUT`` fails its pages and frees its slot; callers bound
+    their wait with ``result_timeout()``.
+*   **Rate limiting.**  Every API call takes a token from a token bucket
+    refilled at ``SARVAM_REQUESTS_PER_SECOND``.
+*   **In-memory output.**  The output ZIP is read with ``zipfile`` from
+    bytes.  Nothing is extracted to disk, and the PDF is built in memory.
+    The SDK itself still needs file paths for upload and download, so
+    ``SarvamSDKBackend`` uses one short-lived temp file per job for each.
+*   **Page mapping.**  Per-page texts come from numbered page files in the
+    output, or from page-break markers in the document.  If a multi-page
+    job's output cannot be split, its pages are resubmitted as single-page
+    jobs, and later batches use one page per job.
+
+Setting ``SARVAM_STUB_URL`` sends jobs to the local stub server
+(``python -m api.services.sarvam_stub``) instead of the SDK, for offline
+throughput tests.
+
+Usage:
+    client = get_sarvam_client()
+    futures = [client.submit(png_bytes, "hi-IN") for png_bytes in pages]
+    texts = [f.result().text for f in futures]
+"""
+
+import io
+import logging
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger("AssessIQ.SarvamClient")
+
+# A page is encoded image bytes (PNG / JPEG) or a path to an image file
+PageInput = Union[bytes, str]
+
+FAILED_STATES = {"failed", "error", "cancelled", "canceled"}
+PENDING_STATES = {"accepted", "pending", "running"}
+TEXT_SUFFIXES = (".md", ".txt", ".html")
+
+_PAGE_FILE = re.compile(r"page[\s_\-]*0*(\d+)", re.IGNORECASE)
+_PAGE_BREAK = re.compile(r"\f|<!--\s*page[^>]*-->|<div[^>]*page-break[^>]*>\s*</div>", re.IGNORECASE)
+
+
+class SarvamJobError(RuntimeError):
+    """A Sarvam job failed, timed out or returned no usable output."""
+
+
+@dataclass
+class PageResult:
+    """Text for one submitted page."""
+    text: str
+    job_id: str
+    page: int            # 1-based position inside the job
+    pages_in_job: int
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Rate limiting
+# ═══════════════════════════════════════════════════════════════════════
+
+class TokenBucket:
+    """Thread-safe token bucket; ``rate <= 0`` means unlimited."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = max(1.0, burst if burst is not None else rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until *tokens* are available; returns seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Job input / output
+# ═══════════════════════════════════════════════════════════════════════
+
+def pages_to_pdf(pages: Sequence[PageInput]) -> bytes:
+    """Pack page images into one multi-page PDF, in memory."""
+    from PIL import Image
+
+    images = []
+    try:
+        for page in pages:
+            img = Image.open(io.BytesIO(page) if isinstance(page, bytes) else page)
+            if img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            images.append(img)
+        buffer = io.BytesIO()
+        images[0].save(buffer, "PDF", save_all=True, append_images=images[1:], resolution=300)
+        return buffer.getvalue()
+    finally:
+        for img in images:
+            img.close()
+
+
+def _readable(content: str) -> bool:
+    return bool(content) and not content.startswith("PK")
+
+
+def _document_text(texts: Dict[str, str]) -> str:
+    """document.md, else the longest .md, .txt then .html file."""
+    named = [t for name, t in texts.items() if os.path.basename(name) == "document.md"]
+    if named:
+        return max(named, key=len)
+    for suffix in TEXT_SUFFIXES:
+        candidates = [t for name, t in texts.items() if name.lower().endswith(suffix)]
+        if candidates:
+            return max(candidates, key=len)
+    return ""
+
+
+def read_output(data: bytes, pages: int) -> Tuple[str, Optional[List[str]]]:
+    """
+    Read a job's output ZIP from memory.
+
+    Returns ``(document text, per-page texts)``; per-page texts are ``None``
+    when the output does not say where pages begin.
+    """
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile:
+        text = data.decode("utf-8", errors="ignore").strip()
+        if not _readable(text):
+            return "", None
+        return text, [text] if pages == 1 else None
+
+    texts: Dict[str, str] = {}
+    with archive:
+        for info in archive.infolist():
+            if info.is_dir() or not info.filename.lower().endswith(TEXT_SUFFIXES):
+                continue
+            content = archive.read(info).decode("utf-8", errors="ignore").strip()
+            if _readable(content):
+                texts[info.filename] = content
+
+    # Per page: numbered page files (markdown preferred) ...
+    numbered: Dict[int, Tuple[int, str]] = {}
+    documents: Dict[str, str] = {}
+    for name, text in texts.items():
+        match = _PAGE_FILE.search(os.path.basename(name))
+        if not match:
+            documents[name] = text
+            continue
+        rank = TEXT_SUFFIXES.index(os.path.splitext(name)[1].lower())
+        index = int(match.group(1))
+        if index not in numbered or rank < numbered[index][0]:
+            numbered[index] = (rank, text)
+    page_texts = [numbered[i][1] for i in sorted(numbered)]
+
+    document = _document_text(documents) or "\n\n".join(page_texts)
+    if len(page_texts) == pages:
+        return document, page_texts
+
+    # ... or page-break markers in the document
+    parts = [p.strip() for p in _PAGE_BREAK.split(document)] if document else []
+    if pages > 1 and len(parts) == pages:
+        return document, parts
+    if pages == 1 and document:
+        return document, [document]
+    return document, None
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Backends
+# ═══════════════════════════════════════════════════════════════════════
+
+class SarvamSDKBackend:
+    """Jobs through the official ``sarvamai`` SDK."""
+
+    POLL_INTERVAL = 2.0
+
+    def __init__(self, api_key: str):
+        from sarvamai import SarvamAI
+        self._client = SarvamAI(api_subscription_key=api_key)
+
+    def create_job(self, language: str, output_format: str = "md"):
+        return self._client.document_intelligence.create_job(language=language, output_format=output_format)
+
+    @staticmethod
+    def job_id(job) -> str:
+        return str(job.job_id)
+
+    def upload(self, job, filename: str, data: bytes) -> None:
+        # The SDK uploads from a path
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, filename)
+            with open(path, "wb") as f:
+                f.write(data)
+            job.upload_file(path)
+
+    def start(self, job) -> None:
+        job.start()
+
+    def wait(self, job, timeout: float, throttle: Callable[[], Any]) -> str:
+        # Polled here, not with wait_until_complete(), so the deadline and the rate limit apply
+        deadline = time.monotonic() + timeout
+        while True:
+            throttle()
+            state = str(getattr(job.get_status(), "job_state", "") or "")
+            if state.lower() not in PENDING_STATES:
+                return state
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise SarvamJobError(f"Sarvam job {self.job_id(job)} not finished after {timeout:.0f}s")
+            time.sleep(min(self.POLL_INTERVAL, remaining))
+
+    def download(self, job) -> bytes:
+        # The SDK downloads to a path
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "output.zip")
+            job.download_output(path)
+            with open(path, "rb") as f:
+                return f.read()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Batching client
+# ═══════════════════════════════════════════════════════════════════════
+
+@dataclass
+class _PageRequest:
+    image: PageInput
+    language: str
+    future: Future = field(default_factory=Future)
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class SarvamBatchClient:
+    """Packs queued pages into multi-page jobs and runs a bounded number at once."""
+
+    def __init__(
+        self,
+        backend,
+        pages_per_job: int = 10,
+        max_concurrent_jobs: int = 3,
+        requests_per_second: float = 5.0,
+        linger: float = 0.1,
+        job_timeout: float = 300.0,
+    ):
+        self.backend = backend
+        self.pages_per_job = max(1, pages_per_job)
+        self.max_concurrent_jobs = max(1, max_concurrent_jobs)
+        self.linger = linger
+        self.job_timeout = job_timeout
+
+        self._bucket = TokenBucket(requests_per_second)
+        self._slots = threading.BoundedSemaphore(self.max_concurrent_jobs)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_jobs, thread_name_prefix="sarvam-job")
+        self._pending: Dict[str, List[_PageRequest]] = {}
+        self._cond = threading.Condition()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._split_pages = True   # cleared if multi-page output can't be mapped to pages
+
+        # Bookkeeping
+        self.jobs = 0
+        self.pages = 0
+        self.failed_jobs = 0
+        self.requests = 0
+        self.throttled_seconds = 0.0
+        self._in_flight = 0
+        self.max_in_flight = 0
+
+    # ─── Submission ──────────────────────────────────────────────────
+
+    def submit(self, image: PageInput, language: str = "en-IN") -> "Future[PageResult]":
+        """Queue one page; the future resolves to its ``PageResult``."""
+        request = _PageRequest(image=image, language=language)
+        with self._cond:
+            self._pending.setdefault(language, []).append(request)
+            self._ensure_dispatcher()
+            self._cond.notify_all()
+        return request.future
+
+    def extract(self, images: Sequence[PageInput], language: str = "en-IN",
+                timeout: Optional[float] = None) -> List[PageResult]:
+        """Submit *images* together and wait for all of them."""
+        futures = [self.submit(image, language) for image in images]
+        return [f.result(timeout=timeout) for f in futures]
+
+    def result_timeout(self) -> float:
+        """
+        How long a caller should wait for pages it just submitted: every job
+        in flight or queued ahead of them and their own, ``max_concurrent_jobs``
+        at a time, each bounded by ``job_timeout`` (plus the batch linger).
+        """
+        with self._cond:
+            queued = sum(len(q) for q in self._pending.values())
+            jobs = self._in_flight + math.ceil(queued / self._batch_size())
+        rounds = max(1, math.ceil(jobs / self.max_concurrent_jobs))
+        return rounds * (self.job_timeout + self.linger)
+
+    # ─── Dispatch ────────────────────────────────────────────────────
+
+    def _batch_size(self) -> int:
+        return self.pages_per_job if self._split_pages else 1
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None:
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name="sarvam-dispatch", daemon=True)
+            self._dispatcher.start()
+
+    def _next_batch(self) -> List[_PageRequest]:
+        with self._cond:
+            while not any(self._pending.values()):
+                self._cond.wait()
+            # Oldest waiting language first; give its batch a moment to fill
+            language = min((lang for lang, q in self._pending.items() if q),
+                           key=lambda lang: self._pending[lang][0].queued_at)
+            queue = self._pending[language]
+            fill_by = queue[0].queued_at + self.linger
+            while len(queue) < self._batch_size():
+                remaining = fill_by - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            size = self._batch_size()
+            batch = queue[:size]
+            del queue[:size]
+            return batch
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            batch = self._next_batch()
+            # Back-pressure: while every slot is busy, more pages queue up
+            self._slots.acquire()
+            with self._cond:
+                self._in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            self._executor.submit(self._run_job, batch)
+
+    def _run_job(self, batch: List[_PageRequest]) -> None:
+        try:
+            job_id, per_page = self._process(batch)
+            if per_page is None:
+                # Output can't be mapped back to pages: one page per job from now on
+                logger.warning(f"[Sarvam] Job {job_id} output has no page boundaries; resubmitting {len(batch)} pages singly")
+                with self._cond:
+                    self._split_pages = False
+                    for request in reversed(batch):
+                        self._pending.setdefault(request.language, []).insert(0, request)
+                    self._cond.notify_all()
+                return
+            for position, (request, text) in enumerate(zip(batch, per_page), start=1):
+                request.future.set_result(PageResult(text, job_id, position, len(batch)))
+        except BaseException as e:
+            with self._cond:
+                self.failed_jobs += 1
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+            self._slots.release()
+
+    # ─── One job ─────────────────────────────────────────────────────
+
+    def _throttle(self) -> None:
+        waited = self._bucket.acquire()
+        with self._cond:
+            self.requests += 1
+            self.throttled_seconds += waited
+
+    def _process(self, batch: List[_PageRequest]) -> Tuple[str, Optional[List[str]]]:
+        start = time.monotonic()
+        language = batch[0].language
+        pdf = pages_to_pdf([request.image for request in batch])
+
+        self._throttle()
+        job = self.backend.create_job(language=language, output_format="md")
+        job_id = self.backend.job_id(job)
+        self._throttle()
+        self.backend.upload(job, f"pages-{len(batch)}.pdf", pdf)
+        self._throttle()
+        self.backend.start(job)
+
+        state = self.backend.wait(job, self.job_timeout, self._throttle)
+        if state.lower() in FAILED_STATES:
+            raise SarvamJobError(f"Sarvam job {job_id} ended in state {state}")
+
+        self._throttle()
+        document, per_page = read_output(self.backend.download(job), len(batch))
+        if not document:
+            raise SarvamJobError(f"Sarvam job {job_id} returned no text")
+
+        with self._cond:
+            self.jobs += 1
+            self.pages += len(batch)
+        logger.info(f"[Sarvam] Job {job_id}: {len(batch)} page(s), {language}, {time.monotonic() - start:.1f}s")
+        return job_id, per_page
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "pages_per_job": self._batch_size(),
+                "max_concurrent_jobs": self.max_concurrent_jobs,
+                "jobs": self.jobs,
+                "pages": self.pages,
+                "failed_jobs": self.failed_jobs,
+                "requests": self.requests,
+                "throttled_seconds": round(self.throttled_seconds, 3),
+                "queued_pages": sum(len(q) for q in self._pending.values()),
+                "in_flight": self._in_flight,
+                "max_in_flight": self.max_in_flight,
+            }
+
+
+# ─── Process-wide singleton ──────────────────────────────────────────
+
+_client: Optional[SarvamBatchClient] = None
+_client_lock = threading.Lock()
+
+
+def get_sarvam_client() -> SarvamBatchClient:
+    """
+    Shared client configured from settings.
+
+    Raises ``ImportError`` when the ``sarvamai`` SDK is missing (and no stub
+    URL is configured) and ``ValueError`` without an API key.
+    """
+    global _client
+    from config.settings import settings
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if settings.SARVAM_STUB_URL:
+                    from api.services.sarvam_stub import StubBackend
+                    backend = StubBackend(settings.SARVAM_STUB_URL)
+                    logger.info(f"[Sarvam] Using stub server at {settings.SARVAM_STUB_URL}")
+                else:
+                    if not settings.SARVAM_API_KEY:
+                        raise ValueError("SARVAM_API_KEY not configured")
+                    backend = SarvamSDKBackend(settings.SARVAM_API_KEY)
+                _client = SarvamBatchClient(
+                    backend,
+                    pages_per_job=settings.SARVAM_PAGES_PER_JOB,
+                    max_concurrent_jobs=settings.SARVAM_MAX_CONCURRENT_JOBS,
+                    requests_per_second=settings.SARVAM_REQUESTS_PER_SECOND,
+                    linger=settings.SARVAM_BATCH_LINGER_MS / 1000.0,
+                    job_timeout=settings.SARVAM_JOB_TIMEOUT,
+                )
+    return _client
@@ -0,0 +1,348 @@
+"""
+Sarvam Stub Server
+===================
+Local stand-in for Sarvam document-intelligence jobs, for offline tests and
+throughput measurements of ``SarvamBatchClient``.
+
+Problem
+-------
+Every Sarvam change needed the real API (network, a key, quota) to see
+whether batching, concurrency and rate limiting actually helped.
+
+Solution
+--------
+``SarvamStubServer`` is a small threaded HTTP server with the same job life
+cycle as the real service: create → upload → start → poll → download.
+
+*   A job "runs" for ``job_latency + pages × page_latency`` seconds after it
+    is started, so packing pages into fewer jobs pays off as it does in
+    production.
+*   The "OCR" reports each page's image size (``Stub page 2: 1240x1754``),
+    read from the uploaded PDF, so tests can check page order.
+*   The output is a ZIP with ``document.md`` plus one ``page_NNN.md`` per
+    page, like a multi-page job.
+*   With ``max_requests_per_second`` set, requests over the limit get
+    HTTP 429, so a client with no rate limiting shows up in tests.
+*   ``get_stats()`` reports jobs, pages, requests, 429s and peak concurrent
+    running jobs.
+
+``StubBackend`` is the matching client backend; ``SARVAM_STUB_URL`` makes
+``get_sarvam_client()`` use it.
+
+Usage:
+    python -m api.services.sarvam_stub --port 8765        # serve
+    python -m api.services.sarvam_stub --benchmark 40     # pages/s, batched vs one job per page
+"""
+
+import io
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+import zipfile
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("AssessIQ.SarvamStub")
+
+_IMAGE_SIZE = re.compile(rb"/Width (\d+)\s*/Height (\d+)")
+
+
+def stub_page_texts(pdf: bytes) -> list:
+    """The stub's "OCR": one line per page image, in document order."""
+    return [f"Stub page {i}: {w.decode()}x{h.decode()}"
+            for i, (w, h) in enumerate(_IMAGE_SIZE.findall(pdf), start=1)]
+
+
+class SarvamStubServer:
+    """Threaded HTTP server emulating Sarvam's job life cycle."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        job_latency: float = 0.5,
+        page_latency: float = 0.05,
+        max_requests_per_second: Optional[float] = None,
+    ):
+        self.job_latency = job_latency
+        self.page_latency = page_latency
+        self.max_requests_per_second = max_requests_per_second
+
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._recent = deque()  # request times within the last second
+
+        # Bookkeeping
+        self.requests = 0
+        self.rejected = 0
+        self.jobs_created = 0
+        self.pages = 0
+        self.max_running = 0
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "SarvamStubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="sarvam-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "SarvamStubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ─── Job state ───────────────────────────────────────────────────
+
+    def _admit(self) -> bool:
+        """Count a request; ``False`` if it exceeds the rate limit."""
+        with self._lock:
+            self.requests += 1
+            if not self.max_requests_per_second:
+                return True
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] >= 1.0:
+                self._recent.popleft()
+            if len(self._recent) >= self.max_requests_per_second:
+                self.rejected += 1
+                return False
+            self._recent.append(now)
+            return True
+
+    def _state(self, job: Dict[str, Any]) -> str:
+        if job["started"] is None:
+            return "Pending"
+        if time.monotonic() < job["done_at"]:
+            return "Running"
+        return "Completed"
+
+    def _running(self) -> int:
+        return sum(1 for job in self._jobs.values() if self._state(job) == "Running")
+
+    def create(self, language: str) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._jobs[job_id] = {"language": language, "pdf": b"", "started": None, "done_at": None}
+            self.jobs_created += 1
+        return job_id
+
+    def upload(self, job_id: str, data: bytes) -> None:
+        with self._lock:
+            self._jobs[job_id]["pdf"] = data
+
+    def start_job(self, job_id: str) -> None:
+        with self._lock:
+            job = self._jobs[job_id]
+            pages = len(stub_page_texts(job["pdf"]))
+            job["started"] = time.monotonic()
+            job["done_at"] = job["started"] + self.job_latency + pages * self.page_latency
+            self.pages += pages
+            self.max_running = max(self.max_running, self._running())
+
+    def status(self, job_id: str) -> str:
+        with self._lock:
+            return self._state(self._jobs[job_id])
+
+    def output(self, job_id: str) -> bytes:
+        with self._lock:
+            job = self._jobs[job_id]
+        texts = stub_page_texts(job["pdf"])
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("document.md", "\n\n".join(texts))
+            for i, text in enumerate(texts, start=1):
+                archive.writestr(f"pages/page_{i:03d}.md", text)
+        return buffer.getvalue()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "rejected": self.rejected,
+                "jobs": self.jobs_created,
+                "pages": self.pages,
+                "max_running": self.max_running,
+            }
+
+    # ─── HTTP ────────────────────────────────────────────────────────
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, fmt, *args):
+                logger.debug(fmt % args)
+
+            def _reply(self, status: int, body: bytes = b"", content_type: str = "application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if status == 429:
+                    self.send_header("Retry-After", "1")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _json(self, payload: Dict[str, Any]):
+                self._reply(200, json.dumps(payload).encode())
+
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+            def _route(self, method: str):
+                body = self._body()
+                if not server._admit():
+                    return self._reply(429, b'{"error": "rate limited"}')
+                parts = [p for p in self.path.split("/") if p]
+                try:
+                    if method == "POST" and parts == ["jobs"]:
+                        language = json.loads(body or b"{}").get("language", "en-IN")
+                        return self._json({"job_id": server.create(language)})
+                    job_id = parts[1]
+                    if method == "PUT" and parts[2:] == ["file"]:
+                        server.upload(job_id, body)
+                        return self._json({"ok": True})
+                    if method == "POST" and parts[2:] == ["start"]:
+                        server.start_job(job_id)
+                        return self._json({"ok": True})
+                    if method == "GET" and parts[2:] == []:
+                        return self._json({"job_id": job_id, "job_state": server.status(job_id)})
+                    if method == "GET" and parts[2:] == ["output"]:
+                        return self._reply(200, server.output(job_id), "application/zip")
+                except (IndexError, KeyError):
+                    pass
+                self._reply(404, b'{"error": "not found"}')
+
+            def do_GET(self):
+                self._route("GET")
+
+            def do_POST(self):
+                self._route("POST")
+
+            def do_PUT(self):
+                self._route("PUT")
+
+        return Handler
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Client backend
+# ═══════════════════════════════════════════════════════════════════════
+
+class StubBackend:
+    """``SarvamBatchClient`` backend speaking to a ``SarvamStubServer``."""
+
+    POLL_INTERVAL = 0.05
+    MAX_RETRIES = 10
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        import requests
+        self._session = requests.Session()
+        self._base = base_url.rstrip("/")
+        self._timeout = timeout
+
+    def _call(self, method: str, path: str, **kwargs):
+        for attempt in range(self.MAX_RETRIES):
+            response = self._session.request(method, self._base + path, timeout=self._timeout, **kwargs)
+            if response.status_code != 429:
+                response.raise_for_status()
+                return response
+            time.sleep(float(response.headers.get("Retry-After", 1)))
+        response.raise_for_status()
+
+    def create_job(self, language: str, output_format: str = "md") -> str:
+        return self._call("POST", "/jobs", json={"language": language, "output_format": output_format}).json()["job_id"]
+
+    @staticmethod
+    def job_id(job: str) -> str:
+        return job
+
+    def upload(self, job: str, filename: str, data: bytes) -> None:
+        self._call("PUT", f"/jobs/{job}/file", data=data)
+
+    def start(self, job: str) -> None:
+        self._call("POST", f"/jobs/{job}/start")
+
+    def wait(self, job: str, timeout: float, throttle: Callable[[], Any]) -> str:
+        deadline = time.monotonic() + timeout
+        while True:
+            throttle()
+            state = self._call("GET", f"/jobs/{job}").json()["job_state"]
+            if state not in ("Pending", "Running"):
+                return state
+            if time.monotonic() >= deadline:
+                from api.services.sarvam_client import SarvamJobError
+                raise SarvamJobError(f"Sarvam job {job} not finished after {timeout:.0f}s")
+            time.sleep(self.POLL_INTERVAL)
+
+    def download(self, job: str) -> bytes:
+        return self._call("GET", f"/jobs/{job}/output").content
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Benchmark
+# ═══════════════════════════════════════════════════════════════════════
+
+def benchmark(pages: int = 40, pages_per_job: int = 10, max_concurrent_jobs: int = 3,
+              requests_per_second: float = 20.0, **server_options) -> Dict[str, Any]:
+    """Throughput of ``pages`` pages, batched vs. one job per page, against a fresh stub."""
+    from PIL import Image
+    from api.services.sarvam_client import SarvamBatchClient
+
+    images = []
+    for i in range(pages):
+        buffer = io.BytesIO()
+        Image.new("L", (200 + i, 100), 255).save(buffer, "PNG")
+        images.append(buffer.getvalue())
+
+    report = {}
+    for label, per_job, concurrent in (("sequential", 1, 1), ("batched", pages_per_job, max_concurrent_jobs)):
+        with SarvamStubServer(**server_options) as server:
+            client = SarvamBatchClient(StubBackend(server.url), pages_per_job=per_job,
+                                       max_concurrent_jobs=concurrent, requests_per_second=requests_per_second)
+            start = time.monotonic()
+            client.extract(images)
+            elapsed = time.monotonic() - start
+            report[label] = {"seconds": round(elapsed, 2), "pages_per_second": round(pages / elapsed, 2),
+                             "client": client.get_stats(), "server": server.get_stats()}
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local Sarvam job stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--job-latency", type=float, default=0.5)
+    parser.add_argument("--page-latency", type=float, default=0.05)
+    parser.add_argument("--max-rps", type=float, default=None)
+    parser.add_argument("--benchmark", type=int, metavar="PAGES", help="Run a throughput comparison and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    options = dict(job_latency=args.job_latency, page_latency=args.page_latency,
+                   max_requests_per_second=args.max_rps)
+    if args.benchmark:
+        print(json.dumps(benchmark(args.benchmark, **options), indent=2))
+    else:
+        stub = SarvamStubServer(args.host, args.port, **options)
+        print(f"Sarvam stub listening on {stub.url} (set SARVAM_STUB_URL={stub.url})")
+        try:
+            stub._httpd.serve_forever()
+        except KeyboardInterrupt:
+            stub.stop()
@@ -101,13 +101,12 @@ class SemanticAnalyzer:
             self._model_initialized = True
     
     def _init_model(self):
-        """Initialize the Sentence Transformer model."""
+        """Fetch the shared Sentence Transformer model from the model registry."""
         try:
-            from sentence_transformers import SentenceTransformer
+            from api.services.model_registry import get_model_registry
             
-            logger.info(f"Loading Sentence Transformer model: {self.model_name}")
-            self._model = SentenceTransformer(self.model_name)
-            logger.info(f"Model '{self.model_name}' loaded successfully")
+            self._model = get_model_registry().get_sentence_transformer(self.model_name)
+            self._model_initialized = True
             
         except ImportError:
             logger.error(
@@ -126,6 +125,9 @@ class SemanticAnalyzer:
         Embeddings are high-dimensional vectors that capture
         the semantic meaning of the text.
         
+        Each string is looked up in the shared embedding cache first (keyed
+        by model name + text hash); only the misses in a list are encoded.
+        
         Args:
             text: Single text string or list of strings
             
@@ -146,9 +148,14 @@ class SemanticAnalyzer:
         else:
             text = [t[:10000] for t in text]
         
-        embedding = self._model.encode(text, convert_to_numpy=True)
+        from api.services.embedding_cache import get_embedding_cache
+        cache = get_embedding_cache()
+        if cache is None:
+            return self._model.encode(text, convert_to_numpy=True)
         
-        return embedding
+        if isinstance(text, str):
+            return cache.encode(self.model_name, [text], self._model)[0]
+        return cache.encode(self.model_name, text, self._model)
     
     def cosine_similarity(
         self, 
@@ -190,7 +197,8 @@ class SemanticAnalyzer:
         self, 
         text1: str, 
         text2: str,
-        normalize: bool = True
+        normalize: bool = True,
+        context=None,
     ) -> float:
         """
         Calculate semantic similarity between two texts.
@@ -202,6 +210,8 @@ class SemanticAnalyzer:
             text1: First text (e.g., model answer)
             text2: Second text (e.g., student answer)
             normalize: Whether to normalize score to 0-1 range
+            context: Optional EvaluationContext; its embeddings are reused
+                     when it was built for the same model
             
         Returns:
             Similarity score (0 to 1 if normalized)
@@ -212,9 +222,12 @@ class SemanticAnalyzer:
         
         logger.debug(f"Calculating similarity between texts...")
         
-        # Generate embeddings
-        embedding1 = self.get_embedding(text1)
-        embedding2 = self.get_embedding(text2)
+        # Generate embeddings (shared with the other scorers via the context)
+        if context is not None and context.model_name == self.model_name:
+            embedding1, embedding2 = context.embed([text1, text2])
+        else:
+            embedding1 = self.get_embedding(text1)
+            embedding2 = self.get_embedding(text2)
         
         # Calculate cosine similarity
         similarity = self.cosine_similarity(embedding1, embedding2)
@@ -80,6 +80,8 @@ from typing import Dict, List, Optional, Set, Tuple
 
 import numpy as np
 
+from api.services.model_registry import get_model_registry
+
 logger = logging.getLogger("AssessIQ.SentenceAlignment")
 
 
@@ -216,15 +218,21 @@ class SentenceSegmenter:
         """Load spaCy for sentence tokenization and NER."""
         self._nlp = None
         try:
-            import spacy
-            self._nlp = spacy.load("en_core_web_sm")
+            self._nlp = get_model_registry().get_spacy()
             logger.debug("spaCy loaded for sentence segmentation")
         except Exception:
             logger.warning("spaCy not available; falling back to regex splitter")
 
-    def segment(self, text: str) -> List[SentenceInfo]:
-        """Split *text* into ``SentenceInfo`` objects with roles."""
-        raw_sents = self._split_sentences(text)
+    def segment(self, text: str, context=None) -> List[SentenceInfo]:
+        """Split *text* into ``SentenceInfo`` objects with roles.
+
+        When an ``EvaluationContext`` is given its sentence segmentation is
+        reused instead of re-parsing the text.
+        """
+        if context is not None:
+            raw_sents = context.sentences(text)
+        else:
+            raw_sents = self._split_sentences(text)
         sentences: List[SentenceInfo] = []
         for idx, sent_text in enumerate(raw_sents):
             sent_text = sent_text.strip()
@@ -371,8 +379,7 @@ class ImportanceScorer:
     def _entity_density(self, sentences: List[SentenceInfo]) -> None:
         """Count named-entity / technical-term density per sentence."""
         try:
-            import spacy
-            nlp = spacy.load("en_core_web_sm")
+            nlp = get_model_registry().get_spacy()
         except Exception:
             for s in sentences:
                 s.entity_density = 0.5
@@ -402,30 +409,34 @@ class AlignmentMatrixBuilder:
 
     def _ensure_model(self):
         if self._model is None:
-            from sentence_transformers import SentenceTransformer
-            self._model = SentenceTransformer("all-MiniLM-L6-v2")
+            self._model = get_model_registry().get_sentence_transformer()
 
     def build_matrix(
         self,
         model_sents: List[SentenceInfo],
         student_sents: List[SentenceInfo],
+        context=None,
     ) -> np.ndarray:
         """Return an N x M cosine-similarity matrix.
 
         N = len(model_sents), M = len(student_sents).
         Each cell (i, j) = cosine_sim(model_i, student_j).
         Also populates the ``embedding`` field of each SentenceInfo.
+        Sentence embeddings come from *context* when one is given.
         """
-        self._ensure_model()
-
         model_texts = [s.text for s in model_sents]
         student_texts = [s.text for s in student_sents]
 
         # Batch encode
-        model_embs = self._model.encode(model_texts, convert_to_numpy=True,
-                                        show_progress_bar=False)
-        student_embs = self._model.encode(student_texts, convert_to_numpy=True,
-                                          show_progress_bar=False)
+        if context is not None:
+            model_embs = context.embed(model_texts)
+            student_embs = context.embed(student_texts)
+        else:
+            self._ensure_model()
+            model_embs = self._model.encode(model_texts, convert_to_numpy=True,
+                                            show_progress_bar=False)
+            student_embs = self._model.encode(student_texts, convert_to_numpy=True,
+                                              show_progress_bar=False)
 
         # Store embeddings
         for s, emb in zip(model_sents, model_embs):
@@ -777,22 +788,40 @@ class SentenceAlignmentScorer:
         model_text: str,
         student_text: str,
         custom_keywords: Optional[List[str]] = None,
+        context=None,
+        compiled=None,
     ) -> AlignmentResult:
-        """Run the full 6-layer pipeline and return ``AlignmentResult``."""
+        """Run the full 6-layer pipeline and return ``AlignmentResult``.
+
+        *context* (an ``EvaluationContext``) supplies the sentence split and
+        sentence embeddings already computed for this answer pair.
+        *compiled* (a ``CompiledModelAnswer``) supplies the model sentences
+        with their importance; it is ignored when custom keywords change
+        the importance weighting.
+        """
         t0 = time.time()
 
+        use_compiled = (
+            compiled is not None and not custom_keywords
+            and compiled.text == model_text
+        )
+
         # ── Layer 1: Segment ────────────────────────────────────────
-        model_sents = self._segmenter.segment(model_text)
-        student_sents = self._segmenter.segment(student_text)
+        if use_compiled:
+            model_sents = compiled.build_sentence_infos()
+        else:
+            model_sents = self._segmenter.segment(model_text, context)
+        student_sents = self._segmenter.segment(student_text, context)
 
         if not model_sents or not student_sents:
             return self._empty_result(model_sents, student_sents, time.time() - t0)
 
         # ── Layer 2: Importance ─────────────────────────────────────
-        model_sents = self._importance.score(model_sents, model_text, custom_keywords)
+        if not use_compiled:
+            model_sents = self._importance.score(model_sents, model_text, custom_keywords)
 
         # ── Layer 3: Build alignment matrix ─────────────────────────
-        sim_matrix = self._matrix_builder.build_matrix(model_sents, student_sents)
+        sim_matrix = self._matrix_builder.build_matrix(model_sents, student_sents, context)
         optimal_pairs = self._matrix_builder.optimal_alignment(sim_matrix)
         soft_map = self._matrix_builder.soft_alignment(sim_matrix, threshold=0.40)
 
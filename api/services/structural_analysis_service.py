@@ -46,6 +46,8 @@ import re
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple, Set
 
+from api.services.model_registry import get_model_registry
+
 logger = logging.getLogger("AssessIQ.StructuralAnalysis")
 
 
@@ -641,8 +643,7 @@ class StructuralAnalyzer:
     def __init__(self):
         self._nlp = None
         try:
-            import spacy
-            self._nlp = spacy.load("en_core_web_sm")
+            self._nlp = get_model_registry().get_spacy()
         except Exception:
             logger.warning("spaCy not available; using regex sentence splitting")
 
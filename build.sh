@@ -14,7 +14,10 @@ pip install torch==2.1.2+cpu --extra-index-url https://download.pytorch.org/whl/
 pip install -r requirements.txt --extra-index-url https://download.pytorch.org/whl/cpu
 
 echo "=== Downloading NLTK data ==="
-python -c "import nltk; nltk.download('punkt'); nltk.download('stopwords'); nltk.download('wordnet'); nltk.download('averaged_perceptron_tagger')"
+python -c "import nltk; nltk.download('punkt'); nltk.download('stopwords'); nltk.download('wordnet'); nltk.download('averaged_perceptron_tagger'); nltk.download('words')"
+
+echo "=== Prebuilding shared lexicon ==="
+python -m api.services.lexicon
 
 echo "=== Creating directories ==="
 mkdir -p uploads/student_answers uploads/model_answers uploads/processed uploads/results uploads/evaluations logs temp
@@ -12,6 +12,7 @@ from .models import (
     ModelAnswer,
     Evaluation,
     ManualEvaluation,
+    EvaluationAggregate,
     ActivityLog,
     RefreshToken,
     DatabaseManager,
@@ -24,6 +25,11 @@ from .models import (
     FileType,
     ActivityType,
 )
+from . import aggregates, dashboard_counters
+
+# Keep evaluation_aggregates and the dashboard counters in step with every flush
+aggregates.register()
+dashboard_counters.register()
 
 __all__ = [
     "Base",
@@ -38,6 +44,7 @@ __all__ = [
     "ModelAnswer",
     "Evaluation",
     "ManualEvaluation",
+    "EvaluationAggregate",
     "ActivityLog",
     "RefreshToken",
     "DatabaseManager",
@@ -0,0 +1,398 @@
+"""
+Evaluation Statistics Aggregates
+=================================
+Running evaluation totals, maintained in the same transaction as the
+evaluations themselves.
+
+Problem
+-------
+``DatabaseManager.get_statistics``, ``/admin/dashboard`` and
+``/teachers/dashboard`` recomputed counts, averages and review backlogs
+with a separate ``COUNT`` / ``AVG`` scan of ``evaluations`` and
+``manual_evaluations`` per figure, on every request.
+
+Solution
+--------
+``evaluation_aggregates`` holds one row per (source, scope, scope id,
+grade): count, scored count, score sum / min / max and reviewed count.
+Sources are ``ai`` (``Evaluation``, ``final_score``) and ``manual``
+(``ManualEvaluation``, obtained / max marks as a percentage).  Scopes are
+``global``, ``teacher``, ``subject`` and ``class`` (the student's class).
+
+A session ``after_flush`` hook (``database/flush_deltas.py``) turns every
+inserted, updated (re-scored, re-graded, reviewed) or deleted evaluation
+into delta upserts on the rows it touches, so the totals commit or roll
+back with the evaluation.  A scope's statistics and grade histogram are
+read from at most a dozen rows.  Removing the current minimum / maximum
+re-reads the bound from the source table for that one row.
+
+Bulk ``query(...).update()`` / ``delete()`` bypass the hook; run
+``python -m database.aggregates`` to compare the totals with the tables
+(``--rebuild`` recomputes them).  Evaluations are counted against the
+class their student was in when they were written.
+
+Usage:
+    from database.aggregates import read_totals
+    totals = read_totals(db, "teacher", teacher.id)
+    totals["ai"]["average_score"], totals["ai"]["pending_reviews"]
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, func, literal_column, or_, select
+from sqlalchemy.orm import Session
+
+from database.flush_deltas import (
+    CheckTarget,
+    FlushDeltaHook,
+    ScoreDelta,
+    attribute_value,
+    removes_bound,
+    run_check_cli,
+    same,
+)
+
+from database.models import (
+    EvaluationAggregate,
+    Evaluation,
+    ManualEvaluation,
+    Student,
+    GradeLevel,
+)
+
+logger = logging.getLogger("AssessIQ.Aggregates")
+
+SOURCES = {Evaluation: "ai", ManualEvaluation: "manual"}
+SCOPES = ("global", "teacher", "class", "subject")
+KEY_COLUMNS = ("source", "scope", "scope_id", "grade")
+
+# (source, scope, scope_id, grade)
+AggregateKey = Tuple[str, str, int, str]
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Contributions
+# ═══════════════════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class Contribution:
+    """What one evaluation adds to the aggregates."""
+    source: str
+    teacher_id: Optional[int]
+    subject_id: Optional[int]
+    student_id: Optional[int]
+    grade: str
+    score: Optional[float]
+    reviewed: bool
+
+    def keys(self, class_ids: Dict[int, Optional[int]]) -> Iterable[AggregateKey]:
+        scope_ids = {
+            "global": 0,
+            "teacher": self.teacher_id,
+            "class": class_ids.get(self.student_id) if self.student_id is not None else None,
+            "subject": self.subject_id,
+        }
+        for scope in SCOPES:
+            if scope_ids[scope] is not None:
+                yield self.source, scope, scope_ids[scope], self.grade
+
+
+def _grade(value: Any) -> str:
+    return str(getattr(value, "value", value) or "")
+
+
+def _percentage(obtained: Optional[float], max_marks: Optional[float]) -> Optional[float]:
+    if obtained is None or not max_marks:
+        return None
+    return obtained * 100.0 / max_marks
+
+
+def contribution(obj: Any, old: bool = False) -> Contribution:
+    source = SOURCES[type(obj)]
+    get = lambda name: attribute_value(obj, name, old)
+    if source == "ai":
+        score = get("final_score")
+        reviewed = bool(get("is_reviewed"))
+    else:
+        score = _percentage(get("obtained_marks"), get("max_marks"))
+        reviewed = get("status") == "completed"
+    return Contribution(
+        source=source,
+        teacher_id=get("teacher_id"),
+        subject_id=get("subject_id"),
+        student_id=get("student_id"),
+        grade=_grade(get("grade")),
+        score=float(score) if score is not None else None,
+        reviewed=reviewed,
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Flush hook
+# ═══════════════════════════════════════════════════════════════════════
+
+# Attributes whose old value an update has to subtract
+WATCHED = {
+    Evaluation: ("final_score", "is_reviewed", "grade", "teacher_id", "subject_id", "student_id"),
+    ManualEvaluation: ("obtained_marks", "max_marks", "status", "grade", "teacher_id", "subject_id", "student_id"),
+}
+
+
+@dataclass
+class _Delta(ScoreDelta):
+    count: int = 0
+    reviewed: int = 0
+
+    def apply(self, c: Contribution, sign: int) -> None:
+        self.count += sign
+        self.reviewed += sign if c.reviewed else 0
+        self.add_score(c.score, sign)
+
+
+def apply_changes(connection, changes: List[Tuple[Contribution, int]]) -> None:
+    """Fold signed contributions into per-row deltas and write them."""
+    student_ids = {c.student_id for c, _ in changes if c.student_id is not None}
+    class_ids: Dict[int, Optional[int]] = {}
+    if student_ids:
+        class_ids = dict(connection.execute(
+            select(Student.id, Student.class_id).where(Student.id.in_(student_ids))).all())
+
+    deltas: Dict[AggregateKey, _Delta] = defaultdict(_Delta)
+    for c, sign in changes:
+        for key in c.keys(class_ids):
+            deltas[key].apply(c, sign)
+
+    for key, delta in deltas.items():
+        if delta.added or delta.count or delta.scored or delta.reviewed or delta.total:
+            _upsert(connection, key, delta)
+        if delta.removed or delta.count < 0:
+            _refresh_bounds(connection, key, delta.removed)
+
+
+def _key_clause(key: AggregateKey):
+    table = EvaluationAggregate.__table__
+    return and_(*(table.c[name] == value for name, value in zip(KEY_COLUMNS, key)))
+
+
+def _upsert(connection, key: AggregateKey, delta: _Delta) -> None:
+    table = EvaluationAggregate.__table__
+    now = datetime.utcnow()
+    lo = min(delta.added, default=None)
+    hi = max(delta.added, default=None)
+    values = dict(zip(KEY_COLUMNS, key), count=delta.count, scored_count=delta.scored,
+                  score_sum=delta.total, score_min=lo, score_max=hi,
+                  reviewed_count=delta.reviewed, updated_at=now)
+    increments = {
+        "count": table.c.count + delta.count,
+        "scored_count": table.c.scored_count + delta.scored,
+        "score_sum": table.c.score_sum + delta.total,
+        "reviewed_count": table.c.reviewed_count + delta.reviewed,
+        "updated_at": now,
+    }
+    if delta.added:
+        increments["score_min"] = case(
+            (or_(table.c.score_min.is_(None), table.c.score_min > lo), lo), else_=table.c.score_min)
+        increments["score_max"] = case(
+            (or_(table.c.score_max.is_(None), table.c.score_max < hi), hi), else_=table.c.score_max)
+
+    dialect = connection.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        connection.execute(insert(table).values(**values).on_conflict_do_update(
+            index_elements=list(KEY_COLUMNS), set_=increments))
+    elif connection.execute(table.update().where(_key_clause(key)).values(**increments)).rowcount == 0:
+        connection.execute(table.insert().values(**values))
+
+
+def _refresh_bounds(connection, key: AggregateKey, removed: List[float]) -> None:
+    """Drop emptied rows; re-read min / max when a removed score was a bound."""
+    table = EvaluationAggregate.__table__
+    row = connection.execute(select(table.c.count, table.c.scored_count, table.c.score_min,
+                                    table.c.score_max).where(_key_clause(key))).first()
+    if row is None:
+        return
+    if row.count <= 0:
+        connection.execute(delete(table).where(_key_clause(key)))
+        return
+    if row.scored_count <= 0:
+        bounds = (None, None)
+    elif removes_bound(removed, row.score_min, row.score_max):
+        source, scope, scope_id, grade = key
+        query = _grouped_query(source, scope, scope_id, grade)
+        bounds = connection.execute(query).first()[3:5]
+    else:
+        return
+    connection.execute(table.update().where(_key_clause(key)).values(
+        score_min=bounds[0], score_max=bounds[1]))
+
+
+hook = FlushDeltaHook("evaluation_aggregates", WATCHED, lambda obj, old: (contribution(obj, old),), apply_changes)
+
+
+def register(session_class=Session) -> None:
+    """Install the flush hooks (done once, when ``database`` is imported)."""
+    hook.register(session_class)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Full recomputation
+# ═══════════════════════════════════════════════════════════════════════
+
+def _source_columns(source: str):
+    if source == "ai":
+        return Evaluation, Evaluation.final_score, Evaluation.is_reviewed == True
+    m = ManualEvaluation
+    score = case((and_(m.obtained_marks.isnot(None), m.max_marks > 0),
+                  m.obtained_marks * 100.0 / m.max_marks), else_=None)
+    return m, score, m.status == "completed"
+
+
+def _grouped_query(source: str, scope: str, scope_id: Optional[int] = None, grade: Optional[str] = None):
+    """``scope id, grade, count, scored, sum, min, max, reviewed`` per row, straight from the source table.
+
+    With *scope_id* and *grade*, just ``count .. reviewed`` of that one row.
+    """
+    model, score, reviewed = _source_columns(source)
+    scope_column = {"teacher": model.teacher_id, "subject": model.subject_id,
+                    "class": Student.class_id}.get(scope)
+    totals = [
+        func.count(model.id), func.count(score), func.coalesce(func.sum(score), 0.0),
+        func.min(score), func.max(score), func.coalesce(func.sum(case((reviewed, 1), else_=0)), 0),
+    ]
+
+    if scope_id is not None:
+        query = select(*totals).select_from(model)
+        if scope_column is not None:
+            query = query.where(scope_column == scope_id)
+        query = query.where(model.grade.is_(None) if not grade else model.grade == GradeLevel(grade))
+    elif scope_column is not None:
+        query = select(scope_column, model.grade, *totals).select_from(model)
+        query = query.where(scope_column.isnot(None)).group_by(scope_column, model.grade)
+    else:
+        query = select(literal_column("0"), model.grade, *totals).select_from(model).group_by(model.grade)
+
+    if scope == "class":
+        query = query.join(Student, model.student_id == Student.id)
+    return query
+
+
+def compute(connection) -> Dict[AggregateKey, Tuple]:
+    """Expected rows: key -> (count, scored_count, score_sum, score_min, score_max, reviewed_count)."""
+    expected = {}
+    for source in SOURCES.values():
+        for scope in SCOPES:
+            for scope_id, grade, *totals in connection.execute(_grouped_query(source, scope)):
+                key = (source, scope, 0 if scope == "global" else scope_id, _grade(grade))
+                expected[key] = tuple(totals)
+    return expected
+
+
+def stored(connection) -> Dict[AggregateKey, Tuple]:
+    table = EvaluationAggregate.__table__
+    rows = connection.execute(select(
+        *(table.c[name] for name in KEY_COLUMNS), table.c.count, table.c.scored_count, table.c.score_sum,
+        table.c.score_min, table.c.score_max, table.c.reviewed_count))
+    return {tuple(row[:4]): tuple(row[4:]) for row in rows}
+
+
+def check(db: Session) -> List[Dict[str, Any]]:
+    """Rows whose stored totals differ from a recomputation (empty when consistent)."""
+    connection = db.connection()
+    expected, actual = compute(connection), stored(connection)
+    mismatches = []
+    for key in sorted(set(expected) | set(actual), key=str):
+        if key not in expected or key not in actual or not all(map(same, expected[key], actual[key])):
+            mismatches.append({"key": key, "stored": actual.get(key), "expected": expected.get(key)})
+    return mismatches
+
+
+def rebuild(db: Session) -> int:
+    """Recompute every aggregate row from the source tables; returns the row count."""
+    table = EvaluationAggregate.__table__
+    connection = db.connection()
+    expected = compute(connection)
+    now = datetime.utcnow()
+    connection.execute(delete(table))
+    if expected:
+        connection.execute(table.insert(), [
+            dict(zip(KEY_COLUMNS, key), count=t[0], scored_count=t[1], score_sum=t[2],
+                 score_min=t[3], score_max=t[4], reviewed_count=t[5], updated_at=now)
+            for key, t in expected.items()
+        ])
+    db.commit()
+    logger.info(f"Rebuilt {len(expected)} evaluation aggregate rows")
+    return len(expected)
+
+
+def ensure_built(db: Session) -> bool:
+    """Build the aggregates once for existing evaluations (e.g. right after upgrading)."""
+    if db.query(EvaluationAggregate.id).first() is not None:
+        return False
+    if db.query(Evaluation.id).first() is None and db.query(ManualEvaluation.id).first() is None:
+        return False
+    rebuild(db)
+    return True
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Reads
+# ═══════════════════════════════════════════════════════════════════════
+
+def read_totals(db: Session, scope: str = "global", scope_id: int = 0) -> Dict[str, Dict[str, Any]]:
+    """Per-source statistics and grade histogram of one scope."""
+    raw = {source: {"count": 0, "scored": 0, "sum": 0.0, "min": None, "max": None,
+                    "reviewed": 0, "grades": {}} for source in SOURCES.values()}
+    rows = db.query(EvaluationAggregate).filter(
+        EvaluationAggregate.scope == scope, EvaluationAggregate.scope_id == scope_id).all()
+    for row in rows:
+        t = raw[row.source]
+        t["count"] += row.count
+        t["scored"] += row.scored_count
+        t["sum"] += row.score_sum
+        t["reviewed"] += row.reviewed_count
+        if row.score_min is not None:
+            t["min"] = row.score_min if t["min"] is None else min(t["min"], row.score_min)
+            t["max"] = row.score_max if t["max"] is None else max(t["max"], row.score_max)
+        if row.count:
+            t["grades"][row.grade or "ungraded"] = row.count
+
+    return {
+        source: {
+            "count": t["count"],
+            "average_score": round(t["sum"] / t["scored"], 2) if t["scored"] else 0,
+            "highest_score": t["max"] or 0,
+            "lowest_score": t["min"] or 0,
+            "reviewed": t["reviewed"],
+            "pending_reviews": t["count"] - t["reviewed"],
+            "grade_distribution": t["grades"],
+        }
+        for source, t in raw.items()
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from api.services.result_store import get_result_store
+
+    def describe(m: Dict[str, Any]) -> str:
+        return f"{'/'.join(map(str, m['key']))}: stored={m['stored']} expected={m['expected']}"
+
+    def targets(db: Session) -> List[CheckTarget]:
+        store = get_result_store()
+        return [
+            CheckTarget("evaluation_aggregates", lambda: check(db), lambda: rebuild(db), describe),
+            CheckTarget("result_totals", store.check_totals, store.rebuild_totals, describe),
+        ]
+
+    return run_check_cli(argv, "Check or rebuild the evaluation statistics aggregates", "rebuild",
+                         "recompute the aggregates from the source tables", targets)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
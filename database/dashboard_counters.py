@@ -0,0 +1,337 @@
+"""
+Dashboard Counters
+===================
+Teacher and student dashboard metrics, maintained in the same transaction
+as the rows they count.
+
+Problem
+-------
+Every dashboard view called ``DashboardService.update_teacher_metrics``
+(six ``COUNT`` queries, then every ``final_score`` of the teacher pulled
+into Python to average) or ``update_student_metrics`` (all of a student's
+evaluations loaded with ``.all()`` to count, average and min / max them),
+so opening a dashboard got slower with every evaluation ever written.
+
+Solution
+--------
+A session ``after_flush`` hook (``database/flush_deltas.py``) turns each
+inserted, updated or deleted ``Student``, ``Class``, ``Evaluation``,
+``ManualEvaluation``, ``ModelAnswer`` and ``UploadedFile`` into deltas on
+the dashboards it counts towards: one ``UPDATE dashboards SET x = x + d ... WHERE
+teacher_id / student_id = ?`` per dashboard, committed or rolled back with
+the change.  Averages are kept as a running ``score_sum`` / ``scored_count``
+on the row; removing a student's highest / lowest score re-reads that one
+bound from the student's evaluations.
+
+Dashboards start from a one-owner recomputation when they are created, and
+only receive deltas afterwards.  The counters always cover all existing
+data: ``DashboardService.reset_dashboard`` leaves them as they are.  Bulk ``query(...).update()`` /
+``delete()`` bypass the hook, so ``repair()`` recomputes every dashboard
+with grouped queries and rewrites the ones that drifted; the API runs it at
+startup and every ``DASHBOARD_REPAIR_INTERVAL_MINUTES``, and
+``python -m database.dashboard_counters --repair`` runs it by hand.
+
+Admin dashboards are still recomputed by ``update_admin_metrics``.
+
+Usage:
+    from database.dashboard_counters import recompute, repair
+    recompute(db, "teacher", teacher.id)   # one dashboard
+    repair(db)                             # every dashboard, returns rows fixed
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.orm import Session
+
+from database.flush_deltas import (
+    CheckTarget,
+    FlushDeltaHook,
+    ScoreDelta,
+    attribute_value,
+    removes_bound,
+    run_check_cli,
+    same,
+)
+
+from database.models import (
+    Dashboard,
+    Student,
+    Class,
+    Evaluation,
+    ManualEvaluation,
+    ModelAnswer,
+    UploadedFile,
+)
+
+logger = logging.getLogger("AssessIQ.DashboardCounters")
+
+ROLES = ("teacher", "student")
+
+# ("teacher" | "student", owner id)
+DashboardKey = Tuple[str, int]
+
+# Column holding the running average of each role, and the bounds kept beside it
+AVERAGE = {"teacher": "average_evaluation_score", "student": "average_score"}
+BOUNDS = {"student": ("lowest_score", "highest_score")}
+
+FIELDS = {
+    "teacher": ("students_taught", "classes_managed", "evaluations_created", "manual_evaluations_done",
+                "model_answers_uploaded", "total_evaluations", "documents_uploaded",
+                "score_sum", "scored_count", "average_evaluation_score"),
+    "student": ("evaluations_received", "total_feedback_received",
+                "score_sum", "scored_count", "average_score", "highest_score", "lowest_score"),
+}
+
+
+def _owner_column(role: str):
+    return Dashboard.__table__.c[f"{role}_id"]
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Effects
+# ═══════════════════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class Effect:
+    """What one row adds to one dashboard: +1 on each counter, and maybe a score."""
+    role: str
+    owner_id: int
+    counters: Tuple[str, ...]
+    score: Optional[float] = None
+
+
+def effects(obj: Any, old: bool = False) -> Tuple[Effect, ...]:
+    get = lambda name: attribute_value(obj, name, old)
+    teacher_id = get("teacher_id")
+    found: List[Effect] = []
+
+    if isinstance(obj, Evaluation):
+        score = get("final_score")
+        score = float(score) if score is not None else None
+        if teacher_id is not None:
+            found.append(Effect("teacher", teacher_id, ("evaluations_created", "total_evaluations"), score))
+        student_id = get("student_id")
+        if student_id is not None:
+            counters = ("evaluations_received",) + (("total_feedback_received",) if get("explanation") else ())
+            found.append(Effect("student", student_id, counters, score))
+    elif teacher_id is not None:
+        counters = {
+            Student: ("students_taught",),
+            Class: ("classes_managed",),
+            ManualEvaluation: ("manual_evaluations_done", "total_evaluations"),
+            ModelAnswer: ("model_answers_uploaded",),
+            UploadedFile: ("documents_uploaded",),
+        }[type(obj)]
+        found.append(Effect("teacher", teacher_id, counters))
+    return tuple(found)
+
+
+# Attributes whose old value an update has to subtract
+WATCHED = {
+    Student: ("teacher_id",),
+    Class: ("teacher_id",),
+    Evaluation: ("teacher_id", "student_id", "final_score", "explanation"),
+    ManualEvaluation: ("teacher_id",),
+    ModelAnswer: ("teacher_id",),
+    UploadedFile: ("teacher_id",),
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Flush hook
+# ═══════════════════════════════════════════════════════════════════════
+
+@dataclass
+class _Delta(ScoreDelta):
+    counters: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def apply(self, e: Effect, sign: int) -> None:
+        for name in e.counters:
+            self.counters[name] += sign
+        self.add_score(e.score, sign)
+
+
+def apply_changes(connection, changes: Iterable[Tuple[Effect, int]]) -> None:
+    """Fold signed effects into one delta per dashboard and write them."""
+    deltas: Dict[DashboardKey, _Delta] = defaultdict(_Delta)
+    for e, sign in changes:
+        deltas[(e.role, e.owner_id)].apply(e, sign)
+    for key, delta in deltas.items():
+        _update(connection, key, delta)
+        if delta.removed and key[0] in BOUNDS:
+            _refresh_bounds(connection, key, delta.removed)
+
+
+def _update(connection, key: DashboardKey, delta: _Delta) -> None:
+    table = Dashboard.__table__
+    role, owner_id = key
+    col = lambda name: func.coalesce(table.c[name], 0)
+    values = {name: col(name) + n for name, n in delta.counters.items() if n}
+
+    if delta.scored or delta.total:
+        # SET expressions all read the row as it was before this UPDATE
+        count = col("scored_count") + delta.scored
+        total = col("score_sum") + delta.total
+        values["scored_count"] = count
+        values["score_sum"] = total
+        values[AVERAGE[role]] = case((count > 0, total / count), else_=0.0)
+    if delta.added and role in BOUNDS:
+        lo_name, hi_name = BOUNDS[role]
+        lo, hi = min(delta.added), max(delta.added)
+        first = col("scored_count") == 0
+        values[lo_name] = case((or_(first, table.c[lo_name] > lo), lo), else_=table.c[lo_name])
+        values[hi_name] = case((or_(first, table.c[hi_name] < hi), hi), else_=table.c[hi_name])
+
+    if values:
+        connection.execute(table.update().where(_owner_column(role) == owner_id).values(**values))
+
+
+def _refresh_bounds(connection, key: DashboardKey, removed: List[float]) -> None:
+    """Re-read the bounds when a removed score was one of them."""
+    table = Dashboard.__table__
+    role, owner_id = key
+    lo_name, hi_name = BOUNDS[role]
+    row = connection.execute(select(table.c.scored_count, table.c[lo_name], table.c[hi_name])
+                             .where(_owner_column(role) == owner_id)).first()
+    if row is None:
+        return
+    count, lo, hi = row
+    if not count or count <= 0:
+        bounds = (0.0, 0.0)
+    elif removes_bound(removed, lo, hi):
+        bounds = connection.execute(
+            select(func.min(Evaluation.final_score), func.max(Evaluation.final_score))
+            .where(Evaluation.student_id == owner_id, Evaluation.final_score.isnot(None))).first()
+        bounds = tuple(b if b is not None else 0.0 for b in bounds)
+    else:
+        return
+    connection.execute(table.update().where(_owner_column(role) == owner_id).values(
+        {lo_name: bounds[0], hi_name: bounds[1]}))
+
+
+hook = FlushDeltaHook("dashboard_counters", WATCHED, effects, apply_changes)
+
+
+def register(session_class=Session) -> None:
+    """Install the flush hooks (done once, when ``database`` is imported)."""
+    hook.register(session_class)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Full recomputation
+# ═══════════════════════════════════════════════════════════════════════
+
+def _grouped_queries(role: str, owner_id: Optional[int] = None):
+    """``(owner id, {field: expression})`` queries counting each owner's rows."""
+    e = Evaluation
+    if role == "teacher":
+        specs = [
+            (Student.teacher_id, {"students_taught": func.count(Student.id)}),
+            (Class.teacher_id, {"classes_managed": func.count(Class.id)}),
+            (e.teacher_id, {"evaluations_created": func.count(e.id), "scored_count": func.count(e.final_score),
+                            "score_sum": func.coalesce(func.sum(e.final_score), 0.0)}),
+            (ManualEvaluation.teacher_id, {"manual_evaluations_done": func.count(ManualEvaluation.id)}),
+            (ModelAnswer.teacher_id, {"model_answers_uploaded": func.count(ModelAnswer.id)}),
+            (UploadedFile.teacher_id, {"documents_uploaded": func.count(UploadedFile.id)}),
+        ]
+    else:
+        has_feedback = case((func.coalesce(e.explanation, "") != "", 1), else_=0)
+        specs = [
+            (e.student_id, {"evaluations_received": func.count(e.id), "scored_count": func.count(e.final_score),
+                            "score_sum": func.coalesce(func.sum(e.final_score), 0.0),
+                            "lowest_score": func.min(e.final_score), "highest_score": func.max(e.final_score),
+                            "total_feedback_received": func.coalesce(func.sum(has_feedback), 0)}),
+        ]
+    for owner, columns in specs:
+        query = select(owner, *columns.values()).where(owner.isnot(None)).group_by(owner)
+        if owner_id is not None:
+            query = query.where(owner == owner_id)
+        yield query, list(columns)
+
+
+def _finish(role: str, values: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill the derived fields from the counted ones."""
+    values = {name: values.get(name) or 0 for name in FIELDS[role]}
+    values["score_sum"] = float(values["score_sum"])
+    average = values["score_sum"] / values["scored_count"] if values["scored_count"] else 0.0
+    values[AVERAGE[role]] = average
+    if role == "teacher":
+        values["total_evaluations"] = values["evaluations_created"] + values["manual_evaluations_done"]
+    else:
+        values["lowest_score"] = float(values["lowest_score"])
+        values["highest_score"] = float(values["highest_score"])
+    return values
+
+
+def compute(connection, role: str, owner_id: Optional[int] = None) -> Dict[int, Dict[str, Any]]:
+    """Expected metrics of every *role* owner with rows (or just *owner_id*)."""
+    counted: Dict[int, Dict[str, Any]] = defaultdict(dict)
+    for query, names in _grouped_queries(role, owner_id):
+        for owner, *values in connection.execute(query):
+            counted[owner].update(zip(names, values))
+    if owner_id is not None and owner_id not in counted:
+        counted[owner_id] = {}
+    return {owner: _finish(role, values) for owner, values in counted.items()}
+
+
+def recompute(db: Session, role: str, owner_id: int) -> None:
+    """Rewrite one dashboard's counters from the source tables (flushed, not committed)."""
+    if role not in ROLES:
+        return
+    connection = db.connection()
+    values = compute(connection, role, owner_id)[owner_id]
+    connection.execute(Dashboard.__table__.update().where(_owner_column(role) == owner_id).values(**values))
+
+
+def check(db: Session) -> List[Dict[str, Any]]:
+    """Dashboards whose counters differ from a recomputation (empty when consistent)."""
+    connection = db.connection()
+    table = Dashboard.__table__
+    mismatches = []
+    for role in ROLES:
+        expected = compute(connection, role)
+        owner = _owner_column(role)
+        rows = connection.execute(select(owner, *(table.c[name] for name in FIELDS[role]))
+                                  .where(owner.isnot(None)))
+        for owner_id, *stored in rows:
+            want = expected.get(owner_id) or _finish(role, {})
+            differing = {name: (value, want[name]) for name, value in zip(FIELDS[role], stored)
+                         if not same(value, want[name])}
+            if differing:
+                mismatches.append({"key": (role, owner_id), "expected": want, "fields": differing})
+    return mismatches
+
+
+def repair(db: Session) -> int:
+    """Recompute every teacher / student dashboard and rewrite the ones that drifted."""
+    mismatches = check(db)
+    connection = db.connection()
+    for m in mismatches:
+        role, owner_id = m["key"]
+        connection.execute(Dashboard.__table__.update().where(_owner_column(role) == owner_id)
+                           .values(**m["expected"]))
+    db.commit()
+    if mismatches:
+        logger.warning(f"Repaired {len(mismatches)} dashboards whose counters had drifted")
+    return len(mismatches)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    def describe(m: Dict[str, Any]) -> str:
+        return f"{'/'.join(map(str, m['key']))}: " + ", ".join(
+            f"{name} stored={s} expected={e}" for name, (s, e) in m["fields"].items())
+
+    def targets(db: Session) -> List[CheckTarget]:
+        return [CheckTarget("dashboards", lambda: check(db), lambda: repair(db), describe,
+                            checked="{} with drifted counters", fixed="repaired {}")]
+
+    return run_check_cli(argv, "Check or repair the dashboard counters", "repair",
+                         "rewrite drifted dashboards from the source tables", targets)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,172 @@
+"""
+Flush Deltas
+=============
+Shared machinery for totals maintained in the same transaction as the rows
+they count (``database/aggregates.py``, ``database/dashboard_counters.py``).
+
+A ``FlushDeltaHook`` reads what each watched row contributed before a flush
+(``before_flush``, while deleted rows still exist) and what it contributes
+after it (``after_flush``), and hands the signed differences to the owning
+module, which folds them into delta ``UPDATE`` / upsert statements on the
+flush's connection.  The old value of every watched attribute is loaded on
+assignment, once per attribute however many hooks watch it.
+
+``ScoreDelta`` carries the running score sum / count and the scores added
+and removed (for min / max bounds); ``run_check_cli`` is the common
+``check`` / ``--rebuild`` command line of the modules.
+
+Usage:
+    hook = FlushDeltaHook("evaluation_aggregates", WATCHED, extract, apply_changes)
+    hook.register()
+"""
+
+import argparse
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+# obj, old -> what the row contributes (a tuple of hashable items)
+Extractor = Callable[[Any, bool], Tuple[Hashable, ...]]
+# connection, [(item, +1 | -1)]
+Applier = Callable[[Any, List[Tuple[Hashable, int]]], None]
+
+_history_loaded: set = set()
+
+
+def attribute_value(obj: Any, name: str, old: bool) -> Any:
+    """Current attribute value, or the value before this flush's changes."""
+    if old:
+        history = inspect(obj).attrs[name].history
+        if history.deleted:
+            return history.deleted[0]
+        if history.added:
+            return None
+    return getattr(obj, name)
+
+
+def _keep_value(target, value, oldvalue, initiator):
+    return value
+
+
+def load_old_values(model: type, names: Iterable[str]) -> None:
+    """Load the old value on assignment so an update can subtract it."""
+    for name in names:
+        if (model, name) not in _history_loaded:
+            event.listen(getattr(model, name), "set", _keep_value, active_history=True, retval=True)
+            _history_loaded.add((model, name))
+
+
+class FlushDeltaHook:
+    """Before / after flush listeners turning row changes into signed contributions."""
+
+    def __init__(self, name: str, watched: Dict[type, Sequence[str]], extract: Extractor, apply: Applier):
+        self.name = name
+        self.watched = watched
+        self.extract = extract
+        self.apply = apply
+        self._pending = f"{name}.pending"
+        self._registered: set = set()
+
+    def before_flush(self, session: Session, flush_context, instances) -> None:
+        # Old contributions are read here, while deleted rows still exist
+        pending = []
+        for obj in session.dirty:
+            if type(obj) in self.watched and session.is_modified(obj):
+                pending.append((obj, self.extract(obj, True)))
+        for obj in session.deleted:
+            if type(obj) in self.watched:
+                pending.append((None, self.extract(obj, True)))
+        session.info[self._pending] = pending
+
+    def after_flush(self, session: Session, flush_context) -> None:
+        changes: List[Tuple[Hashable, int]] = []
+        for obj, old in session.info.pop(self._pending, []):
+            new = self.extract(obj, False) if obj is not None else ()
+            if new != old:
+                changes.extend((item, -1) for item in old)
+                changes.extend((item, 1) for item in new)
+        for obj in session.new:
+            if type(obj) in self.watched:
+                changes.extend((item, 1) for item in self.extract(obj, False))
+        if changes:
+            self.apply(session.connection(), changes)
+
+    def register(self, session_class=Session) -> None:
+        """Install the flush hooks on *session_class* (once)."""
+        if session_class in self._registered:
+            return
+        for model, names in self.watched.items():
+            load_old_values(model, names)
+        event.listen(session_class, "before_flush", self.before_flush)
+        event.listen(session_class, "after_flush", self.after_flush)
+        self._registered.add(session_class)
+
+
+@dataclass
+class ScoreDelta:
+    """Running score sum / count change, and the scores added / removed (for bounds)."""
+    scored: int = 0
+    total: float = 0.0
+    added: List[float] = field(default_factory=list)
+    removed: List[float] = field(default_factory=list)
+
+    def add_score(self, score: Optional[float], sign: int) -> None:
+        if score is None:
+            return
+        self.scored += sign
+        self.total += sign * score
+        (self.added if sign > 0 else self.removed).append(score)
+
+
+def removes_bound(removed: Iterable[float], lo: Optional[float], hi: Optional[float]) -> bool:
+    """Whether removing these scores may have removed the stored min or max."""
+    return any(lo is None or hi is None or s <= lo or s >= hi for s in removed)
+
+
+def same(a: Any, b: Any) -> bool:
+    """Stored and recomputed values agree (floats within rounding)."""
+    if a is None or b is None:
+        return a is b
+    return abs(float(a) - float(b)) <= 1e-6 * max(1.0, abs(float(a)))
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Command line
+# ═══════════════════════════════════════════════════════════════════════
+
+@dataclass
+class CheckTarget:
+    """One set of maintained totals the command line checks and rebuilds."""
+    label: str
+    check: Callable[[], List[Dict[str, Any]]]
+    fix: Callable[[], int]
+    describe: Callable[[Dict[str, Any]], str]
+    checked: str = "{} mismatched rows"
+    fixed: str = "rebuilt {} rows"
+
+
+def run_check_cli(argv: Optional[List[str]], description: str, fix_flag: str, fix_help: str,
+                  targets: Callable[[Session], List[CheckTarget]]) -> int:
+    """Print mismatches of every target (and fix them with ``--<fix_flag>``); 1 when drifted and not fixed."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(f"--{fix_flag}", action="store_true", help=fix_help)
+    fix = getattr(parser.parse_args(argv), fix_flag)
+
+    from database.models import SessionLocal
+
+    db = SessionLocal()
+    drifted = False
+    try:
+        for target in targets(db):
+            mismatches = target.check()
+            for m in mismatches:
+                print(target.describe(m))
+            print(f"{target.label}: {target.checked.format(len(mismatches))}")
+            drifted = drifted or bool(mismatches)
+            if fix:
+                print(f"{target.label}: {target.fixed.format(target.fix())}")
+    finally:
+        db.close()
+    return 1 if drifted and not fix else 0
@@ -0,0 +1,65 @@
+"""
+Alembic environment for AssessIQ
+=================================
+Migrates ``settings.DATABASE_URL`` against ``database.models.Base``.
+
+``database.schema.upgrade_database()`` passes its own connection in
+``config.attributes["connection"]`` so startup migrations run inside the
+migration lock; the ``alembic`` CLI opens a connection here instead.
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from config.settings import settings
+from database.models import Base
+
+config = context.config
+
+if config.config_file_name is not None and "connection" not in config.attributes:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without a database (``alembic upgrade head --sql``)."""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _run(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        compare_type=True,
+        # SQLite can't ALTER most things; batch mode rebuilds the table instead
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+    engine = create_engine(config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL,
+                           poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        _run(connection)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,670 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 20:50:53.818856
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ENUM_VALUES = {
+    'userstatus': ('ACTIVE', 'INACTIVE', 'SUSPENDED'),
+    'userrole': ('ADMIN', 'TEACHER', 'STUDENT'),
+    'communitytype': ('ADMIN_TEACHER', 'TEACHER_STUDENT'),
+    'questiontype': ('FACTUAL', 'DESCRIPTIVE', 'DIAGRAM', 'MIXED'),
+    'activitytype': ('LOGIN', 'LOGOUT', 'CREATE', 'UPDATE', 'DELETE', 'EVALUATE', 'UPLOAD', 'DOWNLOAD'),
+    'memberrole': ('OWNER', 'MEMBER'),
+    'messagetype': ('TEXT', 'ANNOUNCEMENT', 'FILE', 'SYSTEM'),
+    'gradelevel': ('EXCELLENT', 'GOOD', 'AVERAGE', 'POOR'),
+    'grievancepriority': ('LOW', 'MEDIUM', 'HIGH', 'URGENT'),
+    'grievancestatus': ('PENDING', 'IN_REVIEW', 'RESOLVED', 'REJECTED', 'ESCALATED'),
+    'filetype': ('MODEL_ANSWER', 'STUDENT_ANSWER', 'EVALUATION_RESULT', 'MANUAL_CHECK', 'OTHER'),
+}
+
+
+def _enum(name: str) -> sa.Enum:
+    # Several tables share a PostgreSQL type: it is created once in upgrade()
+    values = ENUM_VALUES[name]
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=False), "postgresql")
+
+
+def upgrade() -> None:
+    # Databases created by the old drop_all / create_all startup already have
+    # some of these tables: adopt them, creating only the missing tables and
+    # adding the columns the adopted ones lack
+    bind = op.get_bind()
+    offline = context.is_offline_mode()
+    inspector = None if offline else sa.inspect(bind)
+    existing = set() if offline else set(inspector.get_table_names())
+
+    def create_table(name: str, *elements) -> bool:
+        """Create *name*, or add its missing columns; ``True`` when it was created."""
+        if name not in existing:
+            op.create_table(name, *elements)
+            return True
+        present = {c['name'] for c in inspector.get_columns(name)}
+        for column in elements:
+            if isinstance(column, sa.Column) and column.name not in present:
+                op.add_column(name, column)
+        return False
+
+    if bind.dialect.name == "postgresql":
+        for name, values in ENUM_VALUES.items():
+            postgresql.ENUM(*values, name=name).create(bind, checkfirst=not offline)
+
+    if create_table('admins',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('admin_id', sa.String(length=50), nullable=True),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=True),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('profile_image', sa.String(length=500), nullable=True),
+        sa.Column('oauth_provider', sa.String(length=50), nullable=True),
+        sa.Column('oauth_id', sa.String(length=255), nullable=True),
+        sa.Column('status', _enum('userstatus'), nullable=True),
+        sa.Column('is_super_admin', sa.Boolean(), nullable=True),
+        sa.Column('last_login', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    ):
+        with op.batch_alter_table('admins', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_admins_admin_id'), ['admin_id'], unique=True)
+            batch_op.create_index(batch_op.f('ix_admins_email'), ['email'], unique=True)
+            batch_op.create_index(batch_op.f('ix_admins_oauth_id'), ['oauth_id'], unique=True)
+
+    create_table('evaluation_aggregates',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('source', sa.String(length=10), nullable=False),
+        sa.Column('scope', sa.String(length=10), nullable=False),
+        sa.Column('scope_id', sa.Integer(), nullable=False),
+        sa.Column('grade', sa.String(length=20), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('scored_count', sa.Integer(), nullable=False),
+        sa.Column('score_sum', sa.Float(), nullable=False),
+        sa.Column('score_min', sa.Float(), nullable=True),
+        sa.Column('score_max', sa.Float(), nullable=True),
+        sa.Column('reviewed_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source', 'scope', 'scope_id', 'grade', name='unique_evaluation_aggregate')
+    )
+
+    if create_table('refresh_tokens',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('token', sa.String(length=500), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('user_role', _enum('userrole'), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('is_revoked', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('revoked_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    ):
+        with op.batch_alter_table('refresh_tokens', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_refresh_tokens_token'), ['token'], unique=True)
+
+    if create_table('subjects',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('subject_id', sa.String(length=50), nullable=True),
+        sa.Column('code', sa.String(length=20), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('credits', sa.Integer(), nullable=True),
+        sa.Column('department', sa.String(length=100), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('code')
+    ):
+        with op.batch_alter_table('subjects', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_subjects_subject_id'), ['subject_id'], unique=True)
+
+    if create_table('teachers',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('teacher_id', sa.String(length=50), nullable=True),
+        sa.Column('employee_id', sa.String(length=50), nullable=True),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=True),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('oauth_provider', sa.String(length=50), nullable=True),
+        sa.Column('oauth_id', sa.String(length=255), nullable=True),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('department', sa.String(length=100), nullable=True),
+        sa.Column('designation', sa.String(length=100), nullable=True),
+        sa.Column('profile_image', sa.String(length=500), nullable=True),
+        sa.Column('status', _enum('userstatus'), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('last_login', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['admins.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('employee_id')
+    ):
+        with op.batch_alter_table('teachers', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_teachers_email'), ['email'], unique=True)
+            batch_op.create_index(batch_op.f('ix_teachers_oauth_id'), ['oauth_id'], unique=True)
+            batch_op.create_index(batch_op.f('ix_teachers_teacher_id'), ['teacher_id'], unique=True)
+
+    if create_table('classes',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('class_id', sa.String(length=50), nullable=True),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('section', sa.String(length=20), nullable=True),
+        sa.Column('semester', sa.Integer(), nullable=True),
+        sa.Column('department', sa.String(length=100), nullable=True),
+        sa.Column('academic_year', sa.String(length=20), nullable=True),
+        sa.Column('teacher_id', sa.Integer(), nullable=True),
+        sa.Column('max_students', sa.Integer(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    ):
+        with op.batch_alter_table('classes', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_classes_class_id'), ['class_id'], unique=True)
+
+    if create_table('communities',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('community_id', sa.String(length=50), nullable=True),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('community_type', _enum('communitytype'), nullable=False),
+        sa.Column('profile_image', sa.String(length=500), nullable=True),
+        sa.Column('owner_admin_id', sa.Integer(), nullable=True),
+        sa.Column('owner_teacher_id', sa.Integer(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('allow_member_posts', sa.Boolean(), nullable=True),
+        sa.Column('allow_file_sharing', sa.Boolean(), nullable=True),
+        sa.Column('member_count', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['owner_admin_id'], ['admins.id'], ),
+        sa.ForeignKeyConstraint(['owner_teacher_id'], ['teachers.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    ):
+        with op.batch_alter_table('communities', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_communities_community_id'), ['community_id'], unique=True)
+
+    if create_table('model_answers',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('answer_id', sa.String(length=50), nullable=True),
+        sa.Column('question_number', sa.String(length=50), nullable=True),
+        sa.Column('question_text', sa.Text(), nullable=True),
+        sa.Column('answer_text', sa.Text(), nullable=True),
+        sa.Column('file_path', sa.String(length=500), nullable=True),
+        sa.Column('subject_id', sa.Integer(), nullable=True),
+        sa.Column('teacher_id', sa.Integer(), nullable=True),
+        sa.Column('question_type', _enum('questiontype'), nullable=True),
+        sa.Column('max_marks', sa.Integer(), nullable=True),
+        sa.Column('keywords', sa.JSON(), nullable=True),
+        sa.Column('key_concepts', sa.JSON(), nullable=True),
+        sa.Column('rubric', sa.JSON(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['subject_id'], ['subjects.id'], ),
+        sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    ):
+        with op.batch_alter_table('model_answers', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_model_answers_answer_id'), ['answer_id'], unique=True)
+
+    create_table('teacher_subjects',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('teacher_id', sa.Integer(), nullable=False),
+        sa.Column('subject_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['subject_id'], ['subjects.id'], ),
+        sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('teacher_id', 'subject_id', name='unique_teacher_subject')
+    )
+
+    create_table('class_subjects',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('class_id', sa.Integer(), nullable=False),
+        sa.Column('subject_id', sa.Integer(), nullable=False),
+        sa.Column('teacher_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['class_id'], ['classes.id'], ),
+        sa.ForeignKeyConstraint(['subject_id'], ['subjects.id'], ),
+        sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('class_id', 'subject_id', name='unique_class_subject')
+    )
+
+    if create_table('students',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('student_id', sa.String(length=50), nullable=True),
+        sa.Column('roll_no', sa.String(length=50), nullable=False),
+        sa.Column('enrollment_no', sa.String(length=50), nullable=True),
+        sa.Column('email', sa.String(length=255), nullable=True),
+        sa.Column('password_hash', sa.String(length=255), nullable=True),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('oauth_provider', sa.String(length=50), nullable=True),
+        sa.Column('oauth_id', sa.String(length=255), nullable=True),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('date_of_birth', sa.DateTime(), nullable=True),
+        sa.Column('gender', sa.String(length=20), nullable=True),
+        sa.Column('address', sa.Text(), nullable=True),
+        sa.Column('profile_image', sa.String(length=500), nullable=True),
+        sa.Column('class_id', sa.Integer(), nullable=True),
+        sa.Column('teacher_id', sa.Integer(), nullable=True),
+        sa.Column('status', _enum('userstatus'), nullable=True),
+        sa.Column('academic_year', sa.String(length=20), nullable=True),
+        sa.Column('last_login', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['class_id'], ['classes.id'], ),
+        sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('enrollment_no'),
+        sa.UniqueConstraint('roll_no', 'class_id', name='unique_roll_in_class')
+    ):
+        with op.batch_alter_table('students', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_students_email'), ['email'], unique=True)
+            batch_op.create_index(batch_op.f('ix_students_oauth_id'), ['oauth_id'], unique=True)
+            batch_op.create_index(batch_op.f('ix_students_roll_no'), ['roll_no'], unique=False)
+            batch_op.create_index(batch_op.f('ix_students_student_id'), ['student_id'], unique=True)
+
+    if create_table('activity_logs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('log_id', sa.String(length=50), nullable=True),
+        sa.Column('admin_id', sa.Integer(), nullable=True),
+        sa.Column('teacher_id', sa.Integer(), nullable=True),
+        sa.Column('student_id', sa.Integer(), nullable=True),
+        sa.Column('user_role', _enum('userrole'), nullable=True),
+        sa.Column('activity_type', _enum('activitytype'), nullable=False),
+        sa.Column('action', sa.String(length=100), nullable=False),
+        sa.Column('resource_type', sa.String(length=50), nullable=True),
+        sa.Column('resource_id', sa.String(length=50), nullable=True),
+        sa.Column('details', sa.JSON(), nullable=True),
+        sa.Column('ip_address', sa.String(length=50), nullable=True),
+        sa.Column('user_agent', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['admin_id'], ['admins.id'], ),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+        sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    ):
+        with op.batch_alter_table('activity_logs', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_activity_logs_created_at'), ['created_at'], unique=False)
+            batch_op.create_index(batch_op.f('ix_activity_logs_log_id'), ['log_id'], unique=True)
+
+    create_table('community_members',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('community_id', sa.Integer(), nullable=False),
+        sa.Column('admin_id', sa.Integer(), nullable=True),
+        sa.Column('teacher_id', sa.Integer(), nullable=True),
+        sa.Column('student_id', sa.Integer(), nullable=True),
+        sa.Column('member_role', _enum('memberrole'), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_muted', sa.Boolean(), nullable=True),
+        sa.Column('joined_at', sa.DateTime(), nullable=True),
+        sa.Column('last_seen', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['admin_id'], ['admins.id'], ),
+        sa.ForeignKeyConstraint(['community_id'], ['communities.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+        sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('community_id', 'admin_id', name='unique_community_admin'),
+        sa.UniqueConstraint('community_id', 'student_id', name='unique_community_student'),
+        sa.UniqueConstraint('community_id', 'teacher_id', name='unique_community_teacher')
+    )
+
+    if create_table('community_messages',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('message_id', sa.String(length=50), nullable=True),
+        sa.Column('community_id', sa.Integer(), nullable=False),
+        sa.Column('sender_admin_id', sa.Integer(), nullable=True),
+        sa.Column('sender_teacher_id', sa.Integer(), nullable=True),
+        sa.Column('sender_student_id', sa.Integer(), nullable=True),
+        sa.Column('message_type', _enum('messagetype'), nullable=True),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column('file_path', sa.String(length=500), nullable=True),
+        sa.Column('file_name', sa.String(length=255), nullable=True),
+        sa.Column('reply_to_id', sa.Integer(), nullable=True),
+        sa.Column('is_pinned', sa.Boolean(), nullable=True),
+        sa.Column('is_deleted', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['community_id'], ['communities.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['reply_to_id'], ['community_messages.id'], ),
+        sa.ForeignKeyConstraint(['sender_admin_id'], ['admins.id'], ),
+        sa.ForeignKeyConstraint(['sender_student_id'], ['students.id'], ),
+        sa.ForeignKeyConstraint(['sender_teacher_id'], ['teachers.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    ):
+        with op.batch_alter_table('community_messages', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_community_messages_created_at'), ['created_at'], unique=False)
+            batch_op.create_index(batch_op.f('ix_community_messages_message_id'), ['message_id'], unique=True)
+
+    if create_table('dashboards',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('dashboard_id', sa.String(length=50), nullable=True),
+        sa.Column('admin_id', sa.Integer(), nullable=True),
+        sa.Column('teacher_id', sa.Integer(), nullable=True),
+        sa.Column('student_id', sa.Integer(), nullable=True),
+        sa.Column('user_role', _enum('userrole'), nullable=False),
+        sa.Column('initialized_at', sa.DateTime(), nullable=False),
+        sa.Column('is_first_visit', sa.Boolean(), nullable=True),
+        sa.Column('total_activities', sa.Integer(), nullable=True),
+        sa.Column('total_logins', sa.Integer(), nullable=True),
+        sa.Column('last_activity_at', sa.DateTime(), nullable=True),
+        sa.Column('teachers_created', sa.Integer(), nullable=True),
+        sa.Column('teachers_active', sa.Integer(), nullable=True),
+        sa.Column('students_managed', sa.Integer(), nullable=True),
+        sa.Column('evaluations_overseen', sa.Integer(), nullable=True),
+        sa.Column('students_taught', sa.Integer(), nullable=True),
+        sa.Column('classes_managed', sa.Integer(), nullable=True),
+        sa.Column('evaluations_created', sa.Integer(), nullable=True),
+        sa.Column('manual_evaluations_done', sa.Integer(), nullable=True),
+        sa.Column('model_answers_uploaded', sa.Integer(), nullable=True),
+        sa.Column('total_evaluations', sa.Integer(), nullable=True),
+        sa.Column('average_evaluation_score', sa.Float(), nullable=True),
+        sa.Column('assignments_received', sa.Integer(), nullable=True),
+        sa.Column('assignments_completed', sa.Integer(), nullable=True),
+        sa.Column('evaluations_received', sa.Integer(), nullable=True),
+        sa.Column('average_score', sa.Float(), nullable=True),
+        sa.Column('highest_score', sa.Float(), nullable=True),
+        sa.Column('lowest_score', sa.Float(), nullable=True),
+        sa.Column('total_feedback_received', sa.Integer(), nullable=True),
+        sa.Column('documents_uploaded', sa.Integer(), nullable=True),
+        sa.Column('documents_downloaded', sa.Integer(), nullable=True),
+        sa.Column('grievances_filed', sa.Integer(), nullable=True),
+        sa.Column('grievances_resolved', sa.Integer(), nullable=True),
+        sa.Column('community_messages_sent', sa.Integer(), nullable=True),
+        sa.Column('data', sa.JSON(), nullable=True),
+        sa.Column('last_updated_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['admin_id'], ['admins.id'], ),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+        sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('admin_id', name='unique_admin_dashboard'),
+        sa.UniqueConstraint('student_id', name='unique_student_dashboard'),
+        sa.UniqueConstraint('teacher_id', name='unique_teacher_dashboard')
+    ):
+        with op.batch_alter_table('dashboards', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_dashboards_dashboard_id'), ['dashboard_id'], unique=True)
+
+    if create_table('evaluations',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('evaluation_id', sa.String(length=50), nullable=True),
+        sa.Column('student_id', sa.Integer(), nullable=True),
+        sa.Column('teacher_id', sa.Integer(), nullable=True),
+        sa.Column('model_answer_id', sa.Integer(), nullable=True),
+        sa.Column('subject_id', sa.Integer(), nullable=True),
+        sa.Column('student_answer_text', sa.Text(), nullable=True),
+        sa.Column('student_answer_file', sa.String(length=500), nullable=True),
+        sa.Column('question_type', _enum('questiontype'), nullable=True),
+        sa.Column('max_marks', sa.Integer(), nullable=True),
+        sa.Column('obtained_marks', sa.Float(), nullable=True),
+        sa.Column('final_score', sa.Float(), nullable=True),
+        sa.Column('grade', _enum('gradelevel'), nullable=True),
+        sa.Column('semantic_score', sa.Float(), nullable=True),
+        sa.Column('keyword_score', sa.Float(), nullable=True),
+        sa.Column('diagram_score', sa.Float(), nullable=True),
+        sa.Column('length_penalty', sa.Float(), nullable=True),
+        sa.Column('matched_keywords', sa.JSON(), nullable=True),
+        sa.Column('missing_keywords', sa.JSON(), nullable=True),
+        sa.Column('concept_coverage', sa.Float(), nullable=True),
+        sa.Column('explanation', sa.Text(), nullable=True),
+        sa.Column('suggestions', sa.JSON(), nullable=True),
+        sa.Column('is_reviewed', sa.Boolean(), nullable=True),
+        sa.Column('reviewed_by', sa.Integer(), nullable=True),
+        sa.Column('reviewed_at', sa.DateTime(), nullable=True),
+        sa.Column('processing_time', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['model_answer_id'], ['model_answers.id'], ),
+        sa.ForeignKeyConstraint(['reviewed_by'], ['teachers.id'], ),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+        sa.ForeignKeyConstraint(['subject_id'], ['subjects.id'], ),
+        sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    ):
+        with op.batch_alter_table('evaluations', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_evaluations_created_at'), ['created_at'], unique=False)
+            batch_op.create_index(batch_op.f('ix_evaluations_evaluation_id'), ['evaluation_id'], unique=True)
+
+    if create_table('grievances',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('grievance_id', sa.String(length=50), nullable=True),
+        sa.Column('community_id', sa.Integer(), nullable=True),
+        sa.Column('complainant_student_id', sa.Integer(), nullable=True),
+        sa.Column('complainant_teacher_id', sa.Integer(), nullable=True),
+        sa.Column('assigned_teacher_id', sa.Integer(), nullable=True),
+        sa.Column('assigned_admin_id', sa.Integer(), nullable=True),
+        sa.Column('subject', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=True),
+        sa.Column('priority', _enum('grievancepriority'), nullable=True),
+        sa.Column('attachments', sa.JSON(), nullable=True),
+        sa.Column('status', _enum('grievancestatus'), nullable=True),
+        sa.Column('resolution', sa.Text(), nullable=True),
+        sa.Column('resolved_by_teacher_id', sa.Integer(), nullable=True),
+        sa.Column('resolved_by_admin_id', sa.Integer(), nullable=True),
+        sa.Column('resolved_at', sa.DateTime(), nullable=True),
+        sa.Column('escalated_at', sa.DateTime(), nullable=True),
+        sa.Column('escalation_reason', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['assigned_admin_id'], ['admins.id'], ),
+        sa.ForeignKeyConstraint(['assigned_teacher_id'], ['teachers.id'], ),
+        sa.ForeignKeyConstraint(['community_id'], ['communities.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['complainant_student_id'], ['students.id'], ),
+        sa.ForeignKeyConstraint(['complainant_teacher_id'], ['teachers.id'], ),
+        sa.ForeignKeyConstraint(['resolved_by_admin_id'], ['admins.id'], ),
+        sa.ForeignKeyConstraint(['resolved_by_teacher_id'], ['teachers.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    ):
+        with op.batch_alter_table('grievances', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_grievances_created_at'), ['created_at'], unique=False)
+            batch_op.create_index(batch_op.f('ix_grievances_grievance_id'), ['grievance_id'], unique=True)
+
+    if create_table('dashboard_metrics',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('metric_id', sa.String(length=50), nullable=True),
+        sa.Column('dashboard_id', sa.Integer(), nullable=False),
+        sa.Column('metric_name', sa.String(length=100), nullable=False),
+        sa.Column('metric_value', sa.Float(), nullable=False),
+        sa.Column('period_date', sa.DateTime(), nullable=True),
+        sa.Column('period_type', sa.String(length=20), nullable=True),
+        sa.Column('context', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['dashboard_id'], ['dashboards.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    ):
+        with op.batch_alter_table('dashboard_metrics', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_dashboard_metrics_dashboard_id'), ['dashboard_id'], unique=False)
+            batch_op.create_index(batch_op.f('ix_dashboard_metrics_metric_id'), ['metric_id'], unique=True)
+            batch_op.create_index(batch_op.f('ix_dashboard_metrics_period_date'), ['period_date'], unique=False)
+
+    if create_table('grievance_responses',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('response_id', sa.String(length=50), nullable=True),
+        sa.Column('grievance_id', sa.Integer(), nullable=False),
+        sa.Column('responder_admin_id', sa.Integer(), nullable=True),
+        sa.Column('responder_teacher_id', sa.Integer(), nullable=True),
+        sa.Column('responder_student_id', sa.Integer(), nullable=True),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('attachments', sa.JSON(), nullable=True),
+        sa.Column('action_taken', sa.String(length=100), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['grievance_id'], ['grievances.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['responder_admin_id'], ['admins.id'], ),
+        sa.ForeignKeyConstraint(['responder_student_id'], ['students.id'], ),
+        sa.ForeignKeyConstraint(['responder_teacher_id'], ['teachers.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    ):
+        with op.batch_alter_table('grievance_responses', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_grievance_responses_response_id'), ['response_id'], unique=True)
+
+    if create_table('manual_evaluations',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('manual_eval_id', sa.String(length=50), nullable=True),
+        sa.Column('student_id', sa.Integer(), nullable=True),
+        sa.Column('teacher_id', sa.Integer(), nullable=False),
+        sa.Column('subject_id', sa.Integer(), nullable=True),
+        sa.Column('ai_evaluation_id', sa.Integer(), nullable=True),
+        sa.Column('student_answer_file', sa.String(length=500), nullable=True),
+        sa.Column('model_answer_file', sa.String(length=500), nullable=True),
+        sa.Column('question_number', sa.String(length=50), nullable=True),
+        sa.Column('question_text', sa.Text(), nullable=True),
+        sa.Column('max_marks', sa.Integer(), nullable=True),
+        sa.Column('obtained_marks', sa.Float(), nullable=True),
+        sa.Column('grade', _enum('gradelevel'), nullable=True),
+        sa.Column('annotations', sa.JSON(), nullable=True),
+        sa.Column('teacher_remarks', sa.Text(), nullable=True),
+        sa.Column('improvement_suggestions', sa.JSON(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['ai_evaluation_id'], ['evaluations.id'], ),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+        sa.ForeignKeyConstraint(['subject_id'], ['subjects.id'], ),
+        sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    ):
+        with op.batch_alter_table('manual_evaluations', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_manual_evaluations_manual_eval_id'), ['manual_eval_id'], unique=True)
+
+    if create_table('uploaded_files',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('file_id', sa.String(length=50), nullable=True),
+        sa.Column('original_filename', sa.String(length=500), nullable=False),
+        sa.Column('stored_filename', sa.String(length=500), nullable=False),
+        sa.Column('file_path', sa.String(length=1000), nullable=False),
+        sa.Column('file_size', sa.Integer(), nullable=True),
+        sa.Column('mime_type', sa.String(length=100), nullable=True),
+        sa.Column('file_type', _enum('filetype'), nullable=True),
+        sa.Column('student_id', sa.Integer(), nullable=True),
+        sa.Column('teacher_id', sa.Integer(), nullable=True),
+        sa.Column('evaluation_id', sa.Integer(), nullable=True),
+        sa.Column('model_answer_id', sa.Integer(), nullable=True),
+        sa.Column('extracted_text', sa.Text(), nullable=True),
+        sa.Column('checksum', sa.String(length=64), nullable=True),
+        sa.Column('is_processed', sa.Boolean(), nullable=True),
+        sa.Column('is_deleted', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['evaluation_id'], ['evaluations.id'], ),
+        sa.ForeignKeyConstraint(['model_answer_id'], ['model_answers.id'], ),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+        sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    ):
+        with op.batch_alter_table('uploaded_files', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_uploaded_files_file_id'), ['file_id'], unique=True)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('uploaded_files', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_uploaded_files_file_id'))
+
+    op.drop_table('uploaded_files')
+    with op.batch_alter_table('manual_evaluations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_manual_evaluations_manual_eval_id'))
+
+    op.drop_table('manual_evaluations')
+    with op.batch_alter_table('grievance_responses', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_grievance_responses_response_id'))
+
+    op.drop_table('grievance_responses')
+    with op.batch_alter_table('dashboard_metrics', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_dashboard_metrics_period_date'))
+        batch_op.drop_index(batch_op.f('ix_dashboard_metrics_metric_id'))
+        batch_op.drop_index(batch_op.f('ix_dashboard_metrics_dashboard_id'))
+
+    op.drop_table('dashboard_metrics')
+    with op.batch_alter_table('grievances', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_grievances_grievance_id'))
+        batch_op.drop_index(batch_op.f('ix_grievances_created_at'))
+
+    op.drop_table('grievances')
+    with op.batch_alter_table('evaluations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_evaluations_evaluation_id'))
+        batch_op.drop_index(batch_op.f('ix_evaluations_created_at'))
+
+    op.drop_table('evaluations')
+    with op.batch_alter_table('dashboards', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_dashboards_dashboard_id'))
+
+    op.drop_table('dashboards')
+    with op.batch_alter_table('community_messages', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_community_messages_message_id'))
+        batch_op.drop_index(batch_op.f('ix_community_messages_created_at'))
+
+    op.drop_table('community_messages')
+    op.drop_table('community_members')
+    with op.batch_alter_table('activity_logs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_activity_logs_log_id'))
+        batch_op.drop_index(batch_op.f('ix_activity_logs_created_at'))
+
+    op.drop_table('activity_logs')
+    with op.batch_alter_table('students', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_students_student_id'))
+        batch_op.drop_index(batch_op.f('ix_students_roll_no'))
+        batch_op.drop_index(batch_op.f('ix_students_oauth_id'))
+        batch_op.drop_index(batch_op.f('ix_students_email'))
+
+    op.drop_table('students')
+    op.drop_table('class_subjects')
+    op.drop_table('teacher_subjects')
+    with op.batch_alter_table('model_answers', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_model_answers_answer_id'))
+
+    op.drop_table('model_answers')
+    with op.batch_alter_table('communities', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_communities_community_id'))
+
+    op.drop_table('communities')
+    with op.batch_alter_table('classes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_classes_class_id'))
+
+    op.drop_table('classes')
+    with op.batch_alter_table('teachers', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_teachers_teacher_id'))
+        batch_op.drop_index(batch_op.f('ix_teachers_oauth_id'))
+        batch_op.drop_index(batch_op.f('ix_teachers_email'))
+
+    op.drop_table('teachers')
+    with op.batch_alter_table('subjects', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_subjects_subject_id'))
+
+    op.drop_table('subjects')
+    with op.batch_alter_table('refresh_tokens', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_refresh_tokens_token'))
+
+    op.drop_table('refresh_tokens')
+    op.drop_table('evaluation_aggregates')
+    with op.batch_alter_table('admins', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_admins_oauth_id'))
+        batch_op.drop_index(batch_op.f('ix_admins_email'))
+        batch_op.drop_index(batch_op.f('ix_admins_admin_id'))
+
+    op.drop_table('admins')
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        for name, values in ENUM_VALUES.items():
+            postgresql.ENUM(*values, name=name).drop(bind, checkfirst=not context.is_offline_mode())
@@ -0,0 +1,58 @@
+"""Hot query indexes
+
+Composite indexes for the newest-first list / dashboard queries, and
+partial indexes (SQLite and PostgreSQL) for live community messages and
+the teacher's unreviewed evaluations.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 20:54:18.840836
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _where(column: str) -> dict:
+    # "<column> is false" as each dialect spells it (and as its queries render it)
+    return {"sqlite_where": sa.text(f"{column} = 0"), "postgresql_where": sa.text(f"{column} = false")}
+
+
+INDEXES = [
+    ('activity_logs', 'ix_activity_logs_role_created', ['user_role', 'created_at'], {}),
+    ('activity_logs', 'ix_activity_logs_type_created', ['activity_type', 'created_at'], {}),
+    ('community_messages', 'ix_community_messages_live', ['community_id', 'created_at'], _where('is_deleted')),
+    ('evaluations', 'ix_evaluations_student_created', ['student_id', 'created_at'], {}),
+    ('evaluations', 'ix_evaluations_teacher_created', ['teacher_id', 'created_at'], {}),
+    ('evaluations', 'ix_evaluations_teacher_pending', ['teacher_id', 'created_at'], _where('is_reviewed')),
+    ('grievances', 'ix_grievances_assigned_teacher', ['assigned_teacher_id'], {}),
+    ('grievances', 'ix_grievances_complainant_student', ['complainant_student_id', 'created_at'], {}),
+    ('grievances', 'ix_grievances_complainant_teacher', ['complainant_teacher_id'], {}),
+    ('grievances', 'ix_grievances_priority', ['priority'], {}),
+    ('grievances', 'ix_grievances_status_priority', ['status', 'priority'], {}),
+    ('manual_evaluations', 'ix_manual_evaluations_student_created', ['student_id', 'created_at'], {}),
+    ('students', 'ix_students_teacher_class', ['teacher_id', 'class_id'], {}),
+]
+
+
+def upgrade() -> None:
+    # Databases adopted by 0001 may already have some of these (built by create_all)
+    inspector = None if context.is_offline_mode() else sa.inspect(op.get_bind())
+    for table, name, columns, options in INDEXES:
+        if inspector is not None and name in {ix['name'] for ix in inspector.get_indexes(table)}:
+            continue
+        op.create_index(name, table, columns, unique=False, **options)
+
+
+def downgrade() -> None:
+    for table, name, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,44 @@
+"""Dashboard score totals
+
+Running score sum / count on dashboards, so the teacher and student
+averages can be updated with deltas.  Existing dashboards are filled in by
+the first counter repair.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 21:32:07.415529
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = [
+    sa.Column('score_sum', sa.Float(), nullable=True, server_default='0'),
+    sa.Column('scored_count', sa.Integer(), nullable=True, server_default='0'),
+]
+
+
+def upgrade() -> None:
+    # Databases adopted by 0001 may already have them (built by create_all)
+    existing = set()
+    if not context.is_offline_mode():
+        existing = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('dashboards')}
+    for column in COLUMNS:
+        if column.name not in existing:
+            op.add_column('dashboards', column)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('dashboards') as batch_op:
+        for column in reversed(COLUMNS):
+            batch_op.drop_column(column.name)
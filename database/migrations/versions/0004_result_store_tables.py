@@ -0,0 +1,92 @@
+"""Result store tables
+
+Evaluation report summaries, compressed reports and their running totals,
+moved from the per-host ``results.db`` SQLite file into the main database
+so every replica serves the same results.  The old file is imported once by
+the result store on startup.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 09:12:44.601327
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SUMMARY_INDEXES = [
+    ('ix_result_summaries_timestamp', ['timestamp']),
+    ('ix_result_summaries_grade_timestamp', ['grade', 'timestamp']),
+    ('ix_result_summaries_score', ['final_score']),
+    ('ix_result_summaries_teacher_timestamp', ['teacher_id', 'timestamp']),
+    ('ix_result_summaries_class_timestamp', ['class_id', 'timestamp']),
+]
+
+
+def upgrade() -> None:
+    # Databases adopted by 0001 may already have them (built by create_all)
+    existing = set()
+    if not context.is_offline_mode():
+        existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'result_summaries' not in existing:
+        op.create_table('result_summaries',
+            sa.Column('evaluation_id', sa.String(length=50), nullable=False),
+            sa.Column('final_score', sa.Float(), nullable=False),
+            sa.Column('max_marks', sa.Integer(), nullable=False),
+            sa.Column('obtained_marks', sa.Float(), nullable=False),
+            sa.Column('grade', sa.String(length=20), nullable=False),
+            sa.Column('timestamp', sa.String(length=40), nullable=False),
+            sa.Column('teacher_id', sa.String(length=50), nullable=True),
+            sa.Column('student_id', sa.String(length=50), nullable=True),
+            sa.Column('class_id', sa.String(length=50), nullable=True),
+            sa.Column('saved_at', sa.String(length=40), nullable=True),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('evaluation_id')
+        )
+        for name, columns in SUMMARY_INDEXES:
+            op.create_index(name, 'result_summaries', columns, unique=False)
+
+    if 'result_details' not in existing:
+        op.create_table('result_details',
+            sa.Column('evaluation_id', sa.String(length=50), nullable=False),
+            sa.Column('detail', sa.LargeBinary(), nullable=False),
+            sa.PrimaryKeyConstraint('evaluation_id')
+        )
+
+    if 'result_totals' not in existing:
+        op.create_table('result_totals',
+            sa.Column('scope', sa.String(length=20), nullable=False),
+            sa.Column('scope_id', sa.String(length=50), nullable=False),
+            sa.Column('grade', sa.String(length=20), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.Column('score_sum', sa.Float(), nullable=False),
+            sa.Column('score_min', sa.Float(), nullable=True),
+            sa.Column('score_max', sa.Float(), nullable=True),
+            sa.PrimaryKeyConstraint('scope', 'scope_id', 'grade')
+        )
+
+    if 'result_store_meta' not in existing:
+        op.create_table('result_store_meta',
+            sa.Column('key', sa.String(length=50), nullable=False),
+            sa.Column('value', sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint('key')
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('result_store_meta')
+    op.drop_table('result_totals')
+    op.drop_table('result_details')
+    for name, _ in reversed(SUMMARY_INDEXES):
+        op.drop_index(name, table_name='result_summaries')
+    op.drop_table('result_summaries')
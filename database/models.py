@@ -12,6 +12,7 @@ Tables:
 - ModelAnswer: Model answer keys
 - Evaluation: AI evaluation results
 - ManualEvaluation: Manual checking by teachers
+- ResultSummary / ResultDetail / ResultTotal: Indexed evaluation reports
 - UploadedFile: Central file storage
 - ActivityLog: Audit trail
 """
@@ -279,9 +280,10 @@ class Student(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    # Unique constraint for roll_no within a class
+    # Unique constraint for roll_no within a class; teacher's student list by class
     __table_args__ = (
         UniqueConstraint('roll_no', 'class_id', name='unique_roll_in_class'),
+        Index('ix_students_teacher_class', 'teacher_id', 'class_id'),
     )
 
     # Relationships
@@ -608,6 +610,14 @@ class Evaluation(Base):
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Newest-first lists per student / teacher, and the teacher's review queue
+    __table_args__ = (
+        Index('ix_evaluations_student_created', 'student_id', 'created_at'),
+        Index('ix_evaluations_teacher_created', 'teacher_id', 'created_at'),
+        Index('ix_evaluations_teacher_pending', 'teacher_id', 'created_at',
+              sqlite_where=is_reviewed == False, postgresql_where=is_reviewed == False),
+    )
+
     # Relationships
     student = relationship("Student", back_populates="evaluations")
     teacher = relationship("Teacher", back_populates="evaluations", foreign_keys=[teacher_id])
@@ -690,6 +700,11 @@ class ManualEvaluation(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Newest-first list per student
+    __table_args__ = (
+        Index('ix_manual_evaluations_student_created', 'student_id', 'created_at'),
+    )
+
     # Relationships
     student = relationship("Student", back_populates="manual_evaluations")
     teacher = relationship("Teacher", back_populates="manual_evaluations", foreign_keys=[teacher_id])
@@ -712,6 +727,110 @@ class ManualEvaluation(Base):
         }
 
 
+class EvaluationAggregate(Base):
+    """
+    Evaluation Aggregate Model
+    ---------------------------
+    Running totals of evaluations per source, scope and grade.
+    Maintained on every flush by database/aggregates.py.
+    """
+    __tablename__ = "evaluation_aggregates"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Key
+    source = Column(String(10), nullable=False)  # ai (Evaluation), manual (ManualEvaluation)
+    scope = Column(String(10), nullable=False)  # global, teacher, class, subject
+    scope_id = Column(Integer, nullable=False, default=0)  # 0 for global
+    grade = Column(String(20), nullable=False, default="")  # GradeLevel value, "" when ungraded
+
+    # Totals
+    count = Column(Integer, nullable=False, default=0)
+    scored_count = Column(Integer, nullable=False, default=0)  # Rows with a score
+    score_sum = Column(Float, nullable=False, default=0.0)  # Percentages
+    score_min = Column(Float, nullable=True)
+    score_max = Column(Float, nullable=True)
+    reviewed_count = Column(Integer, nullable=False, default=0)  # Reviewed (ai) / completed (manual)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint('source', 'scope', 'scope_id', 'grade', name='unique_evaluation_aggregate'),
+    )
+
+    def __repr__(self):
+        return f"<EvaluationAggregate({self.source}/{self.scope}/{self.scope_id}/{self.grade}, count={self.count})>"
+
+
+class ResultSummary(Base):
+    """
+    Result Summary Model
+    ---------------------
+    One row per saved evaluation report: the columns /results lists,
+    filters and sorts on.  ``version`` grows on every write and is what
+    per-worker report caches check against (api/services/result_store.py).
+    """
+    __tablename__ = "result_summaries"
+
+    evaluation_id = Column(String(50), primary_key=True)
+    final_score = Column(Float, nullable=False, default=0.0)
+    max_marks = Column(Integer, nullable=False, default=10)
+    obtained_marks = Column(Float, nullable=False, default=0.0)
+    grade = Column(String(20), nullable=False, default="unknown")  # Lower case
+    timestamp = Column(String(40), nullable=False, default="")  # ISO, as in the report
+    teacher_id = Column(String(50), nullable=True)
+    student_id = Column(String(50), nullable=True)
+    class_id = Column(String(50), nullable=True)
+    saved_at = Column(String(40), nullable=True)
+    version = Column(Integer, nullable=False, default=1)
+
+    __table_args__ = (
+        Index('ix_result_summaries_timestamp', 'timestamp'),
+        Index('ix_result_summaries_grade_timestamp', 'grade', 'timestamp'),
+        Index('ix_result_summaries_score', 'final_score'),
+        Index('ix_result_summaries_teacher_timestamp', 'teacher_id', 'timestamp'),
+        Index('ix_result_summaries_class_timestamp', 'class_id', 'timestamp'),
+    )
+
+
+class ResultDetail(Base):
+    """
+    Result Detail Model
+    --------------------
+    The full evaluation report as zlib-compressed JSON.
+    """
+    __tablename__ = "result_details"
+
+    evaluation_id = Column(String(50), primary_key=True)
+    detail = Column(LargeBinary, nullable=False)
+
+
+class ResultTotal(Base):
+    """
+    Result Total Model
+    -------------------
+    Count and score sum / min / max of saved reports per scope and grade.
+    Scope is ``all`` or an owner column (teacher_id, student_id, class_id).
+    """
+    __tablename__ = "result_totals"
+
+    scope = Column(String(20), primary_key=True)
+    scope_id = Column(String(50), primary_key=True, default="")  # "" for all
+    grade = Column(String(20), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_min = Column(Float, nullable=True)
+    score_max = Column(Float, nullable=True)
+
+
+class ResultStoreMeta(Base):
+    """One-time result store steps already done (e.g. the legacy import)."""
+    __tablename__ = "result_store_meta"
+
+    key = Column(String(50), primary_key=True)
+    value = Column(Text, nullable=True)
+
+
 # ========== Activity Log ==========
 class ActivityLog(Base):
     """
@@ -744,6 +863,12 @@ class ActivityLog(Base):
     # Timestamp
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
+    # Admin log filters, newest first
+    __table_args__ = (
+        Index('ix_activity_logs_role_created', 'user_role', 'created_at'),
+        Index('ix_activity_logs_type_created', 'activity_type', 'created_at'),
+    )
+
     # Relationships
     admin = relationship("Admin", back_populates="activity_logs", foreign_keys=[admin_id])
     teacher = relationship("Teacher", back_populates="activity_logs", foreign_keys=[teacher_id])
@@ -953,6 +1078,12 @@ class CommunityMessage(Base):
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Latest live messages of a community (deleted ones are never listed)
+    __table_args__ = (
+        Index('ix_community_messages_live', 'community_id', 'created_at',
+              sqlite_where=is_deleted == False, postgresql_where=is_deleted == False),
+    )
+
     # Relationships
     community = relationship("Community", back_populates="messages")
     sender_admin = relationship("Admin", foreign_keys=[sender_admin_id])
@@ -1048,6 +1179,15 @@ class Grievance(Base):
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Status / priority filters and counts, and each role's own grievances
+    __table_args__ = (
+        Index('ix_grievances_status_priority', 'status', 'priority'),
+        Index('ix_grievances_priority', 'priority'),
+        Index('ix_grievances_complainant_student', 'complainant_student_id', 'created_at'),
+        Index('ix_grievances_complainant_teacher', 'complainant_teacher_id'),
+        Index('ix_grievances_assigned_teacher', 'assigned_teacher_id'),
+    )
+
     # Relationships
     community = relationship("Community", back_populates="grievances")
     complainant_student = relationship("Student", foreign_keys=[complainant_student_id])
@@ -1209,6 +1349,10 @@ class Dashboard(Base):
     lowest_score = Column(Float, default=0.0)  # Lowest score
     total_feedback_received = Column(Integer, default=0)  # Count of feedback items
     
+    # ===== Running Score Totals (behind the teacher / student average) =====
+    score_sum = Column(Float, default=0.0)  # Sum of the non-null final scores counted
+    scored_count = Column(Integer, default=0)  # Number of non-null final scores counted
+    
     # ===== Engagement Metrics =====
     documents_uploaded = Column(Integer, default=0)  # Total files uploaded
     documents_downloaded = Column(Integer, default=0)  # Total files downloaded
@@ -1306,37 +1450,40 @@ class Dashboard(Base):
         
         return response
 
-    def reset_to_zero(self):
-        """Reset all metrics to zero (for new session/period)."""
-        self.total_activities = 0
-        self.total_logins = 0
-        
-        self.teachers_created = 0
-        self.teachers_active = 0
-        self.students_managed = 0
-        self.evaluations_overseen = 0
-        
-        self.students_taught = 0
-        self.classes_managed = 0
-        self.evaluations_created = 0
-        self.manual_evaluations_done = 0
-        self.model_answers_uploaded = 0
-        self.total_evaluations = 0
-        self.average_evaluation_score = 0.0
-        
-        self.assignments_received = 0
-        self.assignments_completed = 0
-        self.evaluations_received = 0
-        self.average_score = 0.0
-        self.highest_score = 0.0
-        self.lowest_score = 0.0
-        self.total_feedback_received = 0
-        
-        self.documents_uploaded = 0
-        self.documents_downloaded = 0
-        self.grievances_filed = 0
-        self.grievances_resolved = 0
-        self.community_messages_sent = 0
+    def reset_to_zero(self, keep=()):
+        """Reset all metrics to zero (for new session/period), except the columns named in *keep*."""
+        zeroed = {
+            "total_activities": 0,
+            "total_logins": 0,
+            "teachers_created": 0,
+            "teachers_active": 0,
+            "students_managed": 0,
+            "evaluations_overseen": 0,
+            "students_taught": 0,
+            "classes_managed": 0,
+            "evaluations_created": 0,
+            "manual_evaluations_done": 0,
+            "model_answers_uploaded": 0,
+            "total_evaluations": 0,
+            "average_evaluation_score": 0.0,
+            "assignments_received": 0,
+            "assignments_completed": 0,
+            "evaluations_received": 0,
+            "average_score": 0.0,
+            "highest_score": 0.0,
+            "lowest_score": 0.0,
+            "total_feedback_received": 0,
+            "score_sum": 0.0,
+            "scored_count": 0,
+            "documents_uploaded": 0,
+            "documents_downloaded": 0,
+            "grievances_filed": 0,
+            "grievances_resolved": 0,
+            "community_messages_sent": 0,
+        }
+        for name, value in zeroed.items():
+            if name not in keep:
+                setattr(self, name, value)
         
         self.last_activity_at = None
         self.updated_at = datetime.utcnow()
@@ -1416,17 +1563,20 @@ class DatabaseManager:
     # ===== Statistics =====
     def get_statistics(self) -> dict:
         """Get overall statistics."""
+        from database.aggregates import read_totals
+
         session = self.get_session()
         try:
+            totals = read_totals(session)
             stats = {
                 "total_admins": session.query(func.count(Admin.id)).scalar() or 0,
                 "total_teachers": session.query(func.count(Teacher.id)).filter(Teacher.status == UserStatus.ACTIVE).scalar() or 0,
                 "total_students": session.query(func.count(Student.id)).filter(Student.status == UserStatus.ACTIVE).scalar() or 0,
                 "total_classes": session.query(func.count(Class.id)).filter(Class.is_active == True).scalar() or 0,
                 "total_subjects": session.query(func.count(Subject.id)).filter(Subject.is_active == True).scalar() or 0,
-                "total_evaluations": session.query(func.count(Evaluation.id)).scalar() or 0,
-                "total_manual_evaluations": session.query(func.count(ManualEvaluation.id)).scalar() or 0,
-                "average_score": session.query(func.avg(Evaluation.final_score)).scalar() or 0,
+                "total_evaluations": totals["ai"]["count"],
+                "total_manual_evaluations": totals["manual"]["count"],
+                "average_score": totals["ai"]["average_score"],
             }
             return stats
         finally:
@@ -1445,11 +1595,9 @@ def get_db():
 
 # ========== Initialize Database ==========
 def init_db():
-    """Initialize database tables."""
-    # Drop existing tables to recreate with new schema
-    Base.metadata.drop_all(bind=engine)
-    # Create all tables with the new schema
-    Base.metadata.create_all(bind=engine)
+    """Bring the database schema up to the latest migration (never drops data)."""
+    from database.schema import upgrade_database
+    upgrade_database(engine)
 
 
 # Create singleton database manager
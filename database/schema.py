@@ -0,0 +1,144 @@
+"""
+Schema Management
+==================
+Versioned, non-destructive schema upgrades at startup.
+
+Problem
+-------
+``init_db()`` ran ``Base.metadata.drop_all`` and ``create_all`` on every
+boot.  Each restart or new worker wiped the database and rebuilt 20+
+tables, and workers starting together wiped each other's data.
+
+Solution
+--------
+The schema is versioned with Alembic (``database/migrations``).  Startup
+reads the database's revision (one query) and returns when it is already at
+head.  Otherwise it takes a migration lock, reads the revision again and
+upgrades only if no other worker got there first:
+
+*   **PostgreSQL**: ``pg_advisory_xact_lock`` in the migration transaction
+    (DDL is transactional, so a failed upgrade leaves nothing behind).
+*   **SQLite**: an exclusive lock on ``<database>.migrate.lock``.
+
+Databases created by the old ``create_all`` startup have no revision yet;
+the initial migration adopts them, creating only the tables they lack.
+
+With ``DB_AUTO_MIGRATE`` off, startup only checks the revision and refuses
+to start behind head; run ``alembic upgrade head`` as a release step.
+
+Usage:
+    from database.schema import upgrade_database
+    upgrade_database(engine)
+
+    # After changing database/models.py:
+    #   alembic revision --autogenerate -m "describe the change"
+"""
+
+import logging
+import os
+from contextlib import contextmanager
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger("AssessIQ.Schema")
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATIONS_DIR = os.path.join(ROOT_DIR, "database", "migrations")
+
+# pg_advisory_xact_lock key shared by every AssessIQ worker
+PG_LOCK_KEY = 0x41535149  # "ASQI"
+
+
+def alembic_config(connection: Optional[Connection] = None):
+    """Alembic ``Config`` for the bundled migrations, optionally bound to *connection*."""
+    from alembic.config import Config
+
+    ini = os.path.join(ROOT_DIR, "alembic.ini")
+    config = Config(ini if os.path.exists(ini) else None)
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def head_revision() -> Optional[str]:
+    from alembic.script import ScriptDirectory
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(connection: Connection) -> Optional[str]:
+    from alembic.runtime.migration import MigrationContext
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Exclusive, blocking lock on *path* across processes."""
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            while True:
+                try:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue   # LK_LOCK gives up after ~10 s; keep waiting
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def migration_lock(engine: Engine):
+    """Serialise migrations across workers sharing a SQLite file (PostgreSQL locks in-transaction)."""
+    database = engine.url.database
+    if engine.dialect.name == "sqlite" and database and database != ":memory:" and "mode=memory" not in database:
+        with _file_lock(os.path.abspath(database) + ".migrate.lock"):
+            yield
+    else:
+        yield
+
+
+def upgrade_database(engine: Optional[Engine] = None, auto_migrate: Optional[bool] = None) -> bool:
+    """Migrate *engine*'s database to head if it is behind; ``True`` when this call migrated it."""
+    from config.settings import settings
+
+    if engine is None:
+        from database.models import engine
+    if auto_migrate is None:
+        auto_migrate = settings.DB_AUTO_MIGRATE
+
+    head = head_revision()
+    with engine.connect() as connection:
+        current = current_revision(connection)
+    if current == head:
+        logger.info(f"Database schema is up to date (revision {head})")
+        return False
+    if not auto_migrate:
+        raise RuntimeError(f"Database schema is at revision {current}, the code expects {head}; "
+                           f"run `alembic upgrade head` (or enable DB_AUTO_MIGRATE)")
+
+    from alembic import command
+
+    with migration_lock(engine), engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PG_LOCK_KEY})
+        current = current_revision(connection)
+        if current == head:
+            logger.info(f"Database schema was migrated to {head} by another worker")
+            return False
+        logger.info(f"Migrating database schema {current or '(unversioned)'} -> {head}")
+        command.upgrade(alembic_config(connection), "head")
+    return True
@@ -0,0 +1,211 @@
+"""
+Tests for the class-wide batch grading service
+===============================================
+Covers: model answer extracted / compiled once, per-student progress,
+failure isolation, bulk result writes, failed writes, result-store reports,
+scoring on the evaluation executor, and persisted / interrupted job state.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from api.services.batch_grading_service import (
+    DONE,
+    FAILED,
+    RUNNING,
+    STALE_AFTER_SECONDS,
+    BatchGradingService,
+)
+from api.services.evaluation_executor import EvaluationExecutor
+from api.services.result_store import ResultStore
+
+
+class TestBatchGradingService(unittest.TestCase):
+    """Tests for BatchGradingService."""
+
+    def setUp(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from sqlalchemy.pool import StaticPool
+        from database.models import Base
+
+        self.tmp = tempfile.mkdtemp()
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool,
+        )
+        Base.metadata.create_all(bind=engine)
+        self.Session = sessionmaker(bind=engine)
+        self.commits = 0
+
+        session_factory = self.Session
+
+        def counting_session():
+            db = session_factory()
+            original = db.commit
+
+            def commit():
+                self.commits += 1
+                original()
+            db.commit = commit
+            return db
+
+        self.session_factory = counting_session
+        self.evaluations = EvaluationExecutor(max_workers=2, queue_size=0)
+        self.service = BatchGradingService(
+            root_dir=self.tmp, max_workers=3, flush_size=2, session_factory=counting_session,
+            evaluation_executor=self.evaluations,
+        )
+        self.extracted = []
+        self._extract_lock = threading.Lock()
+
+        # Reports go through a pool of their own, as in a real database
+        self.results_engine = create_engine(f"sqlite:///{os.path.join(self.tmp, 'assessiq.db')}")
+        Base.metadata.create_all(bind=self.results_engine)
+        self.store = ResultStore(self.results_engine)
+        patcher = mock.patch("api.services.result_store.get_result_store", return_value=self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.service.shutdown()
+        self.evaluations.shutdown(wait=True)
+        self.results_engine.dispose()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def extract(self, path, engine):
+        with self._extract_lock:
+            self.extracted.append(os.path.basename(path))
+        if "broken" in path:
+            raise RuntimeError("unreadable scan")
+        return f"text of {os.path.basename(path)}"
+
+    @staticmethod
+    def evaluate(model_text, student_text, compiled, job):
+        return {
+            "obtained_marks": 7.0,
+            "final_score": 70.0,
+            "grade": "good",
+            "score_breakdown": {"semantic_score": 0.7, "keyword_score": 0.6, "length_penalty": 0.0},
+            "concepts": {"matched": ["a"], "missing": ["b"], "coverage_percentage": 60.0},
+            "explanation": "ok",
+            "suggestions": [],
+            "is_unanswered": False,
+        }
+
+    def _run(self, students):
+        job = self.service.create_job(
+            "/x/model_key.pdf", [f"/x/{s}" for s in students], max_marks=10,
+        )
+        with mock.patch(
+            "api.services.model_answer_compiler.get_compiled_model_answer", return_value=None,
+        ) as compile_mock:
+            self.service.run(job, evaluate_fn=self.evaluate, extract_fn=self.extract)
+        return job, compile_mock
+
+    def test_model_answer_processed_once(self):
+        job, compile_mock = self._run(["s1.png", "s2.png", "s3.png", "s4.png"])
+        self.assertEqual(self.extracted.count("model_key.pdf"), 1)
+        self.assertEqual(compile_mock.call_count, 1)
+        self.assertEqual(job.status, DONE)
+        self.assertEqual(job.completed, 4)
+        self.assertEqual(job.progress, 1.0)
+
+    def test_results_written_in_bulk(self):
+        from database.models import Evaluation
+
+        job, _ = self._run(["s1.png", "s2.png", "s3.png", "s4.png", "s5.png"])
+        db = self.Session()
+        self.assertEqual(db.query(Evaluation).count(), 5)
+        db.close()
+        # flush_size=2 → 3 bulk commits for 5 sheets
+        self.assertEqual(self.commits, 3)
+        self.assertTrue(all(s.persisted for s in job.students))
+
+    def test_scoring_runs_on_the_evaluation_executor(self):
+        job, _ = self._run(["s1.png", "s2.png", "s3.png"])
+        self.assertEqual(job.completed, 3)
+        self.assertEqual(self.evaluations.completed, 3)
+        self.assertEqual(self.evaluations.rejected, 0)
+
+    def test_reports_are_saved_to_the_result_store(self):
+        job = self.service.create_job("/x/model_key.pdf", ["/x/s1.png", "/x/s2.png"], teacher_id=7)
+        self.service.run(job, evaluate_fn=self.evaluate, extract_fn=self.extract)
+        self.assertEqual(self.store.list(teacher_id="7")[0], 2)
+        report = self.store.get(job.students[0].evaluation_id)
+        self.assertEqual(report["batch_job_id"], job.job_id)
+        self.assertEqual(report["student_ref"], "s1")
+        self.assertEqual(report["student_answer_text"], "text of s1.png")
+
+    def test_failed_write_fails_the_job(self):
+        def broken_session():
+            db = self.session_factory()
+            db.commit = mock.Mock(side_effect=RuntimeError("database is locked"))
+            return db
+
+        self.service._session_factory = broken_session
+        job, _ = self._run(["s1.png", "s2.png", "s3.png"])
+        self.assertEqual(job.status, FAILED)
+        self.assertIn("3 graded results could not be saved", job.error)
+        self.assertEqual(job.completed, 0)
+        self.assertTrue(all(s.status == FAILED and "database is locked" in s.error for s in job.students))
+        self.assertEqual(self.store.list()[0], 0)
+
+    def test_failed_sheet_does_not_stop_the_job(self):
+        job, _ = self._run(["s1.png", "broken.png", "s3.png"])
+        self.assertEqual(job.status, DONE)
+        self.assertEqual(job.completed, 2)
+        self.assertEqual(job.failed, 1)
+        broken = next(s for s in job.students if s.filename == "broken.png")
+        self.assertEqual(broken.status, FAILED)
+        self.assertIn("unreadable", broken.error)
+
+    def test_model_extraction_failure_fails_job(self):
+        job = self.service.create_job("/x/broken_model.pdf", ["/x/s1.png"])
+        self.service.run(job, evaluate_fn=self.evaluate, extract_fn=self.extract)
+        self.assertEqual(job.status, FAILED)
+        self.assertEqual(self.extracted, ["broken_model.pdf"])
+
+    def test_job_state_is_persisted(self):
+        job, _ = self._run(["s1.png", "s2.png"])
+        fresh = BatchGradingService(root_dir=self.tmp)
+        loaded = fresh.get_job(job.job_id)
+        self.assertIsNotNone(loaded)
+        self.assertEqual(loaded.status, DONE)
+        self.assertEqual([s.student_ref for s in loaded.students], ["s1", "s2"])
+        self.assertEqual(loaded.students[0].grade, "good")
+        self.assertIsNone(fresh.get_job("missing"))
+
+    def test_interrupted_job_is_reported_failed(self):
+        job = self.service.create_job("/x/model_key.pdf", ["/x/s1.png", "/x/s2.png"])
+        job.status = RUNNING
+        job.students[0].status = DONE
+        job.students[1].status = RUNNING
+        self.service._persist(job)
+
+        fresh = BatchGradingService(root_dir=self.tmp)
+        self.assertEqual(fresh.get_job(job.job_id).status, RUNNING)
+
+        path = os.path.join(self.service.job_dir(job.job_id), "job.json")
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data["heartbeat_at"] = time.time() - STALE_AFTER_SECONDS - 1
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+        loaded = fresh.get_job(job.job_id)
+        self.assertEqual(loaded.status, FAILED)
+        self.assertIn("interrupted", loaded.error)
+        self.assertEqual([s.status for s in loaded.students], [DONE, FAILED])
+
+
+if __name__ == "__main__":
+    unittest.main()
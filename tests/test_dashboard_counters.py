@@ -0,0 +1,205 @@
+"""
+Tests for the incremental dashboard counters
+=============================================
+Covers: teacher and student dashboards kept in step with inserted,
+re-scored, reassigned and deleted rows (counts, running averages, highest /
+lowest score re-read when a bound is removed), one UPDATE per dashboard per
+flush, rollbacks leaving the counters untouched, dashboards created or reset
+from existing data, and the check / repair job after a bulk update.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database.dashboard_counters import check, repair
+from database.models import (
+    Base, Class, Dashboard, Evaluation, ManualEvaluation, ModelAnswer, Student, UploadedFile, UserRole,
+)
+from api.services.dashboard_service import DashboardService, run_counter_repairs
+
+
+class CounterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine, autoflush=False)
+        self.db = self.Session()
+        self.db.add_all([Student(id=1, roll_no="1", name="A", teacher_id=1),
+                         Student(id=2, roll_no="2", name="B", teacher_id=2)])
+        self.db.commit()
+        for user_id, role in ((1, UserRole.TEACHER), (2, UserRole.TEACHER), (1, UserRole.STUDENT)):
+            DashboardService.get_or_create_dashboard(self.db, user_id, role)
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def dashboard(self, role, user_id):
+        self.db.expire_all()
+        return DashboardService.get_dashboard_by_user(self.db, user_id, role)
+
+    def teacher(self, user_id=1):
+        return self.dashboard(UserRole.TEACHER, user_id)
+
+    def student(self, user_id=1):
+        return self.dashboard(UserRole.STUDENT, user_id)
+
+    def assertConsistent(self):
+        self.assertEqual(check(self.db), [])
+
+
+class TestIncrementalCounters(CounterTestCase):
+    """Counters maintained on flush."""
+
+    def test_inserts(self):
+        self.db.add_all([
+            Evaluation(teacher_id=1, student_id=1, final_score=80.0, explanation="Good"),
+            Evaluation(teacher_id=1, student_id=1, final_score=60.0),
+            Evaluation(teacher_id=1, final_score=None),
+            ManualEvaluation(teacher_id=1, student_id=1),
+            ModelAnswer(teacher_id=1),
+            UploadedFile(teacher_id=1, original_filename="a", stored_filename="a", file_path="a"),
+            Class(name="CSE-A", teacher_id=1),
+            Student(id=3, roll_no="3", name="C", teacher_id=1),
+        ])
+        self.db.commit()
+
+        t = self.teacher()
+        self.assertEqual((t.evaluations_created, t.manual_evaluations_done, t.total_evaluations), (3, 1, 4))
+        self.assertEqual((t.model_answers_uploaded, t.documents_uploaded), (1, 1))
+        self.assertEqual((t.students_taught, t.classes_managed), (2, 1))
+        self.assertEqual(t.average_evaluation_score, 70.0)
+
+        s = self.student()
+        self.assertEqual((s.evaluations_received, s.total_feedback_received), (2, 1))
+        self.assertEqual((s.average_score, s.highest_score, s.lowest_score), (70.0, 80.0, 60.0))
+        self.assertEqual(self.teacher(2).evaluations_created, 0)
+        self.assertConsistent()
+
+    def test_rescore_reassign_and_delete(self):
+        low, mid, high = (Evaluation(teacher_id=1, student_id=1, final_score=score) for score in (40.0, 60.0, 95.0))
+        self.db.add_all([low, mid, high])
+        self.db.commit()
+
+        high.final_score = 70.0          # the highest score goes down: bound re-read
+        mid.teacher_id = 2               # moves to the other teacher
+        self.db.commit()
+        s = self.student()
+        self.assertEqual((s.highest_score, s.lowest_score), (70.0, 40.0))
+        self.assertEqual((self.teacher().evaluations_created, self.teacher(2).evaluations_created), (2, 1))
+        self.assertEqual(self.teacher(2).average_evaluation_score, 60.0)
+        self.assertConsistent()
+
+        self.db.delete(low)
+        self.db.commit()
+        s = self.student()
+        self.assertEqual((s.evaluations_received, s.lowest_score, s.average_score), (2, 60.0, 65.0))
+
+        self.db.delete(mid)
+        self.db.delete(high)
+        self.db.commit()
+        s = self.student()
+        self.assertEqual((s.evaluations_received, s.average_score, s.highest_score, s.lowest_score), (0, 0, 0, 0))
+        self.assertConsistent()
+
+    def test_one_update_per_dashboard(self):
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(self.engine, "before_cursor_execute", listener)
+        try:
+            self.db.add_all([Evaluation(teacher_id=1, student_id=1, final_score=float(i)) for i in range(20)])
+            self.db.commit()
+        finally:
+            event.remove(self.engine, "before_cursor_execute", listener)
+        updates = [s for s in statements if s.startswith("UPDATE dashboards")]
+        self.assertEqual(len(updates), 2)       # the teacher's and the student's
+        self.assertFalse(any(s.startswith("SELECT") and "FROM evaluations" in s for s in statements))
+        self.assertEqual(self.student().evaluations_received, 20)
+
+    def test_rollback_leaves_counters(self):
+        self.db.add(Evaluation(teacher_id=1, student_id=1, final_score=50.0))
+        self.db.flush()
+        self.db.rollback()
+        self.assertEqual(self.teacher().evaluations_created, 0)
+        self.assertEqual(self.student().evaluations_received, 0)
+
+    def test_owner_without_dashboard(self):
+        self.db.add(Evaluation(teacher_id=9, student_id=2, final_score=50.0))
+        self.db.commit()
+        self.assertIsNone(self.dashboard(UserRole.TEACHER, 9))
+        self.assertConsistent()
+
+
+class TestRecomputation(CounterTestCase):
+    """Creation, reset and the repair job."""
+
+    def test_created_dashboard_counts_existing_rows(self):
+        self.db.add_all([Evaluation(teacher_id=3, student_id=2, final_score=score) for score in (30.0, 90.0)])
+        self.db.commit()
+        t = DashboardService.get_or_create_dashboard(self.db, 3, UserRole.TEACHER)
+        s = DashboardService.get_or_create_dashboard(self.db, 2, UserRole.STUDENT)
+        self.assertEqual((t.evaluations_created, t.average_evaluation_score), (2, 60.0))
+        self.assertEqual((s.evaluations_received, s.highest_score, s.lowest_score), (2, 90.0, 30.0))
+
+        self.db.add(Evaluation(teacher_id=3, final_score=0.0))
+        self.db.commit()
+        self.assertEqual(self.dashboard(UserRole.TEACHER, 3).average_evaluation_score, 40.0)
+        self.assertConsistent()
+
+    def test_reset_keeps_counts_of_existing_data(self):
+        self.db.add(Evaluation(teacher_id=1, final_score=50.0))
+        self.db.commit()
+        t = self.teacher()
+        t.total_logins = 5
+        self.db.commit()
+
+        with mock.patch.object(DashboardService, "update_teacher_metrics",
+                               side_effect=AssertionError("counters recomputed")):
+            t = DashboardService.reset_dashboard(self.db, t)
+        self.assertEqual((t.total_logins, t.evaluations_created, t.average_evaluation_score), (0, 1, 50.0))
+        self.assertEqual(repair(self.db), 0)
+
+        self.db.add(Evaluation(teacher_id=1, final_score=70.0))
+        self.db.commit()
+        self.assertEqual(self.teacher().average_evaluation_score, 60.0)
+        self.assertConsistent()
+
+    def test_repair_after_bulk_update(self):
+        self.db.add_all([Evaluation(teacher_id=1, student_id=1, final_score=score) for score in (20.0, 40.0)])
+        self.db.commit()
+        self.db.query(Evaluation).update({Evaluation.final_score: 100.0}, synchronize_session=False)
+        self.db.commit()
+
+        mismatches = check(self.db)
+        self.assertEqual({m["key"] for m in mismatches}, {("teacher", 1), ("student", 1)})
+        self.assertEqual(repair(self.db), 2)
+        self.assertConsistent()
+        s = self.student()
+        self.assertEqual((s.average_score, s.highest_score, s.lowest_score), (100.0, 100.0, 100.0))
+
+    def test_periodic_repair_job(self):
+        self.db.query(Dashboard).update({Dashboard.students_taught: 99}, synchronize_session=False)
+        self.db.commit()
+
+        async def one_pass():
+            task = asyncio.create_task(run_counter_repairs(60))
+            await asyncio.sleep(0.2)
+            task.cancel()
+
+        with mock.patch("database.models.SessionLocal", self.Session):
+            asyncio.run(one_pass())
+        self.assertEqual(self.teacher().students_taught, 1)
+        self.assertConsistent()
+
+
+if __name__ == "__main__":
+    unittest.main()
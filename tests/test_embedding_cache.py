@@ -0,0 +1,165 @@
+"""
+Tests for the two-tier Embedding Cache
+=======================================
+Covers: per-string lookup, LRU byte budget, on-disk persistence, stats,
+and one disk store shared by several caches / processes.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import subprocess
+import tempfile
+import textwrap
+import unittest
+
+import numpy as np
+
+from api.services.embedding_cache import EmbeddingCache
+
+
+class CountingEncoder:
+    """Deterministic encoder that records which strings it was asked for."""
+
+    DIM = 8
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, convert_to_numpy=True, show_progress_bar=False):
+        self.calls.append(list(texts))
+        return np.array(
+            [[(len(t) + i) % 7 + 0.5 for i in range(self.DIM)] for t in texts],
+            dtype=np.float32,
+        )
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """Tests for EmbeddingCache."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.encoder = CountingEncoder()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_mixed_batch_encodes_only_misses(self):
+        cache = EmbeddingCache()
+        cache.encode("m", ["a", "b"], self.encoder)
+        out = cache.encode("m", ["b", "c", "a", "c"], self.encoder)
+        self.assertEqual(self.encoder.calls, [["a", "b"], ["c"]])
+        self.assertEqual(out.shape, (4, CountingEncoder.DIM))
+        np.testing.assert_array_equal(out[1], out[3])
+
+    def test_model_name_is_part_of_key(self):
+        cache = EmbeddingCache()
+        cache.encode("m1", ["a"], self.encoder)
+        cache.encode("m2", ["a"], self.encoder)
+        self.assertEqual(len(self.encoder.calls), 2)
+
+    def test_memory_budget_evicts_least_recently_used(self):
+        row_bytes = CountingEncoder.DIM * 4
+        cache = EmbeddingCache(memory_budget_bytes=2 * row_bytes)
+        cache.encode("m", ["a", "b"], self.encoder)
+        cache.encode("m", ["a"], self.encoder)          # touch "a"
+        cache.encode("m", ["c"], self.encoder)          # evicts "b"
+        stats = cache.get_stats()
+        self.assertEqual(stats["memory_entries"], 2)
+        self.assertLessEqual(stats["memory_bytes"], 2 * row_bytes)
+        cache.encode("m", ["a", "b"], self.encoder)
+        self.assertEqual(self.encoder.calls[-1], ["b"])
+
+    def test_disk_tier_survives_restart(self):
+        first = EmbeddingCache(disk_dir=self.tmpdir)
+        original = first.encode("all-MiniLM", ["hello world"], self.encoder)
+
+        second = EmbeddingCache(disk_dir=self.tmpdir)
+        restored = second.encode("all-MiniLM", ["hello world"], self.encoder)
+        self.assertEqual(len(self.encoder.calls), 1)
+        np.testing.assert_allclose(restored, original, rtol=1e-3)
+        self.assertEqual(second.get_stats()["disk_hits"], 1)
+
+    def test_disk_ring_overwrites_oldest(self):
+        cache = EmbeddingCache(memory_budget_bytes=0, disk_dir=self.tmpdir, disk_capacity=2)
+        cache.encode("m", ["a", "b", "c"], self.encoder)
+        reopened = EmbeddingCache(memory_budget_bytes=0, disk_dir=self.tmpdir, disk_capacity=2)
+        hits = reopened.get_many("m", ["a", "b", "c"])
+        self.assertIsNone(hits[0])
+        self.assertIsNotNone(hits[1])
+        self.assertIsNotNone(hits[2])
+
+    def test_stats_count_hits_and_misses(self):
+        cache = EmbeddingCache()
+        cache.encode("m", ["a", "b"], self.encoder)
+        cache.encode("m", ["a"], self.encoder)
+        stats = cache.get_stats()
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["memory_hits"], 1)
+        self.assertAlmostEqual(stats["hit_rate"], 1 / 3, places=3)
+
+
+WRITER = textwrap.dedent("""
+    import sys
+    sys.path.insert(0, {root!r})
+    import numpy as np
+    from api.services.embedding_cache import EmbeddingCache
+
+    prefix, count = sys.argv[1], int(sys.argv[2])
+    cache = EmbeddingCache(memory_budget_bytes=0, disk_dir={disk!r}, disk_capacity=1000)
+    for i in range(count):
+        vec = np.full((1, 4), float(i if prefix == "a" else -i), dtype=np.float32)
+        cache.put_many("m", [f"{{prefix}}{{i}}"], vec)
+""")
+
+
+class TestSharedDiskStore(unittest.TestCase):
+    """Several caches (workers) on one EMBEDDING_CACHE_DIR."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def cache(self):
+        return EmbeddingCache(memory_budget_bytes=0, disk_dir=self.tmpdir, disk_capacity=1000)
+
+    def test_two_caches_never_share_a_row(self):
+        first, second = self.cache(), self.cache()
+        first.put_many("m", ["alpha"], np.ones((1, 4), dtype=np.float32))
+        second.put_many("m", ["beta"], np.full((1, 4), 2.0, dtype=np.float32))
+
+        for cache in (first, second, self.cache()):
+            alpha, beta = cache.get_many("m", ["alpha", "beta"])
+            np.testing.assert_array_equal(alpha, [1, 1, 1, 1])
+            np.testing.assert_array_equal(beta, [2, 2, 2, 2])
+
+    def test_overwritten_row_is_a_miss(self):
+        reader = EmbeddingCache(memory_budget_bytes=0, disk_dir=self.tmpdir, disk_capacity=2)
+        writer = EmbeddingCache(memory_budget_bytes=0, disk_dir=self.tmpdir, disk_capacity=2)
+        reader.put_many("m", ["a"], np.ones((1, 4), dtype=np.float32))
+        writer.put_many("m", ["b", "c"], np.full((2, 4), 3.0, dtype=np.float32))   # wraps over "a"
+        self.assertEqual(reader.get_many("m", ["a"]), [None])
+        np.testing.assert_array_equal(reader.get_many("m", ["c"])[0], [3, 3, 3, 3])
+
+    def test_two_processes_writing_at_once(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = WRITER.format(root=root, disk=self.tmpdir)
+        self.cache().put_many("m", ["seed"], np.zeros((1, 4), dtype=np.float32))   # create the store
+        writers = [subprocess.Popen([sys.executable, "-c", script, prefix, "300"]) for prefix in ("a", "b")]
+        for p in writers:
+            self.assertEqual(p.wait(timeout=120), 0)
+
+        cache = self.cache()
+        a = cache.get_many("m", [f"a{i}" for i in range(300)])
+        b = cache.get_many("m", [f"b{i}" for i in range(300)])
+        for i in range(300):
+            np.testing.assert_array_equal(a[i], [i] * 4)
+            np.testing.assert_array_equal(b[i], [-i] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
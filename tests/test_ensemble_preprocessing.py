@@ -0,0 +1,105 @@
+"""
+Tests for shared in-memory ensemble preprocessing
+==================================================
+Covers: one preprocessing base per image, variants handed to the engines
+as numpy arrays, and no temporary PNGs written next to the input.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+
+from api.services.ocr_service import ImagePreprocessor, OCRService
+
+
+def make_page(path):
+    img = np.full((400, 600, 3), 255, dtype=np.uint8)
+    cv2.putText(img, "Photosynthesis", (30, 200), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 0, 0), 3)
+    cv2.imwrite(path, img)
+
+
+class FakeTesseract:
+    Output = types.SimpleNamespace(DICT="dict")
+
+    def __init__(self):
+        self.images = []
+
+    def image_to_string(self, img, config=""):
+        self.images.append(img)
+        return "Photosynthesis converts light energy"
+
+    def image_to_data(self, img, config="", output_type=None):
+        return {"conf": ["90", "88", "91", "87"],
+                "text": ["Photosynthesis", "converts", "light", "energy"]}
+
+
+class TestEnsemblePreprocessing(unittest.TestCase):
+    """Tests for OCRService._extract_ensemble preprocessing."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.image_path = os.path.join(self.tmp, "page.png")
+        make_page(self.image_path)
+
+        self.service = OCRService(engine="ensemble")
+        self.service._enable_language_correction = False
+        self.easy_inputs = []
+
+        def readtext(image, **kwargs):
+            self.easy_inputs.append(image)
+            return [([[0, 0], [10, 0], [10, 10], [0, 10]], "Photosynthesis converts light energy", 0.9)]
+
+        self.service._easyocr_engine = mock.Mock(readtext=readtext)
+        self.service._tesseract_engine = FakeTesseract()
+        self.service._paddleocr_engine = None
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_base_prepared_once_and_arrays_passed_to_engines(self):
+        with mock.patch.object(ImagePreprocessor, "load_image",
+                               autospec=True, side_effect=ImagePreprocessor.load_image) as load:
+            text = self.service._extract_ensemble(self.image_path, preprocess=True, detail=False)
+
+        self.assertIn("Photosynthesis", text)
+        self.assertEqual(load.call_count, 1)
+        self.assertTrue(self.easy_inputs)
+        self.assertTrue(all(isinstance(img, np.ndarray) for img in self.easy_inputs))
+        self.assertTrue(self.service._tesseract_engine.images)
+        self.assertEqual(os.listdir(self.tmp), ["page.png"])
+
+    def test_without_preprocessing_engines_read_the_original(self):
+        self.service._extract_ensemble(self.image_path, preprocess=False, detail=False)
+        self.assertEqual(self.easy_inputs, [self.image_path])
+        self.assertEqual(os.listdir(self.tmp), ["page.png"])
+
+    def test_shared_base_matches_standalone_variants(self):
+        pre = ImagePreprocessor()
+        base = pre.prepare(self.image_path)
+        shared = pre.get_variants_for_engine(self.image_path, "tesseract", base=base)
+        standalone = pre.get_variants_for_engine(self.image_path, "tesseract")
+        self.assertEqual([name for name, _ in shared], [name for name, _ in standalone])
+        for (_, a), (_, b) in zip(shared, standalone):
+            self.assertTrue(np.array_equal(a, b))
+
+    def test_gray_array_converted_for_paddle_and_tesseract(self):
+        gray = np.full((20, 30), 255, dtype=np.uint8)
+        paddle = mock.Mock()
+        paddle.ocr.return_value = [[([[0, 0]], ("word", 0.8))]]
+        self.service._paddleocr_engine = paddle
+        self.assertEqual(self.service._run_paddleocr(gray), ("word", 0.8))
+        self.assertEqual(paddle.ocr.call_args[0][0].shape, (20, 30, 3))
+        self.assertEqual(self.service._to_pil(gray).size, (30, 20))
+
+
+if __name__ == "__main__":
+    unittest.main()
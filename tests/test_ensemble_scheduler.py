@@ -0,0 +1,170 @@
+"""
+Tests for the ensemble early-exit scheduler
+============================================
+Covers: queued variants cancelled once a result is excellent, the per-page
+deadline, returning without waiting for running variants, the per-engine
+variant gate, skipped work and saved time in the timing metrics, and
+OCRService reporting them in detailed output.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import unittest
+from unittest import mock
+
+from config.settings import settings
+from api.services.ensemble_scheduler import EnsembleScheduler, get_ensemble_timing_stats
+from api.services.ocr_service import OCRService
+
+
+def make_runner(plan, calls=None):
+    """``plan[(engine, variant)] = (seconds, quality or None)``."""
+    def run_variant(engine, variant, image):
+        seconds, quality = plan[(engine, variant)]
+        if calls is not None:
+            calls.append((engine, variant))
+        time.sleep(seconds)
+        if quality is None:
+            raise RuntimeError("engine crashed")
+        return {"source_engine": engine, "variant": variant, "quality_score": quality}
+    return run_variant
+
+
+def variants(*names):
+    return [(name, f"{name}.png") for name in names]
+
+
+class TestEnsembleScheduler(unittest.TestCase):
+    """Tests for EnsembleScheduler."""
+
+    def test_excellent_result_cancels_queued_variants(self):
+        plan = {
+            ("easyocr", "a"): (0.05, 0.9),
+            ("tesseract", "a"): (1.0, 0.3),
+            ("tesseract", "b"): (1.0, 0.3),
+            ("tesseract", "c"): (1.0, 0.3),
+        }
+        scheduler = EnsembleScheduler(make_runner(plan), quality_threshold=0.75)
+        start = time.monotonic()
+        results = scheduler.run({"easyocr": variants("a"), "tesseract": variants("a", "b", "c")})
+
+        self.assertLess(time.monotonic() - start, 0.5)  # not 1.0 for the running tesseract call
+        self.assertEqual(scheduler.stop_reason, "quality")
+        # The tesseract call already running is abandoned, not waited for
+        self.assertEqual([(r["source_engine"], r["variant"]) for r in results], [("easyocr", "a")])
+        self.assertEqual(scheduler.skipped, [
+            {"engine": "tesseract", "variant": "b", "reason": "quality"},
+            {"engine": "tesseract", "variant": "c", "reason": "quality"},
+        ])
+        timing = scheduler.timings["tesseract"]
+        self.assertEqual((timing.variants_abandoned, timing.variants_skipped), (1, 2))
+        self.assertAlmostEqual(timing.seconds_saved, 2 * scheduler.timings["easyocr"].seconds, places=6)
+
+    def test_deadline_returns_without_waiting_for_running_variant(self):
+        plan = {("easyocr", "a"): (0, 0.9), ("paddleocr", "a"): (2.0, 0.4)}
+        scheduler = EnsembleScheduler(make_runner(plan), quality_threshold=0.75, deadline=0.3)
+        idle = []
+        start = time.monotonic()
+        scheduler.run({"easyocr": variants("a"), "paddleocr": variants("a")})
+        scheduler.when_idle(lambda: idle.append(time.monotonic() - start))
+
+        self.assertLess(time.monotonic() - start, 0.3)
+        self.assertEqual(idle, [])                 # paddleocr still holds the engines
+        time.sleep(2.2)
+        self.assertEqual(len(idle), 1)
+        self.assertGreaterEqual(idle[0], 2.0)
+
+        plan = {("paddleocr", "a"): (2.0, 0.4)}
+        scheduler = EnsembleScheduler(make_runner(plan), deadline=0.3)
+        start = time.monotonic()
+        self.assertEqual(scheduler.run({"paddleocr": variants("a")}), [])
+        self.assertLess(time.monotonic() - start, 0.6)
+        self.assertEqual(scheduler.stop_reason, "deadline")
+
+    def test_deadline_stops_new_variants(self):
+        plan = {("paddleocr", v): (0.15, 0.4) for v in "abcd"}
+        scheduler = EnsembleScheduler(make_runner(plan), deadline=0.2)
+        results = scheduler.run({"paddleocr": variants("a", "b", "c", "d")})
+
+        self.assertEqual(scheduler.stop_reason, "deadline")
+        self.assertEqual([r["variant"] for r in results], ["a"])       # b was still running
+        self.assertEqual([s["variant"] for s in scheduler.skipped], ["c", "d"])
+        self.assertEqual(scheduler.timings["paddleocr"].variants_abandoned, 1)
+
+    def test_variant_gate_and_failures_stay_per_engine(self):
+        calls = []
+        plan = {
+            ("easyocr", "a"): (0, 0.7),      # good enough for this engine only
+            ("easyocr", "b"): (0, 0.5),
+            ("tesseract", "a"): (0, None),   # crash: next variant still runs
+            ("tesseract", "b"): (0, 0.5),
+        }
+        scheduler = EnsembleScheduler(make_runner(plan, calls), quality_threshold=0.75)
+        results = scheduler.run({"easyocr": variants("a", "b"), "tesseract": variants("a", "b")})
+
+        self.assertIsNone(scheduler.stop_reason)
+        self.assertEqual(sorted(calls), [("easyocr", "a"), ("tesseract", "a"), ("tesseract", "b")])
+        self.assertEqual(len(results), 2)
+        self.assertEqual(scheduler.skipped, [{"engine": "easyocr", "variant": "b", "reason": "engine_quality"}])
+
+    def test_process_wide_totals(self):
+        before = get_ensemble_timing_stats().get_stats()
+        plan = {("easyocr", "a"): (0, 0.9), ("easyocr", "b"): (0, 0.9)}
+        EnsembleScheduler(make_runner(plan)).run({"easyocr": variants("a", "b")})
+        after = get_ensemble_timing_stats().get_stats()
+
+        self.assertEqual(after["pages"], before["pages"] + 1)
+        self.assertEqual(after["early_stops"].get("quality", 0), before["early_stops"].get("quality", 0) + 1)
+        self.assertGreaterEqual(after["engines"]["easyocr"]["variants_skipped"], 1)
+
+
+class TestOCRServiceEnsembleEarlyExit(unittest.TestCase):
+    """OCRService._extract_ensemble reports scheduler metrics."""
+
+    def test_detail_output_includes_timings_and_skips(self):
+        service = OCRService(engine="ensemble")
+        service._enable_language_correction = False
+        service._easyocr_engine, service._tesseract_engine, service._paddleocr_engine = "easy", "tess", None
+        engine_calls = []
+
+        def fake_run(name, text, conf, delay):
+            def run(image):
+                engine_calls.append((name, image))
+                time.sleep(delay)
+                return text, conf
+            return run
+
+        variants_for = {
+            "easyocr": variants("bilateral", "unsharp"),
+            "tesseract": variants("adaptive", "thick", "clean"),
+        }
+        quality = {"Photosynthesis converts light": 0.9, "Ph0t0synth": 0.2}
+
+        def score(text, conf):
+            return {"quality_score": quality[text], "dictionary_ratio": 0.5, "language_model": 0.5}
+
+        with mock.patch.object(service, "_run_easyocr", fake_run("easyocr", "Photosynthesis converts light", 0.9, 0.0)), \
+                mock.patch.object(service, "_run_tesseract", fake_run("tesseract", "Ph0t0synth", 0.5, 0.1)), \
+                mock.patch.object(service.preprocessor, "get_variants_for_engine",
+                                  side_effect=lambda path, eng, base=None: variants_for[eng]), \
+                mock.patch.object(service.preprocessor, "prepare", return_value=object()), \
+                mock.patch.object(service.quality_analyzer, "calculate_quality_score", side_effect=score), \
+                mock.patch.object(service.quality_analyzer, "analyze_per_line", return_value=[]), \
+                mock.patch.object(settings, "OCR_ENSEMBLE_PAGE_DEADLINE", 0):
+            service.preprocessor._available = True
+            output = service._extract_ensemble("page.png", preprocess=True, detail=True)[0]
+
+        self.assertEqual(output["early_exit"], "quality")
+        self.assertEqual(output["text"], "Photosynthesis converts light")
+        self.assertEqual([c for c in engine_calls if c[0] == "tesseract"], [("tesseract", "adaptive.png")])
+        self.assertEqual({(s["engine"], s["variant"]) for s in output["skipped_variants"]},
+                         {("easyocr", "unsharp"), ("tesseract", "thick"), ("tesseract", "clean")})
+        self.assertEqual(output["engine_timings"]["tesseract"]["variants_skipped"], 2)
+        self.assertEqual(output["engine_timings"]["tesseract"]["variants_abandoned"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
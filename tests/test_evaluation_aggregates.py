@@ -0,0 +1,177 @@
+"""
+Tests for the evaluation statistics aggregates
+===============================================
+Covers: totals kept in step with inserted, re-scored, reviewed and deleted
+evaluations (global / teacher / class / subject scopes and grade
+histograms), manual evaluation percentages, min / max re-read when a bound
+is removed, rollbacks leaving the totals untouched, the consistency check
+and rebuild, and the dashboards reading from the aggregates.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import unittest
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database import aggregates
+from database.aggregates import check, read_totals, rebuild
+from database.models import (
+    Base, Evaluation, EvaluationAggregate, ManualEvaluation, Student, Teacher, GradeLevel, UserStatus,
+)
+
+
+def evaluation(score, grade, teacher_id=1, student_id=None, subject_id=None, **extra):
+    return Evaluation(final_score=score, grade=GradeLevel(grade) if grade else None, teacher_id=teacher_id,
+                      student_id=student_id, subject_id=subject_id, **extra)
+
+
+class AggregateTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine, autoflush=False)
+        self.db = self.Session()
+        self.db.add_all([Student(id=1, roll_no="1", name="A", class_id=10),
+                         Student(id=2, roll_no="2", name="B", class_id=20)])
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def assertConsistent(self):
+        self.assertEqual(check(self.db), [])
+
+
+class TestIncrementalAggregates(AggregateTestCase):
+    """Totals maintained on flush."""
+
+    def test_inserts_fill_every_scope(self):
+        self.db.add_all([
+            evaluation(90, "excellent", student_id=1, subject_id=5),
+            evaluation(70, "good", student_id=1, subject_id=5),
+            evaluation(50, "average", teacher_id=2, student_id=2),
+            evaluation(None, None, teacher_id=2),
+        ])
+        self.db.commit()
+
+        ai = read_totals(self.db)["ai"]
+        self.assertEqual((ai["count"], ai["average_score"]), (4, 70.0))
+        self.assertEqual((ai["highest_score"], ai["lowest_score"]), (90, 50))
+        self.assertEqual(ai["grade_distribution"], {"excellent": 1, "good": 1, "average": 1, "ungraded": 1})
+        self.assertEqual(read_totals(self.db, "teacher", 2)["ai"]["count"], 2)
+        self.assertEqual(read_totals(self.db, "class", 10)["ai"]["average_score"], 80.0)
+        self.assertEqual(read_totals(self.db, "subject", 5)["ai"]["count"], 2)
+        self.assertConsistent()
+
+    def test_review_regrade_and_delete(self):
+        low, mid, high = evaluation(40, "poor"), evaluation(60, "average"), evaluation(95, "excellent")
+        self.db.add_all([low, mid, high])
+        self.db.commit()
+
+        low.is_reviewed = True
+        mid.final_score, mid.grade = 75.0, GradeLevel.GOOD
+        self.db.commit()
+        teacher = read_totals(self.db, "teacher", 1)["ai"]
+        self.assertEqual((teacher["reviewed"], teacher["pending_reviews"]), (1, 2))
+        self.assertEqual(teacher["grade_distribution"], {"poor": 1, "good": 1, "excellent": 1})
+        self.assertConsistent()
+
+        # Removing the current bounds re-reads them
+        self.db.delete(high)
+        self.db.delete(low)
+        self.db.commit()
+        ai = read_totals(self.db)["ai"]
+        self.assertEqual((ai["count"], ai["highest_score"], ai["lowest_score"]), (1, 75.0, 75.0))
+        self.assertEqual(self.db.query(EvaluationAggregate).filter_by(grade="poor").count(), 0)
+        self.assertConsistent()
+
+    def test_changes_to_expired_objects_subtract_old_values(self):
+        ev = evaluation(30, "poor")
+        self.db.add(ev)
+        self.db.commit()                    # expires ev
+        ev.final_score = 80.0
+        self.db.commit()
+        self.assertEqual(read_totals(self.db)["ai"]["average_score"], 80.0)
+        self.assertConsistent()
+
+    def test_manual_evaluations_use_percentages(self):
+        self.db.add_all([
+            ManualEvaluation(teacher_id=1, student_id=2, obtained_marks=8, max_marks=10, status="completed"),
+            ManualEvaluation(teacher_id=1, obtained_marks=15, max_marks=20),
+        ])
+        self.db.commit()
+        manual = read_totals(self.db, "teacher", 1)["manual"]
+        self.assertEqual((manual["count"], manual["average_score"], manual["reviewed"]), (2, 77.5, 1))
+        self.assertEqual(read_totals(self.db, "class", 20)["manual"]["count"], 1)
+        self.assertConsistent()
+
+    def test_rollback_leaves_totals_untouched(self):
+        self.db.add(evaluation(60, "average"))
+        self.db.flush()
+        self.db.rollback()
+        self.assertEqual(read_totals(self.db)["ai"]["count"], 0)
+        self.assertEqual(self.db.query(func.count(EvaluationAggregate.id)).scalar(), 0)
+
+
+class TestCheckAndRebuild(AggregateTestCase):
+    """Consistency check and full recomputation."""
+
+    def test_bulk_update_detected_and_repaired(self):
+        self.db.add_all([evaluation(50 + i, "good", student_id=1 + i % 2, subject_id=3) for i in range(6)])
+        self.db.add(ManualEvaluation(teacher_id=1, obtained_marks=5, max_marks=10))
+        self.db.commit()
+        self.assertConsistent()
+
+        # Bulk statements bypass the flush hook
+        self.db.query(Evaluation).filter(Evaluation.final_score < 53).update({"final_score": 10.0})
+        self.db.commit()
+        self.assertTrue(check(self.db))
+
+        rebuild(self.db)
+        self.assertConsistent()
+        self.assertEqual(read_totals(self.db)["ai"]["lowest_score"], 10.0)
+
+    def test_ensure_built_fills_an_empty_table(self):
+        self.db.add(evaluation(70, "good"))
+        self.db.commit()
+        self.db.query(EvaluationAggregate).delete()
+        self.db.commit()
+
+        self.assertTrue(aggregates.ensure_built(self.db))
+        self.assertFalse(aggregates.ensure_built(self.db))
+        self.assertEqual(read_totals(self.db)["ai"]["count"], 1)
+
+
+class TestDashboardsReadAggregates(AggregateTestCase):
+    """The admin and teacher dashboards read the aggregate rows."""
+
+    def test_teacher_and_admin_dashboards(self):
+        from api.routes.admin import admin_dashboard
+        from api.routes.teachers import teacher_dashboard
+        from api.services.auth_service import TokenData
+
+        teacher = Teacher(email="t@example.com", name="T", password_hash="x", status=UserStatus.ACTIVE)
+        self.db.add(teacher)
+        self.db.commit()
+        self.db.add_all([evaluation(80, "good", teacher_id=teacher.id, is_reviewed=True),
+                         evaluation(60, "average", teacher_id=teacher.id)])
+        self.db.commit()
+
+        user = TokenData(user_id=teacher.id, user_unique_id=teacher.teacher_id, email=teacher.email,
+                         name=teacher.name, role="teacher")
+        stats = asyncio.run(teacher_dashboard(current_user=user, db=self.db))["data"]["statistics"]
+        self.assertEqual((stats["total_evaluations"], stats["pending_reviews"], stats["average_score"]), (2, 1, 70.0))
+
+        stats = asyncio.run(admin_dashboard(current_user=user, db=self.db))["data"]["statistics"]
+        self.assertEqual((stats["total_evaluations"], stats["average_score"]), (2, 70.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
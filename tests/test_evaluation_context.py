@@ -0,0 +1,205 @@
+"""
+Tests for the shared per-evaluation EvaluationContext
+======================================================
+Covers: embedding memoisation, batched encoding, sentence reuse, scorers
+consuming the context instead of re-encoding, scorers keeping their own
+sentence heuristics, and cross-pair batching.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+
+import numpy as np
+
+from api.services.evaluation_context import EvaluationContext
+
+
+class CountingEncoder:
+    """Deterministic bag-of-words encoder that records every encode call."""
+
+    DIM = 32
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, convert_to_numpy=True, show_progress_bar=False):
+        self.calls.append(list(texts))
+        out = np.zeros((len(texts), self.DIM), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                out[i, sum(map(ord, word)) % self.DIM] += 1.0
+        return out
+
+
+MODEL = (
+    "Photosynthesis converts light energy into chemical energy. "
+    "It takes place in the chloroplasts of plant cells. "
+    "Oxygen is released as a by-product."
+)
+STUDENT = (
+    "Plants use light energy to make chemical energy. "
+    "This happens in chloroplasts. "
+    "Oxygen is given off."
+)
+
+
+class TestEvaluationContext(unittest.TestCase):
+    """Tests for EvaluationContext."""
+
+    def setUp(self):
+        self.encoder = CountingEncoder()
+        self.context = EvaluationContext.build(
+            MODEL, STUDENT, model_name="test-model", encoder=self.encoder,
+        )
+
+    def test_build_encodes_documents_and_sentences_in_one_batch(self):
+        self.assertEqual(len(self.encoder.calls), 1)
+        batch = self.encoder.calls[0]
+        self.assertIn(MODEL, batch)
+        self.assertIn(STUDENT, batch)
+        for sent in self.context.model_sentences + self.context.student_sentences:
+            self.assertIn(sent, batch)
+
+    def test_repeated_lookups_do_not_re_encode(self):
+        self.context.embed(self.context.model_sentences)
+        self.context.get_embedding(STUDENT)
+        self.assertEqual(len(self.encoder.calls), 1)
+        self.assertGreater(self.context.cache_hits, 0)
+
+    def test_only_unseen_strings_are_encoded(self):
+        self.context.embed(["light energy", "chloroplasts", "light energy"])
+        self.assertEqual(self.encoder.calls[-1], ["light energy", "chloroplasts"])
+        self.context.get_embedding(["chloroplasts", "light energy"])
+        self.assertEqual(len(self.encoder.calls), 2)
+
+    def test_get_embedding_shapes(self):
+        self.assertEqual(self.context.get_embedding("light").shape, (CountingEncoder.DIM,))
+        self.assertEqual(
+            self.context.get_embedding(["a b", "c d"]).shape, (2, CountingEncoder.DIM)
+        )
+        with self.assertRaises(ValueError):
+            self.context.get_embedding("")
+
+    def test_sentence_split_is_memoised(self):
+        first = self.context.sentences(MODEL)
+        self.assertIs(first, self.context.sentences(MODEL))
+        self.assertEqual(len(first), 3)
+
+    def test_sentence_alignment_reuses_context(self):
+        from api.services.sentence_alignment_service import SentenceAlignmentScorer
+
+        calls_before = len(self.encoder.calls)
+        result = SentenceAlignmentScorer().score(MODEL, STUDENT, context=self.context)
+        self.assertEqual(result.model_sentence_count, 3)
+        self.assertEqual(len(self.encoder.calls), calls_before)
+
+    def test_anti_gaming_reuses_context(self):
+        from api.services.anti_gaming_service import AntiGamingAnalyzer
+
+        calls_before = len(self.encoder.calls)
+        report = AntiGamingAnalyzer().analyze(
+            student_text=STUDENT, model_text=MODEL, context=self.context,
+        )
+        self.assertLessEqual(report.total_penalty, AntiGamingAnalyzer.MAX_TOTAL_PENALTY)
+        self.assertEqual(len(self.encoder.calls), calls_before)
+
+    def test_anti_gaming_keeps_its_own_sentence_filter(self):
+        from api.services.anti_gaming_service import AntiGamingAnalyzer
+
+        text = "Ok. Plants make food in chloroplasts. Yes."
+        context = EvaluationContext(MODEL, text, encoder=self.encoder)
+        analyzer = AntiGamingAnalyzer()
+        analyzer._nlp = None
+        self.assertEqual(context.sentences(text)[0], "Ok.")
+        self.assertEqual(
+            analyzer._split_sentences(text, context), ["Plants make food in chloroplasts.", "Yes."],
+        )
+        self.assertEqual(analyzer._split_sentences(text, context), analyzer._split_sentences(text))
+
+    def test_rubric_structure_heuristic_ignores_context_split(self):
+        from api.services.rubric_scoring_service import RubricScorer
+
+        text = "Plants make food! They need light? Chloroplasts do the work. Oxygen is released."
+        context = EvaluationContext(MODEL, text, encoder=self.encoder, nlp=FakeNlp())
+        self.assertEqual(len(context.sentences(text)), 2)
+        with_context = RubricScorer().evaluate(student_text=text, model_text=MODEL, context=context)
+        without = RubricScorer().evaluate(student_text=text, model_text=MODEL)
+        self.assertEqual(with_context.dimension_scores["structure"], without.dimension_scores["structure"])
+
+
+class FakeNlp:
+    """spaCy stand-in: sentence split on full stops, counts pipe / call use."""
+
+    class _Span:
+        def __init__(self, text):
+            self.text = text
+
+    class _Doc:
+        def __init__(self, text):
+            self.sents = [FakeNlp._Span(s + ".") for s in text.split(".") if s.strip()]
+
+    def __init__(self):
+        self.pipe_calls = 0
+        self.single_calls = 0
+
+    def __call__(self, text):
+        self.single_calls += 1
+        return self._Doc(text)
+
+    def pipe(self, texts):
+        self.pipe_calls += 1
+        return [self._Doc(t) for t in texts]
+
+
+class TestBuildBatch(unittest.TestCase):
+    """Tests for EvaluationContext.build_batch (cross-question batching)."""
+
+    PAIRS = [
+        (MODEL, STUDENT, None, None),
+        ("Mitochondria produce ATP. They are the powerhouse of the cell.",
+         "Mitochondria make energy.", None, None),
+        ("Water boils at 100 degrees.", "Water boils at 100 degrees.", None, None),
+    ]
+
+    def setUp(self):
+        self.encoder = CountingEncoder()
+        self.nlp = FakeNlp()
+        self.phrases_seen = []
+
+        def phrases(text, doc):
+            self.phrases_seen.append(doc)
+            return [w for w in text.split() if len(w) > 8]
+
+        self.contexts = EvaluationContext.build_batch(
+            self.PAIRS, phrase_extractor=phrases,
+            model_name="test-model", encoder=self.encoder, nlp=self.nlp,
+        )
+
+    def test_one_parse_and_one_encode_for_all_pairs(self):
+        self.assertEqual(len(self.contexts), 3)
+        self.assertEqual(self.nlp.pipe_calls, 1)
+        self.assertEqual(self.nlp.single_calls, 0)
+        self.assertEqual(len(self.encoder.calls), 1)
+        # Identical strings across pairs are encoded once
+        batch = self.encoder.calls[0]
+        self.assertEqual(len(batch), len(set(batch)))
+
+    def test_per_pair_scoring_needs_no_further_encoding(self):
+        for context in self.contexts:
+            context.embed(context.model_sentences + context.student_sentences)
+            context.get_embedding(context.student_normalized)
+        self.assertEqual(len(self.encoder.calls), 1)
+        self.assertTrue(all(c.encode_calls == 0 for c in self.contexts[1:]))
+
+    def test_phrases_use_batched_parse_and_are_pre_encoded(self):
+        self.assertTrue(all(doc is not None for doc in self.phrases_seen))
+        # Student-side phrases only
+        self.assertTrue(self.contexts[0].has_embedding("chloroplasts."))
+        self.assertFalse(self.contexts[0].has_embedding("Photosynthesis"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Tests for the bounded evaluation executor
+==========================================
+Covers: work runs off the event loop, concurrency cap, queue overflow
+rejection (429), slot release after failures, and background work
+waiting for a worker.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import threading
+import time
+import unittest
+
+from api.services.evaluation_executor import EvaluationExecutor, ExecutorSaturated
+
+
+class TestEvaluationExecutor(unittest.TestCase):
+    """Tests for EvaluationExecutor."""
+
+    def setUp(self):
+        self.executor = EvaluationExecutor(max_workers=2, queue_size=1)
+
+    def tearDown(self):
+        self.executor.shutdown(wait=True)
+
+    def test_runs_off_the_event_loop_thread(self):
+        async def main():
+            loop_thread = threading.get_ident()
+            worker_thread = await self.executor.run(threading.get_ident)
+            return loop_thread, worker_thread
+
+        loop_thread, worker_thread = asyncio.run(main())
+        self.assertNotEqual(loop_thread, worker_thread)
+        self.assertEqual(self.executor.completed, 1)
+
+    def test_event_loop_stays_responsive(self):
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            task = asyncio.create_task(ticker())
+            await self.executor.run(time.sleep, 0.2)
+            task.cancel()
+            return ticks
+
+        self.assertGreater(asyncio.run(main()), 5)
+
+    def test_rejects_when_workers_and_queue_are_full(self):
+        release = threading.Event()
+
+        async def main():
+            tasks = [asyncio.create_task(self.executor.run(release.wait)) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            self.assertEqual(self.executor.running, 2)
+            self.assertEqual(self.executor.queued, 1)
+            with self.assertRaises(ExecutorSaturated):
+                await self.executor.run(release.wait)
+            release.set()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(main())
+        self.assertEqual(self.executor.rejected, 1)
+        self.assertEqual(self.executor.queued, 0)
+        self.assertEqual(self.executor.running, 0)
+
+    def test_failures_propagate_and_free_the_slot(self):
+        def boom():
+            raise ValueError("bad input")
+
+        async def main():
+            for _ in range(4):
+                with self.assertRaises(ValueError):
+                    await self.executor.run(boom)
+            return await self.executor.run(lambda: "ok")
+
+        self.assertEqual(asyncio.run(main()), "ok")
+        self.assertEqual(self.executor.failed, 4)
+
+    def test_background_work_waits_for_a_worker(self):
+        release = threading.Event()
+
+        def background():
+            self.assertEqual(self.executor.run_blocking(release.wait, 1.0), True)
+
+        threads = [threading.Thread(target=background) for _ in range(4)]
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        observed = (self.executor.running, self.executor.queued)
+
+        async def interactive():
+            # The queue slot is still free for a request
+            task = asyncio.create_task(self.executor.run(lambda: "ok"))
+            await asyncio.sleep(0.05)
+            release.set()
+            return await task
+
+        self.assertEqual(asyncio.run(interactive()), "ok")
+        for t in threads:
+            t.join(timeout=2)
+        self.assertEqual(observed, (2, 0))
+        self.assertEqual(self.executor.rejected, 0)
+        self.assertEqual(self.executor.completed, 5)
+
+    def test_route_helper_maps_saturation_to_429(self):
+        from unittest import mock
+        from fastapi import HTTPException
+        from api.services import evaluation_executor
+
+        full = EvaluationExecutor(max_workers=1, queue_size=0)
+        release = threading.Event()
+
+        async def main():
+            with mock.patch.object(evaluation_executor, "_executor", full):
+                first = asyncio.create_task(evaluation_executor.run_evaluation_task(release.wait))
+                await asyncio.sleep(0.05)
+                with self.assertRaises(HTTPException) as ctx:
+                    await evaluation_executor.run_evaluation_task(release.wait)
+                release.set()
+                await first
+            return ctx.exception
+
+        exc = asyncio.run(main())
+        full.shutdown(wait=True)
+        self.assertEqual(exc.status_code, 429)
+        self.assertIn("Retry-After", exc.headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
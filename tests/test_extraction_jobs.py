@@ -0,0 +1,189 @@
+"""
+Tests for background upload extraction jobs
+============================================
+Covers: state transitions, persisted state, joining a running job (in
+this worker or another one, and by the evaluate route before it takes a
+pool worker), failure reporting, interrupted-job detection, and the cache
+files written by the extraction task.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from api.services import extraction_job_service
+from api.services.extraction_job_service import (
+    DONE,
+    FAILED,
+    QUEUED,
+    RUNNING,
+    ExtractionJobService,
+    state_path,
+)
+
+
+class TestExtractionJobService(unittest.TestCase):
+    """Tests for ExtractionJobService."""
+
+    def setUp(self):
+        self.eval_dir = tempfile.mkdtemp()
+        self.service = ExtractionJobService(max_workers=1)
+
+    def tearDown(self):
+        self.service.shutdown()
+        shutil.rmtree(self.eval_dir, ignore_errors=True)
+
+    def _persisted(self):
+        with open(state_path(self.eval_dir), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_job_runs_to_done_and_reports_progress(self):
+        release = threading.Event()
+        seen = []
+
+        def task(progress, value):
+            progress("model", 0.25, "working")
+            seen.append(self._persisted()["status"])
+            release.wait(5)
+            seen.append(value)
+
+        job = self.service.submit("ev1", self.eval_dir, task, task_kwargs={"value": 42})
+        self.assertIn(job.status, (QUEUED, RUNNING))
+        time.sleep(0.1)
+        self.assertEqual(self.service.get_job("ev1", self.eval_dir).stage, "model")
+        release.set()
+
+        finished = self.service.wait("ev1", self.eval_dir, timeout=5)
+        self.assertEqual(finished.status, DONE)
+        self.assertEqual(finished.progress, 1.0)
+        self.assertEqual(seen, [RUNNING, 42])
+        self.assertEqual(self._persisted()["status"], DONE)
+
+    def test_failure_is_recorded(self):
+        def task(progress):
+            raise RuntimeError("OCR engine crashed")
+
+        self.service.submit("ev2", self.eval_dir, task, task_kwargs={})
+        job = self.service.wait("ev2", self.eval_dir, timeout=5)
+        self.assertEqual(job.status, FAILED)
+        self.assertIn("crashed", job.error)
+
+    def test_wait_async_joins_running_job(self):
+        def task(progress):
+            time.sleep(0.3)
+
+        async def main():
+            self.service.submit("ev3", self.eval_dir, task, task_kwargs={})
+            return await self.service.wait_async("ev3", self.eval_dir, timeout=5, poll_interval=0.05)
+
+        self.assertEqual(asyncio.run(main()).status, DONE)
+
+    def test_wait_follows_job_of_another_worker(self):
+        release = threading.Event()
+
+        def task(progress):
+            release.wait(5)
+
+        self.service.submit("ev5", self.eval_dir, task, task_kwargs={})
+        other_worker = ExtractionJobService(max_workers=1)
+        threading.Timer(0.3, release.set).start()
+
+        start = time.monotonic()
+        job = other_worker.wait("ev5", self.eval_dir, timeout=5, poll_interval=0.05)
+        self.assertEqual(job.status, DONE)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+        self.assertEqual(other_worker.wait("ev5", self.eval_dir, timeout=0).status, DONE)
+
+    def test_unknown_job_is_none(self):
+        self.assertIsNone(self.service.get_job("nope", self.eval_dir))
+        self.assertIsNone(self.service.wait("nope", self.eval_dir, timeout=0.1))
+
+    def test_stale_running_state_reported_as_interrupted(self):
+        os.makedirs(os.path.dirname(state_path(self.eval_dir)), exist_ok=True)
+        with open(state_path(self.eval_dir), "w", encoding="utf-8") as f:
+            json.dump({
+                "job_id": "ev4", "eval_dir": self.eval_dir, "status": RUNNING,
+                "heartbeat_at": time.time() - 10 * extraction_job_service.STALE_AFTER_SECONDS,
+            }, f)
+        job = ExtractionJobService().get_job("ev4", self.eval_dir)
+        self.assertEqual(job.status, FAILED)
+        self.assertIn("interrupted", job.error)
+
+        # A fresh heartbeat means another worker still owns the job
+        with open(state_path(self.eval_dir), "w", encoding="utf-8") as f:
+            json.dump({"job_id": "ev4", "eval_dir": self.eval_dir, "status": RUNNING}, f)
+        self.assertEqual(ExtractionJobService().get_job("ev4", self.eval_dir).status, RUNNING)
+
+    def test_evaluate_route_joins_job_before_using_the_pool(self):
+        from api.routes import evaluation as evaluation_routes
+        from api.services import evaluation_executor
+        from config.settings import settings
+
+        eval_dir = os.path.join(self.eval_dir, "evaluations", "ev6")
+        self.service.submit("ev6", eval_dir, lambda progress: time.sleep(0.3), task_kwargs={})
+        handed_over = []
+
+        async def fake_task(fn, *args):
+            handed_over.append(args)
+            return mock.Mock(evaluation_id="ev6"), None
+
+        with mock.patch.object(settings, "UPLOAD_DIR", self.eval_dir), \
+                mock.patch.object(extraction_job_service, "get_extraction_job_service", return_value=self.service), \
+                mock.patch.object(self.service, "wait", side_effect=AssertionError("blocking join")), \
+                mock.patch.object(evaluation_executor, "run_evaluation_task", fake_task):
+            request = mock.Mock(evaluation_id="ev6")
+            asyncio.run(evaluation_routes.evaluate_answer(request, db=mock.Mock(), current_user=None))
+
+        (args,) = handed_over
+        self.assertIs(args[0], request)
+        self.assertEqual(args[1].status, DONE)
+
+
+class TestExtractAndCacheText(unittest.TestCase):
+    """Tests for upload_extraction_task._extract_and_cache_text."""
+
+    def setUp(self):
+        self.eval_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.eval_dir, ignore_errors=True)
+
+    def test_writes_model_and_student_cache(self):
+        from api.routes.upload_extraction_task import _extract_and_cache_text
+
+        model_path = os.path.join(self.eval_dir, "model_key.png")
+        student_path = os.path.join(self.eval_dir, "student_answer.txt")
+        open(model_path, "wb").close()
+        with open(student_path, "w", encoding="utf-8") as f:
+            f.write("Photosynthesis happens in leaves.")
+
+        stages = []
+        with mock.patch("api.services.ocr_service.OCRService") as ocr_cls:
+            ocr_cls.return_value.extract_text.return_value = "Photosynthesis converts light."
+            _extract_and_cache_text(
+                "ev", self.eval_dir, model_path, student_path, "student_answer.txt",
+                progress=lambda stage, fraction, message="": stages.append(stage),
+            )
+
+        cache = os.path.join(self.eval_dir, ".cache")
+        with open(os.path.join(cache, "model_extracted.txt"), encoding="utf-8") as f:
+            self.assertIn("Photosynthesis", f.read())
+        with open(os.path.join(cache, "student_extracted.txt"), encoding="utf-8") as f:
+            self.assertIn("leaves", f.read())
+        self.assertEqual(stages, ["model", "student"])
+        # Text input is never OCRed
+        self.assertEqual(ocr_cls.return_value.extract_text.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
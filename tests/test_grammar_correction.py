@@ -0,0 +1,120 @@
+"""
+Tests for batched T5 grammar correction
+========================================
+Covers: length-bucketed batches, the sentence cache, the per-document time
+budget leaving later sentences uncorrected (and being reported), and the output sanity check.
+torch / transformers are replaced by small fakes.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import contextlib
+import time
+import types
+import unittest
+from unittest import mock
+
+from api.services import language_correction_service as lcs
+from api.services.language_correction_service import GrammarCache, TransformerGrammarCorrector
+
+fake_torch = types.SimpleNamespace(no_grad=contextlib.nullcontext)
+
+
+class FakeTokenizer:
+    def __call__(self, inputs, **kwargs):
+        return types.SimpleNamespace(input_ids=list(inputs), attention_mask=None)
+
+    def batch_decode(self, outputs, skip_special_tokens=True):
+        return list(outputs)
+
+
+class FakeModel:
+    """'Corrects' by fixing "are" → "is" and capitalising; records each batch."""
+
+    def __init__(self, delay=0.0):
+        self.batches = []
+        self.delay = delay
+
+    def generate(self, input_ids=None, attention_mask=None, **kwargs):
+        time.sleep(self.delay)
+        sentences = [s.replace("grammar: ", "") for s in input_ids]
+        self.batches.append(sentences)
+        return [s.replace(" are ", " is ").capitalize() for s in sentences]
+
+
+class TestTransformerGrammarCorrector(unittest.TestCase):
+    """Tests for TransformerGrammarCorrector batching, caching and budget."""
+
+    def setUp(self):
+        self.patches = [
+            mock.patch.dict(sys.modules, {"torch": fake_torch}),
+            mock.patch.object(lcs, "_grammar_cache", GrammarCache(max_entries=100)),
+            mock.patch.object(TransformerGrammarCorrector, "_load_model"),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+
+    def _corrector(self, model, batch_size=2, time_budget=0):
+        corrector = TransformerGrammarCorrector(batch_size=batch_size, time_budget=time_budget, quantize=False)
+        corrector._tokenizer, corrector._model, corrector._available = FakeTokenizer(), model, True
+        return corrector
+
+    def test_batches_are_length_bucketed_and_order_kept(self):
+        model = FakeModel()
+        corrector = self._corrector(model)
+        text = "a long sentence here that are wrong. short are one. mid sized are one. tiny are x."
+        self.assertEqual(
+            corrector.correct(text),
+            "A long sentence here that is wrong. Short is one. Mid sized is one. Tiny is x.",
+        )
+        self.assertEqual(len(model.batches), 2)
+        lengths = [len(s) for batch in model.batches for s in batch]
+        self.assertEqual(lengths, sorted(lengths))
+
+    def test_cached_sentences_skip_generation(self):
+        model = FakeModel()
+        corrector = self._corrector(model)
+        corrector.correct("the cats are here. the dogs are there.")
+        self.assertEqual(len(model.batches), 1)
+
+        # Same sentences, another corrector instance → served from the shared cache
+        again = self._corrector(model)
+        self.assertEqual(again.correct("the dogs are there. new one are here."),
+                         "The dogs is there. New one is here.")
+        self.assertEqual(model.batches[-1], ["new one are here."])
+
+    def test_time_budget_leaves_remaining_sentences_uncorrected(self):
+        model = FakeModel(delay=0.1)
+        corrector = self._corrector(model, batch_size=1, time_budget=0.25)
+        text = "one are a. two are bb. three are ccc. four are dddd."
+        start = time.monotonic()
+        result = corrector.correct(text)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertTrue(result.startswith("One is a. Two is bb."))
+        self.assertTrue(result.endswith("four are dddd."))
+
+        # Reported as incomplete; once every sentence is cached it is complete
+        self.assertEqual(corrector.correct_within_budget("five are e. six are ff.", time_budget=0.05)[1], False)
+        self.assertEqual(corrector.correct_within_budget("one are a. two are bb.")[1], True)
+
+    def test_implausible_output_keeps_original(self):
+        model = FakeModel()
+        model.generate = lambda input_ids=None, **kw: ["" for _ in input_ids]
+        corrector = self._corrector(model)
+        self.assertEqual(corrector.correct("keep this one."), "keep this one.")
+
+    def test_cache_key_depends_on_model_variant(self):
+        plain = self._corrector(FakeModel())
+        quantized = self._corrector(FakeModel())
+        quantized._quantize = True
+        self.assertNotEqual(GrammarCache.key(plain._model_id, "s"), GrammarCache.key(quantized._model_id, "s"))
+
+
+if __name__ == "__main__":
+    unittest.main()
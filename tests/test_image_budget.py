@@ -0,0 +1,104 @@
+"""
+Tests for resolution-budgeted image loading
+============================================
+Covers: reduced-scale JPEG decode, the megapixel cap, skew estimated on a
+thumbnail, and tiled denoisers matching a whole-image run.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+
+from config.settings import settings
+from api.services.ocr_service import ImagePreprocessor
+
+
+def lined_page(width, height, angle=0.0):
+    img = np.full((height, width, 3), 235, dtype=np.uint8)
+    for y in range(height // 10, height, height // 10):
+        cv2.line(img, (width // 20, y), (width - width // 20, y), (30, 30, 30), max(2, width // 800))
+    if angle:
+        M = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+        img = cv2.warpAffine(img, M, (width, height), borderMode=cv2.BORDER_REPLICATE)
+    return img
+
+
+class TestBudgetedLoad(unittest.TestCase):
+    """Tests for ImagePreprocessor.load_image."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.pre = ImagePreprocessor()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _write(self, name, img):
+        path = os.path.join(self.tmp, name)
+        cv2.imwrite(path, img)
+        return path
+
+    def test_large_jpeg_decoded_at_reduced_scale(self):
+        path = self._write("photo.jpg", lined_page(7200, 5400))
+        with mock.patch.object(self.pre.cv2, "imread", wraps=cv2.imread) as imread:
+            img = self.pre.load_image(path, max_pixels=0)
+        self.assertEqual(imread.call_args.args[1], cv2.IMREAD_REDUCED_COLOR_2)
+        self.assertEqual(img.shape[:2], (2700, 3600))   # long side stays >= 3500
+
+    def test_small_jpeg_and_png_decoded_normally(self):
+        small = self._write("small.jpg", lined_page(1200, 900))
+        self.assertEqual(self.pre.load_image(small, max_pixels=0).shape[:2], (900, 1200))
+        png = self._write("scan.png", lined_page(4000, 3000))
+        self.assertEqual(self.pre.load_image(png, max_pixels=0).shape[:2], (3000, 4000))
+
+    def test_megapixel_cap(self):
+        path = self._write("scan.png", lined_page(4000, 3000))
+        with mock.patch.object(settings, "OCR_MAX_MEGAPIXELS", 3.0):
+            img = self.pre.load_image(path)
+        h, w = img.shape[:2]
+        self.assertLessEqual(h * w, 3_000_000)
+        self.assertAlmostEqual(w / h, 4 / 3, places=2)
+
+
+class TestSkewAndTiles(unittest.TestCase):
+    """Thumbnail skew estimation and tiled filters."""
+
+    def setUp(self):
+        self.pre = ImagePreprocessor()
+
+    def test_skew_estimated_on_thumbnail(self):
+        page = lined_page(4800, 3600, angle=3.0)
+        with mock.patch.object(self.pre.cv2, "HoughLines", wraps=cv2.HoughLines) as hough:
+            angle = self.pre.estimate_skew(page)
+        edges = hough.call_args.args[0]
+        self.assertEqual(max(edges.shape), ImagePreprocessor.SKEW_THUMBNAIL)
+        self.assertAlmostEqual(abs(angle), 3.0, delta=1.0)
+
+    def test_tiled_denoisers_match_whole_image(self):
+        rng = np.random.default_rng(0)
+        gray = cv2.GaussianBlur((rng.random((700, 900)) * 255).astype(np.uint8), (5, 5), 0)
+        with mock.patch.object(settings, "OCR_FILTER_TILE_SIZE", 0):
+            whole = (self.pre.denoise(gray, 15), self.pre.denoise_bilateral(gray))
+        with mock.patch.object(settings, "OCR_FILTER_TILE_SIZE", 256):
+            calls = []
+            real = self.pre.cv2.bilateralFilter
+            with mock.patch.object(self.pre.cv2, "bilateralFilter",
+                                   side_effect=lambda t, *a: calls.append(t.shape) or real(t, *a)):
+                tiled = (self.pre.denoise(gray, 15), self.pre.denoise_bilateral(gray))
+
+        self.assertTrue(np.array_equal(whole[0], tiled[0]))
+        self.assertTrue(np.array_equal(whole[1], tiled[1]))
+        self.assertEqual(len(calls), 12)
+        self.assertTrue(all(h <= 256 + 32 and w <= 256 + 32 for h, w in calls))
+
+
+if __name__ == "__main__":
+    unittest.main()
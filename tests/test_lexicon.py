@@ -0,0 +1,183 @@
+"""
+Tests for the shared English lexicon
+=====================================
+Covers: membership / frequency / prefix / batch lookups, inflection
+expansion, the memory-mapped on-disk copy, the symmetric-delete index
+matching a brute-force search, and the quality analyzer and spell
+corrector reading from one shared lexicon.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import shutil
+import string
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from api.services import lexicon as lexicon_module
+from config.settings import settings
+from api.services.lexicon import DeletionIndex, Lexicon, build_lexicon, load_lexicon, osa_distance
+
+BASE = {"algorithm", "answer", "manage", "study", "system", "the", "is", "lo", "stop", "process"}
+
+
+class TestLexicon(unittest.TestCase):
+    """Tests for Lexicon lookups and persistence."""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.lexicon = build_lexicon(BASE)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_membership_includes_inflections_and_tech_terms(self):
+        for word in ("algorithm", "algorithms", "managed", "studies", "stopped", "software", "a"):
+            self.assertIn(word, self.lexicon)
+        for word in ("lo", "algorithmz", "", "x" * 100):
+            self.assertNotIn(word, self.lexicon)
+
+    def test_frequency_and_batch_known(self):
+        self.assertEqual(self.lexicon.frequency("the"), 69971)
+        self.assertEqual(self.lexicon.frequency("studies"), 1)
+        self.assertEqual(self.lexicon.frequency("zzz"), 0)
+        self.assertEqual(self.lexicon.known({"teh", "the", "systems", "x" * 100, ""}), {"the", "systems"})
+
+    def test_prefix_lookup(self):
+        words = self.lexicon.with_prefix("stud")
+        self.assertEqual(words, sorted(words))
+        self.assertIn("study", words)
+        self.assertIn("studies", words)
+        self.assertTrue(all(w.startswith("stud") for w in words))
+        self.assertEqual(len(self.lexicon.with_prefix("stud", limit=2)), 2)
+        self.assertEqual(self.lexicon.with_prefix("qq"), [])
+
+    def test_saved_copy_is_memory_mapped(self):
+        self.lexicon.save(self.dir)
+        opened = Lexicon.open(self.dir)
+        self.assertTrue(opened.get_stats()["memory_mapped"])
+        self.assertEqual(len(opened), len(self.lexicon))
+        self.assertIn("answered", opened)
+        self.assertEqual(opened.frequency("algorithm"), 745)
+
+    def test_load_builds_once_then_opens_prebuilt(self):
+        with mock.patch.object(lexicon_module, "build_lexicon", return_value=self.lexicon) as build:
+            first = load_lexicon(self.dir)
+            second = load_lexicon(self.dir)
+        self.assertEqual(build.call_count, 1)
+        self.assertIsInstance(second._words, np.memmap)
+        self.assertEqual(list(first), list(second))
+
+    def test_missing_corpus_gives_empty_lexicon(self):
+        with mock.patch.object(lexicon_module, "_nltk_words", side_effect=LookupError("words")):
+            lexicon = load_lexicon(self.dir)
+        self.assertEqual(len(lexicon), 0)
+        self.assertNotIn("the", lexicon)
+        self.assertEqual(lexicon.known({"the"}), set())
+        self.assertIsNone(Lexicon.open(self.dir))  # nothing persisted
+
+
+class TestDeletionIndex(unittest.TestCase):
+    """Tests for the SymSpell-style deletion index."""
+
+    def setUp(self):
+        rng = random.Random(7)
+        words = {"".join(rng.choices("abcde", k=rng.randint(1, 9))) for _ in range(3000)}
+        self.lexicon = Lexicon.from_words(words)
+        self.index = DeletionIndex.build(self.lexicon)
+        self.queries = ["".join(rng.choices("abcdef", k=rng.randint(1, 10))) for _ in range(150)]
+
+    def test_osa_distance(self):
+        self.assertEqual(osa_distance("algorithm", "algorithm", 2), 0)
+        self.assertEqual(osa_distance("algorithm", "algortihm", 2), 1)  # transposition
+        self.assertEqual(osa_distance("systern", "system", 2), 2)
+        self.assertEqual(osa_distance("abc", "xyzw", 2), 3)  # capped at max + 1
+
+    def test_lookup_matches_brute_force(self):
+        # Every hit is within distance 2; every word whose prefix is within
+        # distance 2 of the query's prefix is found
+        p = self.index.prefix_length
+        for query in self.queries:
+            found = self.index.lookup(query)
+            within = {w: osa_distance(query, w, 2) for w in self.lexicon}
+            within = {w: d for w, d in within.items() if d <= 2}
+            self.assertLessEqual(found.items(), within.items(), query)
+            for word in within:
+                if osa_distance(query[:p], word[:p], 2) <= 2:
+                    self.assertIn(word, found, query)
+
+    def test_saved_index_is_memory_mapped(self):
+        directory = tempfile.mkdtemp()
+        try:
+            self.index.save(directory)
+            opened = DeletionIndex.open(directory, self.lexicon)
+            self.assertTrue(opened.get_stats()["memory_mapped"])
+            for query in self.queries[:20]:
+                self.assertEqual(opened.lookup(query), self.index.lookup(query))
+            # An index built for another lexicon is not reused
+            self.assertIsNone(DeletionIndex.open(directory, Lexicon.from_words(["abc"])))
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def test_empty_lexicon(self):
+        index = DeletionIndex.build(Lexicon.from_words([]))
+        self.assertEqual(index.lookup("word"), {})
+
+
+class TestSharedLexiconConsumers(unittest.TestCase):
+    """OCRQualityAnalyzer and ContextualSpellCorrector use the shared lexicon."""
+
+    def setUp(self):
+        self.lexicon = build_lexicon(BASE | {"operating", "software", "hardware", "manages"})
+        self.patches = [
+            mock.patch.object(lexicon_module, "_lexicon", self.lexicon),
+            mock.patch.object(lexicon_module, "_deletion_index", None),
+            mock.patch.object(settings, "LEXICON_DIR", None),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+
+    def test_quality_analyzer_uses_shared_lexicon(self):
+        from api.services.ocr_service import OCRQualityAnalyzer
+
+        analyzer = OCRQualityAnalyzer()
+        self.assertIs(analyzer._dictionary, self.lexicon)
+        self.assertTrue(analyzer.is_valid_word("Algorithms"))
+        self.assertFalse(analyzer.is_valid_word("algorlthm"))
+
+    def test_spell_corrector_candidates_and_frequency(self):
+        from api.services.language_correction_service import ContextualSpellCorrector
+
+        corrector = ContextualSpellCorrector(dictionary=self.lexicon)
+        self.assertIs(corrector._dictionary, self.lexicon)
+        self.assertEqual(corrector.correct_text("Operatlng systern"), "Operating system")
+
+        # A plain set still works and gets the same base frequencies
+        from_set = ContextualSpellCorrector(dictionary={"the", "they"})
+        self.assertEqual(from_set._dictionary.frequency("the"), 69971)
+        self.assertEqual(from_set._candidates("thw"), {"the": 1})
+
+    def test_corrections_memoised_per_context(self):
+        from api.services.language_correction_service import ContextualSpellCorrector
+
+        corrector = ContextualSpellCorrector(dictionary=self.lexicon)
+        with mock.patch.object(corrector, "_candidates", wraps=corrector._candidates) as candidates:
+            self.assertEqual(corrector._best_correction("systern", "operating", None), "system")
+            self.assertEqual(corrector._best_correction("systern", "operating", None), "system")
+            self.assertEqual(candidates.call_count, 1)
+            corrector._best_correction("systern", "the", None)
+            self.assertEqual(candidates.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+"""
+Tests for batched line recognition
+===================================
+Covers: EasyOCR crops stacked into one ``recognize`` call and mapped back in
+order, Tesseract single-line mode through a persistent tesserocr API (and
+the pytesseract fallback), StructuredOCRExtractor handing every line crop to
+one recogniser call without temp files, and OCRService picking the best
+engine per line in ensemble mode.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+
+from api.services import line_recognition
+from api.services.line_recognition import EasyOCRLineRecognizer, TesseractLineRecognizer
+from api.services.layout_analysis_service import StructuredOCRExtractor
+from api.services.ocr_service import OCRService
+
+
+def crop(width, height=40, value=0):
+    return np.full((height, width, 3), value, dtype=np.uint8)
+
+
+class FakeReader:
+    """``easyocr.Reader.recognize`` stand-in: reads each box's width back as text."""
+
+    def __init__(self):
+        self.calls = []
+
+    def recognize(self, image, horizontal_list, free_list, **kwargs):
+        self.calls.append((image.shape, list(horizontal_list), kwargs))
+        results = []
+        for x_min, x_max, y_min, y_max in reversed(horizontal_list):
+            points = [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+            results.append((points, f"w{x_max - x_min}", 0.9))
+        return results
+
+
+class TestEasyOCRLineRecognizer(unittest.TestCase):
+    """Tests for EasyOCRLineRecognizer."""
+
+    def test_one_recognize_call_per_batch_in_order(self):
+        reader = FakeReader()
+        crops = [crop(100 + i, 30 + i) for i in range(5)]
+        results = EasyOCRLineRecognizer(reader, batch_size=3).recognize(crops)
+
+        self.assertEqual(results, [(f"w{100 + i}", 0.9) for i in range(5)])
+        self.assertEqual(len(reader.calls), 2)
+        shape, boxes, kwargs = reader.calls[0]
+        self.assertEqual(len(shape), 2)                 # grayscale canvas
+        self.assertEqual(kwargs["batch_size"], 3)
+        # Boxes don't overlap: each crop sits on its own rows
+        self.assertTrue(all(a[3] < b[2] for a, b in zip(boxes, boxes[1:])))
+
+    def test_stack_keeps_pixels(self):
+        recognizer = EasyOCRLineRecognizer(FakeReader())
+        canvas, boxes = recognizer.stack([crop(50, 20, value=0), crop(80, 10, value=100)])
+        x0, x1, y0, y1 = boxes[1]
+        self.assertTrue((canvas[y0:y1, x0:x1] == 100).all())
+        self.assertEqual(canvas.shape[1], 80)
+        self.assertTrue((canvas[boxes[0][2]:boxes[0][3], 50:] == 255).all())
+
+
+class FakeTessAPI:
+    instances = []
+
+    def __init__(self, lang, psm):
+        self.lang, self.psm, self.images = lang, psm, []
+        FakeTessAPI.instances.append(self)
+
+    def SetImage(self, image):
+        self.images.append(image.size)
+
+    def GetUTF8Text(self):
+        return f"line {self.images[-1][0]}\n"
+
+    def MeanTextConf(self):
+        return 80
+
+
+class TestTesseractLineRecognizer(unittest.TestCase):
+    """Tests for TesseractLineRecognizer."""
+
+    def setUp(self):
+        line_recognition._tess_local.__dict__.clear()
+        FakeTessAPI.instances = []
+
+    def test_persistent_single_line_api(self):
+        tesserocr = types.SimpleNamespace(PyTessBaseAPI=FakeTessAPI, PSM=types.SimpleNamespace(SINGLE_LINE=7))
+        with mock.patch.dict(sys.modules, {"tesserocr": tesserocr}):
+            recognizer = TesseractLineRecognizer()
+            first = recognizer.recognize([crop(60), crop(70)])
+            second = recognizer.recognize([crop(90)])
+
+        self.assertEqual(first, [("line 60", 0.8), ("line 70", 0.8)])
+        self.assertEqual(second, [("line 90", 0.8)])
+        self.assertEqual(len(FakeTessAPI.instances), 1)
+        self.assertEqual(FakeTessAPI.instances[0].psm, 7)
+
+    def test_pytesseract_fallback_uses_psm_7(self):
+        pytesseract = mock.Mock()
+        pytesseract.image_to_data.return_value = {"text": ["", "Hello", "world"], "conf": [-1, 90, 70]}
+        with mock.patch.dict(sys.modules, {"tesserocr": None}):
+            results = TesseractLineRecognizer(pytesseract).recognize([crop(60)])
+
+        self.assertEqual(results, [("Hello world", 0.8)])
+        self.assertIn("--psm 7", pytesseract.image_to_data.call_args.kwargs["config"])
+
+
+class TestStructuredBatchedLines(unittest.TestCase):
+    """StructuredOCRExtractor with a batched recogniser."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "page.png")
+        page = np.full((900, 1200, 3), 255, np.uint8)
+        for i in range(6):
+            cv2.putText(page, f"Line number {i} has some words", (60, 100 + i * 120),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1.4, (0, 0, 0), 3)
+        cv2.imwrite(self.path, page)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_all_lines_in_one_call_without_temp_files(self):
+        batches = []
+
+        def recognize_lines(crops):
+            batches.append(crops)
+            return [f"text {i}\n" for i in range(len(crops))]
+
+        ocr_func = mock.Mock(return_value="")
+        with mock.patch.object(tempfile, "mktemp", side_effect=AssertionError("temp file written")):
+            result = StructuredOCRExtractor().extract_structured(
+                self.path, ocr_func=ocr_func, recognize_lines=recognize_lines)
+
+        ocr_func.assert_not_called()
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(len(batches[0]), 6)
+        self.assertTrue(all(isinstance(c, np.ndarray) and c.shape[0] >= 30 for c in batches[0]))
+        self.assertEqual(result["layout"]["recognition"], "batched")
+        self.assertEqual(result["full_text"].split("\n"), [f"text {i}" for i in range(6)])
+
+    def test_recogniser_failure_falls_back_to_ocr_func(self):
+        ocr_func = mock.Mock(return_value="fallback")
+        result = StructuredOCRExtractor().extract_structured(
+            self.path, ocr_func=ocr_func, recognize_lines=mock.Mock(side_effect=RuntimeError("no engine")))
+
+        self.assertEqual(ocr_func.call_count, 6)
+        self.assertEqual(result["layout"]["recognition"], "per_region")
+
+
+class TestOCRServiceRecognizeLines(unittest.TestCase):
+    """OCRService._recognize_lines in ensemble mode."""
+
+    def test_best_candidate_per_line(self):
+        service = OCRService(engine="ensemble")
+        service._easyocr_engine, service._tesseract_engine, service._paddleocr_engine = "easy", "tess", None
+        outputs = {
+            "easy": [("The cell membrane", 0.9), ("x9#q", 0.9)],
+            "tess": [("Th3 ce11 m", 0.6), ("is selectively permeable", 0.7)],
+        }
+
+        def recognizer(name, engine, batch_size=32):
+            return types.SimpleNamespace(recognize=lambda crops: outputs[engine])
+
+        with mock.patch.object(line_recognition, "get_line_recognizer", side_effect=recognizer):
+            texts = service._recognize_lines([crop(100), crop(120)])
+
+        self.assertEqual(texts, ["The cell membrane", "is selectively permeable"])
+
+
+if __name__ == "__main__":
+    unittest.main()
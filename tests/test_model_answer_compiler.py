@@ -0,0 +1,140 @@
+"""
+Tests for compiled model-answer artifacts
+==========================================
+Covers: compile output, a single sentence split, JSON round-trip, scorer
+reuse, and version / answer / question invalidation.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from api.services.model_answer_compiler import (
+    ARTIFACT_VERSION,
+    CompiledModelAnswer,
+    ModelAnswerCompiler,
+)
+
+
+class FakeEmbedder:
+    """SemanticAnalyzer stand-in: deterministic bag-of-words vectors."""
+
+    DIM = 16
+    model_name = "fake-model"
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_embedding(self, text):
+        self.calls += 1
+        texts = [text] if isinstance(text, str) else list(text)
+        out = np.zeros((len(texts), self.DIM), dtype=np.float32)
+        for i, t in enumerate(texts):
+            for word in t.lower().split():
+                out[i, sum(map(ord, word)) % self.DIM] += 1.0
+        return out[0] if isinstance(text, str) else out
+
+
+MODEL = (
+    "An operating system manages hardware resources. "
+    "It schedules processes and allocates memory. "
+    "Compare the kernel with user programs."
+)
+
+
+class TestModelAnswerCompiler(unittest.TestCase):
+    """Tests for ModelAnswerCompiler and CompiledModelAnswer."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Keep the test independent of spaCy / NLTK data being installed
+        with mock.patch("api.services.nlp_service.NLPPreprocessor") as nlp_cls:
+            nlp_cls.return_value.normalize_text.side_effect = str.lower
+            nlp_cls.return_value.extract_keywords.return_value = [
+                "operating system", "hardware", "memory",
+            ]
+            cls.artifact = ModelAnswerCompiler(FakeEmbedder()).compile(MODEL)
+
+    def test_compile_collects_model_side_analysis(self):
+        art = self.artifact
+        self.assertEqual(art.version, ARTIFACT_VERSION)
+        self.assertEqual(art.embedding_model, "fake-model")
+        self.assertTrue(art.keywords)
+        self.assertEqual(len(art.sentences), 3)
+        self.assertEqual(art.sentence_embeddings.shape, (3, FakeEmbedder.DIM))
+        self.assertEqual(art.document_embedding.shape, (FakeEmbedder.DIM,))
+        self.assertTrue(art.concept_graph_ok)
+        self.assertGreater(len(art.concept_nodes), 0)
+        self.assertIn(art.bloom_level, range(1, 7))
+
+    def test_model_text_is_split_once(self):
+        from api.services.sentence_alignment_service import SentenceSegmenter
+
+        split = SentenceSegmenter._split_sentences
+        with mock.patch("api.services.nlp_service.NLPPreprocessor"), \
+                mock.patch.object(SentenceSegmenter, "_split_sentences", autospec=True, side_effect=split) as spy:
+            artifact = ModelAnswerCompiler(FakeEmbedder()).compile(MODEL)
+        self.assertEqual(spy.call_count, 1)
+        self.assertEqual(artifact.raw_sentences, [d["text"] for d in artifact.sentences])
+
+    def test_round_trip_through_json_dict(self):
+        import json
+
+        restored = CompiledModelAnswer.from_dict(json.loads(json.dumps(self.artifact.to_dict())))
+        np.testing.assert_array_equal(restored.sentence_embeddings, self.artifact.sentence_embeddings)
+        self.assertEqual(restored.concept_nodes, self.artifact.concept_nodes)
+        self.assertTrue(restored.is_current(MODEL, "fake-model"))
+        self.assertFalse(restored.is_current(MODEL + " changed", "fake-model"))
+        self.assertFalse(restored.is_current(MODEL, "other-model"))
+
+    def test_question_text_is_part_of_currency(self):
+        with mock.patch("api.services.nlp_service.NLPPreprocessor"):
+            artifact = ModelAnswerCompiler(FakeEmbedder()).compile(MODEL, "Compare the kernel with user programs.")
+        self.assertTrue(artifact.is_current(MODEL, "fake-model", " Compare the kernel with user programs."))
+        self.assertFalse(artifact.is_current(MODEL, "fake-model"))
+        self.assertFalse(self.artifact.is_current(MODEL, "fake-model", "Define an operating system."))
+
+    def test_rebuilt_structures_are_fresh_copies(self):
+        g1 = self.artifact.build_concept_graph()
+        g2 = self.artifact.build_concept_graph()
+        self.assertEqual(g1.node_count, len(self.artifact.concept_nodes))
+        first = next(iter(g1.nodes.values()))
+        first.matched = True
+        self.assertFalse(g2.nodes[first.id].matched)
+        self.assertIsNotNone(first.embedding)
+
+        sents = self.artifact.build_sentence_infos()
+        self.assertEqual([s.text for s in sents], [d["text"] for d in self.artifact.sentences])
+        self.assertIsNotNone(sents[0].embedding)
+
+    def test_concept_graph_scorer_skips_model_extraction(self):
+        from api.services.concept_graph_service import ConceptGraphScorer
+        from api.services.evaluation_context import EvaluationContext
+
+        class Encoder:
+            def encode(self, texts, **kwargs):
+                return FakeEmbedder().get_embedding(list(texts))
+
+        context = EvaluationContext(
+            MODEL, "The OS manages hardware and schedules processes.",
+            model_name="fake-model", encoder=Encoder(),
+        )
+        scorer = ConceptGraphScorer()
+        with mock.patch.object(
+            scorer._extractor, "extract_propositions",
+            side_effect=AssertionError("model text re-extracted"),
+        ):
+            result = scorer.score(
+                MODEL, context.student_text, context=context, compiled=self.artifact,
+            )
+        self.assertEqual(result.model_concept_count, len(self.artifact.concept_nodes))
+        self.assertGreaterEqual(result.combined_score, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
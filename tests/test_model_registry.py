@@ -0,0 +1,113 @@
+"""
+Tests for the process-wide Model Registry
+==========================================
+Covers: load-once semantics, thread safety, failure memoisation, stats.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+import unittest
+
+from api.services.model_registry import ModelRegistry, get_model_registry
+
+
+class TestModelRegistry(unittest.TestCase):
+    """Tests for ModelRegistry."""
+
+    def setUp(self):
+        self.registry = ModelRegistry()
+
+    def test_loader_called_once(self):
+        """Repeated lookups return the same instance without reloading."""
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return object()
+
+        first = self.registry.get_or_load("dummy", "m1", loader)
+        second = self.registry.get_or_load("dummy", "m1", loader)
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+
+    def test_distinct_keys_load_separately(self):
+        a = self.registry.get_or_load("dummy", "a", lambda: ["a"])
+        b = self.registry.get_or_load("dummy", "b", lambda: ["b"])
+        self.assertIsNot(a, b)
+        self.assertTrue(self.registry.is_loaded("dummy", "a"))
+        self.assertFalse(self.registry.is_loaded("dummy", "c"))
+
+    def test_concurrent_first_use_loads_once(self):
+        """Threads racing on a cold key trigger exactly one load."""
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.registry.get_or_load("dummy", "slow", slow_loader)
+                )
+            )
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_failure_is_remembered(self):
+        """A failed load raises the same error type without retrying."""
+        calls = []
+
+        def broken():
+            calls.append(1)
+            raise ImportError("not installed")
+
+        for _ in range(3):
+            with self.assertRaises(ImportError):
+                self.registry.get_or_load("dummy", "broken", broken)
+        self.assertEqual(len(calls), 1)
+
+    def test_clear_forgets_models_and_failures(self):
+        self.registry.get_or_load("dummy", "x", lambda: 1)
+        self.registry.clear()
+        self.assertFalse(self.registry.is_loaded("dummy", "x"))
+        self.assertEqual(self.registry.get_stats()["loaded_count"], 0)
+
+    def test_stats_report_timings_and_hits(self):
+        self.registry.get_or_load("dummy", "x", lambda: 1)
+        self.registry.get_or_load("dummy", "x", lambda: 1)
+        try:
+            self.registry.get_or_load("dummy", "y", lambda: 1 / 0)
+        except ZeroDivisionError:
+            pass
+
+        stats = self.registry.get_stats()
+        self.assertEqual(stats["loaded_count"], 1)
+        self.assertEqual(stats["failed_count"], 1)
+        by_name = {m["name"]: m for m in stats["models"]}
+        self.assertEqual(by_name["x"]["hits"], 2)
+        self.assertTrue(by_name["x"]["loaded"])
+        self.assertGreaterEqual(by_name["x"]["load_seconds"], 0.0)
+        self.assertFalse(by_name["y"]["loaded"])
+        self.assertIn("ZeroDivisionError", by_name["y"]["error"])
+
+    def test_singleton(self):
+        self.assertIs(get_model_registry(), get_model_registry())
+
+
+if __name__ == "__main__":
+    unittest.main()
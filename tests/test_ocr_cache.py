@@ -0,0 +1,200 @@
+"""
+Tests for the content-addressed OCR result cache
+=================================================
+Covers: key sensitivity to engine config, LRU size eviction, purge,
+whole-file hits in OCRService.extract_text, page reuse across PDFs, and
+partial (failed-page) results never being cached.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+import time
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from config.settings import settings
+from api.services import ocr_cache, ocr_engine_pool
+from api.services.ocr_cache import OCRCache, ocr_cache_key
+from api.services.ocr_engine_pool import EngineSet, OCREnginePool
+from api.services.ocr_service import OCRService
+
+
+class TestOCRCache(unittest.TestCase):
+    """Tests for OCRCache."""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_key_depends_on_content_and_config(self):
+        config = {"engine": "easyocr", "languages": ["en"], "fast_ocr_mode": True, "preprocessing": 2}
+        key = ocr_cache_key("document", "abc", config)
+        self.assertEqual(key, ocr_cache_key("document", "abc", dict(config)))
+        self.assertNotEqual(key, ocr_cache_key("document", "abd", config))
+        self.assertNotEqual(key, ocr_cache_key("page", "abc", config))
+        for change in ({"engine": "tesseract"}, {"fast_ocr_mode": False}, {"preprocessing": 3}):
+            self.assertNotEqual(key, ocr_cache_key("document", "abc", {**config, **change}))
+
+    def test_round_trip_with_numpy_detail(self):
+        cache = OCRCache(self.dir)
+        self.assertIsNone(cache.get("k1"))
+        cache.put("k1", {"pages": [{"text": "hi", "items": [{"bbox": np.array([[1, 2]]), "confidence": np.float32(0.5)}]}]})
+        record = cache.get("k1")
+        self.assertEqual(record["pages"][0]["items"][0]["bbox"], [[1, 2]])
+        stats = cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+
+    def test_evicts_least_recently_used_beyond_budget(self):
+        cache = OCRCache(self.dir, max_bytes=3000)
+        payload = {"text": "x" * 900}
+        for i, key in enumerate(("a1", "b2", "c3")):
+            cache.put(key, payload)
+            os.utime(cache._path(key), (time.time() - 100 + i, time.time() - 100 + i))
+        cache.get("a1")  # most recently used now
+        cache.put("d4", payload)
+
+        self.assertIsNotNone(cache.get("a1"))
+        self.assertIsNone(cache.get("b2"))
+        self.assertIsNotNone(cache.get("d4"))
+        self.assertLessEqual(cache.get_stats()["size_bytes"], 3000)
+        self.assertGreaterEqual(cache.evictions, 1)
+
+    def test_purge(self):
+        cache = OCRCache(self.dir)
+        cache.put("a1", {"text": "one"})
+        cache.put("b2", {"text": "two"})
+        self.assertEqual(cache.purge(), 2)
+        self.assertEqual(cache.get_stats()["entries"], 0)
+
+
+class TestOCRServiceCaching(unittest.TestCase):
+    """Tests for OCRService use of the OCR cache."""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = OCRCache(os.path.join(self.dir, "cache"))
+        self.patches = [
+            mock.patch.object(ocr_cache, "_cache", self.cache),
+            mock.patch.object(ocr_engine_pool, "_pool", OCREnginePool(loader=lambda key: EngineSet(key=key))),
+            mock.patch.multiple(settings, OCR_CACHE_ENABLED=True, OCR_PDF_PAGE_TIMEOUT=0),
+        ]
+        for p in self.patches:
+            p.start()
+        self.service = OCRService(engine="easyocr", languages=["en"])
+        self.service._ensure_engine_initialized = mock.Mock()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _file(self, name, content):
+        path = os.path.join(self.dir, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_same_bytes_hit_without_engine(self):
+        first = self._file("section_a.png", b"same scan")
+        second = self._file("section_b.png", b"same scan")
+        with mock.patch.object(self.service, "_extract_single_engine", return_value="Newton's laws") as ocr:
+            self.assertEqual(self.service.extract_text(first), "Newton's laws")
+            self.assertEqual(self.service.extract_text(second), "Newton's laws")
+            self.assertEqual(ocr.call_count, 1)
+            self.assertEqual(self.service._ensure_engine_initialized.call_count, 1)
+
+            # Another engine configuration is a different entry
+            self.service._fast_ocr_mode = not self.service._fast_ocr_mode
+            self.service.extract_text(second)
+            self.assertEqual(ocr.call_count, 2)
+
+            # So is another decode budget
+            with mock.patch.object(settings, "OCR_MAX_MEGAPIXELS", 4.0):
+                self.service.extract_text(second)
+            self.assertEqual(ocr.call_count, 3)
+
+    def test_grammar_budget_exhausted_result_not_cached(self):
+        path = self._file("essay.png", b"long essay")
+        corrector = mock.Mock()
+        corrector.correct.side_effect = [
+            {"corrected_text": "Half corrected", "complete": False},
+            {"corrected_text": "Fully corrected", "complete": True},
+            AssertionError("corrected again"),
+        ]
+        self.service._language_corrector = corrector
+        self.service._enable_language_correction = True
+
+        def extract(path, preprocess, detail):
+            return self.service._apply_language_correction("raw essay text")
+
+        with mock.patch.object(self.service, "_ensure_language_corrector"), \
+                mock.patch.object(self.service, "_extract_single_engine", side_effect=extract):
+            self.assertEqual(self.service.extract_text(path), "Half corrected")
+            self.assertEqual(self.service.extract_text(path), "Fully corrected")
+            self.assertEqual(self.service.extract_text(path), "Fully corrected")   # cached
+
+    def test_pdf_pages_reused_and_partial_results_not_cached(self):
+        rendered = {0: b"cover", 1: b"answer one", 2: b"answer two"}
+        calls = []
+
+        def fake_fitz():
+            def page(i):
+                return types.SimpleNamespace(
+                    get_text=lambda: "",
+                    rect=types.SimpleNamespace(width=100.0, height=100.0),
+                    get_pixmap=lambda matrix=None: types.SimpleNamespace(tobytes=lambda fmt: rendered[i]),
+                )
+            return types.SimpleNamespace(open=lambda path: FakeDoc(page, len(rendered)), Matrix=lambda x, y: (x, y))
+
+        def ocr_page(png, index, total, preprocess, detail, language):
+            calls.append(png)
+            if png == b"answer two" and len(calls) <= 3:
+                raise RuntimeError("engine crashed")
+            return png.decode().upper()
+
+        with mock.patch.dict(sys.modules, {"fitz": fake_fitz()}), \
+                mock.patch.object(self.service, "_ocr_pdf_page", side_effect=ocr_page):
+            pdf_a = self._file("a.pdf", b"pdf A")
+            self.assertEqual(self.service.extract_text(pdf_a), "COVER\n\nANSWER ONE\n\n")
+            self.assertEqual(len(calls), 3)
+
+            # Failed page → document not cached; the good pages are
+            self.assertEqual(self.service.extract_text(pdf_a), "COVER\n\nANSWER ONE\n\nANSWER TWO")
+            self.assertEqual(calls[3:], [b"answer two"])
+
+            # Now complete → whole-file hit
+            self.service.extract_text(pdf_a)
+            self.assertEqual(len(calls), 4)
+
+            # Different PDF bytes, same rendered pages → page-level hits
+            pdf_b = self._file("b.pdf", b"pdf B")
+            self.assertEqual(self.service.extract_text(pdf_b), "COVER\n\nANSWER ONE\n\nANSWER TWO")
+            self.assertEqual(len(calls), 4)
+
+
+class FakeDoc:
+    def __init__(self, page, count):
+        self._page = page
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def load_page(self, index):
+        return self._page(index)
+
+    def close(self):
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+Tests for the OCR engine pool
+==============================
+Covers: one load per key reused across checkouts, the per-key cap with
+waiting and timeout, holds deferring check-in, idle eviction, a failed load releasing its slot, and
+OCRService binding a pooled engine set for one extraction.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from config.settings import settings
+from api.services import ocr_engine_pool
+from api.services.ocr_engine_pool import EngineCheckoutTimeout, EngineSet, OCREnginePool
+from api.services.ocr_service import OCRService, get_quality_analyzer
+
+
+class FakeLoader:
+    """Counts loads; ``fail`` makes the next load raise."""
+
+    def __init__(self):
+        self.loads = 0
+        self.fail = False
+
+    def __call__(self, key):
+        if self.fail:
+            self.fail = False
+            raise RuntimeError("engine not installed")
+        self.loads += 1
+        return EngineSet(key=key, easyocr=f"reader-{self.loads}")
+
+
+class TestOCREnginePool(unittest.TestCase):
+    """Tests for OCREnginePool."""
+
+    def setUp(self):
+        self.loader = FakeLoader()
+        self.pool = OCREnginePool(max_per_key=1, idle_seconds=0, checkout_timeout=5, loader=self.loader)
+
+    def test_engines_loaded_once_and_reused(self):
+        with self.pool.checkout("easyocr", ["en"]) as first:
+            pass
+        with self.pool.checkout("easyocr", ["en"]) as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(self.loader.loads, 1)
+        self.assertEqual(second.uses, 2)
+
+        # Different languages are a different key
+        with self.pool.checkout("easyocr", ["en", "hi"]) as other:
+            self.assertIsNot(other, first)
+        self.assertEqual(self.loader.loads, 2)
+
+    def test_cap_waits_for_checkin_and_times_out(self):
+        engines = self.pool.acquire("easyocr", ["en"])
+        with self.assertRaises(EngineCheckoutTimeout):
+            self.pool.acquire("easyocr", ["en"], timeout=0.1)
+
+        got = []
+        waiter = threading.Thread(target=lambda: got.append(self.pool.acquire("easyocr", ["en"])))
+        waiter.start()
+        time.sleep(0.1)
+        self.assertEqual(got, [])
+        self.pool.release(engines)
+        waiter.join(2)
+
+        self.assertEqual(got, [engines])
+        self.assertEqual(self.loader.loads, 1)
+        self.assertEqual(self.pool.get_stats()["waits"], 2)
+
+    def test_held_set_checked_in_after_last_hold(self):
+        with self.pool.checkout("easyocr", ["en"]) as engines:
+            self.pool.hold(engines)
+        with self.assertRaises(EngineCheckoutTimeout):
+            self.pool.acquire("easyocr", ["en"], timeout=0.1)
+
+        self.pool.drop_hold(engines)
+        with self.pool.checkout("easyocr", ["en"], timeout=0.1) as again:
+            self.assertIs(again, engines)
+
+    def test_idle_sets_evicted(self):
+        self.pool.idle_seconds = 60
+        with self.pool.checkout("easyocr", ["en"]):
+            pass
+        self.assertEqual(self.pool.evict_idle(now=time.time() + 30), 0)
+        self.assertEqual(self.pool.evict_idle(now=time.time() + 120), 1)
+        self.assertEqual(self.pool.get_stats()["keys"], [])
+
+        with self.pool.checkout("easyocr", ["en"]):
+            pass
+        self.assertEqual(self.loader.loads, 2)
+
+    def test_failed_load_releases_slot(self):
+        self.loader.fail = True
+        with self.assertRaises(RuntimeError):
+            self.pool.acquire("easyocr", ["en"], timeout=0.1)
+        with self.pool.checkout("easyocr", ["en"], timeout=0.1) as engines:
+            self.assertEqual(engines.easyocr, "reader-1")
+
+
+class TestOCRServicePooledEngines(unittest.TestCase):
+    """Tests for OCRService checking engines out of the shared pool."""
+
+    def setUp(self):
+        self.loader = FakeLoader()
+        self.pool = OCREnginePool(max_per_key=1, idle_seconds=0, loader=self.loader)
+        self.patches = [
+            mock.patch.object(ocr_engine_pool, "_pool", self.pool),
+            mock.patch.multiple(settings, OCR_CACHE_ENABLED=False, LOW_MEMORY_MODE=True),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+
+    def test_services_share_engines_and_analyzer(self):
+        seen = []
+
+        def single_engine(image_path, preprocess, detail):
+            seen.append(service._easyocr_engine)
+            return "text"
+
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
+            f.write(b"scan")
+        try:
+            for _ in range(2):
+                service = OCRService(engine="easyocr", languages=["en"])
+                self.assertIsNone(service._easyocr_engine)
+                with mock.patch.object(service, "_extract_single_engine", side_effect=single_engine):
+                    self.assertEqual(service.extract_text(f.name), "text")
+                self.assertIsNone(service._easyocr_engine)  # checked back in
+                self.assertIs(service.quality_analyzer, get_quality_analyzer())
+        finally:
+            os.remove(f.name)
+
+        self.assertEqual(seen, ["reader-1", "reader-1"])
+        self.assertEqual(self.loader.loads, 1)
+
+    def test_assigned_engine_overrides_pool(self):
+        service = OCRService(engine="easyocr", languages=["en"])
+        service._easyocr_engine = "test-reader"
+        with service._engines():
+            self.assertEqual(service._easyocr_engine, "test-reader")
+        self.assertEqual(self.loader.loads, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
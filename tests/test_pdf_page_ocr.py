@@ -0,0 +1,314 @@
+"""
+Tests for page-parallel PDF OCR
+================================
+Covers: page order after out-of-order completion, the page-worker cap,
+memory-budgeted worker count, per-page timeouts keeping a partial
+result, abandoned pages keeping their worker slot, the timeout not
+running while a page waits for an engine set, and page workers never
+outnumbering the engine pool's sets (with the default settings).  PyMuPDF
+is replaced by a small fake document and the engine pool by a semaphore.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+import types
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+
+from config.settings import settings
+from api.services.ocr_service import OCRService
+
+
+class FakePixmap:
+    def __init__(self, index):
+        self.index = index
+
+    def tobytes(self, fmt):
+        return f"page-{self.index}".encode()
+
+
+class FakePage:
+    def __init__(self, index, text="", size=(595.0, 842.0)):
+        self.index = index
+        self.text = text
+        self.rect = types.SimpleNamespace(width=size[0], height=size[1])
+
+    def get_text(self):
+        return self.text
+
+    def get_pixmap(self, matrix=None):
+        return FakePixmap(self.index)
+
+
+class FakeDoc:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def __len__(self):
+        return len(self.pages)
+
+    def load_page(self, index):
+        return self.pages[index]
+
+    def close(self):
+        pass
+
+
+def fake_fitz(doc):
+    return types.SimpleNamespace(open=lambda path: doc, Matrix=lambda x, y: (x, y))
+
+
+def engine_pool(size, waits=None):
+    """Stand-in for OCRService._engines: *size* engine sets, held for the page.
+
+    Checkouts that had to wait for a set are appended to *waits*.
+    """
+    sets = threading.Semaphore(size)
+
+    @contextmanager
+    def engines(engine=None):
+        if not sets.acquire(blocking=False):
+            if waits is not None:
+                waits.append(threading.current_thread().name)
+            sets.acquire()
+        try:
+            yield None
+        finally:
+            sets.release()
+    return engines
+
+
+class TestPdfPageOcr(unittest.TestCase):
+    """Tests for OCRService._extract_from_pdf page parallelism."""
+
+    def setUp(self):
+        self.service = OCRService(engine="easyocr")
+        self.service.low_memory_mode = False
+        self.settings = mock.patch.multiple(
+            settings,
+            OCR_PDF_PAGE_WORKERS=3,
+            OCR_PDF_MEMORY_BUDGET_MB=0,
+            OCR_PDF_PAGE_TIMEOUT=0,
+            OCR_CACHE_ENABLED=False,
+        )
+        self.settings.start()
+        self.engines = engine_pool(8)
+        self.pool = mock.patch(
+            "api.services.ocr_engine_pool.get_ocr_engine_pool",
+            return_value=types.SimpleNamespace(max_per_key=8),
+        )
+        self.pool.start()
+
+    def tearDown(self):
+        self.pool.stop()
+        self.settings.stop()
+
+    def _extract(self, doc, ocr_page, detail=False):
+        with mock.patch.dict(sys.modules, {"fitz": fake_fitz(doc)}), \
+                mock.patch.object(self.service, "_engines", self.engines), \
+                mock.patch.object(self.service, "_ocr_pdf_page", side_effect=ocr_page):
+            return self.service._extract_from_pdf("booklet.pdf", True, detail, language="en")
+
+    def test_pages_reassembled_in_order_with_bounded_concurrency(self):
+        embedded = "Embedded text that is comfortably longer than fifty characters on page 3."
+        pages = [FakePage(i) for i in range(6)]
+        pages[2] = FakePage(2, text=embedded)
+        lock = threading.Lock()
+        active, peak = [0], [0]
+
+        def ocr_page(png, index, total, preprocess, detail, language):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            # Earlier pages finish last
+            time.sleep(0.05 * (6 - index))
+            with lock:
+                active[0] -= 1
+            return png.decode()
+
+        text = self._extract(FakeDoc(pages), ocr_page)
+        self.assertEqual(
+            text.split("\n\n"),
+            ["page-0", "page-1", embedded, "page-3", "page-4", "page-5"],
+        )
+        self.assertEqual(peak[0], 3)
+
+    def test_timed_out_page_keeps_partial_result(self):
+        settings.OCR_PDF_PAGE_TIMEOUT = 0.3
+        release = threading.Event()
+
+        def ocr_page(png, index, total, preprocess, detail, language):
+            if index == 1:
+                release.wait(5)
+            return png.decode()
+
+        try:
+            start = time.time()
+            text = self._extract(FakeDoc([FakePage(i) for i in range(4)]), ocr_page)
+            self.assertLess(time.time() - start, 2.0)
+        finally:
+            release.set()
+        self.assertEqual(text.split("\n\n"), ["page-0", "", "page-2", "page-3"])
+
+    def test_timed_out_page_marked_in_detail_mode(self):
+        settings.OCR_PDF_PAGE_TIMEOUT = 0.2
+        release = threading.Event()
+
+        def ocr_page(png, index, total, preprocess, detail, language):
+            if index == 0:
+                release.wait(5)
+            return [{"text": png.decode(), "confidence": 0.9}]
+
+        try:
+            items = self._extract(FakeDoc([FakePage(i) for i in range(2)]), ocr_page, detail=True)
+        finally:
+            release.set()
+        self.assertEqual([(d["page"], d.get("source")) for d in items], [(1, "timeout"), (2, None)])
+
+    def test_abandoned_page_keeps_its_worker_slot(self):
+        settings.OCR_PDF_PAGE_WORKERS = 2
+        settings.OCR_PDF_PAGE_TIMEOUT = 0.2
+        release = threading.Event()
+        lock = threading.Lock()
+        active, peak = [0], [0]
+
+        def ocr_page(png, index, total, preprocess, detail, language):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            try:
+                if index == 0:
+                    release.wait(5)
+                else:
+                    time.sleep(0.1)
+                return png.decode()
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        try:
+            text = self._extract(FakeDoc([FakePage(i) for i in range(5)]), ocr_page)
+        finally:
+            release.set()
+        self.assertEqual(text.split("\n\n"), ["", "page-1", "page-2", "page-3", "page-4"])
+        self.assertEqual(peak[0], 2)
+
+    def test_waiting_for_an_engine_does_not_time_out(self):
+        settings.OCR_PDF_PAGE_TIMEOUT = 0.3
+        self.engines = engine_pool(1)       # LOW_MEMORY_MODE: one set per key
+
+        def ocr_page(png, index, total, preprocess, detail, language):
+            time.sleep(0.2)
+            return png.decode()
+
+        text = self._extract(FakeDoc([FakePage(i) for i in range(3)]), ocr_page)
+        self.assertEqual(text.split("\n\n"), ["page-0", "page-1", "page-2"])
+
+    def test_slots_held_by_abandoned_pages_skip_the_rest(self):
+        settings.OCR_PDF_PAGE_WORKERS = 1
+        settings.OCR_PDF_PAGE_TIMEOUT = 0.2
+        self.engines = engine_pool(1)
+        release = threading.Event()
+        calls = []
+
+        def ocr_page(png, index, total, preprocess, detail, language):
+            calls.append(index)
+            release.wait(5)
+            return png.decode()
+
+        pages = []
+        try:
+            start = time.time()
+            with mock.patch.dict(sys.modules, {"fitz": fake_fitz(FakeDoc([FakePage(i) for i in range(3)]))}), \
+                    mock.patch.object(self.service, "_engines", self.engines), \
+                    mock.patch.object(self.service, "_ocr_pdf_page", side_effect=ocr_page):
+                text = self.service._extract_from_pdf("booklet.pdf", True, False, language="en", pages=pages)
+            self.assertLess(time.time() - start, 2.0)
+        finally:
+            release.set()
+        self.assertEqual(text.split("\n\n"), ["", "", ""])
+        self.assertEqual(calls, [0])
+        self.assertEqual([p["source"] for p in pages], ["timeout"] * 3)
+
+    def test_failed_page_does_not_fail_document(self):
+        def ocr_page(png, index, total, preprocess, detail, language):
+            if index == 0:
+                raise RuntimeError("engine crashed")
+            return png.decode()
+
+        text = self._extract(FakeDoc([FakePage(i) for i in range(2)]), ocr_page)
+        self.assertEqual(text.split("\n\n"), ["", "page-1"])
+
+    def test_worker_count_respects_memory_budget_and_low_memory_mode(self):
+        doc = FakeDoc([FakePage(i, size=(2000.0, 3000.0)) for i in range(8)])
+        pages = list(range(8))
+        self.assertEqual(self.service._pdf_page_workers(doc, pages), 3)
+
+        # 2000x3000pt at 2x, RGB, x5 working set ≈ 343 MB per page
+        settings.OCR_PDF_MEMORY_BUDGET_MB = 700
+        self.assertEqual(self.service._pdf_page_workers(doc, pages), 2)
+        settings.OCR_PDF_MEMORY_BUDGET_MB = 100
+        self.assertEqual(self.service._pdf_page_workers(doc, pages), 1)
+
+        settings.OCR_PDF_MEMORY_BUDGET_MB = 0
+        self.service.low_memory_mode = True
+        with mock.patch.object(settings, "OCR_PDF_LOW_MEMORY_PAGE_WORKERS", 2):
+            self.assertEqual(self.service._pdf_page_workers(doc, pages), 2)
+        self.assertEqual(self.service._pdf_page_workers(doc, pages[:1]), 1)
+
+    def test_worker_count_capped_by_engine_sets(self):
+        doc = FakeDoc([FakePage(i) for i in range(8)])
+        with mock.patch(
+            "api.services.ocr_engine_pool.get_ocr_engine_pool",
+            return_value=types.SimpleNamespace(max_per_key=2),
+        ):
+            self.assertEqual(self.service._pdf_page_workers(doc, list(range(8))), 2)
+
+
+class TestPdfPageWorkersDefaults(unittest.TestCase):
+    """Page workers against the engine pool built from the default settings."""
+
+    def test_pages_never_wait_for_an_engine_set(self):
+        from config.settings import Settings
+        from api.services import ocr_engine_pool
+
+        defaults = Settings()
+        service = OCRService(engine="easyocr")
+        for low_memory in (True, False):
+            with self.subTest(low_memory=low_memory), \
+                    mock.patch.object(settings, "LOW_MEMORY_MODE", low_memory), \
+                    mock.patch.multiple(
+                        settings,
+                        OCR_PDF_PAGE_WORKERS=defaults.OCR_PDF_PAGE_WORKERS,
+                        OCR_PDF_LOW_MEMORY_PAGE_WORKERS=defaults.OCR_PDF_LOW_MEMORY_PAGE_WORKERS,
+                        OCR_ENGINE_POOL_SIZE=defaults.OCR_ENGINE_POOL_SIZE,
+                        OCR_ENGINE_LOW_MEMORY_POOL_SIZE=defaults.OCR_ENGINE_LOW_MEMORY_POOL_SIZE,
+                        OCR_PDF_MEMORY_BUDGET_MB=0, OCR_PDF_PAGE_TIMEOUT=0, OCR_CACHE_ENABLED=False,
+                    ), \
+                    mock.patch.object(ocr_engine_pool, "_pool", None):
+                service.low_memory_mode = low_memory
+                sets = ocr_engine_pool.get_ocr_engine_pool().max_per_key
+                waits = []
+                doc = FakeDoc([FakePage(i) for i in range(6)])
+
+                def ocr_page(png, index, total, preprocess, detail, language):
+                    time.sleep(0.02)
+                    return png.decode()
+
+                with mock.patch.dict(sys.modules, {"fitz": fake_fitz(doc)}), \
+                        mock.patch.object(service, "_engines", engine_pool(sets, waits)), \
+                        mock.patch.object(service, "_ocr_pdf_page", side_effect=ocr_page):
+                    text = service._extract_from_pdf("booklet.pdf", True, False, language="en")
+
+                self.assertEqual(text.split("\n\n"), [f"page-{i}" for i in range(6)])
+                self.assertEqual(service._pdf_page_workers(doc, list(range(6))), sets)
+                self.assertEqual(waits, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Query-plan regression suite for hot list / dashboard queries
+=============================================================
+Covers: ``EXPLAIN QUERY PLAN`` of each hot query (built the way the routes
+build it) on a database migrated to head, failing when a query falls back
+to a full scan (of the table, or of an unrelated index) instead of an
+index search, or sorts a newest-first list in a temp B-tree; and the
+partial indexes rendering their ``WHERE`` clause for PostgreSQL.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, desc, func, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.schema import CreateIndex
+
+from database.models import (
+    ActivityLog, ActivityType, CommunityMessage, Evaluation, Grievance, GrievancePriority,
+    GrievanceStatus, ManualEvaluation, Student, UserRole, UserStatus,
+)
+from database.schema import upgrade_database
+
+
+# name -> (statement, must the ORDER BY come from the index?)
+HOT_QUERIES = {
+    "student evaluations (students.py)": (
+        select(Evaluation).where(Evaluation.student_id == 7).order_by(desc(Evaluation.created_at)).limit(20),
+        True),
+    "teacher evaluations (teachers.py, dashboard.py)": (
+        select(Evaluation).where(Evaluation.teacher_id == 3).order_by(desc(Evaluation.created_at)).limit(20),
+        True),
+    "teacher review queue (teachers.py)": (
+        select(Evaluation).where(Evaluation.teacher_id == 3, Evaluation.is_reviewed == False)
+        .order_by(desc(Evaluation.created_at)).limit(20),
+        True),
+    "student manual evaluations (students.py)": (
+        select(ManualEvaluation).where(ManualEvaluation.student_id == 7)
+        .order_by(desc(ManualEvaluation.created_at)),
+        True),
+    "community messages (community.py)": (
+        select(CommunityMessage).where(CommunityMessage.community_id == 2, CommunityMessage.is_deleted == False)
+        .order_by(desc(CommunityMessage.created_at)).limit(50),
+        True),
+    "grievances by status and priority (grievance.py)": (
+        select(func.count(Grievance.id)).where(Grievance.status == GrievanceStatus.PENDING,
+                                               Grievance.priority == GrievancePriority.HIGH),
+        False),
+    "grievance priority counts (grievance.py)": (
+        select(func.count(Grievance.id)).where(Grievance.priority == GrievancePriority.URGENT),
+        False),
+    "student grievances (grievance.py)": (
+        select(Grievance).where(Grievance.complainant_student_id == 7).order_by(desc(Grievance.created_at)),
+        True),
+    "teacher grievances (grievance.py)": (
+        select(Grievance).where(or_(Grievance.assigned_teacher_id == 3, Grievance.complainant_teacher_id == 3)),
+        False),
+    "activity logs by role (admin.py)": (
+        select(ActivityLog).where(ActivityLog.user_role == UserRole.TEACHER)
+        .order_by(desc(ActivityLog.created_at)).limit(50),
+        True),
+    "activity logs by type (admin.py)": (
+        select(ActivityLog).where(ActivityLog.activity_type == ActivityType.LOGIN)
+        .order_by(desc(ActivityLog.created_at)).limit(50),
+        True),
+    "teacher students by class (teachers.py)": (
+        select(Student).where(Student.teacher_id == 3, Student.class_id == 4, Student.status == UserStatus.ACTIVE),
+        False),
+    "teacher student count (teachers.py)": (
+        select(func.count(Student.id)).where(Student.teacher_id == 3),
+        False),
+}
+
+
+class TestHotQueryPlans(unittest.TestCase):
+    """EXPLAIN QUERY PLAN on a database migrated to head."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        cls.engine = create_engine(f"sqlite:///{os.path.join(cls.tmp, 'plans.db')}")
+        upgrade_database(cls.engine, auto_migrate=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.engine.dispose()
+        shutil.rmtree(cls.tmp, ignore_errors=True)
+
+    def plan(self, statement):
+        sql = str(statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+        with self.engine.connect() as connection:
+            return [row[3] for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)]
+
+    def test_no_full_table_scans(self):
+        for name, (statement, ordered) in HOT_QUERIES.items():
+            with self.subTest(name):
+                plan = self.plan(statement)
+                # "SCAN t" and "SCAN t USING INDEX ix" both visit every row
+                scans = [step for step in plan if step.startswith("SCAN")]
+                self.assertEqual(scans, [], f"{name}: {plan}")
+                if ordered:
+                    self.assertFalse(any("TEMP B-TREE" in step for step in plan), f"{name}: {plan}")
+
+    def test_partial_indexes_used(self):
+        plan = " ".join(self.plan(HOT_QUERIES["community messages (community.py)"][0]))
+        self.assertIn("ix_community_messages_live", plan)
+        plan = " ".join(self.plan(HOT_QUERIES["teacher review queue (teachers.py)"][0]))
+        self.assertIn("ix_evaluations_teacher_pending", plan)
+
+
+class TestPartialIndexDialects(unittest.TestCase):
+    def test_where_clause_for_both_dialects(self):
+        index = next(ix for ix in CommunityMessage.__table__.indexes if ix.name == "ix_community_messages_live")
+        self.assertIn("WHERE is_deleted = 0", str(CreateIndex(index).compile(dialect=sqlite.dialect())))
+        self.assertIn("WHERE is_deleted = false", str(CreateIndex(index).compile(dialect=postgresql.dialect())))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,299 @@
+"""
+Tests for the indexed evaluation result store
+==============================================
+Covers: compressed report round trips, the bounded report LRU, filtered /
+sorted / paginated listing and statistics from the summary index (without
+reading reports), running totals kept in step with saves, re-tags and
+deletes, owner tagging, deletion, cached reports checked against writes by
+other workers, the one-time import of legacy JSON files and SQLite stores,
+and the /results routes on top of the store.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import json
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine, event
+
+from api.services import result_store
+from api.services.result_store import ResultStore
+from api.routes import results as results_routes
+from database.models import Base
+
+
+def report(score, grade, timestamp, **extra):
+    return {"evaluation_id": extra.pop("evaluation_id", None), "final_score": score, "max_marks": 10,
+            "obtained_marks": score / 10, "grade": grade, "timestamp": timestamp,
+            "explanation": "x" * 2000, **extra}
+
+
+def database(tmp):
+    engine = create_engine(f"sqlite:///{os.path.join(tmp, 'assessiq.db')}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+class TestResultStore(unittest.TestCase):
+    """Tests for ResultStore."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.engine = database(self.tmp)
+        self.store = ResultStore(self.engine, cache_size=2)
+        for i, (score, grade) in enumerate([(91, "excellent"), (72, "good"), (55, "average"), (78, "Good")]):
+            self.store.save(f"ev{i}", report(score, grade, f"2026-01-0{i + 1}T10:00:00"),
+                            teacher_id="t1" if i % 2 else "t2")
+
+    def tearDown(self):
+        self.engine.dispose()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_report_round_trip_is_compressed(self):
+        self.store._cache.clear()
+        self.assertEqual(self.store.get("ev0")["explanation"], "x" * 2000)
+        with self.engine.connect() as connection:
+            blob = connection.exec_driver_sql(
+                "SELECT detail FROM result_details WHERE evaluation_id='ev0'").scalar()
+        self.assertLess(len(blob), 300)
+        self.assertIsNone(self.store.get("missing"))
+
+    def test_report_cache_is_bounded_lru(self):
+        for key in ("ev0", "ev1", "ev0", "ev2"):
+            self.store.get(key)
+        self.assertEqual(list(self.store._cache), ["ev0", "ev2"])
+
+    def test_list_filters_sorts_and_paginates_without_reports(self):
+        self.store._cache.clear()
+        with mock.patch.object(result_store, "decompress", side_effect=AssertionError("report read")):
+            total, rows = self.store.list(limit=1, offset=1, grade="GOOD")
+            self.assertEqual((total, [r["evaluation_id"] for r in rows]), (2, ["ev1"]))
+            total, rows = self.store.list(min_score=70, max_score=80)
+            self.assertEqual([r["evaluation_id"] for r in rows], ["ev3", "ev1"])
+            self.assertEqual(self.store.list(teacher_id="t1")[0], 2)
+            stats = self.store.statistics()
+
+        self.assertEqual(stats["total_evaluations"], 4)
+        self.assertEqual(stats["average_score"], 74.0)
+        self.assertEqual((stats["highest_score"], stats["lowest_score"]), (91, 55))
+        self.assertEqual(sum(stats["grade_distribution"].values()), 4)
+
+    def test_listing_uses_indexes(self):
+        with self.engine.connect() as connection:
+            plan = " ".join(row[3] for row in connection.exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT evaluation_id FROM result_summaries WHERE grade = ? "
+                "ORDER BY timestamp DESC LIMIT 10", ("good",)))
+        self.assertIn("ix_result_summaries_grade_timestamp", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_tag_and_delete(self):
+        self.assertTrue(self.store.tag("ev2", class_id="10A"))
+        self.assertEqual([r["evaluation_id"] for r in self.store.list(class_id="10A")[1]], ["ev2"])
+        self.assertFalse(self.store.tag("missing", class_id="10A"))
+
+        self.assertTrue(self.store.delete("ev2"))
+        self.assertFalse(self.store.delete("ev2"))
+        self.assertIsNone(self.store.get("ev2"))
+        self.assertEqual(self.store.list()[0], 3)
+
+    def test_multi_question_reports_use_overall_fields(self):
+        self.store.save("multi", {"overall_percentage": 64.5, "overall_grade": "average", "total_max_marks": 40,
+                                  "total_obtained_marks": 25.8, "timestamp": "2026-02-01T00:00:00"})
+        row = self.store.list(limit=1)[1][0]
+        self.assertEqual((row["final_score"], row["grade"], row["max_marks"]), (64.5, "average", 40))
+
+
+class TestRunningTotals(unittest.TestCase):
+    """result_totals maintained on every write."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.engine = database(self.tmp)
+        self.store = ResultStore(self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_totals_follow_saves_tags_and_deletes(self):
+        for i, score in enumerate([30, 50, 70, 90]):
+            self.store.save(f"r{i}", report(score, "good" if i % 2 else "Poor", f"2026-01-0{i + 1}"),
+                            teacher_id="t1")
+        self.store.tag("r3", class_id="c1")
+        self.store.save("r1", report(95, "excellent", "2026-01-02"), teacher_id="t1")   # replaced
+        self.store.delete("r0")                                                        # was the minimum
+        self.assertEqual(self.store.check_totals(), [])
+
+        stats = self.store.statistics()
+        self.assertEqual((stats["total_evaluations"], stats["lowest_score"], stats["highest_score"]), (3, 70, 95))
+        self.assertEqual(stats["grade_distribution"], {"excellent": 1, "good": 1, "poor": 1})
+        self.assertEqual(self.store.statistics(class_id="c1")["average_score"], 90.0)
+
+    def test_owner_statistics_read_only_totals(self):
+        self.store.save("a", report(80, "good", "2026-01-01"), teacher_id="t1")
+        self.store.save("b", report(60, "average", "2026-01-02"), teacher_id="t2")
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        stats = self.store.statistics(teacher_id="t1")
+        event.remove(self.engine, "before_cursor_execute", record)
+
+        self.assertEqual((stats["total_evaluations"], stats["average_score"]), (1, 80.0))
+        self.assertTrue(statements)
+        self.assertFalse(any("result_summaries" in sql for sql in statements))
+
+    def test_rebuild_repairs_totals(self):
+        self.store.save("a", report(80, "good", "2026-01-01"), teacher_id="t1")
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql("DELETE FROM result_totals")
+        self.assertNotEqual(self.store.check_totals(), [])
+
+        self.assertEqual(self.store.rebuild_totals(), 2)
+        self.assertEqual(self.store.check_totals(), [])
+        self.assertEqual(self.store.statistics()["total_evaluations"], 1)
+
+
+class TestCacheAcrossWorkers(unittest.TestCase):
+    """Two stores on one database, as two API workers."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.engine = database(self.tmp)
+        self.worker1 = ResultStore(self.engine)
+        self.worker2 = ResultStore(self.engine)
+        self.worker1.save("r", report(70, "good", "2026-01-01"))
+
+    def tearDown(self):
+        self.engine.dispose()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_unchanged_report_served_from_cache(self):
+        with mock.patch.object(result_store, "decompress", side_effect=AssertionError("report read")):
+            self.assertEqual(self.worker1.get("r")["final_score"], 70)
+        self.assertEqual(self.worker1.hits, 1)
+
+    def test_writes_by_another_worker_are_seen(self):
+        self.assertEqual(self.worker2.get("r")["grade"], "good")
+
+        self.assertTrue(self.worker1.tag("r", class_id="10A"))
+        self.assertEqual(self.worker2.get("r")["class_id"], "10A")
+        self.worker1.save("r", report(40, "poor", "2026-01-01"))
+        self.assertEqual(self.worker2.get("r")["final_score"], 40)
+
+        self.assertTrue(self.worker1.delete("r"))
+        self.assertIsNone(self.worker2.get("r"))
+        self.assertNotIn("r", self.worker2._cache)
+
+
+class TestLegacyImport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.engine = database(self.tmp)
+        self.legacy = os.path.join(self.tmp, "results")
+        os.makedirs(self.legacy)
+
+    def tearDown(self):
+        self.engine.dispose()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_json_files_imported_once(self):
+        for i in range(3):
+            with open(os.path.join(self.legacy, f"old{i}.json"), "w") as f:
+                json.dump(report(60 + i, "good", f"2025-12-0{i + 1}", evaluation_id=f"old{i}"), f, indent=2)
+        with open(os.path.join(self.legacy, "broken.json"), "w") as f:
+            f.write("{")
+
+        store = ResultStore(self.engine, legacy_dir=self.legacy)
+        self.assertEqual(store.list()[0], 3)
+        self.assertEqual(store.get("old1")["final_score"], 61)
+        store.delete("old1")
+
+        restarted = ResultStore(self.engine, legacy_dir=self.legacy)
+        self.assertEqual(restarted.list()[0], 2)   # not re-imported
+
+    def test_per_host_store_imported(self):
+        with open(os.path.join(self.legacy, "a.json"), "w") as f:
+            json.dump(report(50, "average", "2025-12-01", evaluation_id="a"), f)
+        path = os.path.join(self.legacy, "results.db")
+        with sqlite3.connect(path) as old:
+            old.execute("CREATE TABLE result_details (evaluation_id TEXT PRIMARY KEY, detail BLOB NOT NULL)")
+            old.executemany("INSERT INTO result_details VALUES (?, ?)", [
+                ("a", result_store.compress(report(50, "average", "2025-12-01", teacher_id="t1"))),
+                ("b", result_store.compress(report(90, "excellent", "2025-12-02", teacher_id="t1"))),
+            ])
+        old.close()
+
+        store = ResultStore(self.engine, legacy_dir=self.legacy, legacy_db=path)
+        self.assertEqual(store.list(teacher_id="t1")[0], 2)
+        self.assertEqual(store.statistics()["total_evaluations"], 2)
+        self.assertEqual(store.check_totals(), [])
+
+
+class TestResultRoutes(unittest.TestCase):
+    """The /results handlers on top of the store."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.engine = database(self.tmp)
+        self.store = ResultStore(self.engine)
+        self.patch = mock.patch.object(result_store, "_store", self.store)
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+        self.engine.dispose()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_save_list_get_stats_delete(self):
+        import numpy as np
+        results_routes.save_result("a", report(np.float64(88.5), "good", "2026-03-01"))
+        results_routes.save_result("b", report(40.0, "poor", "2026-03-02"))
+        self.assertTrue(results_routes.tag_result("a", teacher_id="t9"))
+
+        listing = asyncio.run(results_routes.list_results(limit=10, offset=0, min_score=None, max_score=None,
+                                                          grade=None, teacher_id="t9", class_id=None))
+        self.assertEqual((listing.count, listing.results[0].final_score), (1, 88.5))
+
+        detail = asyncio.run(results_routes.get_result("a"))
+        self.assertIn("saved_at", detail["data"])
+        stats = asyncio.run(results_routes.get_statistics())["data"]
+        self.assertEqual((stats["total_evaluations"], stats["highest_score"]), (2, 88.5))
+
+        asyncio.run(results_routes.delete_result("b"))
+        self.assertIsNone(results_routes.load_result("b"))
+
+    def test_evaluate_route_tags_owner_from_token(self):
+        from api.routes import evaluation as evaluation_routes
+        from api.services import evaluation_executor
+        from api.services.auth_service import TokenData
+
+        results_routes.save_result("ev", report(70.0, "good", "2026-03-03"))
+        result = mock.Mock(evaluation_id="ev")
+
+        async def fake_task(fn, *args):
+            return result, {}
+
+        teacher = TokenData(user_id=7, user_unique_id="TCH7", email="t@x.com", name="T", role="teacher")
+        db = mock.Mock()
+        with mock.patch.object(evaluation_executor, "run_evaluation_task", fake_task):
+            request = mock.Mock(evaluation_id="e-route")
+            returned = asyncio.run(evaluation_routes.evaluate_answer(request, db=db, current_user=teacher))
+
+        self.assertIs(returned, result)
+        saved = db.add.call_args[0][0]
+        self.assertEqual((saved.teacher_id, saved.student_id), (7, None))
+        self.assertEqual(self.store.list(teacher_id="7")[0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,240 @@
+"""
+Tests for batched Sarvam jobs
+==============================
+Covers: reading job output ZIPs in memory and mapping them to pages, the
+token bucket, packing pages (from one PDF or from concurrent callers) into
+multi-page jobs against the local stub server, the concurrent-job cap, the
+SDK job deadline and callers' wait bound, and OCRService sending a PDF's
+pages through the batching client.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import io
+import threading
+import time
+import types
+import unittest
+import zipfile
+from unittest import mock
+
+from PIL import Image
+
+from config.settings import settings
+from api.services import sarvam_client
+from api.services.sarvam_client import (
+    SarvamBatchClient,
+    SarvamJobError,
+    SarvamSDKBackend,
+    TokenBucket,
+    read_output,
+)
+from api.services.sarvam_stub import SarvamStubServer, StubBackend
+from api.services.ocr_service import OCRService
+
+
+def png(width, height=40):
+    buffer = io.BytesIO()
+    Image.new("L", (width, height), 255).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def make_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, text in files.items():
+            archive.writestr(name, text)
+    return buffer.getvalue()
+
+
+class TestReadOutput(unittest.TestCase):
+    """Tests for read_output."""
+
+    def test_numbered_page_files(self):
+        data = make_zip({
+            "out/document.md": "one\n\ntwo",
+            "out/page_002.md": "two",
+            "out/page_001.md": "one",
+            "out/page_001.html": "<p>one</p>",
+            "out/image.png": "PK...",
+        })
+        self.assertEqual(read_output(data, 2), ("one\n\ntwo", ["one", "two"]))
+
+    def test_page_break_markers(self):
+        data = make_zip({"document.md": "first<!-- page 2 -->second\fthird"})
+        self.assertEqual(read_output(data, 3)[1], ["first", "second", "third"])
+
+    def test_unsplittable_multi_page_output(self):
+        data = make_zip({"document.md": "all pages run together"})
+        self.assertEqual(read_output(data, 2), ("all pages run together", None))
+        self.assertEqual(read_output(data, 1)[1], ["all pages run together"])
+
+    def test_plain_text_output(self):
+        self.assertEqual(read_output(b"just text", 1), ("just text", ["just text"]))
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_rate_limits_after_burst(self):
+        bucket = TokenBucket(rate=20, burst=1)
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+        self.assertEqual(TokenBucket(rate=0).acquire(), 0.0)
+
+
+class TestSarvamBatchClient(unittest.TestCase):
+    """SarvamBatchClient against the local stub server."""
+
+    def setUp(self):
+        self.server = SarvamStubServer(job_latency=0.2, page_latency=0.01, max_requests_per_second=40).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _client(self, **kwargs):
+        options = dict(pages_per_job=10, max_concurrent_jobs=2, requests_per_second=30, linger=0.05)
+        options.update(kwargs)
+        return SarvamBatchClient(StubBackend(self.server.url), **options)
+
+    def test_pages_packed_into_jobs_in_order(self):
+        client = self._client()
+        results = client.extract([png(100 + i) for i in range(25)])
+
+        self.assertEqual([r.text for r in results], [f"Stub page {r.page}: {100 + i}x40" for i, r in enumerate(results)])
+        self.assertEqual([r.pages_in_job for r in results], [10] * 20 + [5] * 5)
+        stats = self.server.get_stats()
+        self.assertEqual((stats["jobs"], stats["pages"], stats["rejected"]), (3, 25, 0))
+        self.assertLessEqual(stats["max_running"], 2)
+        self.assertEqual(client.get_stats()["max_in_flight"], 2)
+
+    def test_concurrent_callers_share_a_job(self):
+        client = self._client(linger=0.3)
+        results = {}
+
+        def caller(width):
+            results[width] = client.submit(png(width), "hi-IN").result(timeout=10)
+
+        threads = [threading.Thread(target=caller, args=(w,)) for w in (120, 121, 122, 123)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+
+        self.assertEqual(self.server.get_stats()["jobs"], 1)
+        self.assertEqual({w: r.text.split(": ")[1] for w, r in results.items()},
+                         {w: f"{w}x40" for w in (120, 121, 122, 123)})
+        self.assertEqual(len({r.job_id for r in results.values()}), 1)
+
+    def test_languages_never_share_a_job(self):
+        client = self._client()
+        futures = [client.submit(png(100), "hi-IN"), client.submit(png(101), "ta-IN")]
+        self.assertEqual({f.result(timeout=10).pages_in_job for f in futures}, {1})
+        self.assertEqual(self.server.get_stats()["jobs"], 2)
+
+    def test_unsplittable_output_resubmitted_per_page(self):
+        client = self._client()
+        with mock.patch.object(sarvam_client, "read_output",
+                               side_effect=lambda data, pages: ("joined", None if pages > 1 else ["single"])):
+            results = client.extract([png(100), png(101), png(102)])
+        self.assertEqual([r.text for r in results], ["single"] * 3)
+        self.assertEqual(self.server.get_stats()["jobs"], 4)
+        self.assertEqual(client.get_stats()["pages_per_job"], 1)
+
+    def test_failed_job_fails_its_pages(self):
+        client = self._client()
+        with mock.patch.object(StubBackend, "wait", return_value="Failed"):
+            futures = [client.submit(png(100)), client.submit(png(101))]
+            for future in futures:
+                with self.assertRaises(SarvamJobError):
+                    future.result(timeout=10)
+        self.assertEqual(client.get_stats()["failed_jobs"], 1)
+
+    def test_result_timeout_covers_the_jobs_ahead(self):
+        client = self._client(pages_per_job=2, max_concurrent_jobs=2, job_timeout=1.0, linger=0.0)
+        self.assertEqual(client.result_timeout(), 1.0)
+        client._in_flight = 2
+        client._pending["hi-IN"] = [object()] * 3
+        # 2 running + 2 queued jobs, two at a time
+        self.assertEqual(client.result_timeout(), 2.0)
+
+
+class TestSarvamSDKBackend(unittest.TestCase):
+    """SarvamSDKBackend.wait polls with a deadline (no sarvamai needed)."""
+
+    def setUp(self):
+        self.backend = SarvamSDKBackend.__new__(SarvamSDKBackend)
+        self.backend.POLL_INTERVAL = 0.02
+        self.polls = 0
+
+    def job(self, states):
+        states = iter(states)
+
+        def get_status():
+            self.polls += 1
+            return types.SimpleNamespace(job_state=next(states))
+        return types.SimpleNamespace(job_id="job-1", get_status=get_status)
+
+    def test_returns_the_final_state(self):
+        throttled = []
+        job = self.job(["Accepted", "Running", "Completed"])
+        self.assertEqual(self.backend.wait(job, 5, lambda: throttled.append(1)), "Completed")
+        self.assertEqual(len(throttled), 3)
+
+    def test_hung_job_raises_after_the_timeout(self):
+        job = self.job(iter(lambda: "Running", None))
+        start = time.monotonic()
+        with self.assertRaises(SarvamJobError):
+            self.backend.wait(job, 0.1, lambda: None)
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertGreater(self.polls, 1)
+
+
+class FakePixmap:
+    def __init__(self, index):
+        self.index = index
+
+    def tobytes(self, fmt):
+        return png(200 + self.index)
+
+
+class FakeDoc:
+    def __init__(self, count):
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def load_page(self, index):
+        return types.SimpleNamespace(get_text=lambda: "", get_pixmap=lambda matrix=None: FakePixmap(index))
+
+    def close(self):
+        pass
+
+
+class TestOCRServiceSarvamPdf(unittest.TestCase):
+    """OCRService sends a PDF's pages to Sarvam in batched jobs."""
+
+    def test_pdf_pages_share_jobs(self):
+        with SarvamStubServer(job_latency=0.1, page_latency=0.0) as server:
+            client = SarvamBatchClient(StubBackend(server.url), pages_per_job=4, max_concurrent_jobs=2,
+                                       requests_per_second=0, linger=0.05)
+            service = OCRService(engine="sarvam")
+            fitz = types.SimpleNamespace(open=lambda path: FakeDoc(6), Matrix=lambda x, y: (x, y))
+            with mock.patch.dict(sys.modules, {"fitz": fitz}), \
+                    mock.patch.object(sarvam_client, "_client", client), \
+                    mock.patch.object(settings, "OCR_CACHE_ENABLED", False), \
+                    mock.patch.object(service, "_ocr_pdf_page") as single_page:
+                items = service._extract_from_pdf("booklet.pdf", True, True, language="hi")
+
+            self.assertEqual(server.get_stats()["jobs"], 2)
+        single_page.assert_not_called()
+        self.assertEqual([(d["page"], d["text"].split(": ")[1]) for d in items],
+                         [(i + 1, f"{200 + i}x40") for i in range(6)])
+        self.assertEqual({d["language"] for d in items}, {"hi"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Tests for versioned schema management
+======================================
+Covers: a fresh database migrated to head, restarts keeping data and
+skipping Alembic entirely, adoption of databases created by the old
+``create_all`` startup (including tables lacking columns added since),
+the migrations matching the models, workers starting in parallel on one
+SQLite file, and ``DB_AUTO_MIGRATE`` off.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from database import schema
+from database.models import Base, ModelAnswer, Teacher
+from database.schema import current_revision, head_revision, upgrade_database
+
+
+class SchemaTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.url = f"sqlite:///{os.path.join(self.tmp, 'assessiq.db')}"
+        self.engine = create_engine(self.url)
+
+    def tearDown(self):
+        self.engine.dispose()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def revision(self):
+        with self.engine.connect() as connection:
+            return current_revision(connection)
+
+
+class TestUpgradeDatabase(SchemaTestCase):
+    """Tests for upgrade_database."""
+
+    def test_fresh_database_migrated_to_head(self):
+        self.assertTrue(upgrade_database(self.engine, auto_migrate=True))
+        self.assertEqual(self.revision(), head_revision())
+        tables = set(inspect(self.engine).get_table_names())
+        self.assertTrue(set(Base.metadata.tables) <= tables)
+
+    def test_restart_keeps_data_and_skips_alembic(self):
+        upgrade_database(self.engine, auto_migrate=True)
+        with self.engine.begin() as connection:
+            connection.execute(text("INSERT INTO teachers (email, name) VALUES ('t@example.com', 'T')"))
+
+        with mock.patch("alembic.command.upgrade") as upgrade:
+            self.assertFalse(upgrade_database(self.engine, auto_migrate=True))
+        upgrade.assert_not_called()
+        with self.engine.connect() as connection:
+            self.assertEqual(connection.execute(text("SELECT COUNT(*) FROM teachers")).scalar(), 1)
+
+    def test_legacy_create_all_database_adopted(self):
+        Base.metadata.create_all(self.engine)
+        with self.engine.begin() as connection:
+            connection.execute(text("DROP TABLE evaluation_aggregates"))     # an older schema
+            connection.execute(text("INSERT INTO teachers (email, name) VALUES ('t@example.com', 'T')"))
+
+        self.assertTrue(upgrade_database(self.engine, auto_migrate=True))
+        self.assertEqual(self.revision(), head_revision())
+        self.assertIn("evaluation_aggregates", inspect(self.engine).get_table_names())
+        with self.engine.connect() as connection:
+            self.assertEqual(connection.execute(text("SELECT name FROM teachers")).scalar(), "T")
+
+    def test_baseline_schema_database_adopted(self):
+        Base.metadata.create_all(self.engine)
+        with self.engine.begin() as connection:
+            # Tables as the baseline create_all left them: columns added since are missing
+            for table, column in (("dashboards", "score_sum"), ("dashboards", "scored_count")):
+                connection.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+            connection.execute(text("INSERT INTO model_answers (answer_id, answer_text) VALUES ('a', 'Text')"))
+
+        self.assertTrue(upgrade_database(self.engine, auto_migrate=True))
+        with Session(self.engine) as session:
+            answer = session.query(ModelAnswer).one()
+            self.assertEqual(answer.answer_text, "Text")
+        self.test_migrations_match_models()
+
+    def test_migrations_match_models(self):
+        from alembic.autogenerate import compare_metadata
+        from alembic.runtime.migration import MigrationContext
+
+        upgrade_database(self.engine, auto_migrate=True)
+        with self.engine.connect() as connection:
+            diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+        self.assertEqual(diff, [], "database/models.py changed without a migration")
+
+    def test_parallel_workers(self):
+        results, errors = [], []
+
+        def worker():
+            engine = create_engine(self.url, connect_args={"timeout": 30})
+            try:
+                results.append(upgrade_database(engine, auto_migrate=True))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                engine.dispose()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(results), [False, False, False, True])
+        with self.engine.connect() as connection:
+            self.assertEqual(connection.execute(text("SELECT COUNT(*) FROM alembic_version")).scalar(), 1)
+
+    def test_auto_migrate_off_refuses_outdated_schema(self):
+        with self.assertRaises(RuntimeError):
+            upgrade_database(self.engine, auto_migrate=False)
+        self.assertNotIn("teachers", inspect(self.engine).get_table_names())
+
+        upgrade_database(self.engine, auto_migrate=True)
+        self.assertFalse(upgrade_database(self.engine, auto_migrate=False))
+
+
+class TestInitDb(SchemaTestCase):
+    def test_init_db_never_drops_tables(self):
+        from database import models
+
+        with mock.patch.object(models, "engine", self.engine), \
+                mock.patch.object(Base.metadata, "drop_all", side_effect=AssertionError("drop_all")):
+            models.init_db()
+            models.init_db()
+        self.assertEqual(self.revision(), head_revision())
+
+
+if __name__ == "__main__":
+    unittest.main()
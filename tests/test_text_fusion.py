@@ -0,0 +1,127 @@
+"""
+Tests for ensemble text fusion
+===============================
+Covers: the banded alignment primitive, monotone line mapping, position
+voting that survives inserted / dropped words, and the per-token
+dictionary cache.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import unittest
+
+from api.services.ocr_service import TextFuser, banded_alignment
+
+
+def _result(text, confidence):
+    return {"text": text, "confidence": confidence, "engine": "test"}
+
+
+class CountingAnalyzer:
+    """Treats a fixed word list as the dictionary and counts lookups."""
+
+    def __init__(self, words):
+        self.words = set(words)
+        self.calls = 0
+
+    def is_valid_word(self, word):
+        self.calls += 1
+        return word.lower().strip(".,") in self.words
+
+
+class TestBandedAlignment(unittest.TestCase):
+    """Tests for banded_alignment."""
+
+    @staticmethod
+    def _align(a, b, band=8):
+        return banded_alignment(len(a), len(b), lambda i, j: 1.0 if a[i] == b[j] else -1.0, -1.0, band)
+
+    def test_insertion_and_deletion(self):
+        pairs = self._align("abcdef", "abXcdf")
+        self.assertEqual(pairs, [(0, 0), (1, 1), (None, 2), (2, 3), (3, 4), (4, None), (5, 5)])
+
+    def test_covers_both_sequences_in_order(self):
+        rng = random.Random(3)
+        for _ in range(50):
+            a = rng.choices("abc", k=rng.randint(0, 60))
+            b = rng.choices("abc", k=rng.randint(0, 60))
+            pairs = self._align(a, b, band=4)
+            self.assertEqual([i for i, _ in pairs if i is not None], list(range(len(a))))
+            self.assertEqual([j for _, j in pairs if j is not None], list(range(len(b))))
+
+    def test_forbidden_pairs_become_gaps(self):
+        pairs = banded_alignment(2, 2, lambda i, j: float("-inf") if i == j else 1.0, 0.0)
+        self.assertNotIn((0, 0), pairs)
+        self.assertNotIn((1, 1), pairs)
+        self.assertEqual(sum(i is not None and j is not None for i, j in pairs), 1)
+
+
+class TestTextFuser(unittest.TestCase):
+    """Tests for TextFuser.fuse."""
+
+    def test_inserted_word_does_not_shift_later_votes(self):
+        fused = TextFuser.fuse([
+            _result("the process manages memory", 0.9),
+            _result("the the process manaqes memory", 0.6),
+            _result("the process manaqes memory", 0.7),
+        ])
+        # Index voting would have mixed "the"/"process"/"manaqes" columns
+        self.assertEqual(fused, "the process manaqes memory")
+
+    def test_inserted_word_kept_when_most_engines_agree(self):
+        fused = TextFuser.fuse([
+            _result("The quick brown fox", 0.9),
+            _result("The very quick brown fox", 0.7),
+            _result("Tbe very quick brown f0x", 0.6),
+        ])
+        self.assertEqual(fused, "The very quick brown fox")
+
+    def test_lines_mapped_monotonically(self):
+        fused = TextFuser.fuse([
+            _result("operating systems\n\nmanage hardware\nand software", 0.9),
+            _result("extra header line\noperatlng systems\nmanage hardware\nand softwarc", 0.7),
+            _result("operatlng systems\nmanage hardware\nand softwarc", 0.6),
+        ])
+        self.assertEqual(fused, "operatlng systems\n\nmanage hardware\nand softwarc")
+
+    def test_dictionary_words_preferred_and_cached(self):
+        analyzer = CountingAnalyzer({"operating", "system", "the", "system."})
+        fused = TextFuser.fuse([
+            _result("the operatlng system.\nthe operatlng system.", 0.9),
+            _result("the operating system.\nthe operating system.", 0.5),
+        ], quality_analyzer=analyzer)
+        self.assertEqual(fused, "the operating system.\nthe operating system.")
+        self.assertEqual(analyzer.calls, 4)  # one lookup per distinct token
+
+    def test_long_page_fused_exactly(self):
+        rng = random.Random(11)
+        vocab = [f"token{i}" for i in range(500)]
+        lines = [" ".join(rng.choices(vocab, k=10)) for _ in range(300)]
+
+        def noisy(engine, junk):
+            # Stray words from one engine per line, at random positions
+            r = random.Random(engine)
+            out = []
+            for k, line in enumerate(lines):
+                words = line.split()
+                if k % 3 == engine and r.random() < 0.8:
+                    words.insert(r.randrange(len(words) + 1), junk)
+                if (k + 1) % 3 == engine and r.random() < 0.3:
+                    del words[r.randrange(len(words))]
+                out.append(" ".join(words))
+            return "\n".join(out)
+
+        fused = TextFuser.fuse([
+            _result(noisy(0, "ll"), 0.9),
+            _result(noisy(1, "rn"), 0.8),
+            _result(noisy(2, "|"), 0.7),
+        ])
+        # Stray and dropped words are outvoted wherever they fall
+        self.assertEqual(fused.splitlines(), lines)
+
+
+if __name__ == "__main__":
+    unittest.main()